@@ -3,9 +3,11 @@ from signals.utils.env_loader import USERNAME, API_KEY, BASE_URL
 from signals.api.config import CONFIG
 
 
-def authenticate():
+def authenticate(session=None):
     """
     Authentifie avec API key + username pour obtenir un token JWT.
+    `session` : requests.Session partagée (signals.api.client.get_session) pour réutiliser
+    la connexion ; le cache du token est géré par signals.api.client.TokenCache.
     """
 
     if not USERNAME or not API_KEY:
@@ -23,7 +25,8 @@ def authenticate():
         "apiKey": API_KEY
     }
 
-    response = requests.post(login_url, json=payload, headers=headers)
+    post = session.post if session is not None else requests.post
+    response = post(login_url, json=payload, headers=headers, timeout=10)
 
     if response.status_code != 200:
         raise ConnectionError(f"Erreur HTTP: {response.status_code} – {response.text}")
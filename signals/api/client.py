@@ -1,18 +1,45 @@
 # signals/api/client.py
+"""
+Client HTTP TopstepX partagé.
 
-import requests
-import time
+- get_session() : une requests.Session unique (pool de connexions keep-alive) : plus de
+  poignée de main TCP+TLS par requête.
+- TokenCache : token JWT mis en cache et renouvelé juste avant son expiration (claim `exp`,
+  sinon durée par défaut) ; un seul login même si plusieurs threads le demandent en même temps.
+- APIClient : url_for / login / post (utilisé par la boucle live via place_order et par les
+  commandes CLI de signals/api/endpoints). Un 401 invalide le token et rejoue une fois.
+- Chaque POST passe par le limiteur de débit et le disjoncteur de sa famille d'endpoints
+  (signals.logic.execution.api.throttle) ; Retry-After est remonté dans la réponse d'erreur.
+Session et token sont partagés entre toutes les instances (APIClient() reste bon marché).
+"""
+
+import base64
+import json
 import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
-def safe_post(url, json_data, headers=None):
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+DEFAULT_TIMEOUT = 10.0
+TOKEN_REFRESH_MARGIN = 120.0      # renouvelle le token 2 min avant expiration
+TOKEN_DEFAULT_TTL = 23 * 3600     # si le token n'expose pas de claim `exp`
+
+
+def safe_post(url, json_data, headers=None, session=None):
+    post = session.post if session is not None else requests.post
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             logging.info(f"[API] POST {url} | tentative {attempt}")
-            response = requests.post(url, json=json_data, headers=headers)
+            response = post(url, json=json_data, headers=headers)
             response.raise_for_status()
             return response
         except RequestException as e:
@@ -20,3 +47,228 @@ def safe_post(url, json_data, headers=None):
             time.sleep(RETRY_DELAY)
     logging.error(f"[API] Échec POST après {MAX_RETRIES} tentatives: {url}")
     raise Exception("Échec API : max tentatives atteintes.")
+
+
+# ------------------------------------------------------------
+# Session partagée
+# ------------------------------------------------------------
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.RLock()
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"accept": "application/json", "Content-Type": "application/json"})
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session()
+    return _session
+
+
+# ------------------------------------------------------------
+# Token JWT
+# ------------------------------------------------------------
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Claim `exp` (epoch s) d'un JWT, sans vérification de signature ; None si illisible."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class TokenCache:
+    def __init__(
+        self,
+        fetch: Callable[[], str],
+        *,
+        refresh_margin: float = TOKEN_REFRESH_MARGIN,
+        default_ttl: float = TOKEN_DEFAULT_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._fetch = fetch
+        self.refresh_margin = float(refresh_margin)
+        self.default_ttl = float(default_ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: Optional[Tuple[str, float]] = None   # (token, expiration epoch s)
+
+    def _valid(self, state: Optional[Tuple[str, float]]) -> bool:
+        return state is not None and self._clock() < state[1] - self.refresh_margin
+
+    def get(self) -> str:
+        state = self._state
+        if self._valid(state):
+            return state[0]
+        with self._lock:
+            state = self._state
+            if not self._valid(state):
+                token = self._fetch()
+                expires = jwt_expiry(token) or (self._clock() + self.default_ttl)
+                state = self._state = (token, expires)
+                logging.info("🔑 [API] Token renouvelé")
+            return state[0]
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Oublie le token (seulement s'il s'agit toujours de `token`, si fourni)."""
+        with self._lock:
+            if token is None or (self._state is not None and self._state[0] == token):
+                self._state = None
+
+
+def _authenticate() -> str:
+    # import paresseux : signals.api.config exige TOPSTEPX_BASE_URL
+    from signals.api import auth
+    return auth.authenticate(session=get_session())
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def get_token_cache() -> TokenCache:
+    global _token_cache
+    if _token_cache is None:
+        with _session_lock:
+            if _token_cache is None:
+                _token_cache = TokenCache(_authenticate)
+    return _token_cache
+
+
+# ------------------------------------------------------------
+# Client
+# ------------------------------------------------------------
+
+class APIClient:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        *,
+        endpoints: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        token_cache: Optional[TokenCache] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        debug: bool = False,
+        throttle: Any = None,
+    ):
+        self._base_url = base_url
+        self._endpoints = endpoints
+        self.session = session or get_session()
+        self.token_cache = token_cache or get_token_cache()
+        self.timeout = float(timeout)
+        self.debug = bool(debug)
+        # None -> registre partagé du process ; False -> pas de limitation ; sinon ThrottleRegistry
+        self.throttle = throttle
+
+    def _config(self) -> Tuple[str, Dict[str, str]]:
+        if self._base_url is None or self._endpoints is None:
+            from signals.api import config
+            if self._base_url is None:
+                self._base_url = config.BASE_URL
+            if self._endpoints is None:
+                self._endpoints = config.CONFIG["api"]["endpoints"]
+        return self._base_url, self._endpoints
+
+    def url_for(self, endpoint_name: str) -> str:
+        base_url, endpoints = self._config()
+        return f"{base_url}{endpoints[endpoint_name]}"
+
+    def login(self) -> str:
+        return self.token_cache.get()
+
+    def post(
+        self,
+        endpoint_name: str,
+        payload: Dict[str, Any],
+        debug: bool = False,
+        timeout: Optional[float] = None,
+        strict: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        POST authentifié sur la session partagée. Erreur HTTP -> {"statusCode", "error", "body"
+        [, "retryAfter"]} (ou HTTPError si strict) ; circuit ouvert -> {"statusCode": 503,
+        "circuitOpen": True, "retryAfter"} sans appel réseau ; réponse JSON telle quelle sinon.
+        """
+        url = self.url_for(endpoint_name)
+        guard = self._guard(endpoint_name)
+        if guard is not None:
+            wait = guard.acquire()
+            if wait is not None:
+                return {"statusCode": 503, "error": "circuit ouvert", "circuitOpen": True, "retryAfter": round(wait, 3)}
+
+        try:
+            response = self._send(url, payload, debug, timeout)
+        except BaseException:
+            # réseau, mais aussi login (auth) ou autre : l'appel d'essai du half-open doit être libéré
+            if guard is not None:
+                guard.record(ok=False)
+            raise
+
+        status = response.status_code
+        retry_after = None
+        if status == 429 or status >= 500:
+            from signals.logic.execution.api import throttle
+            retry_after = throttle.parse_retry_after((getattr(response, "headers", None) or {}).get("Retry-After"))
+        if guard is not None:
+            guard.record(ok=status != 429 and status < 500, retry_after=retry_after)
+
+        if status >= 400:
+            if strict:
+                response.raise_for_status()
+            error = {"statusCode": status, "error": response.reason, "body": response.text}
+            if retry_after is not None:
+                error["retryAfter"] = retry_after
+            return error
+        try:
+            return response.json()
+        except ValueError:
+            return {"raw": response.text, "statusCode": status}
+
+    def _send(self, url: str, payload: Dict[str, Any], debug: bool, timeout: Optional[float]) -> requests.Response:
+        for attempt in (1, 2):
+            token = self.login()
+            if debug or self.debug:
+                logging.info(f"[API] POST {url} | tentative {attempt}")
+            response = self.session.post(
+                url,
+                json=payload,
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=timeout or self.timeout,
+            )
+            if response.status_code == 401 and attempt == 1:
+                self.token_cache.invalidate(token)   # token révoqué/expiré côté serveur
+                continue
+            break
+        return response
+
+    def _guard(self, endpoint_name: str) -> Any:
+        if self.throttle is False:
+            return None
+        from signals.logic.execution.api import throttle   # import tardif (évite un cycle d'import)
+        registry = self.throttle if self.throttle is not None else throttle.get_registry()
+        return registry.guard_for(endpoint_name)
+
+
+_client: Optional[APIClient] = None
+
+
+def get_client() -> APIClient:
+    """Client partagé (boucle live + commandes CLI)."""
+    global _client
+    if _client is None:
+        with _session_lock:
+            if _client is None:
+                _client = APIClient()
+    return _client
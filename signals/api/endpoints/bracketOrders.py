@@ -1,7 +1,9 @@
 import sys
 import json
 import argparse
-import uuid
+
+from signals.logic.execution.bracket import build_bracket_payloads, submit_bracket
+from signals.logic.execution.gateway import OrderGateway
 
 
 def run(client):
@@ -30,62 +32,35 @@ def run(client):
     args = parser.parse_args(sys.argv[2:])
     debug = args.debug or client.debug
 
-    common_payload = {
-        "accountId": args.accountId,
-        "contractId": args.contractId,
-        "side": args.side,
-        "size": args.size,
-    }
+    entry_payload, stop_payload, tp_payload = build_bracket_payloads(
+        account_id=args.accountId,
+        contract_id=args.contractId,
+        side=args.side,
+        size=args.size,
+        entry_type=args.entryType,
+        entry_price=args.entryPrice,
+        stop_price=args.stopPrice,
+        take_profit_price=args.limitPrice,
+    )
 
     try:
-        # Créer un tag unique pour l'ensemble
-        group_tag = str(uuid.uuid4())
-
-        # 1. Entrée
-        entry_payload = {
-            **common_payload,
-            "type": args.entryType,
-            "limitPrice": args.entryPrice if args.entryType == 1 else None,
-            "customTag": f"{group_tag}-entry"
-        }
-        entry_payload = {k: v for k, v in entry_payload.items() if v is not None}
-        entry_data = client.post("placeOrder", entry_payload)
-        entry_id = entry_data.get("orderId")
-
-        if not entry_id:
-            raise Exception("Échec de création de l'ordre d’entrée.")
-
-        print(f"✅ Entrée créée (orderId={entry_id})")
-
-        # 2. Stop Loss
-        stop_payload = {
-            **common_payload,
-            "type": 4,  # Stop
-            "stopPrice": args.stopPrice,
-            "customTag": f"{group_tag}-sl",
-            "linkedOrderId": entry_id
-        }
-        stop_data = client.post("placeOrder", stop_payload)
-
-        if stop_data.get("orderId"):
-            print(f"✅ Stop loss créé (orderId={stop_data['orderId']})")
-        else:
-            print("❌ Erreur lors de la création du stop loss.")
-
-        # 3. Take Profit
-        tp_payload = {
-            **common_payload,
-            "type": 1,  # Limit
-            "limitPrice": args.limitPrice,
-            "customTag": f"{group_tag}-tp",
-            "linkedOrderId": entry_id
-        }
-        tp_data = client.post("placeOrder", tp_payload)
-
-        if tp_data.get("orderId"):
-            print(f"✅ Take profit créé (orderId={tp_data['orderId']})")
-        else:
-            print("❌ Erreur lors de la création du take profit.")
+        # Entrée puis SL + TP en parallèle ; annulation des autres jambes si l'une échoue
+        with OrderGateway(client, max_retries=0) as gateway:
+            result = submit_bracket(gateway, entry_payload, stop_payload, tp_payload).result()
+
+        for label, key in (("Entrée", "entry"), ("Stop loss", "stop"), ("Take profit", "take_profit")):
+            leg = result.get(key)
+            if leg is None:
+                continue
+            if leg.get("order_id"):
+                print(f"✅ {label} : orderId={leg['order_id']} ({leg['latency_ms']:.0f} ms)")
+            else:
+                print(f"❌ {label} refusé(e) : {leg.get('error') or leg.get('response')}")
+
+        if result["status"] == "ok":
+            print(f"🛡️ Bracket protégé {result['naked_ms']:.0f} ms après l'acceptation de l'entrée")
+        elif result["status"] == "rolled_back":
+            print(f"↩️ Bracket annulé ({len(result['rollback'])} annulation(s)) : {result.get('error')}")
 
         if debug:
             print("\n📦 Bracket complet :")
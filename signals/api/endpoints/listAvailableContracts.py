@@ -1,30 +1,26 @@
-import requests
 import sys
 import json
 from signals.api.config import CONFIG
 from signals.utils.env_loader import BASE_URL
+from signals.logic.execution.state_cache import get_contract_cache
 
 
 def run(client):
     """
     Commande CLI :
-        python main.py available [--live true|false]
+        python main.py available [--live true|false] [--refresh]
+    Lue depuis le cache contrats (disque, TTL api.contracts_ttl_hours) ; --refresh force l'appel API.
     """
 
     import argparse
     parser = argparse.ArgumentParser(description="Lister les contrats disponibles")
     parser.add_argument("--live", type=str, choices=["true", "false"], default="false", help="Mode live ou sim ?")
+    parser.add_argument("--refresh", action="store_true", help="Ignorer le cache et interroger l'API")
     args = parser.parse_args(sys.argv[2:])
 
     live_mode = args.live.lower() == "true"
-    token = client.login()
 
     url = f"{BASE_URL}{CONFIG['api']['endpoints']['listAvailableContracts']}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "Content-Type": "application/json"
-    }
     payload = {
         "live": live_mode
     }
@@ -34,7 +30,6 @@ def run(client):
 
     if enable_logging:
         print(f"📄 [API Call] POST {url}")
-        print(f"   Headers: {headers}")
         print(f"   Payload: {json.dumps(payload, indent=2)}")
 
     if dry_run:
@@ -42,20 +37,18 @@ def run(client):
         return
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        cache = get_contract_cache(client, live=live_mode)
+        if args.refresh:
+            cache.refresh()
+        else:
+            cache.ensure()
         if enable_logging:
-            print(f"   Status Code: {response.status_code}")
+            print(f"   Cache: {cache.path} (TTL {cache.ttl_seconds / 3600:g} h)")
 
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("success") and data.get("errorCode") == 0:
-            contracts = data.get("contracts", [])
-            print(f"✅ {len(contracts)} contrat(s) disponible(s) :")
-            for contract in contracts:
-                print(f"- {contract['id']} | {contract['name']} | {contract['description']}")
-        else:
-            print(f"❌ Erreur API : {data.get('errorMessage')}")
+        contracts = cache.all()
+        print(f"✅ {len(contracts)} contrat(s) disponible(s) :")
+        for contract in contracts:
+            print(f"- {contract['id']} | {contract['name']} | {contract['description']}")
 
     except Exception as e:
         print(f"❌ Exception pendant la requête : {e}")
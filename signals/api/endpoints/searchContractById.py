@@ -1,10 +1,10 @@
 import sys
 import json
 import argparse
-import requests
 
 from signals.api.config import CONFIG
 from signals.utils.env_loader import BASE_URL
+from signals.logic.execution.state_cache import get_contract_cache
 
 
 
@@ -12,6 +12,7 @@ def run(client):
     """
     Commande CLI :
         python main.py searchById <contractId>
+    Contrat lu dans le cache contrats s'il y est (sinon appel API, résultat mis en cache).
     """
 
     parser = argparse.ArgumentParser(description="Rechercher un contrat par ID")
@@ -26,18 +27,11 @@ def run(client):
     endpoint_name = "searchContractById"
     url = f"{BASE_URL}{CONFIG['api']['endpoints'][endpoint_name]}"
 
-    headers = {
-        "Authorization": f"Bearer {client.login()}",
-        "accept": "application/json",
-        "Content-Type": "application/json"
-    }
-
     enable_logging = CONFIG.get("logging", {}).get("enable_api_logging", False) or args.debug
     dry_run = CONFIG.get("logging", {}).get("dry_run_mode", False)
 
     if enable_logging:
         print(f"🔍 [API Call] POST {url}")
-        print(f"   Headers: {headers}")
         print(f"   Payload: {json.dumps(payload, indent=2)}")
 
     if dry_run:
@@ -45,20 +39,16 @@ def run(client):
         return
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-
-        if enable_logging:
-            print(f"   Status Code: {response.status_code}")
-
-        response.raise_for_status()
-        data = response.json()
+        cache = get_contract_cache(client)
+        if cache.expired:
+            cache.load()
+        contract = cache.fetch(contract_id)
 
-        if data.get("success") and data.get("errorCode") == 0:
-            contract = data.get("contract", {})
+        if contract:
             print("✅ Contrat trouvé :")
             print(json.dumps(contract, indent=2))
         else:
-            print(f"❌ Erreur API : {data.get('errorMessage')}")
+            print(f"❌ Erreur API : contrat {contract_id} introuvable")
 
     except Exception as e:
         print(f"❌ Exception pendant la requête : {e}")
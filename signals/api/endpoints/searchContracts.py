@@ -1,10 +1,8 @@
 import sys
 import json
 import argparse
-import requests
 
 from signals.api.config import CONFIG
-from signals.utils.env_loader import BASE_URL
 
 
 
@@ -30,20 +28,13 @@ def run(client):
     }
 
     endpoint_name = "searchContracts"
-    url = f"{BASE_URL}{CONFIG['api']['endpoints'][endpoint_name]}"
-
-    headers = {
-        "Authorization": f"Bearer {client.login()}",
-        "accept": "application/json",
-        "Content-Type": "application/json"
-    }
+    url = client.url_for(endpoint_name)
 
     enable_logging = CONFIG.get("logging", {}).get("enable_api_logging", False) or args.debug
     dry_run = CONFIG.get("logging", {}).get("dry_run_mode", False)
 
     if enable_logging:
         print(f"🔍 [API Call] POST {url}")
-        print(f"   Headers: {headers}")
         print(f"   Payload: {json.dumps(payload, indent=2)}")
 
     if dry_run:
@@ -51,13 +42,8 @@ def run(client):
         return
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-
-        if enable_logging:
-            print(f"   Status Code: {response.status_code}")
-
-        response.raise_for_status()
-        data = response.json()
+        # client partagé : limiteur + disjoncteur, timeout, retry 401
+        data = client.post(endpoint_name, payload, strict=True)
 
         if data.get("success") and data.get("errorCode") == 0:
             contracts = data.get("contracts", [])
@@ -65,7 +51,7 @@ def run(client):
             for contract in contracts:
                 print(f"- {contract['id']} | {contract['name']} | {contract['description']}")
         else:
-            print(f"❌ Erreur API : {data.get('errorMessage')}")
+            print(f"❌ Erreur API : {data.get('errorMessage') or data.get('error')}")
 
     except Exception as e:
         print(f"❌ Exception pendant la requête : {e}")
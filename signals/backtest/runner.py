@@ -7,12 +7,15 @@ import json
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, List, Iterable
 
+import numpy as np
 import pandas as pd
 
 from signals.utils.config_reader import load_config
+from signals.feeds.ohlcv_store import load_ohlcv_frame
 from signals.optimizer.optimizer_rules import load_optimizer_config
 from signals.features.real_time_features import compute_features_for_live_data, get_last_row_features
 from signals.utils.time_utils import get_current_hour_label
+from signals.optimizer.schedule_index import ScheduleMode, get_schedule_index
 from signals.logic.trade_decider import load_model  # XGBoost Booster
 from signals.metrics.perf_tracker import PerformanceTracker, FuturesSpec
 
@@ -48,7 +51,8 @@ class BacktestEngine:
     def _load_5m(self) -> pd.DataFrame:
         data_root = self.cfg["data"]["data_path"]
         file_5m = os.path.join(data_root, self.cfg["data"]["input_5m"])
-        df = pd.read_csv(file_5m)
+        # store .ohlcv memmap si input_5m le désigne, sinon CSV
+        df = load_ohlcv_frame(file_5m)
         # tri + index propre
         df = df.sort_values("time").reset_index(drop=True)
         return df
@@ -56,11 +60,14 @@ class BacktestEngine:
     def _prepare_features(self, df5: pd.DataFrame) -> pd.DataFrame:
         # Recalcule les features à la volée avec la même pipeline que le live
         enriched = compute_features_for_live_data(df5.copy(), self.cfg)
+        # la pipeline live renomme time -> datetime : on conserve le libellé d'origine pour les trades
+        if "time" not in enriched.columns and "time" in df5.columns and len(enriched) == len(df5):
+            enriched.insert(0, "time", df5["time"].to_numpy())
         return enriched
 
     def _select_session_config(self, dt_hour_utc: int) -> Optional[tuple[str, dict]]:
         # identique à la logique live (basée sur optimizer)
-        label = get_current_hour_label(dt_hour_utc, {"CONFIGURATIONS_BY_SCHEDULE": self.optimizer_cfg})
+        label = get_current_hour_label(dt_hour_utc, self.optimizer_cfg)
         if not label:
             return None
         return label, self.optimizer_cfg[label]
@@ -70,23 +77,183 @@ class BacktestEngine:
         dmx = xgb.DMatrix(X_row_df)
         return float(self.model.predict(dmx)[0])
 
+    def _ml_probs(self, X_df: pd.DataFrame, chunk_size: int = 1_000_000) -> np.ndarray:
+        """Probabilités pour toutes les lignes de X_df (un predict par bloc de chunk_size lignes)."""
+        import xgboost as xgb
+        out = np.empty(len(X_df), dtype=np.float64)
+        for start in range(0, len(X_df), chunk_size):
+            part = X_df.iloc[start:start + chunk_size]
+            out[start:start + len(part)] = self.model.predict(xgb.DMatrix(part))
+        return out
+
+    def _features_for(self, cfg_now: dict) -> List[str]:
+        features_list: List[str] = cfg_now.get("features") or []  # si présent dans ton optimizer
+        if not features_list:
+            # fallback: utilise le set de features du model de config.yaml (optionnel)
+            features_list = (self.cfg.get("model", {}).get("features") or [])
+        return features_list
+
     def _qty_from_config(self, cfg_now: dict) -> float:
         rm = cfg_now.get("RISK_MANAGEMENT", {}) or {}
         return float(rm.get("FIXED_LOTS", 1))
 
-    def simulate(self) -> List[Trade]:
+    def simulate(self, batch: bool = True) -> List[Trade]:
+        """
+        batch=True : features/probabilités calculées une fois pour toutes les lignes
+        (quelques appels predict), puis machine à états sur les tableaux précalculés.
+        batch=False : chemin ligne à ligne historique (un predict par bougie).
+        Les deux modes produisent les mêmes trades.
+        """
         df = self._load_5m()
         if df.empty:
             return []
 
         enriched = self._prepare_features(df)
-        trades: List[Trade] = []
-        position: Optional[Trade] = None
 
         # colonnes minimales
         if "time" not in enriched.columns or "close" not in enriched.columns:
             raise RuntimeError("Colonnes 'time'/'close' manquantes dans les données enrichies.")
 
+        if batch:
+            return self._simulate_batch(enriched)
+        return self._simulate_rows(enriched)
+
+    def _session_probs(self, enriched: pd.DataFrame):
+        """
+        (labels, cfg_by_label, probs, usable) pour toutes les lignes :
+        session par ligne, probabilité ML (NaN si non calculée) et masque des lignes exploitables.
+        """
+        n = len(enriched)
+        # session de chaque ligne : requête vectorielle de l'index compilé (même sémantique
+        # que _select_session_config / get_current_hour_label)
+        index = get_schedule_index(self.optimizer_cfg, ScheduleMode.HOUR_LABEL)
+        k = index.index_array(pd.to_datetime(enriched["time"]))
+        labels = np.array(index.labels + (None,), dtype=object)[k].tolist()  # -1 -> None
+        cfg_by_label = {index.labels[j]: self.optimizer_cfg[index.labels[j]] for j in np.unique(k) if j >= 0}
+
+        # une matrice de features et un predict par liste de features distincte
+        probs = np.full(n, np.nan)
+        usable = np.zeros(n, dtype=bool)
+        label_arr = np.array(labels, dtype=object)
+        by_features: Dict[tuple, List[str]] = {}
+        for label, cfg_now in cfg_by_label.items():
+            by_features.setdefault(tuple(self._features_for(cfg_now)), []).append(label)
+        for feats, group in by_features.items():
+            if any(f not in enriched.columns for f in feats):
+                continue  # équivalent de l'exception get_last_row_features : lignes ignorées
+            mask = np.isin(label_arr, group)
+            if not mask.any():
+                continue
+            probs[mask] = self._ml_probs(enriched.loc[mask, list(feats)])
+            usable |= mask
+        return labels, cfg_by_label, probs, usable
+
+    def _simulate_batch(self, enriched: pd.DataFrame) -> List[Trade]:
+        n = len(enriched)
+        labels, cfg_by_label, probs, usable = self._session_probs(enriched)
+        cols = {c: enriched[c].to_numpy() for c in ("time", "high", "low", "close", "vwap") if c in enriched.columns}
+
+        def row_at(i: int) -> Dict[str, Any]:
+            return {c: v[i] for c, v in cols.items()}
+
+        trades: List[Trade] = []
+        position: Optional[Trade] = None
+        for i in np.flatnonzero(usable):
+            label = labels[i]
+            cfg_now = cfg_by_label[label]
+            prob = float(probs[i])
+            seuil = float(cfg_now.get("ML_THRESHOLD", 0.5))
+            if prob < seuil or position:
+                if position:
+                    row = row_at(i)
+                    if self._maybe_exit(position, row, cfg_now):
+                        self._close_position(position, row)
+                        trades.append(position)
+                        position = None
+                continue
+
+            position = Trade(
+                time=cols["time"][i],
+                action="BUY",
+                price=float(cols["close"][i]),
+                qty=self._qty_from_config(cfg_now),
+                reason=f"ML≥{seuil} ({prob:.2f}) | {label}",
+                session=label,
+                prob=prob,
+                vwap=float(cols["vwap"][i]) if "vwap" in cols else None,
+            )
+
+        # force une clôture à la fin si besoin (marque à marché)
+        if position:
+            self._close_position(position, row_at(n - 1))
+            trades.append(position)
+
+        return trades
+
+    def vector_inputs(self, enriched: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Tableaux alignés pour signals.backtest.vectorized / sweep :
+        high, low, close, vwap, atr, ndist (normalized_dist_to_vwap), prob, sched_idx
+        (index du schedule dans optimizer_cfg, -1 hors séance ou features indisponibles).
+        """
+        labels, _, probs, usable = self._session_probs(enriched)
+        pos = {label: k for k, label in enumerate(self.optimizer_cfg.keys())}
+        sched = np.array([pos[l] if (ok and l is not None) else -1 for l, ok in zip(labels, usable)], dtype=np.int64)
+
+        def col(name: str) -> np.ndarray:
+            return enriched[name].to_numpy(dtype=float) if name in enriched.columns else np.full(len(enriched), np.nan)
+
+        return {
+            "high": col("high"), "low": col("low"), "close": col("close"), "vwap": col("vwap"),
+            "atr": col("atr"), "ndist": col("normalized_dist_to_vwap"), "prob": probs, "sched_idx": sched,
+        }
+
+    def simulate_vectorized(self) -> List[Trade]:
+        """
+        Simulation NumPy avec la sémantique optimizer complète (decide_entry_from_features,
+        direction BUY/SELL, sorties decide_exit SL ATR -> fixed_ticks -> cross -> vwap_level).
+        """
+        from signals.backtest.vectorized import EXIT_REASONS, run_vectorized
+
+        df = self._load_5m()
+        if df.empty:
+            return []
+        enriched = self._prepare_features(df)
+        arrays = self.vector_inputs(enriched)
+        names = list(self.optimizer_cfg.keys())
+        res = run_vectorized(
+            **arrays,
+            schedules=[self.optimizer_cfg[l] for l in names],
+            tick_size=self.spec.tick_size, tick_value=self.spec.tick_value,
+        )
+
+        probs = arrays["prob"]
+        vwap = arrays["vwap"]
+        times = enriched["time"].to_numpy()
+        trades: List[Trade] = []
+        for k in range(len(res)):
+            i, j = int(res.entry_idx[k]), int(res.exit_idx[k])
+            label = names[int(res.schedule[k])]
+            seuil = float(self.optimizer_cfg[label].get("ML_THRESHOLD", 0.5))
+            trades.append(Trade(
+                time=times[i],
+                action="BUY" if res.side[k] > 0 else "SELL",
+                price=float(res.entry_price[k]),
+                qty=float(res.qty[k]),
+                reason=f"ML≥{seuil} ({probs[i]:.2f}) | {label} | exit={EXIT_REASONS[res.reason[k]]}",
+                session=label,
+                prob=float(probs[i]),
+                vwap=float(vwap[i]),
+                exit_time=times[j],
+                exit_price=float(res.exit_price[k]),
+                pnl=float(res.pnl_usd[k]),
+            ))
+        return trades
+
+    def _simulate_rows(self, enriched: pd.DataFrame) -> List[Trade]:
+        trades: List[Trade] = []
+        position: Optional[Trade] = None
+
         for i in range(len(enriched)):
             row = enriched.iloc[i]
             # heure UTC (les CSV sont en Z)
@@ -96,10 +263,7 @@ class BacktestEngine:
                 continue
             label, cfg_now = sel
 
-            features_list: List[str] = cfg_now.get("features") or []  # si présent dans ton optimizer
-            if not features_list:
-                # fallback: utilise le set de features du model de config.yaml (optionnel)
-                features_list = (self.cfg.get("model", {}).get("features") or [])
+            features_list = self._features_for(cfg_now)
 
             # extrait la dernière ligne de features pour le modèle
             try:
@@ -180,14 +344,11 @@ class BacktestEngine:
         pnl_usd = pnl_ticks * self.spec.tick_value * pos.qty
         pos.pnl = pnl_usd
         # alimente le tracker (optionnel selon ton usage)
-        self.tracker.on_fill_simulated(
-            side=pos.action, fill_price=pos.price, qty=pos.qty, mode="entry"
-        )
-        self.tracker.on_fill_simulated(
-            side=("SELL" if pos.action == "BUY" else "BUY"),
-            fill_price=exit_price,
+        self.tracker.on_fill(price=pos.price, qty=pos.qty, side=pos.action)
+        self.tracker.on_fill(
+            price=exit_price,
             qty=pos.qty,
-            mode="exit",
+            side=("SELL" if pos.action == "BUY" else "BUY"),
         )
 
 
@@ -0,0 +1,252 @@
+# signals/backtest/sweep.py
+"""
+Balayage de grille ML_THRESHOLD × VWAP_CONFIG.entry_threshold × TP_TICKS × ATR_MULTIPLIER
+par schedule, sur des features / probabilités calculées une seule fois.
+
+- Les tableaux (high, low, close, vwap, atr, normalized_dist_to_vwap, prob, schedule) sont
+  placés dans un bloc multiprocessing.shared_memory : les workers du pool s'y attachent
+  à l'initialisation (aucun pickling de la matrice par tâche).
+- Chaque combinaison est évaluée par run_vectorized (sémantique decide_entry / decide_exit).
+- Les dimensions sans effet pour un schedule (TP_TICKS hors fixed_ticks, ATR_MULTIPLIER hors
+  METHOD=ATR) ne sont pas balayées (valeur NaN dans la table).
+
+Usage CLI :
+    python -m signals.backtest.sweep --out output/sweep.csv --workers 4 --tp-ticks 4 6 8 --atr-mult 1 1.5 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from signals.backtest.vectorized import run_vectorized
+from signals.logic.risk_constraints import get_dd_limit_from_optimizer
+
+ARRAY_FIELDS = ("high", "low", "close", "vwap", "atr", "ndist", "prob", "sched_idx")
+
+RESULT_COLUMNS = [
+    "schedule", "ML_THRESHOLD", "entry_threshold", "TP_TICKS", "ATR_MULTIPLIER",
+    "n_trades", "pnl", "win_rate", "max_dd", "dd_limit", "dd_ok",
+]
+
+
+@dataclass
+class SweepGrid:
+    ml_thresholds: Sequence[float] = field(default_factory=lambda: [0.5])
+    entry_thresholds: Sequence[float] = field(default_factory=lambda: [0.0])
+    tp_ticks: Sequence[float] = field(default_factory=lambda: [4])
+    atr_multipliers: Sequence[float] = field(default_factory=lambda: [1.5])
+
+    def variants(self, cfg_now: Mapping[str, Any]) -> List[Tuple[float, float, float, float]]:
+        """Combinaisons pertinentes pour ce schedule (NaN pour une dimension sans effet)."""
+        rm = (cfg_now.get("RISK_MANAGEMENT") or {})
+        vwap_cfg = (cfg_now.get("VWAP_CONFIG") or {})
+        tp_type = str(rm.get("TP_TYPE") or vwap_cfg.get("tp_type") or "").strip().lower()
+        tps = list(self.tp_ticks) if tp_type == "fixed_ticks" else [np.nan]
+        atrs = list(self.atr_multipliers) if str(rm.get("METHOD", "")).upper() == "ATR" else [np.nan]
+        return [
+            (float(ml), float(et), float(tp), float(am))
+            for ml, et, tp, am in itertools.product(self.ml_thresholds, self.entry_thresholds, tps, atrs)
+        ]
+
+
+def apply_variant(cfg_now: Mapping[str, Any], variant: Tuple[float, float, float, float]) -> Dict[str, Any]:
+    ml, et, tp, am = variant
+    cfg = copy.deepcopy(dict(cfg_now))
+    cfg["ML_THRESHOLD"] = ml
+    cfg.setdefault("VWAP_CONFIG", {})
+    cfg["VWAP_CONFIG"] = dict(cfg["VWAP_CONFIG"] or {}, entry_threshold=et)
+    rm = dict(cfg.get("RISK_MANAGEMENT") or {})
+    if not np.isnan(tp):
+        rm["TP_TICKS"] = tp
+    if not np.isnan(am):
+        rm["ATR_MULTIPLIER"] = am
+    cfg["RISK_MANAGEMENT"] = rm
+    return cfg
+
+
+def max_drawdown(pnl: np.ndarray) -> float:
+    """Drawdown max (USD) de la courbe d'equity réalisée (départ à 0)."""
+    if len(pnl) == 0:
+        return 0.0
+    equity = np.concatenate(([0.0], np.cumsum(pnl)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+# ------------------------------------------------------------
+# Évaluation (process courant ou worker)
+# ------------------------------------------------------------
+
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_worker(shm_name: str, n: int, tick_size: float, tick_value: float) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((len(ARRAY_FIELDS), n), dtype=np.float64, buffer=shm.buf)
+    _SHARED.clear()
+    _SHARED.update(shm=shm, tick_size=tick_size, tick_value=tick_value, masks={})
+    _SHARED["arrays"] = {name: block[k] for k, name in enumerate(ARRAY_FIELDS)}
+
+
+def _evaluate(
+    arrays: Mapping[str, np.ndarray],
+    sched_mask: np.ndarray,
+    cfg_now: Mapping[str, Any],
+    label: str,
+    variants: Sequence[Tuple[float, float, float, float]],
+    dd_limit: Optional[float],
+    tick_size: float,
+    tick_value: float,
+) -> List[Dict[str, Any]]:
+    rows = []
+    for v in variants:
+        res = run_vectorized(
+            high=arrays["high"], low=arrays["low"], close=arrays["close"], vwap=arrays["vwap"],
+            atr=arrays["atr"], ndist=arrays["ndist"], prob=arrays["prob"], sched_idx=sched_mask,
+            schedules=[apply_variant(cfg_now, v)], tick_size=tick_size, tick_value=tick_value,
+        )
+        pnl = res.pnl_usd
+        dd = max_drawdown(pnl)
+        rows.append({
+            "schedule": label,
+            "ML_THRESHOLD": v[0],
+            "entry_threshold": v[1],
+            "TP_TICKS": v[2],
+            "ATR_MULTIPLIER": v[3],
+            "n_trades": int(len(pnl)),
+            "pnl": float(pnl.sum()),
+            "win_rate": float((pnl > 0).mean()) if len(pnl) else 0.0,
+            "max_dd": dd,
+            "dd_limit": dd_limit,
+            "dd_ok": True if dd_limit is None else bool(dd <= dd_limit),
+        })
+    return rows
+
+
+def _worker_task(k: int, cfg_now: Mapping[str, Any], label: str, variants, dd_limit) -> List[Dict[str, Any]]:
+    arrays = _SHARED["arrays"]
+    masks = _SHARED["masks"]
+    if k not in masks:
+        masks[k] = np.where(arrays["sched_idx"] == k, 0, -1).astype(np.int64)
+    return _evaluate(arrays, masks[k], cfg_now, label, variants, dd_limit,
+                     _SHARED["tick_size"], _SHARED["tick_value"])
+
+
+def run_sweep(
+    arrays: Mapping[str, np.ndarray],
+    schedules: Mapping[str, Mapping[str, Any]],
+    grid: SweepGrid,
+    *,
+    tick_size: float,
+    tick_value: float,
+    optimizer_root: Optional[Mapping[str, Any]] = None,
+    app_cfg: Optional[Mapping[str, Any]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> pd.DataFrame:
+    """
+    arrays : {high, low, close, vwap, atr, ndist, prob, sched_idx} alignés (sched_idx = index du
+             schedule dans `schedules`, -1 hors séance).
+    workers : nombre de process (None = os.cpu_count(), <= 1 = évaluation dans le process courant).
+    """
+    missing = [f for f in ARRAY_FIELDS if f not in arrays]
+    if missing:
+        raise ValueError(f"❌ Tableaux manquants pour le sweep : {missing}")
+    n = len(arrays["close"])
+    labels = list(schedules.keys())
+
+    tasks = []
+    for k, label in enumerate(labels):
+        cfg_now = schedules[label]
+        dd_limit = get_dd_limit_from_optimizer(
+            cfg_now=dict(cfg_now), optimizer_root=dict(optimizer_root or {}), app_cfg=dict(app_cfg or {})
+        )
+        variants = grid.variants(cfg_now)
+        for start in range(0, len(variants), chunk_size):
+            tasks.append((k, cfg_now, label, variants[start:start + chunk_size], dd_limit))
+
+    workers = os.cpu_count() if workers is None else int(workers)
+    rows: List[Dict[str, Any]] = []
+
+    if workers <= 1 or len(tasks) <= 1:
+        f64 = {name: np.asarray(arrays[name], dtype=np.float64) for name in ARRAY_FIELDS}
+        sched = np.asarray(arrays["sched_idx"], dtype=np.int64)
+        masks: Dict[int, np.ndarray] = {}
+        for k, cfg_now, label, variants, dd_limit in tasks:
+            if k not in masks:
+                masks[k] = np.where(sched == k, 0, -1).astype(np.int64)
+            rows.extend(_evaluate(f64, masks[k], cfg_now, label, variants, dd_limit, tick_size, tick_value))
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(ARRAY_FIELDS) * n * 8))
+    try:
+        block = np.ndarray((len(ARRAY_FIELDS), n), dtype=np.float64, buffer=shm.buf)
+        for k, name in enumerate(ARRAY_FIELDS):
+            block[k] = np.asarray(arrays[name], dtype=np.float64)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(shm.name, n, float(tick_size), float(tick_value)),
+        ) as pool:
+            futures = [pool.submit(_worker_task, *t) for t in tasks]
+            for fut in futures:
+                rows.extend(fut.result())
+        del block
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+# ------------------------------------------------------------
+# Intégration BacktestEngine
+# ------------------------------------------------------------
+
+def sweep_backtest(grid: SweepGrid, *, workers: Optional[int] = None) -> pd.DataFrame:
+    from signals.backtest.runner import BacktestEngine
+    from signals.optimizer.optimizer_rules import load_optimizer_config
+    from signals.utils.config_reader import load_config
+
+    cfg = load_config()
+    optimizer_cfg = load_optimizer_config(cfg["config_horaire"]["path"])
+    engine = BacktestEngine(cfg, optimizer_cfg)
+    # features + probabilités calculées une seule fois pour toute la grille
+    arrays = engine.vector_inputs(engine._prepare_features(engine._load_5m()))
+    return run_sweep(
+        arrays, engine.optimizer_cfg, grid,
+        tick_size=engine.spec.tick_size, tick_value=engine.spec.tick_value,
+        optimizer_root=optimizer_cfg, app_cfg=cfg, workers=workers,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from signals.utils.config_reader import load_config
+
+    opt = (load_config().get("optimizer", {}) or {})
+    parser = argparse.ArgumentParser(description="Sweep de paramètres sur features/probabilités calculées une fois")
+    parser.add_argument("--out", default="output/sweep.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--ml", type=float, nargs="+", default=opt.get("ML_THRESHOLDS_TO_TEST") or [0.5])
+    parser.add_argument("--entry", type=float, nargs="+", default=opt.get("ENTRY_THRESHOLDS_TO_TEST") or [0.0])
+    parser.add_argument("--tp-ticks", type=float, nargs="+", default=[4])
+    parser.add_argument("--atr-mult", type=float, nargs="+", default=[1.5])
+    args = parser.parse_args(argv)
+
+    grid = SweepGrid(args.ml, args.entry, args.tp_ticks, args.atr_mult)
+    table = sweep_backtest(grid, workers=args.workers)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    table.to_csv(args.out, index=False)
+    print(f"✅ Sweep terminé : {len(table)} combinaisons -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
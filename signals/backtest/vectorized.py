@@ -0,0 +1,326 @@
+# signals/backtest/vectorized.py
+"""
+Moteur de simulation NumPy avec la sémantique exacte de l'optimizer :
+- entrées : decide_entry_from_features (prob >= ML_THRESHOLD, |normalized_dist_to_vwap| >= entry_threshold,
+  direction contrarienne) ;
+- sorties : decide_exit (priorité SL ATR -> TP fixed_ticks -> cross VWAP -> TP vwap_level),
+  évaluées à chaque bougie après l'entrée avec la config du schedule d'entrée.
+
+Une seule position à la fois ; pas de ré-entrée sur la bougie de sortie ; position ouverte
+clôturée au close de la dernière bougie (reason="eod").
+
+La boucle Python ne porte que sur les trades : la prochaine entrée et la première sortie
+(first-touch) sont cherchées par index précalculés / tranches NumPy.
+run_scalar() est l'implémentation de référence (appel direct des fonctions scalaires).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signals.logic.optimizer_exits import decide_exit
+from signals.logic.optimizer_parity import (
+    decide_entry_from_features,
+    qty_from_risk_management,
+)
+from signals.optimizer.schedule_index import ScheduleMode, get_schedule_index
+
+EXIT_REASONS = ("sl_atr", "fixed_ticks", "cross", "vwap_level", "eod")
+_R_SL, _R_TP, _R_CROSS, _R_LEVEL, _R_EOD = range(len(EXIT_REASONS))
+
+
+@dataclass
+class VectorizedResult:
+    entry_idx: np.ndarray     # int64
+    exit_idx: np.ndarray      # int64
+    side: np.ndarray          # int8 : +1 BUY, -1 SELL
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    reason: np.ndarray        # int8, index dans EXIT_REASONS
+    schedule: np.ndarray      # int64, index dans la liste des schedules
+    qty: np.ndarray
+    pnl_ticks: np.ndarray
+    pnl_usd: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.entry_idx)
+
+    def to_frame(self, times: Optional[Sequence[Any]] = None, labels: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        df = pd.DataFrame({
+            "entry_idx": self.entry_idx,
+            "exit_idx": self.exit_idx,
+            "action": np.where(self.side > 0, "BUY", "SELL"),
+            "price": self.entry_price,
+            "exit_price": self.exit_price,
+            "exit_reason": np.asarray(EXIT_REASONS, dtype=object)[self.reason] if len(self) else [],
+            "schedule": self.schedule,
+            "qty": self.qty,
+            "pnl_ticks": self.pnl_ticks,
+            "pnl": self.pnl_usd,
+        })
+        if times is not None:
+            t = np.asarray(times, dtype=object)
+            df.insert(0, "time", t[self.entry_idx] if len(self) else [])
+            df.insert(1, "exit_time", t[self.exit_idx] if len(self) else [])
+        if labels is not None:
+            df["session"] = [labels[s] for s in self.schedule]
+        return df
+
+
+@dataclass(frozen=True)
+class _ExitRules:
+    sl: bool
+    atr_mult: float
+    tp_fixed: bool
+    tp_ticks: float
+    cross: bool
+    level: bool
+    ml_threshold: float
+    entry_threshold: float
+    qty: float
+
+
+def _rules(cfg_now: Mapping[str, Any], default_lots: float) -> _ExitRules:
+    # mêmes lectures de config que decide_entry_from_features / decide_exit
+    rm = (cfg_now.get("RISK_MANAGEMENT") or {})
+    vwap_cfg = (cfg_now.get("VWAP_CONFIG") or {})
+    tp_type = str(rm.get("TP_TYPE") or vwap_cfg.get("tp_type") or "").strip().lower()
+    exit_type = str(vwap_cfg.get("exit_type") or "").strip().lower()
+    sl = str(rm.get("METHOD", "")).upper() == "ATR"
+    return _ExitRules(
+        sl=sl,
+        atr_mult=float(rm.get("ATR_MULTIPLIER", cfg_now.get("ATR_MULTIPLIER", 1.0))) if sl else 0.0,
+        tp_fixed=tp_type == "fixed_ticks",
+        tp_ticks=float(rm.get("TP_TICKS", 0)) if tp_type == "fixed_ticks" else 0.0,
+        cross=exit_type == "cross",
+        level=tp_type == "vwap_level",
+        ml_threshold=float(cfg_now.get("ML_THRESHOLD", 0.5)),
+        entry_threshold=float(vwap_cfg.get("entry_threshold", 0.0)),
+        qty=qty_from_risk_management(dict(cfg_now), default_lots),
+    )
+
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """nxt[j] = plus petit k >= j tel que mask[k], sinon n (taille n+1, nxt[n] = n)."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    out = np.empty(n + 1, dtype=np.int64)
+    out[n] = n
+    out[:n] = np.minimum.accumulate(idx[::-1])[::-1]
+    return out
+
+
+def schedule_index(hours: np.ndarray, schedules: Mapping[str, Mapping[str, Any]]) -> np.ndarray:
+    """Index (dans l'ordre du dict) du schedule actif pour chaque heure UTC, -1 si aucun."""
+    return get_schedule_index(schedules, ScheduleMode.HALF_OPEN).hour_index_array(hours)
+
+
+def _as_float(a: Any) -> np.ndarray:
+    return np.asarray(a, dtype=np.float64)
+
+
+def run_vectorized(
+    *,
+    high: Any,
+    low: Any,
+    close: Any,
+    vwap: Any,
+    atr: Any,
+    ndist: Any,
+    prob: Any,
+    sched_idx: Any,
+    schedules: Sequence[Mapping[str, Any]],
+    tick_size: float,
+    tick_value: float,
+    default_lots: float = 1.0,
+) -> VectorizedResult:
+    """
+    Simulation complète sur tableaux alignés (une valeur par bougie 5m).
+    sched_idx : index du schedule actif par bougie (-1 = hors séance / non utilisable).
+    """
+    high, low, close, vwap, atr = map(_as_float, (high, low, close, vwap, atr))
+    ndist, prob = _as_float(ndist), _as_float(prob)
+    sched_idx = np.asarray(sched_idx, dtype=np.int64)
+    n = len(close)
+    rules = [_rules(c, default_lots) for c in schedules]
+
+    with np.errstate(invalid="ignore"):
+        # entrées (indépendantes de la position) ; NaN -> comparaisons fausses, comme en scalaire
+        ml_th = np.array([r.ml_threshold for r in rules] + [np.inf])[sched_idx]
+        e_th = np.array([r.entry_threshold for r in rules] + [np.inf])[sched_idx]
+        can_enter = (sched_idx >= 0) & ~(prob < ml_th) & ~(np.abs(ndist) < e_th)
+        entry_side = np.where(ndist > 0, -1, 1).astype(np.int8)
+
+        # sorties indépendantes du prix d'entrée : cross (bougie j vs j-1) et vwap_level
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        prev_vwap = np.concatenate(([np.nan], vwap[:-1]))
+        cross = {
+            1: (prev_close < prev_vwap) & (close >= vwap),
+            -1: (prev_close > prev_vwap) & (close <= vwap),
+        }
+        level = {1: close >= vwap, -1: close <= vwap}
+
+    next_entry = _next_true(can_enter)
+    next_cross = {s: _next_true(m) for s, m in cross.items()}
+    next_level = {s: _next_true(m) for s, m in level.items()}
+
+    out: Dict[str, List[Any]] = {k: [] for k in ("ei", "xi", "side", "ep", "xp", "reason", "sched", "qty")}
+    i = int(next_entry[0])
+    while i < n:
+        s = int(sched_idx[i])
+        r = rules[s]
+        side = int(entry_side[i])
+        ep = float(close[i])
+        j0 = i + 1
+
+        # borne supérieure : première sortie indépendante du prix d'entrée
+        k = n
+        if r.cross:
+            k = min(k, int(next_cross[side][j0]))
+        if r.level:
+            k = min(k, int(next_level[side][j0]))
+
+        xi, reason, xp = n, _R_EOD, float(close[-1])
+        if k < n:
+            xi = k
+            reason = _R_CROSS if (r.cross and cross[side][k]) else _R_LEVEL
+            xp = float(close[k])
+
+        # first-touch SL / TP (dépendants du prix d'entrée) sur [j0, xi]
+        if r.sl or r.tp_fixed:
+            stop = min(xi + 1, n)
+            win = 64
+            start = j0
+            while start < stop:
+                end = min(stop, start + win)
+                with np.errstate(invalid="ignore"):
+                    hit_sl = np.zeros(end - start, dtype=bool)
+                    if r.sl:
+                        sl_px = ep - side * atr[start:end] * r.atr_mult
+                        hit_sl = (low[start:end] <= sl_px) if side > 0 else (high[start:end] >= sl_px)
+                    hit_tp = np.zeros(end - start, dtype=bool)
+                    if r.tp_fixed:
+                        tp_px = ep + side * (r.tp_ticks * tick_size)
+                        hit_tp = (high[start:end] >= tp_px) if side > 0 else (low[start:end] <= tp_px)
+                hits = np.flatnonzero(hit_sl | hit_tp)
+                if hits.size:
+                    off = int(hits[0])
+                    j = start + off
+                    if j <= xi:  # à égalité, SL/TP priment sur cross/vwap_level
+                        xi = j
+                        if hit_sl[off]:
+                            reason, xp = _R_SL, float(sl_px[off])
+                        else:
+                            reason, xp = _R_TP, float(tp_px)
+                    break
+                start = end
+                win *= 2
+
+        if xi >= n:
+            xi = n - 1
+        out["ei"].append(i)
+        out["xi"].append(xi)
+        out["side"].append(side)
+        out["ep"].append(ep)
+        out["xp"].append(xp)
+        out["reason"].append(reason)
+        out["sched"].append(s)
+        out["qty"].append(r.qty)
+        if reason == _R_EOD:
+            break
+        i = int(next_entry[xi + 1])
+
+    return _result(out, tick_size, tick_value)
+
+
+def run_scalar(
+    *,
+    high: Any,
+    low: Any,
+    close: Any,
+    vwap: Any,
+    atr: Any,
+    ndist: Any,
+    prob: Any,
+    sched_idx: Any,
+    schedules: Sequence[Mapping[str, Any]],
+    tick_size: float,
+    tick_value: float,
+    default_lots: float = 1.0,
+) -> VectorizedResult:
+    """Référence bougie par bougie : decide_entry_from_features + decide_exit."""
+    high, low, close, vwap, atr = map(_as_float, (high, low, close, vwap, atr))
+    ndist, prob = _as_float(ndist), _as_float(prob)
+    sched_idx = np.asarray(sched_idx, dtype=np.int64)
+    n = len(close)
+
+    out: Dict[str, List[Any]] = {k: [] for k in ("ei", "xi", "side", "ep", "xp", "reason", "sched", "qty")}
+    pos: Optional[Dict[str, Any]] = None
+    for j in range(n):
+        if pos is not None:
+            cfg_now = schedules[pos["sched"]]
+            dec = decide_exit(
+                side=pos["action"],
+                entry_price=pos["price"],
+                candle={"high": high[j], "low": low[j], "close": close[j], "vwap": vwap[j], "atr": atr[j]},
+                cfg_now=dict(cfg_now),
+                tick_size=tick_size,
+                prev_close=close[j - 1],
+                prev_vwap=vwap[j - 1],
+            )
+            if dec.should_exit:
+                _record(out, pos, j, float(dec.price), EXIT_REASONS.index(dec.reason))
+                pos = None
+            continue
+
+        s = int(sched_idx[j])
+        if s < 0:
+            continue
+        cfg_now = schedules[s]
+        sig = decide_entry_from_features(
+            features={"normalized_dist_to_vwap": ndist[j]}, prob=prob[j], cfg_now=dict(cfg_now)
+        )
+        if sig:
+            pos = {
+                "i": j, "action": sig["action"], "price": float(close[j]), "sched": s,
+                "qty": qty_from_risk_management(dict(cfg_now), default_lots),
+            }
+
+    if pos is not None:
+        _record(out, pos, n - 1, float(close[-1]), _R_EOD)
+    return _result(out, tick_size, tick_value)
+
+
+def _record(out: Dict[str, List[Any]], pos: Dict[str, Any], j: int, price: float, reason: int) -> None:
+    out["ei"].append(pos["i"])
+    out["xi"].append(j)
+    out["side"].append(1 if pos["action"] == "BUY" else -1)
+    out["ep"].append(pos["price"])
+    out["xp"].append(price)
+    out["reason"].append(reason)
+    out["sched"].append(pos["sched"])
+    out["qty"].append(pos["qty"])
+
+
+def _result(out: Dict[str, List[Any]], tick_size: float, tick_value: float) -> VectorizedResult:
+    side = np.asarray(out["side"], dtype=np.int8)
+    ep = np.asarray(out["ep"], dtype=np.float64)
+    xp = np.asarray(out["xp"], dtype=np.float64)
+    qty = np.asarray(out["qty"], dtype=np.float64)
+    pnl_ticks = (xp - ep) / float(tick_size) * side
+    return VectorizedResult(
+        entry_idx=np.asarray(out["ei"], dtype=np.int64),
+        exit_idx=np.asarray(out["xi"], dtype=np.int64),
+        side=side,
+        entry_price=ep,
+        exit_price=xp,
+        reason=np.asarray(out["reason"], dtype=np.int8),
+        schedule=np.asarray(out["sched"], dtype=np.int64),
+        qty=qty,
+        pnl_ticks=pnl_ticks,
+        pnl_usd=pnl_ticks * float(tick_value) * qty,
+    )
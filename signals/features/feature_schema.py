@@ -29,12 +29,8 @@ def _ensure_columns(df: pd.DataFrame, feature_names: List[str]) -> pd.DataFrame:
     S'assure que toutes les colonnes existent ; si manquantes, les crée (FALLBACK_FILL_VALUE).
     Conserve uniquement les colonnes de feature_names et dans le bon ordre.
     """
-    df2 = df.copy()
-    for col in feature_names:
-        if col not in df2.columns:
-            df2[col] = FALLBACK_FILL_VALUE
-    # Ordre strict
-    return df2[feature_names].copy()
+    # Une seule copie : sélection + ordre strict + colonnes manquantes créées
+    return df.reindex(columns=list(feature_names), fill_value=FALLBACK_FILL_VALUE)
 
 
 def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
@@ -42,8 +38,11 @@ def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
     Essaie de convertir toutes les colonnes en float (convient aux modèles ML).
     Toute valeur non convertible devient NaN (on gère ensuite).
     """
+    non_numeric = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+    if not non_numeric:
+        return df
     out = df.copy()
-    for c in out.columns:
+    for c in non_numeric:
         out[c] = pd.to_numeric(out[c], errors="coerce")
     return out
 
@@ -0,0 +1,475 @@
+# signals/features/incremental.py
+"""
+Moteur de features incrémental (O(1) par bougie ajoutée).
+
+Reproduit colonne par colonne la pipeline batch :
+  - calculate_vwap            -> vwap
+  - ta average_true_range     -> atr
+  - add_base_features         -> dist_to_vwap, dist_to_vwap_atr, normalized_dist_to_vwap, signal,
+                                 ret_3/6/12, volatility_6/12, range_6, hour, minute,
+                                 vwap_slope_5, volume_relative_10
+  - add_features(prefix=...)  -> {prefix}ema{span}, {prefix}rsi{period}, {prefix}vol{period}
+
+Chaque état ne garde que la fenêtre glissante nécessaire : le coût d'un update ne dépend
+plus de la longueur de l'historique. Les EMA/RSI rejouent exactement la récursion pandas
+(valeurs identiques au bit près) ; les sommes/écarts-types glissants sont identiques à
+une tolérance flottante près (~1e-12 relatif).
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional
+
+import pandas as pd
+
+NAN = float("nan")
+
+
+def _div(num: float, den: float) -> float:
+    """Division IEEE (comme pandas/numpy) : x/0 -> ±inf, 0/0 -> NaN, NaN se propage."""
+    if den == 0.0:
+        if num != num or num == 0.0:
+            return NAN
+        return math.copysign(math.inf, num) * math.copysign(1.0, den)
+    return num / den
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    s = str(value)
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        return pd.Timestamp(s).to_pydatetime()
+
+
+# ------------------------------------------------------------
+# Briques glissantes
+# ------------------------------------------------------------
+
+class RollingSum:
+    """Somme glissante (fenêtre fixe) avec compensation de Kahan à l'ajout et au retrait."""
+
+    __slots__ = ("window", "_values", "_sum", "_comp")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._values: Deque[float] = deque()
+        self._sum = 0.0
+        self._comp = 0.0
+
+    def _add(self, v: float) -> None:
+        y = v - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum = t
+
+    def update(self, value: float) -> float:
+        if len(self._values) == self.window:
+            self._add(-self._values.popleft())
+        self._values.append(value)
+        self._add(value)
+        return self.value
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def value(self) -> float:
+        return self._sum if self.full else NAN
+
+    @property
+    def mean(self) -> float:
+        return (self._sum / self.window) if self.full else NAN
+
+
+class RollingStd:
+    """Écart-type glissant (ddof=1), recalculé sur la fenêtre (taille fixe => O(1))."""
+
+    __slots__ = ("window", "_values")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._values: Deque[float] = deque(maxlen=self.window)
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        n = self.window
+        if len(self._values) < n or n < 2:
+            return NAN
+        m = sum(self._values) / n
+        return math.sqrt(sum((v - m) * (v - m) for v in self._values) / (n - 1))
+
+
+class RollingExtremum:
+    """Max (ou min) glissant par deque monotone (O(1) amorti)."""
+
+    __slots__ = ("window", "_is_max", "_dq", "_i")
+
+    def __init__(self, window: int, *, is_max: bool):
+        self.window = int(window)
+        self._is_max = is_max
+        self._dq: Deque[tuple] = deque()
+        self._i = -1
+
+    def update(self, value: float) -> float:
+        self._i += 1
+        dq = self._dq
+        if self._is_max:
+            while dq and dq[-1][1] <= value:
+                dq.pop()
+        else:
+            while dq and dq[-1][1] >= value:
+                dq.pop()
+        dq.append((self._i, value))
+        while dq[0][0] <= self._i - self.window:
+            dq.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self._i < self.window - 1 or not self._dq:
+            return NAN
+        return self._dq[0][1]
+
+
+class Lag:
+    """Garde les n dernières valeurs pour diff(n) / pct_change(n)."""
+
+    __slots__ = ("n", "_values")
+
+    def __init__(self, n: int):
+        self.n = int(n)
+        self._values: Deque[float] = deque(maxlen=self.n + 1)
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        return self.lagged
+
+    @property
+    def lagged(self) -> float:
+        """Valeur d'il y a n barres (NaN si historique insuffisant)."""
+        if len(self._values) <= self.n:
+            return NAN
+        return self._values[0]
+
+
+class EWM:
+    """
+    Moyenne exponentielle identique à pandas Series.ewm(...).mean() (récursion rejouée à l'identique).
+    """
+
+    __slots__ = ("alpha", "adjust", "min_periods", "_weighted", "_old_wt", "_nobs")
+
+    def __init__(self, *, alpha: float, adjust: bool, min_periods: int = 1):
+        self.alpha = float(alpha)
+        self.adjust = bool(adjust)
+        self.min_periods = max(int(min_periods), 1)
+        self._weighted = NAN
+        self._old_wt = 1.0
+        self._nobs = 0
+
+    def update(self, value: float) -> float:
+        new_wt = 1.0 if self.adjust else self.alpha
+        if value != value:  # NaN : pandas (ignore_na=False) décote quand même l'ancien poids
+            if self._nobs:
+                self._old_wt *= (1.0 - self.alpha)
+            return self.value
+        if self._nobs == 0:
+            self._weighted = value
+            self._old_wt = 1.0
+        else:
+            self._old_wt *= (1.0 - self.alpha)
+            if self._weighted != value:
+                self._weighted = (self._old_wt * self._weighted + new_wt * value) / (self._old_wt + new_wt)
+            if self.adjust:
+                self._old_wt += new_wt
+            else:
+                self._old_wt = 1.0
+        self._nobs += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._weighted if self._nobs >= self.min_periods else NAN
+
+
+class WilderATR:
+    """ATR identique à ta.volatility.average_true_range (0.0 pendant le warmup, puis lissage de Wilder)."""
+
+    __slots__ = ("window", "_prev_close", "_warmup", "_atr", "_n")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._prev_close: Optional[float] = None
+        self._warmup: List[float] = []
+        self._atr = 0.0
+        self._n = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            pc = self._prev_close
+            tr = max(high - low, abs(high - pc), abs(low - pc))
+        self._prev_close = close
+        self._n += 1
+
+        if self._n < self.window:
+            self._warmup.append(tr)
+            self._atr = 0.0
+        elif self._n == self.window:
+            self._warmup.append(tr)
+            self._atr = float(pd.Series(self._warmup).mean())
+            self._warmup = []
+        else:
+            self._atr = (self._atr * (self.window - 1) + tr) / float(self.window)
+        return self._atr
+
+    @property
+    def value(self) -> float:
+        return self._atr
+
+
+# ------------------------------------------------------------
+# add_features (EMA / RSI / vol) incrémental
+# ------------------------------------------------------------
+
+class IncrementalIndicators:
+    """
+    Équivalent incrémental de features_utils.add_features(df, prefix, ema_span, rsi_period, vol_period).
+    """
+
+    def __init__(self, prefix: str = "", ema_span: int = 21, rsi_period: int = 14, vol_period: int = 12):
+        self.prefix = prefix
+        self.ema_span = int(ema_span)
+        self.rsi_period = int(rsi_period)
+        self.vol_period = int(vol_period)
+        self.columns = [
+            f"{prefix}ema{self.ema_span}",
+            f"{prefix}rsi{self.rsi_period}",
+            f"{prefix}vol{self.vol_period}",
+        ]
+        self._ema = EWM(alpha=2.0 / (self.ema_span + 1.0), adjust=True)
+        self._up = EWM(alpha=1.0 / self.rsi_period, adjust=False, min_periods=self.rsi_period)
+        self._dn = EWM(alpha=1.0 / self.rsi_period, adjust=False, min_periods=self.rsi_period)
+        self._vol = RollingStd(self.vol_period)
+        self._prev_close: Optional[float] = None
+
+    def update(self, close: float) -> Dict[str, float]:
+        diff = NAN if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+        # ta.momentum.rsi : diff.where(diff > 0, 0.0) -> NaN devient 0.0
+        up = diff if diff > 0 else 0.0
+        dn = -diff if diff < 0 else 0.0
+        emaup = self._up.update(up)
+        emadn = self._dn.update(dn)
+        if emadn == 0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - (100.0 / (1.0 + _div(emaup, emadn)))
+
+        return {
+            self.columns[0]: self._ema.update(close),
+            self.columns[1]: rsi,
+            self.columns[2]: self._vol.update(close),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """État interne copié (pour réviser la dernière barre, ex: barre en formation)."""
+        return copy.deepcopy({
+            "ema": self._ema, "up": self._up, "dn": self._dn,
+            "vol": self._vol, "prev_close": self._prev_close,
+        })
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        state = copy.deepcopy(state)
+        self._ema = state["ema"]
+        self._up = state["up"]
+        self._dn = state["dn"]
+        self._vol = state["vol"]
+        self._prev_close = state["prev_close"]
+
+
+# ------------------------------------------------------------
+# Moteur 5m
+# ------------------------------------------------------------
+
+BASE_COLUMNS = [
+    "vwap",
+    "atr",
+    "dist_to_vwap",
+    "dist_to_vwap_atr",
+    "normalized_dist_to_vwap",
+    "signal",
+    "ret_3",
+    "ret_6",
+    "ret_12",
+    "volatility_6",
+    "volatility_12",
+    "range_6",
+    "hour",
+    "minute",
+    "vwap_slope_5",
+    "volume_relative_10",
+]
+
+
+class IncrementalFeatureEngine:
+    """
+    Moteur stateful : update(candle) calcule la ligne de features de la nouvelle bougie en O(1)
+    (mêmes colonnes que compute_features_for_live_data hors multi-timeframe).
+    """
+
+    def __init__(
+        self,
+        *,
+        vwap_period: int,
+        atr_period: int,
+        tick_size: float,
+        entry_threshold: float,
+        buffer: Optional[Any] = None,
+        mtf: Optional[Any] = None,
+    ):
+        """
+        buffer: (optionnel) CandleRingBuffer ; chaque ligne calculée y est ajoutée.
+        mtf:    (optionnel) source multi-timeframe exposant asof(datetime) -> {colonne: valeur}
+                (ex: MultiTimeframeStore, MTFResampler) ; ses colonnes sont ajoutées à chaque ligne.
+                Son refresh() est appelé à chaque bougie : les barres TF ajoutées aux fichiers
+                après le démarrage sont lues (un os.stat par TF tant que mtime/size ne bougent pas).
+        """
+        self.buffer = buffer
+        self.mtf = mtf
+        self.vwap_period = int(vwap_period)
+        self.atr_period = int(atr_period)
+        self.tick_size = float(tick_size)
+        self.entry_threshold = float(entry_threshold)
+
+        self._pv = RollingSum(self.vwap_period)
+        self._vol_sum = RollingSum(self.vwap_period)
+        self._atr = WilderATR(self.atr_period)
+        self._ret = {p: Lag(p) for p in (3, 6, 12)}
+        self._std6 = RollingStd(6)
+        self._std12 = RollingStd(12)
+        self._hi6 = RollingExtremum(6, is_max=True)
+        self._lo6 = RollingExtremum(6, is_max=False)
+        self._vwap_lag5 = Lag(5)
+        self._vol10 = RollingSum(10)
+
+        self.n_updates = 0
+        self.last: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        cfg: Mapping[str, Any],
+        *,
+        buffer: Optional[Any] = None,
+        mtf: Optional[Any] = None,
+    ) -> "IncrementalFeatureEngine":
+        general = cfg.get("general", {}) or {}
+        vwap_period = general.get("DEFAULT_VWAP_PERIOD")
+        atr_period = general.get("ATR_PERIOD")
+        if atr_period is None or not isinstance(atr_period, int):
+            raise ValueError("❌ 'general.ATR_PERIOD' doit être défini (int) dans config.yaml.")
+        if not isinstance(vwap_period, int):
+            raise ValueError("❌ 'general.DEFAULT_VWAP_PERIOD' doit être un entier en production live.")
+        return cls(
+            vwap_period=vwap_period,
+            atr_period=atr_period,
+            tick_size=general.get("TICK_SIZE"),
+            entry_threshold=general.get("DEFAULT_ENTRY_THRESHOLD"),
+            buffer=buffer,
+            mtf=mtf,
+        )
+
+    def update(self, candle: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Ajoute une bougie {time|datetime, open, high, low, close, volume} et renvoie sa ligne de features.
+        Les bougies doivent arriver dans l'ordre chronologique.
+        """
+        ts = candle.get("datetime", candle.get("time"))
+        if ts is None:
+            raise ValueError("❌ Colonne 'time' ou 'datetime' manquante dans la bougie.")
+        dt = _to_datetime(ts)
+
+        o = float(candle.get("open", NAN))
+        h = float(candle["high"])
+        l = float(candle["low"])
+        c = float(candle["close"])
+        v = float(candle.get("volume") or 0.0)
+
+        vwap = _div(self._pv.update(c * v), self._vol_sum.update(v))
+        atr = self._atr.update(h, l, c)
+
+        dist = c - vwap
+        dist_atr = _div(dist, atr * self.tick_size)
+        if dist_atr < -self.entry_threshold:
+            signal = 1
+        elif dist_atr > self.entry_threshold:
+            signal = -1
+        else:
+            signal = 0
+
+        row: Dict[str, Any] = {
+            "datetime": dt,
+            "open": o,
+            "high": h,
+            "low": l,
+            "close": c,
+            "volume": v,
+            "vwap": vwap,
+            "atr": atr,
+            "dist_to_vwap": dist,
+            "dist_to_vwap_atr": dist_atr,
+            "normalized_dist_to_vwap": dist_atr,
+            "signal": signal,
+        }
+        for p, lag in self._ret.items():
+            row[f"ret_{p}"] = _div(c, lag.update(c)) - 1.0
+
+        row["volatility_6"] = self._std6.update(c)
+        row["volatility_12"] = self._std12.update(c)
+        row["range_6"] = self._hi6.update(h) - self._lo6.update(l)
+        row["hour"] = dt.hour
+        row["minute"] = dt.minute
+        row["vwap_slope_5"] = vwap - self._vwap_lag5.update(vwap)
+        self._vol10.update(v)
+        row["volume_relative_10"] = _div(v, self._vol10.mean)
+        if self.mtf is not None:
+            # source agrégée depuis le flux 5m (MTFResampler) : intègre la bougie avant le lookup
+            observe = getattr(self.mtf, "observe", None)
+            if observe is not None:
+                observe(row)
+            else:
+                self.mtf.refresh()      # store sur fichiers : delta seulement, watermark mtime/size
+            row.update(self.mtf.asof(dt))
+
+        self.n_updates += 1
+        self.last = row
+        if self.buffer is not None:
+            self.buffer.append(row)
+        return row
+
+    def update_many(self, candles: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.update(c) for c in candles]
+
+    def warmup(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Rejoue un historique (DataFrame 5m trié) pour initialiser l'état ; renvoie la dernière ligne."""
+        if df is None or df.empty:
+            return self.last
+        time_col = "datetime" if "datetime" in df.columns else "time"
+        cols = [time_col, "open", "high", "low", "close", "volume"]
+        for rec in df[[c for c in cols if c in df.columns]].to_dict("records"):
+            self.update(rec)
+        return self.last
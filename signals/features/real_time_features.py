@@ -8,7 +8,11 @@ from signals.shared.features_utils import (
     calculate_vwap,
     load_and_merge_multiframe,
 )
-from signals.loaders.config_loader import get_general, get_tf_files
+from signals.shared.mtf_store import get_mtf_store
+from signals.loaders.config_loader import get_mtf_resample, get_tf_files
+from signals.features.resampler import MTFResampler, merge_resampled_multiframe
+from signals.features.incremental import IncrementalFeatureEngine
+from signals.features.ring_buffer import CandleRingBuffer, DEFAULT_COLUMNS, required_capacity
 
 
 def compute_features_for_live_data(df_5m: pd.DataFrame, cfg: dict) -> pd.DataFrame:
@@ -52,17 +56,57 @@ def compute_features_for_live_data(df_5m: pd.DataFrame, cfg: dict) -> pd.DataFra
     df = add_base_features(df, _wrap_general_as_obj(general))
 
     # 5) Ajout des features multi-timeframe (si définies)
+    # - data.mtf_source = "resample" : TF agrégées depuis les bougies 5m (aucun fichier lu)
+    # - sinon store partagé : chaque fichier TF n'est parsé qu'une fois, puis delta uniquement
+    resample = get_mtf_resample()
+    if resample:
+        return merge_resampled_multiframe(df, resample["timeframes"], offsets=resample["offsets"])
+
     tf_files = get_tf_files()
     if isinstance(tf_files, dict) and len(tf_files) > 0:
-        df = load_and_merge_multiframe(df, tf_files, add_features)
+        df = load_and_merge_multiframe(df, tf_files, add_features, store=get_mtf_store(tf_files, refresh=False))
 
     return df
 
 
-def get_last_row_features(df_full: pd.DataFrame, feature_list: list) -> pd.DataFrame:
+def build_feature_engine(
+    cfg: dict,
+    history: pd.DataFrame | None = None,
+    optimizer_cfg: dict | None = None,
+) -> IncrementalFeatureEngine:
+    """
+    Version live incrémentale de compute_features_for_live_data :
+    crée le moteur O(1)/bougie (+ MTFResampler si data.mtf_source="resample", sinon
+    store MTF partagé si data.tf_files) et le réchauffe
+    avec l'historique 5m éventuel.
+    Ensuite, chaque nouvelle bougie se traite avec engine.update(candle).
+    Les lignes calculées sont conservées dans engine.buffer (CandleRingBuffer dont la
+    capacité suit la plus longue fenêtre requise par les schedules de optimizer_cfg).
+    """
+    resample = get_mtf_resample()
+    if resample:
+        mtf = MTFResampler(resample["timeframes"], offsets=resample["offsets"])
+    else:
+        mtf = get_mtf_store(tf_files) if (tf_files := get_tf_files()) else None
+    columns = DEFAULT_COLUMNS + (mtf.columns if mtf is not None else [])
+    buffer = CandleRingBuffer(required_capacity(cfg, optimizer_cfg), columns=columns)
+    engine = IncrementalFeatureEngine.from_config(cfg, buffer=buffer, mtf=mtf)
+    if history is not None and not history.empty:
+        df = history.rename(columns={"time": "datetime"}) if "time" in history.columns else history
+        df = df.assign(datetime=pd.to_datetime(df["datetime"])).sort_values("datetime")
+        engine.warmup(df)
+    return engine
+
+
+def get_last_row_features(df_full: pd.DataFrame | CandleRingBuffer, feature_list: list) -> pd.DataFrame:
     """
     Extrait la dernière ligne de la DataFrame avec les colonnes attendues par le modèle.
+    Accepte aussi un CandleRingBuffer (lecture directe du dernier slot, sans copier l'historique).
     """
+    if isinstance(df_full, CandleRingBuffer):
+        values = df_full.last_row_values(feature_list)
+        return pd.DataFrame(values, columns=list(feature_list))
+
     missing = [col for col in feature_list if col not in df_full.columns]
     if missing:
         raise ValueError(f"❌ Colonnes manquantes pour le modèle : {missing}")
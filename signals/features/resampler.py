@@ -0,0 +1,182 @@
+# signals/features/resampler.py
+"""
+Construction interne des timeframes supérieurs (15min/30min/1h/4h/day) à partir du flux 5m,
+sans fichiers data.tf_files.
+
+- Buckets [début, début + largeur) alignés sur l'epoch UTC (+ offset optionnel par TF),
+  étiquetés par leur début — même convention que les exports OHLCV (et resample label/closed="left").
+- Mode batch (backtest) : resample_ohlcv + add_features + merge_asof(direction="backward"),
+  identique à la pipeline fichiers quand les fichiers proviennent des mêmes bougies 5m.
+- Mode incrémental (live) : MTFResampler met à jour la barre en formation à chaque bougie 5m
+  (révision de la dernière barre) — c'est ce que montrerait un export live du fichier TF.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from signals.shared.features_utils import add_features
+from signals.shared.mtf_store import TimeframeSeries
+from signals.utils.time_utils import datetime_to_ns, datetimes_to_ns
+
+# Alias de TF (clés data.tf_files) -> largeur pandas
+TF_ALIASES = {
+    "day": "1D",
+    "1d": "1D",
+    "d": "1D",
+    "daily": "1D",
+}
+
+
+def tf_width_ns(tf: str) -> int:
+    """Largeur du bucket en ns pour une clé TF ('15min', '1h', '4h', 'day', ...)."""
+    rule = TF_ALIASES.get(str(tf).lower(), str(tf))
+    try:
+        width = pd.Timedelta(rule)
+    except ValueError:
+        width = pd.Timedelta(pd.tseries.frequencies.to_offset(rule))
+    if width <= pd.Timedelta(0):
+        raise ValueError(f"Timeframe invalide: {tf!r}")
+    return int(width.value)
+
+
+def bucket_start_ns(t_ns: Any, width_ns: int, offset_ns: int = 0) -> Any:
+    """Début du bucket contenant t (scalaire ou array int64 ns)."""
+    return ((t_ns - offset_ns) // width_ns) * width_ns + offset_ns
+
+
+# ------------------------------------------------------------
+# Batch
+# ------------------------------------------------------------
+
+def resample_ohlcv(df5: pd.DataFrame, tf: str, *, offset: Optional[str] = None, on: str = "datetime") -> pd.DataFrame:
+    """
+    Agrège un DataFrame 5m (datetime, open, high, low, close, volume) en barres TF.
+    Buckets vides ignorés (pas de barre synthétique hors séance).
+    """
+    width = tf_width_ns(tf)
+    off = int(pd.Timedelta(offset).value) if offset else 0
+    dts = pd.to_datetime(df5[on])
+    ts = datetimes_to_ns(dts)
+    buckets = bucket_start_ns(ts, width, off)
+
+    d = pd.DataFrame({
+        "bucket": buckets,
+        "open": df5["open"].to_numpy() if "open" in df5.columns else df5["close"].to_numpy(),
+        "high": df5["high"].to_numpy() if "high" in df5.columns else df5["close"].to_numpy(),
+        "low": df5["low"].to_numpy() if "low" in df5.columns else df5["close"].to_numpy(),
+        "close": df5["close"].to_numpy(),
+        "volume": df5["volume"].to_numpy() if "volume" in df5.columns else np.zeros(len(df5)),
+    })
+    g = d.groupby("bucket", sort=True)
+    out = g.agg(open=("open", "first"), high=("high", "max"), low=("low", "min"),
+                close=("close", "last"), volume=("volume", "sum")).reset_index()
+
+    dt = pd.to_datetime(out["bucket"].to_numpy(dtype="int64"), unit="ns")
+    if getattr(dts.dt, "tz", None) is not None:
+        dt = dt.tz_localize("UTC").tz_convert(dts.dt.tz)
+    # même dtype que la colonne 5m (unité/tz) : requis par merge_asof
+    out.insert(0, on, pd.Series(dt).astype(dts.dtype).to_numpy())
+    return out.drop(columns=["bucket"])
+
+
+def merge_resampled_multiframe(
+    df: pd.DataFrame,
+    timeframes: Iterable[str],
+    *,
+    offsets: Optional[Mapping[str, str]] = None,
+    on: str = "datetime",
+) -> pd.DataFrame:
+    """
+    Équivalent de load_and_merge_multiframe sans fichiers : TF construites depuis df (5m).
+    """
+    offsets = offsets or {}
+    df = df.sort_values(on).reset_index(drop=True)
+    for tf in timeframes:
+        try:
+            bars = resample_ohlcv(df, tf, offset=offsets.get(tf), on=on)
+            bars = add_features(bars, prefix=f"{tf}_", ema_span=21, rsi_period=14, vol_period=12)
+            tfcols = [f"{tf}_ema21", f"{tf}_rsi14", f"{tf}_vol12"]
+            df = pd.merge_asof(df, bars[[on] + tfcols], on=on, direction="backward")
+        except Exception as e:
+            print(f"❌ Erreur lors du resampling MTF pour {tf}: {e}")
+            continue
+    return df
+
+
+# ------------------------------------------------------------
+# Incrémental (live)
+# ------------------------------------------------------------
+
+class _Bucket:
+    __slots__ = ("start", "open", "high", "low", "close", "volume")
+
+    def __init__(self, start: int, o: float, h: float, l: float, c: float, v: float):
+        self.start, self.open, self.high, self.low, self.close, self.volume = start, o, h, l, c, v
+
+
+class MTFResampler:
+    """
+    Agrégation incrémentale des TF depuis le flux 5m ; interface compatible MultiTimeframeStore
+    (columns, refresh, asof) -> utilisable comme `mtf` de IncrementalFeatureEngine.
+    """
+
+    def __init__(self, timeframes: Iterable[str], *, offsets: Optional[Mapping[str, str]] = None):
+        offsets = offsets or {}
+        self.series: Dict[str, TimeframeSeries] = {}
+        self._width: Dict[str, int] = {}
+        self._offset: Dict[str, int] = {}
+        self._bucket: Dict[str, Optional[_Bucket]] = {}
+        for tf in timeframes:
+            self.series[tf] = TimeframeSeries(tf, revisable=True)
+            self._width[tf] = tf_width_ns(tf)
+            self._offset[tf] = int(pd.Timedelta(offsets[tf]).value) if offsets.get(tf) else 0
+            self._bucket[tf] = None
+        self.columns: List[str] = [c for s in self.series.values() for c in s.columns]
+        self._last_t: Optional[int] = None
+
+    def refresh(self) -> Dict[str, int]:
+        return {tf: 0 for tf in self.series}
+
+    def bar(self, tf: str) -> Optional[Dict[str, float]]:
+        """Barre TF en formation (OHLCV)."""
+        b = self._bucket.get(tf)
+        if b is None:
+            return None
+        return {"time": b.start, "open": b.open, "high": b.high, "low": b.low, "close": b.close, "volume": b.volume}
+
+    def observe(self, row: Mapping[str, Any]) -> None:
+        """Intègre une bougie 5m {datetime|time, open, high, low, close, volume}."""
+        t = datetime_to_ns(row.get("datetime", row.get("time")))
+        if self._last_t is not None and t < self._last_t:
+            raise ValueError(f"[MTFResampler] bougie non chronologique: {t} < {self._last_t}")
+        self._last_t = t
+
+        c = float(row["close"])
+        o = float(row.get("open", c))
+        h = float(row.get("high", c))
+        l = float(row.get("low", c))
+        v = float(row.get("volume") or 0.0)
+
+        for tf, series in self.series.items():
+            start = bucket_start_ns(t, self._width[tf], self._offset[tf])
+            b = self._bucket[tf]
+            if b is not None and b.start == start:
+                b.high = max(b.high, h)
+                b.low = min(b.low, l)
+                b.close = c
+                b.volume += v
+                series.revise_last(c)
+            else:
+                self._bucket[tf] = _Bucket(start, o, h, l, c, v)
+                series.append(start, c)
+
+    def asof(self, dt: Any) -> Dict[str, float]:
+        t = datetime_to_ns(dt)
+        out: Dict[str, float] = {}
+        for s in self.series.values():
+            out.update(s.asof(t))
+        return out
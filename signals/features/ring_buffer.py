@@ -0,0 +1,181 @@
+# signals/features/ring_buffer.py
+"""
+Ring buffer NumPy à capacité fixe pour l'historique des bougies (chemin live).
+
+- Stockage colonne par colonne (time en int64 ns epoch UTC, le reste en float64).
+- Chaque valeur est écrite deux fois (slot i et i+capacity) : n'importe quelle fenêtre
+  des n dernières lignes (n <= capacity) est donc une tranche contiguë -> vues sans copie.
+- La mémoire est allouée une fois : elle reste plate même sur des runs de plusieurs semaines.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signals.features.incremental import BASE_COLUMNS
+from signals.features.feature_schema import FALLBACK_FILL_VALUE, select_required_features
+from signals.utils.time_utils import datetime_to_ns
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+DEFAULT_COLUMNS = OHLCV_COLUMNS + BASE_COLUMNS
+
+# Profondeur d'historique (en barres 5m) nécessaire pour chaque feature de base
+_FEATURE_LOOKBACK = {
+    "ret_3": 4,
+    "ret_6": 7,
+    "ret_12": 13,
+    "volatility_6": 6,
+    "volatility_12": 12,
+    "range_6": 6,
+    "volume_relative_10": 10,
+}
+MIN_CAPACITY = 64
+
+
+def required_capacity(
+    cfg: Mapping[str, Any],
+    optimizer_cfg: Optional[Mapping[str, Any]] = None,
+    *,
+    margin: int = 8,
+) -> int:
+    """
+    Capacité = plus longue fenêtre glissante requise par les features des schedules actifs
+    (ou model.features à défaut), + marge. Plancher MIN_CAPACITY.
+    """
+    general = cfg.get("general", {}) or {}
+    vwap_period = int(general.get("DEFAULT_VWAP_PERIOD") or 14)
+    atr_period = int(general.get("ATR_PERIOD") or 14)
+
+    schedules = list(((optimizer_cfg or {}).get("CONFIGURATIONS_BY_SCHEDULE") or {}).values())
+    feats: set = set()
+    for sc in schedules or [None]:
+        feats.update(select_required_features(dict(cfg), sc))
+
+    need = max(vwap_period, atr_period)
+    for f in feats:
+        if f in _FEATURE_LOOKBACK:
+            need = max(need, _FEATURE_LOOKBACK[f])
+        elif f == "vwap_slope_5":
+            need = max(need, vwap_period + 5)
+        elif f in ("normalized_dist_to_vwap", "dist_to_vwap_atr", "dist_to_vwap"):
+            need = max(need, vwap_period, atr_period)
+    return max(MIN_CAPACITY, need + int(margin))
+
+
+class CandleRingBuffer:
+    """
+    Buffer circulaire colonne-orienté : append(row) en O(1), window(n) en vues zéro-copie.
+    """
+
+    def __init__(self, capacity: int, columns: Optional[Sequence[str]] = None):
+        if capacity < 1:
+            raise ValueError("capacity doit être >= 1")
+        self.capacity = int(capacity)
+        self.columns: List[str] = list(columns or DEFAULT_COLUMNS)
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        self._data = np.full((len(self.columns), 2 * self.capacity), np.nan, dtype=np.float64)
+        self._time = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        return self._count
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Ajoute une ligne {datetime|time, <colonnes>} ; colonnes absentes -> NaN."""
+        slot = self._count % self.capacity
+        mirror = slot + self.capacity
+
+        ts = row.get("datetime", row.get("time"))
+        t = datetime_to_ns(ts) if ts is not None else 0
+        self._time[slot] = t
+        self._time[mirror] = t
+
+        data = self._data
+        for name, i in self._col_index.items():
+            v = row.get(name)
+            try:
+                v = float(v) if v is not None else np.nan
+            except (TypeError, ValueError):
+                v = np.nan
+            data[i, slot] = v
+            data[i, mirror] = v
+        self._count += 1
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        for r in rows:
+            self.append(r)
+
+    # ------------------------------------------------------------
+    # Vues zéro-copie
+    # ------------------------------------------------------------
+
+    def _bounds(self, n: Optional[int]) -> tuple[int, int]:
+        size = len(self)
+        n = size if n is None else max(0, min(int(n), size))
+        end = (self._count - 1) % self.capacity + self.capacity + 1 if self._count else 0
+        return end - n, end
+
+    @staticmethod
+    def _readonly(view: np.ndarray) -> np.ndarray:
+        view.setflags(write=False)
+        return view
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Vue (lecture seule) des n dernières valeurs d'une colonne, ordre chronologique."""
+        start, end = self._bounds(n)
+        if name in ("time", "datetime"):
+            return self._readonly(self._time[start:end])
+        return self._readonly(self._data[self._col_index[name], start:end])
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """{colonne: vue} des n dernières lignes (toutes les colonnes + 'time' en int64 ns)."""
+        start, end = self._bounds(n)
+        out = {"time": self._readonly(self._time[start:end])}
+        for name, i in self._col_index.items():
+            out[name] = self._readonly(self._data[i, start:end])
+        return out
+
+    def last(self, name: str) -> float:
+        if not self._count:
+            raise IndexError("buffer vide")
+        slot = (self._count - 1) % self.capacity
+        if name in ("time", "datetime"):
+            return int(self._time[slot])
+        return float(self._data[self._col_index[name], slot])
+
+    def last_row_values(self, feature_names: Sequence[str], *, fill_missing: bool = False) -> np.ndarray:
+        """
+        Vecteur (1, k) des features de la dernière ligne dans l'ordre demandé.
+        fill_missing=True -> colonnes inconnues à FALLBACK_FILL_VALUE (sinon ValueError).
+        """
+        if not self._count:
+            raise IndexError("buffer vide")
+        slot = (self._count - 1) % self.capacity
+        idx = []
+        missing = []
+        for f in feature_names:
+            i = self._col_index.get(f)
+            if i is None:
+                missing.append(f)
+            idx.append(i)
+        if missing and not fill_missing:
+            raise ValueError(f"❌ Colonnes manquantes pour le modèle : {missing}")
+        out = np.empty((1, len(idx)), dtype=np.float64)
+        for k, i in enumerate(idx):
+            out[0, k] = FALLBACK_FILL_VALUE if i is None else self._data[i, slot]
+        return out
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        """Copie DataFrame (compat code pandas existant) des n dernières lignes."""
+        w = self.window(n)
+        t = w.pop("time")
+        df = pd.DataFrame(w, copy=True)
+        df.insert(0, "datetime", pd.to_datetime(t, utc=True))
+        return df
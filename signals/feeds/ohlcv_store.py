@@ -0,0 +1,270 @@
+# signals/feeds/ohlcv_store.py
+"""
+Store OHLCV colonne-orienté sur disque, ouvert en memmap (lecture zéro-copie).
+
+Format : un répertoire (convention: suffixe ".ohlcv") contenant
+  meta.json    {"version": 1, "count": n, "columns": [...], "time_unit": "ns", "tz": "UTC"}
+  time.i8      timestamps epoch UTC en int64 (ns), little-endian, triés
+  <col>.f8     une colonne float64 par champ (open, high, low, close, volume)
+
+- meta.json fait foi pour le nombre de lignes : il est réécrit atomiquement (os.replace)
+  après chaque append, donc un append interrompu n'est jamais visible par les lecteurs
+  (les octets orphelins sont tronqués au prochain append).
+- Conversion ponctuelle depuis les CSV existants :
+    python -m signals.feeds.ohlcv_store convert "CBOT_UB1!, 5.csv" [sortie.ohlcv]
+  Le store est opt-in : pointer data.input_5m / tf_files vers le ".ohlcv". Un CSV présent est
+  toujours lu tel quel (un store converti une fois ne masque jamais un CSV qui continue de grossir).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signals.utils.time_utils import datetimes_to_ns
+
+STORE_SUFFIX = ".ohlcv"
+STORE_VERSION = 1
+META_FILE = "meta.json"
+TIME_FILE = "time.i8"
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+def is_store(path: Any) -> bool:
+    """Vrai si `path` désigne un store OHLCV (répertoire contenant meta.json)."""
+    return isinstance(path, (str, os.PathLike)) and os.path.isfile(os.path.join(path, META_FILE))
+
+
+def default_store_path(csv_path: str) -> str:
+    root, _ = os.path.splitext(csv_path)
+    return root + STORE_SUFFIX
+
+
+def format_times(t_ns: np.ndarray) -> np.ndarray:
+    """int64 ns -> chaînes ISO 'YYYY-MM-DDTHH:MM:SSZ' (format des CSV d'origine)."""
+    secs = np.asarray(t_ns, dtype=np.int64).astype("datetime64[ns]").astype("datetime64[s]")
+    return np.char.add(np.datetime_as_string(secs, unit="s"), "Z")
+
+
+class OHLCVStore:
+    """
+    Store ouvert en lecture (memmap) avec API d'append.
+    Les vues renvoyées par time/column() sont en lecture seule et reflètent l'état au dernier reload().
+    """
+
+    def __init__(self, path: str):
+        if not is_store(path):
+            raise FileNotFoundError(f"Store OHLCV introuvable: {path}")
+        self.path = str(path)
+        self._maps: Dict[str, np.ndarray] = {}
+        self.reload()
+
+    # ------------------------------------------------------------
+    # Création / ouverture
+    # ------------------------------------------------------------
+
+    @classmethod
+    def create(cls, path: str, columns: Sequence[str] = OHLCV_FIELDS, *, overwrite: bool = False) -> "OHLCVStore":
+        if is_store(path) and not overwrite:
+            raise FileExistsError(f"Store OHLCV déjà présent: {path}")
+        os.makedirs(path, exist_ok=True)
+        for name in [TIME_FILE] + [f"{c}.f8" for c in columns]:
+            open(os.path.join(path, name), "wb").close()
+        _write_meta(path, {"version": STORE_VERSION, "count": 0, "columns": list(columns),
+                           "time_unit": "ns", "tz": "UTC"})
+        return cls(path)
+
+    def reload(self) -> int:
+        """Relit meta.json et remappe les colonnes ; renvoie le nombre de lignes."""
+        with open(os.path.join(self.path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if int(self.meta.get("version", 0)) != STORE_VERSION:
+            raise ValueError(f"Version de store OHLCV non supportée: {self.meta.get('version')}")
+        self.columns: List[str] = list(self.meta["columns"])
+        self._count = int(self.meta["count"])
+        self._maps = {"time": self._map(TIME_FILE, np.dtype("<i8"))}
+        for c in self.columns:
+            self._maps[c] = self._map(f"{c}.f8", np.dtype("<f8"))
+        return self._count
+
+    def _map(self, name: str, dtype: np.dtype) -> np.ndarray:
+        if self._count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(self._count,))
+
+    # ------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._maps["time"]
+
+    def column(self, name: str) -> np.ndarray:
+        if name in ("time", "datetime"):
+            return self.time
+        return self._maps[name]
+
+    def searchsorted(self, t_ns: int, side: str = "left") -> int:
+        return int(np.searchsorted(self.time, int(t_ns), side=side))
+
+    def to_frame(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame {time (datetime64 UTC), open, high, low, close, volume} sur [start, stop).
+        Les colonnes sont des copies des tranches memmap (pas de parsing texte).
+        """
+        sl = slice(start, stop)
+        data: Dict[str, Any] = {
+            "time": pd.to_datetime(np.asarray(self.time[sl]), unit="ns", utc=True),
+        }
+        for c in self.columns:
+            data[c] = np.asarray(self._maps[c][sl])
+        return pd.DataFrame(data)
+
+    def iter_candles(self, start: int = 0, chunk: int = 4096) -> Iterator[Dict[str, Any]]:
+        """Bougies au format du feed (time en chaîne ISO 'Z'), à partir de l'index `start`."""
+        i = int(start)
+        while i < self._count:
+            j = min(self._count, i + chunk)
+            times = format_times(self.time[i:j])
+            cols = {c: np.asarray(self._maps[c][i:j]).tolist() for c in self.columns}
+            for k in range(j - i):
+                row: Dict[str, Any] = {"time": str(times[k])}
+                for c in self.columns:
+                    row[c] = cols[c][k]
+                yield row
+            i = j
+
+    # ------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------
+
+    def append(self, times: Any, **columns: Any) -> int:
+        """
+        Ajoute des lignes (times: int64 ns ou dates parsables ; colonnes absentes -> NaN).
+        Les timestamps doivent être croissants et >= au dernier existant. Renvoie le nouveau count.
+        """
+        t = datetimes_to_ns(np.asarray(times))
+        n_new = len(t)
+        if n_new == 0:
+            return self._count
+        if np.any(np.diff(t) < 0) or (self._count and t[0] < self.time[-1]):
+            raise ValueError("❌ Timestamps non chronologiques pour le store OHLCV")
+
+        arrays = {"time": t.astype("<i8")}
+        for c in self.columns:
+            v = columns.get(c)
+            arrays[c] = (np.full(n_new, np.nan) if v is None else np.asarray(v, dtype=np.float64)).astype("<f8")
+            if len(arrays[c]) != n_new:
+                raise ValueError(f"❌ Longueur incohérente pour la colonne {c}")
+
+        self._maps = {}  # libère nos mappings avant d'écrire (requis sous Windows)
+        for name, arr in arrays.items():
+            fname = TIME_FILE if name == "time" else f"{name}.f8"
+            fpath = os.path.join(self.path, fname)
+            with open(fpath, "r+b") as f:
+                if os.fstat(f.fileno()).st_size > self._count * 8:
+                    f.truncate(self._count * 8)  # octets orphelins d'un append interrompu
+                f.seek(self._count * 8)
+                f.write(arr.tobytes())
+        self.meta["count"] = self._count + n_new
+        _write_meta(self.path, self.meta)
+        return self.reload()
+
+    def append_frame(self, df: pd.DataFrame) -> int:
+        time_col = "time" if "time" in df.columns else ("datetime" if "datetime" in df.columns else df.columns[0])
+        return self.append(df[time_col].to_numpy(), **{c: df[c].to_numpy() for c in self.columns if c in df.columns})
+
+    def append_candle(self, candle: Mapping[str, Any]) -> int:
+        ts = candle.get("time", candle.get("datetime"))
+        return self.append([ts], **{c: [candle.get(c, np.nan)] for c in self.columns})
+
+
+def _write_meta(path: str, meta: Mapping[str, Any]) -> None:
+    tmp = os.path.join(path, META_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(meta), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, META_FILE))
+
+
+# ------------------------------------------------------------
+# Conversion / lecture unifiée
+# ------------------------------------------------------------
+
+def convert_csv(
+    csv_path: str,
+    out_path: Optional[str] = None,
+    *,
+    chunksize: int = 500_000,
+    overwrite: bool = False,
+) -> OHLCVStore:
+    """Convertit un CSV (time,open,high,low,close[,volume]) en store ; lignes triées par time."""
+    out_path = out_path or default_store_path(csv_path)
+    df = pd.read_csv(csv_path)
+    time_col = "time" if "time" in df.columns else df.columns[0]
+    df = df.assign(**{time_col: datetimes_to_ns(df[time_col])}).sort_values(time_col, kind="stable")
+    store = OHLCVStore.create(out_path, overwrite=overwrite)
+    for start in range(0, len(df), chunksize):
+        part = df.iloc[start:start + chunksize]
+        store.append(part[time_col].to_numpy(), **{c: part[c].to_numpy() for c in OHLCV_FIELDS if c in part.columns})
+    return store
+
+
+def resolve_data_path(path: str) -> str:
+    """
+    Store si `path` en désigne un ; CSV s'il existe ; sinon store converti (<fichier>.ohlcv) voisin
+    si présent (CSV supprimé après conversion). Jamais de substitution d'un CSV existant.
+    """
+    if is_store(path) or os.path.exists(path):
+        return path
+    alt = default_store_path(path)
+    return alt if path.endswith(".csv") and is_store(alt) else path
+
+
+def load_ohlcv_frame(path: str) -> pd.DataFrame:
+    """
+    Lecture unifiée store memmap / CSV. La colonne time est toujours au format des CSV d'origine
+    (chaînes ISO 'Z'), quelle que soit la source.
+    """
+    path = resolve_data_path(path)
+    if is_store(path):
+        store = OHLCVStore(path)
+        df = store.to_frame()
+        df["time"] = format_times(store.time)
+        return df
+    return pd.read_csv(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Store OHLCV memmap")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_conv = sub.add_parser("convert", help="Convertir un CSV en store .ohlcv")
+    p_conv.add_argument("csv")
+    p_conv.add_argument("out", nargs="?", default=None)
+    p_conv.add_argument("--overwrite", action="store_true")
+    p_info = sub.add_parser("info", help="Résumé d'un store")
+    p_info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "convert":
+        store = convert_csv(args.csv, args.out, overwrite=args.overwrite)
+        print(f"✅ {len(store)} bougies -> {store.path}")
+    else:
+        store = OHLCVStore(args.path)
+        first = format_times(store.time[:1])[0] if len(store) else "-"
+        last = format_times(store.time[-1:])[0] if len(store) else "-"
+        print(f"📦 {store.path} : {len(store)} bougies [{first} -> {last}] colonnes={store.columns}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@
 
 import os
 import csv
+import logging
+import time
 from typing import Iterator, Optional, TypedDict
 
 from signals.utils.config_reader import load_config
+from signals.feeds.ohlcv_store import OHLCVStore, is_store, resolve_data_path
+from signals.feeds.seek import resume_offset
+from signals.feeds.tail import FollowFeed
 
 
 class Candle(TypedDict):
@@ -18,31 +23,80 @@ class Candle(TypedDict):
 
 _feed_iter: Optional[Iterator[Candle]] = None
 _csv_file_handle = None
+_follower: Optional[FollowFeed] = None
+_resume: Optional[dict] = None          # point de reprise (checkpoint) à appliquer à l'ouverture
+_position: Optional[int] = None         # octets CSV / index store juste après la dernière bougie
+_read_seconds = 0.0                     # durée de lecture de la dernière bougie (hors attente en follow)
 
 
-def _build_csv_iterator() -> Iterator[Candle]:
-    """
-    Itère sur le CSV 5m configuré.
-    Format attendu:
-      time,open,high,low,close,volume
-      2025-07-14T14:35:00Z,115.46875,115.46875,115.40625,115.40625,2233
-    """
-    global _csv_file_handle
-
-    cfg = load_config()
+def _feed_path(cfg: dict) -> str:
     base = (cfg.get("data", {}) or {}).get("data_path")
     fn = (cfg.get("data", {}) or {}).get("input_5m")
 
     if not base or not fn:
         raise RuntimeError("Chemins data invalides (data.data_path / data.input_5m)")
 
-    path = os.path.join(base, fn)
+    path = resolve_data_path(os.path.join(base, fn))
     if not os.path.exists(path):
         raise FileNotFoundError(f"Fichier CSV introuvable: {path}")
+    return path
 
-    _csv_file_handle = open(path, "r", newline="", encoding="utf-8")
-    reader = csv.DictReader(_csv_file_handle)
-    for row in reader:
+
+def _start_offset(path: str) -> int:
+    """Position de départ : 0, ou juste après la bougie du checkpoint (consommé une seule fois)."""
+    global _resume
+    if not _resume:
+        return 0
+    point, _resume = _resume, None
+    start = resume_offset(
+        path,
+        offset=point.get("offset"),
+        epoch_ns=point.get("epoch_ns"),
+        timestamp=point.get("timestamp"),
+    )
+    logging.info(f"[Feed] reprise checkpoint -> position {start} ({path})")
+    return start
+
+
+def _build_csv_iterator() -> Iterator[Candle]:
+    """
+    Itère sur le CSV 5m configuré (ou sur son store .ohlcv converti s'il existe).
+    Format attendu:
+      time,open,high,low,close,volume
+      2025-07-14T14:35:00Z,115.46875,115.46875,115.40625,115.40625,2233
+    """
+    global _csv_file_handle, _position
+
+    path = _feed_path(load_config())
+    start = _start_offset(path)
+
+    # store OHLCV binaire (memmap) : pas de parsing texte
+    if is_store(path):
+        for k, row in enumerate(OHLCVStore(path).iter_candles(start), start=start + 1):
+            _position = k
+            yield Candle(
+                time=row["time"],
+                open=row["open"],
+                high=row["high"],
+                low=row["low"],
+                close=row["close"],
+                volume=row.get("volume", 0.0),
+            )
+        return
+
+    # lecture binaire ligne à ligne : l'offset en octets de chaque bougie est connu (checkpoint)
+    _csv_file_handle = open(path, "rb")
+    header_line = _csv_file_handle.readline()
+    header = [h.strip().lstrip("\ufeff") for h in next(csv.reader([header_line.decode("utf-8")]))]
+    pos = max(start, len(header_line))
+    _csv_file_handle.seek(pos)
+    for raw in _csv_file_handle:
+        pos += len(raw)
+        values = next(csv.reader([raw.decode("utf-8")]), None)
+        if not values:
+            continue
+        row = dict(zip(header, values))
+        _position = pos
         yield Candle(
             time=row["time"],
             open=float(row["open"]),
@@ -53,17 +107,58 @@ def _build_csv_iterator() -> Iterator[Candle]:
         )
 
 
+def set_resume_point(
+    *,
+    offset: Optional[int] = None,
+    epoch_ns: Optional[int] = None,
+    timestamp: Optional[str] = None,
+) -> None:
+    """
+    Reprise depuis un checkpoint : le prochain feed ouvert démarre directement après la bougie
+    `epoch_ns`/`timestamp` (offset persisté vérifié, sinon recherche dichotomique) au lieu de
+    relire tout le fichier.
+    """
+    global _resume
+    _resume = None
+    if offset is not None or epoch_ns is not None or timestamp:
+        _resume = {"offset": offset, "epoch_ns": epoch_ns, "timestamp": timestamp}
+
+
+def get_feed_position() -> Optional[int]:
+    """Position (octets CSV / index store) juste après la dernière bougie renvoyée, à checkpointer."""
+    if _follower is not None:
+        return _follower.offset
+    return _position
+
+
 def get_next_candle() -> Candle:
     """
     Retourne la prochaine bougie (5m) depuis le CSV configuré.
+    Avec data.follow: true, suit le fichier en continu (bloque jusqu'à la prochaine bougie
+    ajoutée) au lieu de lever StopIteration en fin de fichier.
     """
-    global _feed_iter, _csv_file_handle
+    global _feed_iter, _csv_file_handle, _follower, _read_seconds
+
+    if _follower is not None:
+        return _follow_next()
+
+    cfg = load_config()
+    data_cfg = cfg.get("data", {}) or {}
+    if data_cfg.get("follow"):
+        path = _feed_path(cfg)
+        _follower = FollowFeed(
+            path,
+            offset=_start_offset(path),
+            poll_interval=float(data_cfg.get("follow_poll_seconds", 1.0)),
+        )
+        return _follow_next()
 
     if _feed_iter is None:
         _feed_iter = _build_csv_iterator()
 
+    t0 = time.perf_counter()
     try:
-        return next(_feed_iter)
+        candle = next(_feed_iter)
     except StopIteration:
         if _csv_file_handle:
             try:
@@ -73,12 +168,31 @@ def get_next_candle() -> Candle:
         _feed_iter = None
         _csv_file_handle = None
         raise
+    _read_seconds = time.perf_counter() - t0
+    return candle
+
+
+def _follow_next() -> Candle:
+    global _read_seconds
+    candle = Candle(**_follower.next_candle())
+    _read_seconds = _follower.last_read_seconds
+    return candle
+
+
+def get_last_read_seconds() -> float:
+    """Durée de lecture de la dernière bougie renvoyée, sans le temps passé à attendre la suivante."""
+    return _read_seconds
 
 
 def reset_feed() -> None:
-    """Réinitialise l'itérateur (utile pour tests)."""
-    global _feed_iter, _csv_file_handle
+    """Réinitialise l'itérateur et le point de reprise (utile pour tests)."""
+    global _feed_iter, _csv_file_handle, _follower, _resume, _position
     _feed_iter = None
+    _resume = None
+    _position = None
+    if _follower is not None:
+        _follower.close()
+    _follower = None
     if _csv_file_handle:
         try:
             _csv_file_handle.close()
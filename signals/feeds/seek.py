@@ -0,0 +1,116 @@
+# signals/feeds/seek.py
+"""
+Reprise rapide du feed depuis un checkpoint.
+
+- Chemin direct : l'offset persisté (octets CSV / index de ligne du store) est vérifié en
+  relisant la ligne qui le précède (son timestamp doit être celui du checkpoint).
+- Repli : recherche dichotomique du premier enregistrement postérieur au checkpoint
+  (octets du CSV trié, ou searchsorted sur la colonne time du store) : O(log n) lectures.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from typing import Optional, Tuple
+
+from signals.feeds.ohlcv_store import OHLCVStore, is_store
+from signals.utils.time_utils import datetime_to_ns
+
+_BACK_READ = 4096
+
+
+def _parse_time(line: bytes, time_idx: int) -> Optional[int]:
+    try:
+        values = next(csv.reader([line.decode("utf-8")]))
+        return datetime_to_ns(values[time_idx])
+    except Exception:
+        return None
+
+
+def _header(f) -> Tuple[int, int]:
+    """(longueur de l'en-tête en octets, index de la colonne time)."""
+    f.seek(0)
+    line = f.readline()
+    header = [h.strip().lstrip("﻿") for h in next(csv.reader([line.decode("utf-8")]))]
+    return len(line), (header.index("time") if "time" in header else 0)
+
+
+def _line_before(f, offset: int, data_start: int) -> Optional[bytes]:
+    """Ligne complète se terminant exactement à `offset` (None si offset n'est pas une fin de ligne)."""
+    if offset <= data_start:
+        return None
+    start = max(data_start, offset - _BACK_READ)
+    f.seek(start)
+    buf = f.read(offset - start)
+    if not buf.endswith(b"\n"):
+        return None
+    prev = buf.rfind(b"\n", 0, len(buf) - 1)
+    if prev < 0 and start > data_start:
+        return None  # ligne plus longue que la fenêtre : on passe par la dichotomie
+    return buf[prev + 1:]
+
+
+def _first_line_from(f, pos: int, size: int, time_idx: int) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Première ligne complète commençant à pos ou après : (début, fin, time_ns)."""
+    f.seek(pos)
+    if pos > 0:
+        f.seek(pos - 1)
+        if f.read(1) != b"\n":
+            f.readline()  # fin de la ligne en cours
+    start = f.tell()
+    if start >= size:
+        return None
+    line = f.readline()
+    if not line.endswith(b"\n"):
+        return None  # ligne partielle finale
+    return start, start + len(line), _parse_time(line, time_idx)
+
+
+def bisect_csv_offset(path: str, epoch_ns: int) -> int:
+    """Offset (octets) de la première ligne de données dont time > epoch_ns (CSV trié par time)."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data_start, time_idx = _header(f)
+        lo, hi = data_start, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found = _first_line_from(f, mid, size, time_idx)
+            if found is None or found[0] >= hi:
+                hi = mid
+                continue
+            start, end, t = found
+            if t is not None and t <= epoch_ns:
+                lo = end
+            else:
+                hi = mid
+        return lo
+
+
+def resume_offset(path: str, *, offset: Optional[int] = None, epoch_ns: Optional[int] = None,
+                  timestamp: Optional[str] = None) -> int:
+    """
+    Position de reprise (octets CSV ou index de ligne du store) juste après la bougie du checkpoint.
+    Renvoie 0 si le checkpoint ne permet aucune reprise.
+    """
+    if epoch_ns is None and timestamp:
+        epoch_ns = datetime_to_ns(timestamp)
+    if epoch_ns is None:
+        return 0
+    epoch_ns = int(epoch_ns)
+
+    if is_store(path):
+        store = OHLCVStore(path)
+        if offset is not None and 0 < int(offset) <= len(store) and int(store.time[int(offset) - 1]) == epoch_ns:
+            return int(offset)
+        return store.searchsorted(epoch_ns, side="right")
+
+    if offset is not None and int(offset) > 0:
+        with open(path, "rb") as f:
+            data_start, time_idx = _header(f)
+            line = _line_before(f, int(offset), data_start)
+        if line is not None and _parse_time(line, time_idx) == epoch_ns:
+            return int(offset)
+        logging.info(f"[Feed] offset checkpoint {offset} invalide pour {path} -> recherche dichotomique")
+    return bisect_csv_offset(path, epoch_ns)
@@ -0,0 +1,216 @@
+# signals/feeds/tail.py
+"""
+Suivi en continu ("tail -f") du fichier 5m pour le live.
+
+- CsvTail : garde l'offset en octets ; ne lit/parse que les octets ajoutés ; une ligne finale
+  incomplète (sans \\n) reste en attente jusqu'à ce qu'elle soit terminée.
+  Rotation (inode différent) ou troncature (taille < offset) -> relecture depuis le début,
+  en ignorant les bougies déjà émises (time <= dernière émise).
+- StoreTail : même interface pour un store .ohlcv (watermark = nombre de lignes de meta.json).
+- FollowFeed : bloque jusqu'à la prochaine bougie ; réveil par watchdog (inotify/ReadDirectoryChanges...)
+  sur le répertoire du fichier, avec un poll de secours (poll_interval) si watchdog est indisponible
+  ou si un évènement est manqué.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from signals.feeds.ohlcv_store import META_FILE, OHLCVStore, is_store
+from signals.utils.time_utils import datetime_to_ns
+
+try:  # dépendance de requirements.txt ; fallback en polling si absente
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None  # type: ignore[assignment]
+
+
+def _row_to_candle(row: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "time": row["time"],
+        "open": float(row["open"]),
+        "high": float(row["high"]),
+        "low": float(row["low"]),
+        "close": float(row["close"]),
+        "volume": float(row.get("volume") or 0.0),
+    }
+
+
+class CsvTail:
+    """Lecteur incrémental d'un CSV 5m (time,open,high,low,close[,volume])."""
+
+    def __init__(self, path: str, *, offset: int = 0):
+        self.path = path
+        self.offset = int(offset)       # octets consommés (lignes complètes uniquement)
+        self._header: Optional[List[str]] = None
+        self._inode: Optional[int] = None
+        self._last_time: Optional[str] = None
+        self._skip_until_ns: Optional[int] = None
+
+    @property
+    def watch_paths(self) -> List[str]:
+        return [self.path]
+
+    def _read_header(self, f) -> int:
+        line = f.readline()
+        if not line.endswith(b"\n"):
+            return 0
+        self._header = [h.strip().lstrip("\ufeff") for h in next(csv.reader([line.decode("utf-8")]))]
+        return len(line)
+
+    def read_new(self) -> List[Tuple[Dict[str, Any], int]]:
+        """Nouvelles bougies complètes, chacune avec l'offset (octets) juste après sa ligne."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []  # rotation en cours : le nouveau fichier n'existe pas encore
+
+        inode = getattr(st, "st_ino", None)
+        if self._inode is not None and (inode != self._inode or st.st_size < self.offset):
+            logging.info(f"[Feed] rotation/troncature détectée sur {self.path} -> relecture")
+            self.offset = 0
+            self._header = None
+            if self._last_time is not None:
+                self._skip_until_ns = datetime_to_ns(self._last_time)
+        self._inode = inode
+        if st.st_size <= self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            if self._header is None:
+                f.seek(0)
+                header_len = self._read_header(f)
+                if not header_len:
+                    return []
+                # reprise à un offset donné (checkpoint) : l'en-tête est déjà derrière
+                self.offset = max(self.offset, header_len)
+            f.seek(self.offset)
+            chunk = f.read()
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return []  # ligne partielle : on attend la suite
+        complete = chunk[: end + 1]
+
+        out = []
+        pos = self.offset
+        for raw in complete.splitlines(keepends=True):
+            pos += len(raw)
+            values = next(csv.reader([raw.decode("utf-8")]), None)
+            if not values:
+                continue
+            row = dict(zip(self._header, values))
+            if not row.get("time"):
+                continue
+            if self._skip_until_ns is not None:
+                if datetime_to_ns(row["time"]) <= self._skip_until_ns:
+                    continue
+                self._skip_until_ns = None
+            out.append((_row_to_candle(row), pos))
+        self.offset += len(complete)
+        if out:
+            self._last_time = out[-1][0]["time"]
+        return out
+
+
+class StoreTail:
+    """Lecteur incrémental d'un store .ohlcv (offset = index de ligne)."""
+
+    def __init__(self, path: str, *, offset: int = 0):
+        self.path = path
+        self.offset = int(offset)
+        self._store = OHLCVStore(path)
+
+    @property
+    def watch_paths(self) -> List[str]:
+        return [os.path.join(self.path, META_FILE)]
+
+    def read_new(self) -> List[Tuple[Dict[str, Any], int]]:
+        n = self._store.reload()
+        if n < self.offset:
+            logging.warning(f"[Feed] store {self.path} raccourci ({n} < {self.offset}) -> relecture")
+            self.offset = 0
+        rows = [(c, self.offset + k + 1) for k, c in enumerate(self._store.iter_candles(self.offset))]
+        self.offset = n
+        return rows
+
+
+class _Wakeup(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(self, paths: List[str], event: threading.Event):
+        self._paths = {os.path.normcase(os.path.abspath(p)) for p in paths}
+        self._event = event
+
+    def on_any_event(self, event) -> None:
+        for p in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if p and os.path.normcase(os.path.abspath(p)) in self._paths:
+                self._event.set()
+                return
+
+
+class FollowFeed:
+    """
+    Flux bloquant : next_candle() renvoie la prochaine bougie complète, en attendant les ajouts.
+    """
+
+    def __init__(self, path: str, *, offset: int = 0, poll_interval: float = 1.0, use_watchdog: bool = True):
+        self.source = StoreTail(path, offset=offset) if is_store(path) else CsvTail(path, offset=offset)
+        self.poll_interval = float(poll_interval)
+        self._pending: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self._offset = int(offset)
+        self._event = threading.Event()
+        self._observer = None
+        self.last_read_seconds = 0.0   # lecture de la dernière bougie, hors attente d'un ajout
+        if use_watchdog and Observer is not None:
+            try:
+                obs = Observer()
+                watch_dir = os.path.dirname(os.path.abspath(self.source.watch_paths[0]))
+                obs.schedule(_Wakeup(self.source.watch_paths, self._event), watch_dir, recursive=False)
+                obs.daemon = True
+                obs.start()
+                self._observer = obs
+            except Exception as e:
+                logging.warning(f"[Feed] watchdog indisponible ({e}) -> polling {self.poll_interval}s")
+
+    @property
+    def offset(self) -> int:
+        """Position (octets CSV / lignes store) juste après la dernière bougie émise."""
+        return self._offset
+
+    def next_candle(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        read = 0.0
+        while True:
+            if self._pending:
+                candle, self._offset = self._pending.popleft()
+                self.last_read_seconds = read
+                return candle
+            self._event.clear()
+            t0 = time.perf_counter()
+            rows = self.source.read_new()
+            read += time.perf_counter() - t0
+            if rows:
+                self._pending.extend(rows)
+                continue
+            wait = self.poll_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError("Aucune nouvelle bougie")
+            self._event.wait(wait)
+
+    def close(self) -> None:
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
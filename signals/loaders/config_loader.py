@@ -22,6 +22,11 @@ def load_json_config(path: str) -> dict:
         logging.error(f"[Config] JSON invalide ({path}) : {e}")
         raise ValueError(f"Format JSON invalide dans {path}")
 
+def get_config() -> dict:
+    """config.yaml (mis en cache, re-parsé seulement si le fichier change ; ne pas modifier)."""
+    return load_config()
+
+
 def get_symbol() -> str:
     cfg = load_config()
     return (cfg.get("trading", {}) or {}).get("symbol", "UNKNOWN")
@@ -45,4 +50,62 @@ def get_dry_run_mode() -> bool:
 def get_default_lots() -> int:
     cfg = load_config()
     # par défaut 1 lot si non défini
-    return int((cfg.get("general", {}) or {}).get("DEFAULT_FIXED_LOTS", 1))
\ No newline at end of file
+    return int((cfg.get("general", {}) or {}).get("DEFAULT_FIXED_LOTS", 1))
+
+def get_general() -> dict:
+    cfg = load_config()
+    return cfg.get("general", {}) or {}
+
+
+def get_tf_files() -> dict:
+    """
+    Renvoie {tf: chemin_complet} pour data.tf_files (joint à data.data_path si relatif).
+    """
+    cfg = load_config()
+    data = cfg.get("data", {}) or {}
+    base = data.get("data_path") or ""
+    tf_files = data.get("tf_files") or {}
+    if not isinstance(tf_files, dict):
+        return {}
+    out = {}
+    for tf, rel in tf_files.items():
+        if not isinstance(rel, str) or not rel:
+            continue
+        out[tf] = rel if (os.path.isabs(rel) or not base) else os.path.join(base, rel)
+    return out
+
+
+def get_mtf_resample() -> dict | None:
+    """
+    data.mtf_source == "resample" -> {"timeframes": [...], "offsets": {tf: "17h", ...}}
+    (TF construites depuis le flux 5m au lieu des fichiers data.tf_files) ; sinon None.
+    Par défaut, les TF sont les clés de data.tf_files.
+    """
+    cfg = load_config()
+    data = cfg.get("data", {}) or {}
+    if str(data.get("mtf_source") or "files").lower() != "resample":
+        return None
+    tfs = data.get("resample_timeframes") or list((data.get("tf_files") or {}).keys())
+    offsets = data.get("resample_offsets") or {}
+    return {"timeframes": [str(tf) for tf in tfs], "offsets": {str(k): str(v) for k, v in offsets.items()}}
+
+
+def get_model_path() -> str:
+    cfg = load_config()
+    return (cfg.get("model", {}) or {}).get("path", "")
+
+
+def get_optimizer_config_path() -> str:
+    cfg = load_config()
+    return (cfg.get("config_horaire", {}) or {}).get("path", "")
+
+
+def get_live_data_path() -> str:
+    """Chemin du CSV 5m (data.data_path + data.input_5m)."""
+    cfg = load_config()
+    data = cfg.get("data", {}) or {}
+    return os.path.join(data.get("data_path") or "", data.get("input_5m") or "")
+
+
+def get_timezone() -> str:
+    return get_general().get("timezone") or "UTC"
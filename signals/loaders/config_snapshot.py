@@ -0,0 +1,124 @@
+# signals/loaders/config_snapshot.py
+"""
+Snapshot de configuration partagé (config.yaml + JSON optimizer), compilé une seule fois.
+
+- Les fichiers sont lus via cfg_reader.load_config / rules.load_optimizer_config, qui ne
+  re-parsent que si le fichier a changé (mtime/taille puis sha1) : sur le chemin par bougie,
+  get_snapshot() ne coûte que deux os.stat().
+- Le snapshot n'est recompilé que si l'un des objets sources change (nouvelle version d'un
+  fichier, ou loader monkeypatché en test).
+- En live avec hot-reload, la source optimizer est le OptimizerReloader (set_optimizer_provider) :
+  la nouvelle version n'est visible qu'après son activation entre deux bougies.
+- Tout est immuable : même type en lecture seule que les loaders (file_cache.read_only :
+  ReadOnlyDict / ReadOnlyList) et tables de schedules typées (ScheduleConfig figés), limites
+  DD pré-calculées par schedule.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+import signals.utils.config_reader as cfg_reader
+import signals.optimizer.optimizer_rules as rules
+from signals.logic.risk_constraints import get_dd_limit_from_optimizer
+from signals.optimizer.optimizer_rules import ScheduleConfig
+from signals.utils.file_cache import ReadOnlyDict, read_only
+
+
+@dataclass(frozen=True)
+class TradingConfig:
+    symbol: str
+    order_type: str
+    time_in_force: str
+    dry_run: bool
+    default_lots: int
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    version: int
+    app: Mapping[str, Any]
+    optimizer: Mapping[str, Any]
+    by_schedule: Mapping[str, Mapping[str, Any]]     # ordre du JSON conservé
+    schedules: Tuple[ScheduleConfig, ...]
+    dd_limits: Mapping[str, Optional[float]]
+    trading: TradingConfig
+    # objets sources (identité) : sert uniquement à détecter un changement
+    _sources: Tuple[Any, Any] = field(default=(None, None), repr=False, compare=False)
+
+    @property
+    def general(self) -> Mapping[str, Any]:
+        return self.app.get("general") or ReadOnlyDict()
+
+
+def compile_snapshot(app_cfg: Mapping[str, Any], optimizer_root: Mapping[str, Any], *, version: int = 0) -> ConfigSnapshot:
+    app = read_only(dict(app_cfg or {}))
+    optimizer = read_only(dict(optimizer_root or {}))
+    by_schedule = optimizer.get("CONFIGURATIONS_BY_SCHEDULE") or ReadOnlyDict()
+    trading = app.get("trading") or {}
+    general = app.get("general") or {}
+    return ConfigSnapshot(
+        version=version,
+        app=app,
+        optimizer=optimizer,
+        by_schedule=by_schedule,
+        schedules=rules.compile_schedules(by_schedule),
+        dd_limits=ReadOnlyDict({
+            label: get_dd_limit_from_optimizer(cfg_now=sc, optimizer_root=optimizer, app_cfg=app)
+            for label, sc in by_schedule.items()
+        }),
+        trading=TradingConfig(
+            symbol=trading.get("symbol", "UNKNOWN"),
+            order_type=trading.get("order_type", "market"),
+            time_in_force=trading.get("time_in_force", "DAY"),
+            dry_run=trading.get("dry_run", True),
+            default_lots=int(general.get("DEFAULT_FIXED_LOTS", 1)),
+        ),
+        _sources=(app_cfg, optimizer_root),
+    )
+
+
+_lock = threading.Lock()
+_current: Optional[ConfigSnapshot] = None
+# source optimizer alternative (hot-reload) : renvoie la version en service, sans I/O
+_optimizer_provider: Optional[Callable[[], Mapping[str, Any]]] = None
+
+
+def set_optimizer_provider(provider: Optional[Callable[[], Mapping[str, Any]]]) -> None:
+    """Remplace la lecture du JSON optimizer par `provider()` (None = retour au fichier)."""
+    global _optimizer_provider
+    _optimizer_provider = provider
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """Snapshot courant (recompilé seulement si config.yaml ou le JSON optimizer a changé)."""
+    global _current
+    app_cfg = cfg_reader.load_config()
+    provider = _optimizer_provider
+    if provider is not None:
+        optimizer_root = provider()
+    else:
+        opt_path = (app_cfg.get("config_horaire", {}) or {}).get("path")
+        optimizer_root = rules.load_optimizer_config(opt_path)
+
+    snap = _current
+    if snap is not None and snap._sources[0] is app_cfg and snap._sources[1] is optimizer_root:
+        return snap
+    with _lock:
+        snap = _current
+        if snap is not None and snap._sources[0] is app_cfg and snap._sources[1] is optimizer_root:
+            return snap
+        version = (snap.version + 1) if snap is not None else 1
+        _current = compile_snapshot(app_cfg, optimizer_root, version=version)
+        logging.info(f"[Config] snapshot v{version} compilé ({len(_current.schedules)} schedules)")
+        return _current
+
+
+def reset_snapshot() -> None:
+    """Oublie le snapshot courant (tests)."""
+    global _current
+    with _lock:
+        _current = None
@@ -1,9 +1,7 @@
 # signals/loaders/optimizer_config.py
-import json
-import os
+from signals.optimizer import optimizer_rules
+
 
 def load_optimizer_config(path: str) -> dict:
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"[OptimizerConfig] introuvable: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # même cache que signals.optimizer.optimizer_rules (un seul parsing par version du fichier)
+    return optimizer_rules.load_optimizer_config(path)
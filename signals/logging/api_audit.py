@@ -1,23 +1,258 @@
 # signals/logging/api_audit.py
+"""
+Audit NDJSON des requêtes/réponses API (une ligne JSON par événement).
 
+- Un AuditSink unique par fichier (get_audit_sink) : handle ouvert en permanence, file non bornée
+  vidée par un thread d'écriture. log() ne fait qu'une copie superficielle + put : aucune
+  latence disque ni de sérialisation entre le signal et l'envoi de l'ordre.
+- Sérialisation dans le thread d'écriture (orjson si installé, sinon json).
+- Rotation par taille (max_bytes) : le fichier courant est renommé <fichier>.<horodatage>,
+  compressé en .gz en tâche de fond ; seules les `backups` dernières archives sont conservées.
+- Index request_id -> (fichier, offset) optionnel (index=True, cf. audit_index) tenu à jour
+  par le thread d'écriture, y compris à la rotation / compression / purge des archives.
+- flush_audit() attend l'écriture de tout ce qui a été loggé (tests, arrêt) ; les sinks sont
+  vidés et fermés à la sortie du process (atexit).
+"""
+
+import atexit
+import gzip
 import json
+import logging
 import os
+import queue
+import shutil
+import threading
 import time
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from signals.logging.audit_index import AuditIndex, Entry, archives_of, entry_for
+
+try:  # sérialisation rapide optionnelle
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    _orjson = None
+
+_STOP = object()
+_FLUSH = object()
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(record, default=str) + b"\n"
+        except TypeError:
+            pass
+    return (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class AuditSink:
+    def __init__(
+        self,
+        path: str,
+        *,
+        asynchronous: bool = True,
+        max_bytes: int = 50 * 1024 * 1024,
+        backups: int = 10,
+        compress: bool = True,
+        index: bool = False,
+    ):
+        self.path = path
+        self.asynchronous = bool(asynchronous)
+        self.max_bytes = int(max_bytes)
+        self.backups = max(0, int(backups))
+        self.compress = bool(compress)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()          # écriture / rotation (thread d'écriture ou mode synchrone)
+        self._fh = open(path, "ab")
+        self._size = self._fh.tell()
+        self.index: Optional[AuditIndex] = AuditIndex.for_audit(path) if index else None
+        self._compressors: List[threading.Thread] = []
+        self._closed = False
+        self._q: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        if self.asynchronous:
+            self._thread = threading.Thread(target=self._run, name="api-audit-writer", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------
+    # API appelant
+    # ------------------------------------------------------------
+
+    def log(self, record: Dict[str, Any]) -> None:
+        record = dict(record)
+        record.setdefault("ts_epoch_ms", int(time.time() * 1000))
+        if self.asynchronous and not self._closed:
+            self._q.put(record)
+        else:
+            self._write([record])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._fh is not None:
+                    self._fh.flush()
+            return True
+        done = threading.Event()
+        self._q.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._q.put((_STOP, None))
+            self._thread.join(timeout)
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        for t in list(self._compressors):
+            t.join(timeout)
+        if self.index is not None:
+            self.index.close()
+
+    # ------------------------------------------------------------
+    # Écriture / rotation
+    # ------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            batch = [item]
+            while len(batch) < 1024:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            records: List[Dict[str, Any]] = []
+            for it in batch:
+                if isinstance(it, tuple) and it and (it[0] is _FLUSH or it[0] is _STOP):
+                    self._write(records)
+                    records = []
+                    if it[0] is _STOP:
+                        return
+                    it[1].set()
+                else:
+                    records.append(it)
+            self._write(records)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            try:
+                if self._fh is None:
+                    self._fh = open(self.path, "ab")
+                    self._size = self._fh.tell()
+                entries: List[Entry] = []
+                for rec in records:
+                    line = _dumps(rec)
+                    if self.max_bytes > 0 and self._size > 0 and self._size + len(line) > self.max_bytes:
+                        self._index(entries)   # entrées du fichier courant avant qu'il soit archivé
+                        entries = []
+                        self._rotate()
+                    self._fh.write(line)
+                    if self.index is not None:
+                        entry = entry_for(rec, self.path, self._size, len(line))
+                        if entry is not None:
+                            entries.append(entry)
+                    self._size += len(line)
+                self._fh.flush()
+                self._index(entries)
+            except Exception:
+                logging.exception(f"[APIAudit] Écriture impossible dans {self.path}")
+
+    def _index(self, entries: List[Entry]) -> None:
+        if self.index is not None and entries:
+            self.index.add_many(entries)
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        rotated = f"{self.path}.{stamp}"
+        os.replace(self.path, rotated)
+        if self.index is not None:
+            self.index.rename_file(self.path, rotated)
+        self._fh = open(self.path, "ab")
+        self._size = 0
+        if self.compress:
+            t = threading.Thread(target=self._compress, args=(rotated,), name="api-audit-gzip", daemon=True)
+            self._compressors = [c for c in self._compressors if c.is_alive()] + [t]
+            t.start()
+        else:
+            self._prune()
+
+    def _compress(self, rotated: str) -> None:
+        try:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz.tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(rotated + ".gz.tmp", rotated + ".gz")
+            if self.index is not None:
+                self.index.rename_file(rotated, rotated + ".gz")
+            os.remove(rotated)
+        except OSError:
+            logging.exception(f"[APIAudit] Compression impossible : {rotated}")
+        self._prune()
+
+    def _prune(self) -> None:
+        archives = [p for p in archives_of(self.path) if p.endswith(".gz") == self.compress]
+        removed = []
+        for old in archives[: max(0, len(archives) - self.backups)]:
+            try:
+                os.remove(old)
+                removed.append(old)
+            except OSError:
+                pass
+        if self.index is not None and removed:
+            self.index.drop_files(removed)
+
+
+# ------------------------------------------------------------
+# Registre (un sink par fichier)
+# ------------------------------------------------------------
+
+_sinks: Dict[str, AuditSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_audit_sink(path: str, **options: Any) -> AuditSink:
+    """Sink partagé pour ce fichier (créé au premier appel ; les options suivantes sont ignorées)."""
+    key = os.path.abspath(path)
+    sink = _sinks.get(key)
+    if sink is None or sink._closed:
+        with _sinks_lock:
+            sink = _sinks.get(key)
+            if sink is None or sink._closed:
+                sink = _sinks[key] = AuditSink(path, **options)
+    return sink
+
+
+def flush_audit(timeout: Optional[float] = 10.0) -> None:
+    for sink in list(_sinks.values()):
+        sink.flush(timeout)
+
+
+@atexit.register
+def close_audit_sinks() -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
 
 
 class APIAuditLogger:
     """
-    Écrit un log NDJSON (une ligne JSON par événement) pour chaque requête/réponse API.
+    Façade historique : écrit via le sink partagé du fichier (plus d'ouverture par événement).
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, **options: Any):
         self.path = path
-        directory = os.path.dirname(path) or "."
-        os.makedirs(directory, exist_ok=True)
+        self._sink = get_audit_sink(path, **options)
 
     def log(self, record: Dict[str, Any]) -> None:
-        record = dict(record)
-        record.setdefault("ts_epoch_ms", int(time.time() * 1000))
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._sink.log(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self._sink.flush(timeout)
@@ -0,0 +1,208 @@
+# signals/logging/async_writer.py
+"""
+Écriture CSV en tâche de fond pour les logs de la boucle live.
+
+- write(path, row) ne fait qu'un put_nowait dans une file bornée : un pic de latence disque
+  ne bloque jamais le chemin décision/ordre. File pleine -> ligne rejetée et comptée (dropped).
+  La ligne est figée à la mise en file (cellules non scalaires -> str, comme csv.writer) :
+  un dict modifié par l'appelant après write() ne change pas ce qui est écrit.
+- Un thread unique vide la file par lots, regroupe les lignes par fichier (writerows) et garde
+  les fichiers ouverts ; flush toutes les `flush_interval` secondes, os.fsync en plus si `fsync`.
+- flush() attend que tout ce qui a été mis en file soit écrit ; close() vide la file puis ferme
+  les fichiers. Les writers encore ouverts sont vidés à la sortie du process (atexit).
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+
+_STOP = object()
+_FLUSH = object()
+
+
+class AsyncCSVWriter:
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10_000,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+        batch_size: int = 512,
+        name: str = "csv-writer",
+    ):
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.fsync = bool(fsync)
+        self.batch_size = max(1, int(batch_size))
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self._q: "queue.Queue[Tuple[Any, Any]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._files: Dict[str, TextIO] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _live_writers.add(self)
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> Optional["AsyncCSVWriter"]:
+        """logging.async_writer.{enabled, queue_size, flush_interval, fsync} ; None si désactivé."""
+        aw = ((cfg.get("logging") or {}).get("async_writer") or {})
+        if not aw.get("enabled", False):
+            return None
+        return cls(
+            queue_size=int(aw.get("queue_size", 10_000)),
+            flush_interval=float(aw.get("flush_interval", 1.0)),
+            fsync=bool(aw.get("fsync", False)),
+        )
+
+    # ------------------------------------------------------------
+    # API appelant (thread de la boucle live)
+    # ------------------------------------------------------------
+
+    def write(self, path: str, row: Sequence[Any]) -> bool:
+        if self._closed:
+            # après close() : écriture directe plutôt que de perdre la ligne
+            _append_rows(path, [row])
+            return True
+        try:
+            self._q.put_nowait((path, _snapshot(row)))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logging.warning(f"⚠️ File d'écriture CSV pleine : {self.dropped} ligne(s) rejetée(s)")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend que toutes les lignes déjà en file soient écrites (et flushées)."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._q.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._q.put((_STOP, None))
+            self._thread.join(timeout)
+        _live_writers.discard(self)
+
+    @property
+    def pending(self) -> int:
+        return self._q.qsize()
+
+    # ------------------------------------------------------------
+    # Thread d'écriture
+    # ------------------------------------------------------------
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._q.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    self._flush_files()
+                    last_flush = time.monotonic()
+                    continue
+
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if self._process(batch):
+                    return
+                now = time.monotonic()
+                if now - last_flush >= self.flush_interval:
+                    self._flush_files()
+                    last_flush = now
+        except Exception:
+            logging.exception("[AsyncCSVWriter] Arrêt inattendu du thread d'écriture")
+        finally:
+            self._close_files()
+
+    def _process(self, batch: List[Tuple[Any, Any]]) -> bool:
+        """Écrit le lot dans l'ordre ; renvoie True si un ordre d'arrêt a été reçu."""
+        rows: Dict[str, List[Sequence[Any]]] = {}
+        for path, payload in batch:
+            if path is _FLUSH or path is _STOP:
+                self._write_rows(rows)
+                rows = {}
+                self._flush_files()
+                if path is _STOP:
+                    return True
+                payload.set()
+            else:
+                rows.setdefault(path, []).append(payload)
+        self._write_rows(rows)
+        return False
+
+    def _write_rows(self, rows: Dict[str, List[Sequence[Any]]]) -> None:
+        for path, lines in rows.items():
+            try:
+                fh = self._files.get(path)
+                if fh is None:
+                    fh = self._files[path] = open(path, "a", newline="", encoding="utf-8")
+                csv.writer(fh).writerows(lines)
+                self.written += len(lines)
+            except OSError:
+                self.errors += len(lines)
+                logging.exception(f"[AsyncCSVWriter] Écriture impossible dans {path} ({len(lines)} ligne(s) perdue(s))")
+                self._drop_file(path)
+
+    def _flush_files(self) -> None:
+        for path, fh in list(self._files.items()):
+            try:
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+            except OSError:
+                logging.exception(f"[AsyncCSVWriter] Flush impossible pour {path}")
+                self._drop_file(path)
+
+    def _drop_file(self, path: str) -> None:
+        fh = self._files.pop(path, None)
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
+    def _close_files(self) -> None:
+        self._flush_files()
+        for path in list(self._files):
+            self._drop_file(path)
+
+
+def _snapshot(row: Sequence[Any]) -> List[Any]:
+    """Copie de la ligne telle que csv.writer l'écrirait (dict/list -> str), indépendante de l'appelant."""
+    return [v if v is None or isinstance(v, (str, int, float)) else str(v) for v in row]
+
+
+def _append_rows(path: str, rows: Sequence[Sequence[Any]]) -> None:
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+# Vidage des writers encore ouverts à la sortie (arrêt sans close explicite)
+_live_writers: "weakref.WeakSet[AsyncCSVWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    for w in list(_live_writers):
+        w.close(timeout=5.0)
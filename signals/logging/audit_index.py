@@ -0,0 +1,213 @@
+# signals/logging/audit_index.py
+"""
+Index request_id -> (fichier, offset) de l'audit API NDJSON, pour retrouver en quelques ms
+la chronologie complète d'un ordre (request / response / error) sans grep.
+
+- Sidecar SQLite à côté du fichier d'audit : <audit sans extension>.idx.sqlite
+  table entries(request_id, file, offset, length, ts_ms, event).
+- Tenu à jour par AuditSink (thread d'écriture) ; à la rotation les entrées suivent le fichier
+  archivé (.gz : l'offset est celui du flux décompressé), et sont supprimées avec l'archive.
+- Reconstruction en une passe streaming sur le fichier courant et ses archives.
+
+CLI :
+    python -m signals.logging.audit_index lookup logs/api_responses.ndjson <request_id>
+    python -m signals.logging.audit_index rebuild logs/api_responses.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Entry = Tuple[str, str, int, int, Optional[int], Optional[str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    request_id TEXT NOT NULL,
+    file       TEXT NOT NULL,
+    offset     INTEGER NOT NULL,
+    length     INTEGER NOT NULL,
+    ts_ms      INTEGER,
+    event      TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_request_id ON entries (request_id);
+CREATE INDEX IF NOT EXISTS entries_file ON entries (file);
+"""
+
+
+def index_path_for(audit_path: str) -> str:
+    return os.path.splitext(audit_path)[0] + ".idx.sqlite"
+
+
+def request_id_of(record: Dict[str, Any]) -> Optional[str]:
+    """request_id de l'événement, sinon clientOrderId du payload."""
+    rid = record.get("request_id")
+    if rid is None:
+        payload = record.get("payload")
+        if isinstance(payload, dict):
+            rid = payload.get("clientOrderId")
+    return None if rid is None else str(rid)
+
+
+def archives_of(audit_path: str) -> List[str]:
+    """Archives issues de la rotation (<fichier>.<horodatage>[.gz]), plus anciennes d'abord."""
+    return sorted(p for p in glob.glob(glob.escape(audit_path) + ".[0-9]*") if not p.endswith(".tmp"))
+
+
+def _open(path: str) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+class AuditIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_audit(cls, audit_path: str) -> "AuditIndex":
+        return cls(index_path_for(audit_path))
+
+    # ------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------
+
+    def add_many(self, entries: Sequence[Entry]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO entries (request_id, file, offset, length, ts_ms, event) VALUES (?, ?, ?, ?, ?, ?)",
+                entries,
+            )
+            self._conn.execute("COMMIT")
+
+    def rename_file(self, old: str, new: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE entries SET file = ? WHERE file = ?", (_key(new), _key(old)))
+
+    def drop_files(self, files: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE file = ?", [(_key(f),) for f in files])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------
+
+    def lookup(self, request_id: str) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file, offset, length FROM entries WHERE request_id = ? ORDER BY ts_ms, rowid",
+                (str(request_id),),
+            ).fetchall()
+        return [(f, int(o), int(n)) for f, o, n in rows]
+
+    def timeline(self, request_id: str) -> List[Dict[str, Any]]:
+        """Événements de cet ordre, relus par seek dans les fichiers (ordre chronologique)."""
+        out: List[Dict[str, Any]] = []
+        handles: Dict[str, IO[bytes]] = {}
+        try:
+            for file, offset, length in self.lookup(request_id):
+                fh = handles.get(file)
+                if fh is None:
+                    fh = handles[file] = _open(file)
+                fh.seek(offset)
+                out.append(json.loads(fh.read(length)))
+        finally:
+            for fh in handles.values():
+                fh.close()
+        return out
+
+    # ------------------------------------------------------------
+    # Reconstruction
+    # ------------------------------------------------------------
+
+    def rebuild(self, audit_path: str, *, batch: int = 10_000) -> int:
+        """Réindexe le fichier courant et ses archives (une passe streaming par fichier)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+        n = 0
+        for path in archives_of(audit_path) + ([audit_path] if os.path.exists(audit_path) else []):
+            pending: List[Entry] = []
+            for entry in scan_file(path):
+                pending.append(entry)
+                if len(pending) >= batch:
+                    self.add_many(pending)
+                    n += len(pending)
+                    pending = []
+            self.add_many(pending)
+            n += len(pending)
+        return n
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def entry_for(record: Dict[str, Any], file: str, offset: int, length: int) -> Optional[Entry]:
+    rid = request_id_of(record)
+    if rid is None:
+        return None
+    ts = record.get("ts_epoch_ms")
+    return (rid, _key(file), offset, length, ts if isinstance(ts, int) else None, record.get("event"))
+
+
+def scan_file(path: str) -> Iterator[Entry]:
+    offset = 0
+    with _open(path) as fh:
+        for line in fh:
+            length = len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                entry = entry_for(record, path, offset, length)
+                if entry is not None:
+                    yield entry
+            offset += length
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Index request_id de l'audit API")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_l = sub.add_parser("lookup", help="Chronologie complète d'un ordre")
+    p_l.add_argument("audit")
+    p_l.add_argument("request_id")
+    p_r = sub.add_parser("rebuild", help="Reconstruire l'index depuis les NDJSON existants")
+    p_r.add_argument("audit")
+    args = parser.parse_args(argv)
+
+    index = AuditIndex.for_audit(args.audit)
+    t0 = time.perf_counter()
+    try:
+        if args.cmd == "rebuild":
+            n = index.rebuild(args.audit)
+            print(f"✅ {n} événement(s) indexé(s) -> {index.db_path} ({time.perf_counter() - t0:.1f} s)")
+            return
+        events = index.timeline(args.request_id)
+        for rec in events:
+            print(json.dumps(rec, ensure_ascii=False))
+        print(f"🔎 {len(events)} événement(s) pour {args.request_id} en {(time.perf_counter() - t0) * 1000:.1f} ms")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+# signals/logging/signal_journal.py
+"""
+Journal colonne-orienté (append-only) des signaux et snapshots de perf, alternative au CSV.
+
+Format : un répertoire contenant deux sous-répertoires `signals/` et `performance/`, chacun
+composé de segments immuables `seg-<n°>_<tmin>_<tmax>.npz` (tmin/tmax = epoch ns, pour
+écarter les segments hors plage sans les ouvrir). Colonnes typées dans chaque segment :
+  time            int64 (epoch ns UTC)
+  num.<col>       float64 (prob, price, qty, vwap, ... ; None -> NaN)
+  int.<col>       int64 (n_trades)
+  cat.<col>       codes int32 (-1 = vide) + cat_levels.<col> (symbol, action, session, reason, schedule)
+  feat.<nom>      float64, une colonne par feature (dict `features` aplati)
+  json.<col>      chaîne JSON pour le reste de `extra` (vwap_config, risk)
+
+- ColumnarSignalLogger a la même interface que SignalLogger : les lignes sont bufferisées et
+  un segment est écrit (tmp + os.replace) tous les `segment_rows` lignes, après
+  `flush_interval` secondes, ou à flush()/close(). Les lignes du segment sont passées à un
+  thread d'écriture (colonnes + np.savez + fsync) : le thread de décision ne fait qu'un put.
+  flush() attend que les segments en file soient écrits ; close() vide la file et arrête le
+  thread (aussi fait à la sortie du process, atexit).
+- load_journal() relit en DataFrame (categoricals, timestamps UTC) en quelques ms par mois.
+- CLI :
+    python -m signals.logging.signal_journal query logs/journal --start 2025-07-01 --session ASIAN02 --by action
+    python -m signals.logging.signal_journal convert logs/signals_log.csv logs/performance_log.csv logs/journal
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import atexit
+import glob
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signals.utils.time_utils import datetimes_to_ns
+
+SIGNALS = "signals"
+PERFORMANCE = "performance"
+KINDS = (SIGNALS, PERFORMANCE)
+
+SIGNAL_CATEGORIES = ("symbol", "action", "reason", "session", "schedule")
+SIGNAL_NUMBERS = ("prob", "price", "qty", "vwap", "spread_to_vwap")
+PERF_NUMBERS = ("equity", "realized_pnl", "unrealized_pnl", "drawdown", "max_equity", "position_size", "last_price")
+PERF_INTS = ("n_trades",)
+
+_STOP = object()
+_FLUSH = object()
+
+
+def _float(v: Any) -> float:
+    try:
+        return float(v) if v is not None and v != "" else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _categorical(values: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    cat = pd.Categorical([None if v in (None, "") else str(v) for v in values])
+    return cat.codes.astype(np.int32), np.asarray(cat.categories, dtype=str)
+
+
+# ------------------------------------------------------------
+# Segments
+# ------------------------------------------------------------
+
+def _segment_paths(root: str, kind: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(root, kind, "seg-*.npz")))
+
+
+def _segment_bounds(path: str) -> tuple[int, int]:
+    _, tmin, tmax = os.path.splitext(os.path.basename(path))[0].split("_")
+    return int(tmin), int(tmax)
+
+
+def _write_segment(root: str, kind: str, columns: Mapping[str, np.ndarray]) -> str:
+    directory = os.path.join(root, kind)
+    os.makedirs(directory, exist_ok=True)
+    existing = _segment_paths(root, kind)
+    seq = int(os.path.basename(existing[-1])[4:10]) + 1 if existing else 1
+    t = columns["time"]
+    path = os.path.join(directory, f"seg-{seq:06d}_{int(t.min())}_{int(t.max())}.npz")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **columns)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def _signal_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    cols: Dict[str, np.ndarray] = {"time": datetimes_to_ns([r["timestamp"] for r in rows])}
+    for c in SIGNAL_NUMBERS:
+        cols[f"num.{c}"] = np.array([_float(r.get(c)) for r in rows], dtype=np.float64)
+    for c in SIGNAL_CATEGORIES:
+        cols[f"cat.{c}"], cols[f"cat_levels.{c}"] = _categorical([r.get(c) for r in rows])
+    cols["num.shadow"] = np.array([_float(r.get("shadow")) for r in rows], dtype=np.float64)
+
+    names: Dict[str, None] = {}
+    for r in rows:
+        names.update(dict.fromkeys(r["features"]))
+    for name in names:
+        cols[f"feat.{name}"] = np.array([_float(r["features"].get(name)) for r in rows], dtype=np.float64)
+    cols["json.extra"] = np.array([r["extra"] for r in rows], dtype=str)
+    return cols
+
+
+def _perf_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    cols: Dict[str, np.ndarray] = {"time": datetimes_to_ns([r["timestamp"] for r in rows])}
+    for c in PERF_NUMBERS:
+        cols[f"num.{c}"] = np.array([_float(r.get(c)) for r in rows], dtype=np.float64)
+    for c in PERF_INTS:
+        cols[f"int.{c}"] = np.array([int(_float(r.get(c)) if r.get(c) not in (None, "") else 0) for r in rows], dtype=np.int64)
+    return cols
+
+
+def _split_signal(
+    *, timestamp: str, symbol: str, action: Optional[str], prob: Any, price: Any, qty: Any,
+    reason: Optional[str], session: Optional[str], vwap: Any, spread_to_vwap: Any,
+    features: Any, extra: Optional[Mapping[str, Any]],
+) -> Dict[str, Any]:
+    """Ligne brute -> champs typés (features numériques à plat, extra résiduel en JSON)."""
+    extra = dict(extra or {})
+    feats = {str(k): v for k, v in features.items()} if isinstance(features, Mapping) else {}
+    if features is not None and not isinstance(features, Mapping):
+        extra["features"] = features
+    return {
+        "timestamp": timestamp, "symbol": symbol, "action": (action or "").upper(), "prob": prob,
+        "price": price, "qty": qty, "reason": reason, "session": session, "vwap": vwap,
+        "spread_to_vwap": spread_to_vwap, "schedule": extra.pop("schedule", None),
+        "shadow": extra.pop("shadow", None), "features": feats,
+        "extra": json.dumps(extra, ensure_ascii=False, default=str) if extra else "",
+    }
+
+
+# ------------------------------------------------------------
+# Logger (même interface que SignalLogger)
+# ------------------------------------------------------------
+
+class ColumnarSignalLogger:
+    def __init__(self, journal_dir: str, *, segment_rows: int = 1000, flush_interval: float = 60.0):
+        self.journal_dir = journal_dir
+        self.segment_rows = max(1, int(segment_rows))
+        self.flush_interval = float(flush_interval)
+        self.errors = 0
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {SIGNALS: [], PERFORMANCE: []}
+        self._last_flush = time.monotonic()
+        for kind in KINDS:
+            os.makedirs(os.path.join(journal_dir, kind), exist_ok=True)
+        # segments à écrire, dans l'ordre (non bornée : un segment n'est jamais rejeté)
+        self._q: "queue.Queue[tuple[Any, Any]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+        _live_journals.add(self)
+
+    def log_signal(self, **row: Any) -> None:
+        row.setdefault("extra", None)
+        self._append(SIGNALS, _split_signal(**row))
+
+    def log_performance_snapshot(self, **row: Any) -> None:
+        self._append(PERFORMANCE, row)
+
+    def _append(self, kind: str, row: Dict[str, Any]) -> None:
+        buf = self._buffers[kind]
+        buf.append(row)
+        if len(buf) >= self.segment_rows:
+            self._write(kind)
+        elif time.monotonic() - self._last_flush >= self.flush_interval:
+            self._write_all()
+
+    def _write(self, kind: str) -> None:
+        rows, self._buffers[kind] = self._buffers[kind], []
+        if not rows:
+            return
+        if self._closed or not self._thread.is_alive():
+            # après close() : écriture directe plutôt que de perdre les lignes
+            self._write_rows(kind, rows)
+        else:
+            self._q.put((kind, rows))
+
+    def _write_all(self) -> None:
+        for kind in KINDS:
+            self._write(kind)
+        self._last_flush = time.monotonic()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Passe les buffers au thread d'écriture et attend que tous les segments en file soient écrits."""
+        self._write_all()
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._q.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        if self._closed:
+            return
+        self._write_all()
+        self._closed = True
+        if self._thread.is_alive():
+            self._q.put((_STOP, None))
+            self._thread.join(timeout)
+        _live_journals.discard(self)
+
+    # ------------------------------------------------------------
+    # Thread d'écriture
+    # ------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            kind, payload = self._q.get()
+            if kind is _STOP:
+                return
+            if kind is _FLUSH:
+                payload.set()
+            else:
+                self._write_rows(kind, payload)
+
+    def _write_rows(self, kind: str, rows: List[Dict[str, Any]]) -> None:
+        try:
+            cols = _signal_columns(rows) if kind == SIGNALS else _perf_columns(rows)
+            _write_segment(self.journal_dir, kind, cols)
+        except Exception:
+            self.errors += len(rows)
+            logging.exception(f"[ColumnarSignalLogger] Segment {kind} non écrit ({len(rows)} ligne(s) perdue(s))")
+
+
+# Vidage des journaux encore ouverts à la sortie (arrêt sans close explicite)
+_live_journals: "weakref.WeakSet[ColumnarSignalLogger]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    for j in list(_live_journals):
+        j.close(timeout=5.0)
+
+
+# ------------------------------------------------------------
+# Lecture
+# ------------------------------------------------------------
+
+def _segment_frame(path: str) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as z:
+        data: Dict[str, Any] = {"timestamp": pd.to_datetime(z["time"], utc=True)}
+        for key in z.files:
+            prefix, _, name = key.partition(".")
+            if prefix in ("num", "int", "feat"):
+                data[name if prefix != "feat" else key] = z[key]
+            elif prefix == "cat":
+                data[name] = pd.Categorical.from_codes(z[key], categories=z[f"cat_levels.{name}"])
+            elif prefix == "json":
+                data[name] = z[key]
+    return pd.DataFrame(data)
+
+
+def load_journal(
+    journal_dir: str,
+    kind: str = SIGNALS,
+    *,
+    start: Any = None,
+    end: Any = None,
+) -> pd.DataFrame:
+    """Relit un journal (segments dans la plage [start, end] uniquement) en DataFrame trié par timestamp."""
+    lo = datetimes_to_ns([start])[0] if start is not None else None
+    hi = datetimes_to_ns([end])[0] if end is not None else None
+    frames = []
+    for path in _segment_paths(journal_dir, kind):
+        tmin, tmax = _segment_bounds(path)
+        if (lo is not None and tmax < lo) or (hi is not None and tmin > hi):
+            continue
+        frames.append(_segment_frame(path))
+    if not frames:
+        return pd.DataFrame({"timestamp": pd.Series(dtype="datetime64[ns, UTC]")})
+
+    df = pd.concat(frames, ignore_index=True)
+    for c in (SIGNAL_CATEGORIES if kind == SIGNALS else ()):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    if lo is not None:
+        df = df[df["timestamp"] >= pd.Timestamp(lo, tz="UTC")]
+    if hi is not None:
+        df = df[df["timestamp"] <= pd.Timestamp(hi, tz="UTC")]
+    return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def query_journal(
+    journal_dir: str,
+    kind: str = SIGNALS,
+    *,
+    start: Any = None,
+    end: Any = None,
+    session: Optional[Sequence[str]] = None,
+    action: Optional[Sequence[str]] = None,
+    by: Optional[Sequence[str]] = None,
+    agg: str = "count",
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Filtre (plage, sessions, actions) puis agrège éventuellement par `by` (count/mean/sum/min/max/last)."""
+    df = load_journal(journal_dir, kind, start=start, end=end)
+    if session and "session" in df.columns:
+        df = df[df["session"].isin(list(session))]
+    if action and "action" in df.columns:
+        df = df[df["action"].isin([a.upper() for a in action])]
+    if not by:
+        return df[list(columns)] if columns else df
+
+    grouped = df.groupby(list(by), observed=True)
+    if agg == "count":
+        return grouped.size().rename("count").reset_index()
+    cols = list(columns) if columns else [c for c in df.columns if c not in by and pd.api.types.is_numeric_dtype(df[c])]
+    return grouped[cols].agg(agg).reset_index()
+
+
+# ------------------------------------------------------------
+# Conversion des CSV existants
+# ------------------------------------------------------------
+
+def _literal(text: Any) -> Any:
+    if not isinstance(text, str) or not text:
+        return None
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def _csv_records(path: str) -> Iterable[Dict[str, Any]]:
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.to_dict("records")
+
+
+def convert_csv_logs(
+    signal_csv: Optional[str],
+    performance_csv: Optional[str],
+    journal_dir: str,
+    *,
+    segment_rows: int = 50_000,
+) -> ColumnarSignalLogger:
+    """Convertit les CSV de SignalLogger (features/extra en repr de dict) en journal colonne."""
+    journal = ColumnarSignalLogger(journal_dir, segment_rows=segment_rows, flush_interval=math.inf)
+    if signal_csv:
+        for r in _csv_records(signal_csv):
+            journal.log_signal(
+                timestamp=r["timestamp"], symbol=r.get("symbol"), action=r.get("action"),
+                prob=r.get("prob"), price=r.get("price"), qty=r.get("qty"), reason=r.get("reason"),
+                session=r.get("session"), vwap=r.get("vwap"), spread_to_vwap=r.get("spread_to_vwap"),
+                features=_literal(r.get("features")), extra=_literal(r.get("extra")),
+            )
+    if performance_csv:
+        for r in _csv_records(performance_csv):
+            journal.log_performance_snapshot(**r)
+    journal.close()
+    return journal
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Journal colonne des signaux / perfs")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_q = sub.add_parser("query", help="Filtrer / agréger un journal")
+    p_q.add_argument("journal")
+    p_q.add_argument("--kind", choices=KINDS, default=SIGNALS)
+    p_q.add_argument("--start")
+    p_q.add_argument("--end")
+    p_q.add_argument("--session", action="append")
+    p_q.add_argument("--action", action="append")
+    p_q.add_argument("--by", help="colonnes de regroupement, séparées par des virgules")
+    p_q.add_argument("--agg", default="count", choices=("count", "mean", "sum", "min", "max", "last"))
+    p_q.add_argument("--columns", help="colonnes à afficher / agréger, séparées par des virgules")
+    p_q.add_argument("--limit", type=int, default=50)
+
+    p_c = sub.add_parser("convert", help="Convertir les CSV SignalLogger en journal")
+    p_c.add_argument("signal_csv")
+    p_c.add_argument("performance_csv", nargs="?", default=None)
+    p_c.add_argument("journal")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "convert":
+        convert_csv_logs(args.signal_csv, args.performance_csv, args.journal)
+        n = len(load_journal(args.journal, SIGNALS))
+        print(f"✅ {n} signaux -> {args.journal}")
+        return
+
+    split = lambda s: [x.strip() for x in s.split(",") if x.strip()] if s else None
+    t0 = time.perf_counter()
+    out = query_journal(
+        args.journal, args.kind, start=args.start, end=args.end, session=args.session,
+        action=args.action, by=split(args.by), agg=args.agg, columns=split(args.columns),
+    )
+    elapsed = time.perf_counter() - t0
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(out.head(args.limit).to_string(index=False) if len(out) else "(aucune ligne)")
+    print(f"📊 {len(out)} ligne(s) en {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
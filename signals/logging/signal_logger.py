@@ -2,13 +2,22 @@
 
 import csv
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from signals.logging.async_writer import AsyncCSVWriter
 
 
 class SignalLogger:
-    def __init__(self, signal_csv_path: str, performance_csv_path: str):
+    """
+    Logs CSV des signaux et snapshots de perf.
+    Avec `writer` (AsyncCSVWriter), les lignes sont mises en file et écrites en tâche de fond ;
+    sinon écriture directe (ouverture/ajout/fermeture à chaque appel).
+    """
+
+    def __init__(self, signal_csv_path: str, performance_csv_path: str, writer: Optional[AsyncCSVWriter] = None):
         self.signal_csv_path = signal_csv_path
         self.performance_csv_path = performance_csv_path
+        self.writer = writer
         os.makedirs(os.path.dirname(signal_csv_path) or ".", exist_ok=True)
         os.makedirs(os.path.dirname(performance_csv_path) or ".", exist_ok=True)
         self._ensure_signal_header()
@@ -61,8 +70,7 @@ class SignalLogger:
             (features if features is not None else ""),
             (extra if extra is not None else ""),
         ]
-        with open(self.signal_csv_path, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(row)
+        self._append(self.signal_csv_path, row)
 
     def log_performance_snapshot(
         self,
@@ -88,5 +96,20 @@ class SignalLogger:
             f"{position_size:.6f}",
             (None if last_price is None else f"{last_price:.6f}"),
         ]
-        with open(self.performance_csv_path, "a", newline="", encoding="utf-8") as f:
+        self._append(self.performance_csv_path, row)
+
+    def _append(self, path: str, row: List[Any]) -> None:
+        if self.writer is not None:
+            self.writer.write(path, row)
+            return
+        with open(path, "a", newline="", encoding="utf-8") as f:
             csv.writer(f).writerow(row)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        if self.writer is not None:
+            self.writer.flush(timeout)
+
+    def close(self) -> None:
+        """Vide la file d'écriture et ferme les fichiers (writer partagé : close idempotent)."""
+        if self.writer is not None:
+            self.writer.close()
@@ -4,10 +4,12 @@ from __future__ import annotations
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
-import signals.utils.config_reader as cfg_reader
-import signals.optimizer.optimizer_rules as rules
+# cfg_reader / rules : sources lues par config_snapshot (patchables en test via ce module)
+import signals.utils.config_reader as cfg_reader  # noqa: F401
+import signals.optimizer.optimizer_rules as rules  # noqa: F401
+import signals.loaders.config_snapshot as config_snapshot
 from signals.logic.optimizer_parity import get_active_schedule, decide_entry_from_features
-from signals.logic.risk_constraints import get_dd_limit_from_optimizer, allow_new_entry
+from signals.logic.risk_constraints import allow_new_entry
 
 
 def process_signal(
@@ -34,10 +36,9 @@ def process_signal(
     Returns:
         dict signal {action, prob, features{normalized_dist_to_vwap}, session} ou None si pas d'entrée.
     """
-    app_cfg = cfg_reader.load_config()
-    opt_path = (app_cfg.get("config_horaire", {}) or {}).get("path")
-    optimizer_root = rules.load_optimizer_config(opt_path)
-    by_schedule = optimizer_root["CONFIGURATIONS_BY_SCHEDULE"]
+    # snapshot compilé (aucun parsing YAML/JSON tant que les fichiers ne changent pas)
+    snap = config_snapshot.get_snapshot()
+    by_schedule = snap.by_schedule
 
     # heure courante UTC (ou injectée)
     now = now or datetime.now(timezone.utc)
@@ -51,7 +52,7 @@ def process_signal(
 
     # contrainte DD (si tracker fourni)
     if tracker is not None:
-        dd_limit = get_dd_limit_from_optimizer(cfg_now=cfg_now, optimizer_root=optimizer_root, app_cfg=app_cfg)
+        dd_limit = snap.dd_limits.get(session_label)
         if not allow_new_entry(tracker=tracker, dd_limit_usd=dd_limit):
             # On bloque l'entrée (parité avec le guardrail optimiseur)
             return None
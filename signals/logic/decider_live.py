@@ -6,10 +6,17 @@ from datetime import datetime, timezone
 
 import pandas as pd
 
-import signals.utils.config_reader as cfg_reader
-import signals.optimizer.optimizer_rules as rules
-
-from signals.features.feature_schema import select_required_features
+# cfg_reader / rules : sources lues par config_snapshot (patchables en test via ce module)
+import signals.utils.config_reader as cfg_reader  # noqa: F401
+import signals.optimizer.optimizer_rules as rules  # noqa: F401
+import signals.loaders.config_snapshot as config_snapshot
+
+from signals.features.feature_schema import (
+    FALLBACK_FILL_VALUE,
+    build_feature_frame,
+    select_required_features,
+    validate_feature_values,
+)
 from signals.features.feature_adapter import get_feature_vector_for_prediction
 from signals.logic.optimizer_parity import (
     get_active_schedule,
@@ -17,6 +24,8 @@ from signals.logic.optimizer_parity import (
     enrich_signal_with_session_and_qty,
 )
 from signals.logic.predictor import predict_proba
+from signals.logic.risk_constraints import allow_new_entry
+from signals.monitoring.tracing import span
 
 
 def process_signal_from_enriched(
@@ -45,10 +54,10 @@ def process_signal_from_enriched(
     if enriched_df is None or enriched_df.empty:
         return None
 
-    app_cfg = cfg_reader.load_config()
-    opt_path = (app_cfg.get("config_horaire", {}) or {}).get("path")
-    optimizer_root = rules.load_optimizer_config(opt_path)
-    by_schedule = optimizer_root["CONFIGURATIONS_BY_SCHEDULE"]
+    # snapshot compilé (aucun parsing YAML/JSON tant que les fichiers ne changent pas)
+    snap = config_snapshot.get_snapshot()
+    app_cfg = snap.app
+    by_schedule = snap.by_schedule
 
     now = now or datetime.now(timezone.utc)
     hour = now.hour
@@ -63,9 +72,10 @@ def process_signal_from_enriched(
     feats = select_required_features(app_cfg, cfg_now)
 
     # 2) Construire X (1 ligne, ordre strict, valeurs numériques, fallback=0.0)
-    X, feats_used, errs = get_feature_vector_for_prediction(
-        enriched_df=enriched_df, cfg=app_cfg, cfg_now=cfg_now, row_index=row_index
-    )
+    with span("features"):
+        X, feats_used, errs = get_feature_vector_for_prediction(
+            enriched_df=enriched_df, cfg=app_cfg, cfg_now=cfg_now, row_index=row_index
+        )
     if errs:
         # si les features sont invalides, on refuse le signal
         return None
@@ -74,11 +84,68 @@ def process_signal_from_enriched(
     if model is None:
         # L'appelant devrait injecter le modèle ; ici on ne force pas le chargement
         return None
-    prob = predict_proba(model, X)
+    with span("predict"):
+        prob = predict_proba(model, X)
 
     # 4) Construire la vue 'features' pour decide_entry (doit contenir normalized_dist_to_vwap)
     idx = row_index if row_index is not None else (len(enriched_df) - 1)
-    row = enriched_df.iloc[idx]
+    return _decide(enriched_df.iloc[idx], prob, session_label, cfg_now)
+
+
+def process_candle_incremental(
+    *,
+    engine: Any,
+    candle: Dict[str, Any],
+    now: Optional[datetime] = None,
+    tracker: Optional[Any] = None,
+    model: Optional[Any] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Version 'live' incrémentale : la bougie est ajoutée au moteur (IncrementalFeatureEngine,
+    O(1) par bougie, cf. real_time_features.build_feature_engine) puis même décision que
+    process_signal_from_enriched, sans recalcul des features sur l'historique.
+
+    Le moteur doit recevoir toutes les bougies dans l'ordre : update() est appelé même hors schedule.
+    X est lu dans le dernier slot de engine.buffer (CandleRingBuffer) quand le moteur en a un.
+    Si tracker est fourni, même contrainte DD que decider.process_signal (snap.dd_limits par session).
+    Renvoie le signal (avec 'vwap' de la bougie) ou None.
+    """
+    with span("features"):
+        row = engine.update(candle)
+
+    snap = config_snapshot.get_snapshot()
+    app_cfg = snap.app
+    now = now or datetime.now(timezone.utc)
+    active = get_active_schedule(hour_utc=now.hour, optimizer_cfg_by_schedule=snap.by_schedule)
+    if not active or model is None:
+        return None
+    session_label, cfg_now = active
+
+    # contrainte DD (si tracker fourni) : parité avec decider.process_signal, avant toute prédiction
+    if tracker is not None:
+        dd_limit = snap.dd_limits.get(session_label)
+        if not allow_new_entry(tracker=tracker, dd_limit_usd=dd_limit):
+            return None
+
+    feats = select_required_features(app_cfg, cfg_now)
+    if engine.buffer is not None:
+        # dernier slot du ring buffer : vecteur dans l'ordre du modèle, sans DataFrame d'historique
+        values = engine.buffer.last_row_values(feats, fill_missing=True)
+        X = pd.DataFrame(values, columns=list(feats)).fillna(FALLBACK_FILL_VALUE)
+    else:
+        X = build_feature_frame(pd.DataFrame([row]), feats)
+    if validate_feature_values(X.iloc[0], feats):
+        return None
+    with span("predict"):
+        prob = predict_proba(model, X)
+
+    sig = _decide(pd.Series(row), prob, session_label, cfg_now)
+    if sig:
+        sig["vwap"] = row.get("vwap")
+    return sig
+
+
+def _decide(row: pd.Series, prob: float, session_label: str, cfg_now: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     features_view = {}
     if "normalized_dist_to_vwap" in row.index:
         try:
@@ -94,5 +161,4 @@ def process_signal_from_enriched(
         return None
 
     # 5) Ajoute session + qty depuis FIXED_LOTS
-    sig = enrich_signal_with_session_and_qty(sig, session_label=session_label, cfg_now=cfg_now)
-    return sig
+    return enrich_signal_with_session_and_qty(sig, session_label=session_label, cfg_now=cfg_now)
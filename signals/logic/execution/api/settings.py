@@ -15,5 +15,22 @@ def load_api_settings() -> Dict[str, Any]:
         "backoff_initial_ms": int(api.get("backoff_initial_ms", 200)),
         "backoff_max_ms": int(api.get("backoff_max_ms", 2000)),
         "retryable_statuses": list(api.get("retryable_statuses", [429, 500, 502, 503, 504])),
+        "max_in_flight": int(api.get("max_in_flight", 8)),
         "audit_log_file": api.get("audit_log_file", "logs/api_responses.ndjson"),
+        "audit_async": bool(api.get("audit_async", True)),
+        "audit_max_bytes": int(float(api.get("audit_max_mb", 50)) * 1024 * 1024),
+        "audit_backups": int(api.get("audit_backups", 10)),
+        "audit_compress": bool(api.get("audit_compress", True)),
+        "audit_index": bool(api.get("audit_index", True)),
+    }
+
+
+def audit_options(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Options du sink d'audit (défauts si absentes des settings)."""
+    return {
+        "asynchronous": bool(settings.get("audit_async", True)),
+        "max_bytes": int(settings.get("audit_max_bytes", 50 * 1024 * 1024)),
+        "backups": int(settings.get("audit_backups", 10)),
+        "compress": bool(settings.get("audit_compress", True)),
+        "index": bool(settings.get("audit_index", True)),
     }
@@ -0,0 +1,232 @@
+# signals/logic/execution/api/throttle.py
+"""
+Limiteur de débit (token bucket) et disjoncteur partagés par famille d'endpoints.
+
+- Familles : orders (place/modify/cancel), positions, contracts, default ; le débit
+  de chaque famille se règle dans config.yaml (api.rate_limits.<famille>.rate / burst).
+- CircuitBreaker : s'ouvre après `failure_threshold` échecs consécutifs (429, 5xx, erreurs
+  réseau) ou sur un Retry-After du broker ; refuse les appels jusqu'à l'échéance, puis laisse
+  passer un appel d'essai (half-open) qui referme ou rouvre le circuit.
+- Gauges Prometheus : <ns>_circuit_state{family} (0 fermé, 1 essai, 2 ouvert),
+  <ns>_rate_limit_tokens{family} ; compteur <ns>_api_throttled_total{family, reason}.
+Tous les appelants d'une même famille partagent le même état : sous throttling broker, le
+débit se réduit pour tout le monde au lieu que chaque appelant réessaie en cadence.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from signals.monitoring import metrics
+
+CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+ENDPOINT_FAMILIES: Dict[str, str] = {
+    "placeOrder": "orders",
+    "modifyOrder": "orders",
+    "cancelOrder": "orders",
+    "searchOpenOrders": "orders",
+    "searchTrades": "orders",
+    "searchOpenPositions": "positions",
+    "closePosition": "positions",
+    "searchContracts": "contracts",
+    "searchContractById": "contracts",
+    "listAvailableContracts": "contracts",
+}
+
+DEFAULT_LIMITS: Dict[str, Dict[str, float]] = {
+    "orders": {"rate": 5.0, "burst": 10},
+    "positions": {"rate": 2.0, "burst": 5},
+    "contracts": {"rate": 2.0, "burst": 5},
+    "default": {"rate": 5.0, "burst": 10},
+}
+
+
+def family_of(endpoint: str) -> str:
+    return ENDPOINT_FAMILIES.get(endpoint, "default")
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """En-tête Retry-After (secondes ou date HTTP) -> secondes, None si absent/illisible."""
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, *, clock: Callable[[], float] = time.monotonic):
+        self.rate = max(1e-9, float(rate))
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._tokens = self.burst
+        self._t = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Réserve un jeton ; renvoie l'attente (s) avant de pouvoir l'utiliser (0 si disponible)."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._t) * self.rate)
+            self._t = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return min(self.burst, self._tokens + (self._clock() - self._t) * self.rate)
+
+
+class CircuitBreaker:
+    def __init__(self, *, failure_threshold: int = 5, reset_seconds: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = float(reset_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    def check(self) -> float:
+        """0 si l'appel peut partir, sinon secondes avant réouverture (un seul appel d'essai)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            now = self._clock()
+            if now < self._open_until:
+                return self._open_until - now
+            if self._probe_in_flight:
+                return max(0.05, self.reset_seconds / 10)
+            self.state = HALF_OPEN
+            self._probe_in_flight = True
+            return 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if retry_after is not None or self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                pause = retry_after if retry_after is not None else self.reset_seconds
+                self._open_until = max(self._open_until, self._clock() + pause)
+
+
+class EndpointGuard:
+    """Limiteur + disjoncteur d'une famille, avec export des gauges."""
+
+    def __init__(self, family: str, bucket: TokenBucket, breaker: CircuitBreaker):
+        self.family = family
+        self.bucket = bucket
+        self.breaker = breaker
+
+    def before_call(self) -> tuple[float, Optional[str]]:
+        """(attente, raison) : raison "circuit" = appel refusé, "rate" = attendre puis envoyer."""
+        wait = self.breaker.check()
+        if wait > 0:
+            metrics.inc_throttled(self.family, "circuit")
+            self._export()
+            return wait, "circuit"
+        wait = self.bucket.reserve()
+        if wait > 0:
+            metrics.inc_throttled(self.family, "rate")
+        self._export()
+        return wait, ("rate" if wait > 0 else None)
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> Optional[float]:
+        """Version bloquante : attend le jeton ; renvoie le délai restant si le circuit est ouvert."""
+        wait, reason = self.before_call()
+        if reason == "circuit":
+            return wait
+        if wait > 0:
+            sleep(wait)
+        return None
+
+    def record(self, *, ok: bool, retry_after: Optional[float] = None) -> None:
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure(retry_after)
+        self._export()
+
+    def _export(self) -> None:
+        metrics.set_circuit_state(self.family, self.breaker.state)
+        metrics.set_rate_tokens(self.family, self.bucket.tokens)
+
+
+# ------------------------------------------------------------
+# Registre partagé
+# ------------------------------------------------------------
+
+class ThrottleRegistry:
+    """Un EndpointGuard par famille, créé à la demande depuis la section `api` de config.yaml."""
+
+    def __init__(self, api_cfg: Optional[Dict[str, Any]] = None, *, clock: Callable[[], float] = time.monotonic):
+        self.config = dict(api_cfg or {})
+        self._clock = clock
+        self._guards: Dict[str, EndpointGuard] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "ThrottleRegistry":
+        if cfg is None:
+            from signals.utils import config_reader
+            cfg = config_reader.load_config()
+        return cls((cfg or {}).get("api") or {})
+
+    def guard_for(self, endpoint: str) -> EndpointGuard:
+        family = family_of(endpoint)
+        guard = self._guards.get(family)
+        if guard is not None:
+            return guard
+        with self._lock:
+            guard = self._guards.get(family)
+            if guard is None:
+                limits = {**DEFAULT_LIMITS.get(family, DEFAULT_LIMITS["default"]),
+                          **((self.config.get("rate_limits") or {}).get(family) or {})}
+                cb = self.config.get("circuit_breaker") or {}
+                guard = self._guards[family] = EndpointGuard(
+                    family,
+                    TokenBucket(limits["rate"], limits["burst"], clock=self._clock),
+                    CircuitBreaker(failure_threshold=int(cb.get("failure_threshold", 5)),
+                                   reset_seconds=float(cb.get("reset_seconds", 10.0)), clock=self._clock),
+                )
+        return guard
+
+
+_registry: Optional[ThrottleRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ThrottleRegistry:
+    """Registre partagé par tous les appels API du process (config.yaml, défauts sinon)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                try:
+                    _registry = ThrottleRegistry.from_config()
+                except Exception:
+                    _registry = ThrottleRegistry()
+    return _registry
+
+
+def guard_for(endpoint: str) -> EndpointGuard:
+    return get_registry().guard_for(endpoint)
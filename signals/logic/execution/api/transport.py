@@ -1,6 +1,7 @@
 # signals/logic/execution/api/transport.py
 
 import inspect
+import random
 import time
 import uuid
 from typing import Any, Dict, Optional, Tuple
@@ -82,6 +83,30 @@ def should_retry(status_code: Optional[int], error: Optional[str], retryable_sta
     return False
 
 
-def sleep_backoff(attempt: int, initial_ms: int, max_ms: int) -> None:
-    delay_ms = min(max_ms, initial_ms * (2 ** (attempt - 1)))
-    time.sleep(delay_ms / 1000.0)
+_rng = random.Random()
+
+
+def retry_after_of(resp: Any) -> Optional[float]:
+    """Délai Retry-After (s) remonté par APIClient.post dans la réponse d'erreur, None sinon."""
+    if isinstance(resp, dict) and isinstance(resp.get("retryAfter"), (int, float)):
+        return max(0.0, float(resp["retryAfter"]))
+    return None
+
+
+def is_circuit_open(resp: Any) -> bool:
+    """Appel refusé localement par le disjoncteur : inutile de réessayer dans la foulée."""
+    return isinstance(resp, dict) and resp.get("circuitOpen") is True
+
+
+def backoff_delay(attempt: int, initial_ms: int, max_ms: int, retry_after: Optional[float] = None) -> float:
+    """
+    Jitter complet : uniforme dans [0, min(max, initial * 2^(n-1))] (les clients qui ont échoué
+    ensemble ne réessaient pas ensemble) ; jamais moins que le Retry-After du broker.
+    """
+    cap_ms = min(max_ms, initial_ms * (2 ** max(0, attempt - 1)))
+    delay = _rng.uniform(0.0, cap_ms / 1000.0)
+    return max(delay, retry_after) if retry_after is not None else delay
+
+
+def sleep_backoff(attempt: int, initial_ms: int, max_ms: int, retry_after: Optional[float] = None) -> None:
+    time.sleep(backoff_delay(attempt, initial_ms, max_ms, retry_after))
@@ -74,7 +74,8 @@ def place_order(payload: Dict[str, Any]) -> Dict[str, Any]:
     load_cfg = _resolve_load_api_settings() or _settings.load_api_settings
     cfg = load_cfg()
 
-    audit = APIAuditLogger(cfg["audit_log_file"])
+    # Sink partagé (handle persistant, écriture en tâche de fond) : pas de latence avant l'envoi
+    audit = APIAuditLogger(cfg["audit_log_file"], **_settings.audit_options(cfg))
 
     importer = _resolve_import_api_client() or _import_util.import_api_client
     APIClient = importer()
@@ -93,6 +94,7 @@ def place_order(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     for attempt in range(1, cfg["max_retries"] + 2):
         attempts = attempt
+        retry_after: Optional[float] = None
 
         audit.log({
             "event": "request",
@@ -116,6 +118,13 @@ def place_order(payload: Dict[str, Any]) -> Dict[str, Any]:
             last_status_code = _extract_status_code(resp)
             audit.log({"event": "response", "endpoint": "placeOrder", "attempt": attempt, "response": resp, "request_id": req_id})
             observe_api_latency("placeOrder", str(last_status_code or "ok"), elapsed)
+            retry_after = _transport.retry_after_of(resp)
+
+            # ⛔ Disjoncteur ouvert : refus local, on ne martèle pas le broker
+            if _transport.is_circuit_open(resp):
+                inc_order("error")
+                return {"status": "error", "error": resp.get("error") or "circuit ouvert", "attempts": attempts,
+                        "request_id": req_id, "last_status": last_status_code, "retry_after": retry_after}
 
             # ✅ Succès implicite sans code (tests FakeClient)
             if _is_success_without_code(resp):
@@ -139,9 +148,9 @@ def place_order(payload: Dict[str, Any]) -> Dict[str, Any]:
                     "last_status": last_status_code,
                 }
 
-        # Retry si possible
-        if attempt < cfg["max_retries"] + 1:
-            _transport.sleep_backoff(attempt, cfg["backoff_initial_ms"], cfg["backoff_max_ms"])
+        # Retry si possible (Retry-After plus long que le backoff max : on rend la main)
+        if attempt < cfg["max_retries"] + 1 and (retry_after is None or retry_after * 1000 <= cfg["backoff_max_ms"]):
+            _transport.sleep_backoff(attempt, cfg["backoff_initial_ms"], cfg["backoff_max_ms"], retry_after)
         else:
             inc_order("error")
             return {
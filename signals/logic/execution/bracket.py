@@ -0,0 +1,117 @@
+# signals/logic/execution/bracket.py
+"""
+Ordre bracket (entrée + stop loss + take profit) via la passerelle asyncio.
+
+- Entrée d'abord ; dès que son orderId est connu, SL et TP partent en parallèle
+  (exposition sans protection ~2 allers-retours au lieu de 3).
+- Si une jambe échoue : annulation des jambes déjà acceptées (et de l'entrée, ou ordre
+  au marché de sens opposé pour la taille de l'entrée si elle était au marché : une
+  position déjà détenue sur le contrat n'est pas touchée).
+- Latence par jambe et durée d'exposition non protégée dans le résultat.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from .gateway import OrderGateway
+
+ORDER_TYPE_LIMIT = 1
+ORDER_TYPE_MARKET = 2
+ORDER_TYPE_STOP = 4
+
+
+def build_bracket_payloads(
+    *,
+    account_id: Any,
+    contract_id: str,
+    side: int,
+    size: int,
+    entry_type: int,
+    stop_price: float,
+    take_profit_price: float,
+    entry_price: Optional[float] = None,
+    tag: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Payloads TopstepX (side 0=Buy, 1=Sell) ; SL/TP du côté opposé à l'entrée."""
+    tag = tag or str(uuid.uuid4())
+    common = {"accountId": account_id, "contractId": contract_id, "size": size}
+    exit_side = 1 - int(side)
+    entry = {**common, "side": int(side), "type": entry_type, "customTag": f"{tag}-entry"}
+    if entry_type == ORDER_TYPE_LIMIT and entry_price is not None:
+        entry["limitPrice"] = entry_price
+    stop = {**common, "side": exit_side, "type": ORDER_TYPE_STOP, "stopPrice": stop_price, "customTag": f"{tag}-sl"}
+    take_profit = {**common, "side": exit_side, "type": ORDER_TYPE_LIMIT, "limitPrice": take_profit_price,
+                   "customTag": f"{tag}-tp"}
+    return entry, stop, take_profit
+
+
+def _order_id(res: Dict[str, Any]) -> Optional[Any]:
+    resp = res.get("response") if res.get("status") == "ok" else None
+    if not isinstance(resp, dict) or resp.get("success") is False:
+        return None
+    return resp.get("orderId")
+
+
+async def _leg(gateway: OrderGateway, payload: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    res = await gateway.place_order(payload)
+    return {**res, "order_id": _order_id(res), "latency_ms": (time.perf_counter() - t0) * 1000}
+
+
+async def place_bracket(
+    gateway: OrderGateway,
+    entry: Dict[str, Any],
+    stop: Dict[str, Any],
+    take_profit: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Renvoie {"status": "ok" | "error" | "rolled_back", "entry", "stop", "take_profit",
+    "rollback": [...], "naked_ms"} ; chaque jambe porte order_id et latency_ms.
+    """
+    t0 = time.perf_counter()
+    entry_res = await _leg(gateway, entry)
+    entry_id = entry_res["order_id"]
+    if entry_id is None:
+        return {"status": "error", "error": entry_res.get("error") or "entrée refusée",
+                "entry": entry_res, "stop": None, "take_profit": None, "rollback": [], "naked_ms": 0.0}
+
+    t_entry = time.perf_counter()
+    linked = {"linkedOrderId": entry_id}
+    stop_res, tp_res = await asyncio.gather(_leg(gateway, {**stop, **linked}), _leg(gateway, {**take_profit, **linked}))
+    naked_ms = (time.perf_counter() - t_entry) * 1000
+    result = {"entry": entry_res, "stop": stop_res, "take_profit": tp_res, "rollback": [], "naked_ms": naked_ms,
+              "total_ms": (time.perf_counter() - t0) * 1000}
+    if stop_res["order_id"] is not None and tp_res["order_id"] is not None:
+        return {**result, "status": "ok"}
+
+    # Rollback : jambes acceptées + entrée (ou contre-ordre si entrée au marché, déjà exécutée)
+    account = {"accountId": entry.get("accountId")}
+    undo: List[Tuple[str, Dict[str, Any]]] = [
+        ("cancelOrder", {**account, "orderId": leg["order_id"]})
+        for leg in (stop_res, tp_res) if leg["order_id"] is not None
+    ]
+    if entry.get("type") == ORDER_TYPE_MARKET:
+        tag = str(entry.get("customTag") or uuid.uuid4()).removesuffix("-entry")
+        undo.append(("placeOrder", {**account, "contractId": entry.get("contractId"), "side": 1 - int(entry["side"]),
+                                    "size": entry.get("size"), "type": ORDER_TYPE_MARKET, "customTag": f"{tag}-unwind"}))
+    else:
+        undo.append(("cancelOrder", {**account, "orderId": entry_id}))
+    rollback = await asyncio.gather(*(gateway.request(endpoint, payload) for endpoint, payload in undo))
+    failed = [leg for leg in (stop_res, tp_res) if leg["order_id"] is None]
+    return {**result, "status": "rolled_back", "rollback": list(rollback),
+            "error": failed[0].get("error") or (failed[0].get("response") or {}).get("errorMessage") or "jambe refusée"}
+
+
+def submit_bracket(
+    gateway: OrderGateway,
+    entry: Dict[str, Any],
+    stop: Dict[str, Any],
+    take_profit: Dict[str, Any],
+) -> "concurrent.futures.Future[Dict[str, Any]]":
+    """Version non bloquante pour la boucle live (gateway démarrée)."""
+    return gateway.run_threadsafe(place_bracket(gateway, entry, stop, take_profit))
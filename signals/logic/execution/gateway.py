@@ -0,0 +1,319 @@
+# signals/logic/execution/gateway.py
+"""
+Passerelle d'ordres asyncio : placeOrder / modifyOrder / cancelOrder / closePosition
+avec plusieurs requêtes en vol, timeout par requête et backoff non bloquant.
+
+- La boucle asyncio tourne dans un thread dédié (start/stop) : la boucle live (synchrone)
+  soumet via submit() et récupère un concurrent.futures.Future sans attendre l'aller-retour.
+- Les appels HTTP passent par le client partagé (session keep-alive, cf. signals.api.client),
+  exécutés dans un pool de `max_in_flight` threads ; le timeout par requête est celui de
+  client.post(timeout=...), qui interrompt réellement l'appel (asyncio.wait_for n'est qu'un
+  filet de sécurité : il ne stoppe pas le thread) ; asyncio.sleep remplace time.sleep pour le
+  backoff (jitter, Retry-After respecté) ; un refus du disjoncteur termine la requête sans retry.
+- placeOrder après un timeout : l'ordre a pu être reçu par le broker. Pas de nouvel envoi tant
+  que searchOpenOrders (par clientOrderId/customTag) n'a pas montré qu'il est absent ; trouvé,
+  il est rendu comme succès ; recherche impossible, la requête s'arrête en erreur.
+- Même politique de retry et même forme de résultat que api_client.place_order
+  ({"status", "response", "attempts", "request_id", "last_status"}), audit NDJSON non bloquant.
+- InFlightOrders : suivi côté boucle live des ordres soumis ; collect() applique les fills
+  au tracker depuis le thread de la boucle (pas d'accès concurrent au tracker), ou transmet
+  les réponses au cycle de vie des ordres (lifecycle.OrderLifecycle) quand il est actif.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from requests.exceptions import Timeout as HTTPTimeout
+
+from signals.logging.api_audit import APIAuditLogger
+from signals.monitoring.metrics import inc_order, observe_api_latency
+
+from . import api_client as api
+from .api import settings as _settings
+from .api import transport as _transport
+
+ORDER_ENDPOINTS = ("placeOrder", "modifyOrder", "cancelOrder", "closePosition")
+TIMEOUT_GRACE_SECONDS = 1.0     # marge du filet asyncio au-delà du timeout HTTP (connexion + lecture)
+
+
+class OrderGateway:
+    def __init__(
+        self,
+        client: Any,
+        *,
+        max_in_flight: int = 8,
+        timeout_seconds: float = 5.0,
+        max_retries: int = 3,
+        backoff_initial_ms: int = 200,
+        backoff_max_ms: int = 2000,
+        retryable_statuses: Optional[List[int]] = None,
+        audit_log_file: Optional[str] = None,
+    ):
+        self.client = client
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.timeout_seconds = float(timeout_seconds)
+        self.max_retries = int(max_retries)
+        self.backoff_initial_ms = int(backoff_initial_ms)
+        self.backoff_max_ms = int(backoff_max_ms)
+        self.retryable_statuses = list(retryable_statuses or [429, 500, 502, 503, 504])
+        self.audit = APIAuditLogger(audit_log_file) if audit_log_file else None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_settings(cls, client: Any = None, settings: Optional[Dict[str, Any]] = None) -> "OrderGateway":
+        """Paramètres de la section `api` (timeouts, retries, audit) ; client réel par défaut."""
+        cfg = settings or _settings.load_api_settings()
+        if client is None:
+            APIClient = api.import_api_client()
+            if APIClient is None:
+                raise RuntimeError("APIClient indisponible (import échoué)")
+            client = APIClient()
+        return cls(
+            client,
+            max_in_flight=int(cfg.get("max_in_flight", 8)),
+            timeout_seconds=cfg["timeout_seconds"],
+            max_retries=cfg["max_retries"],
+            backoff_initial_ms=cfg["backoff_initial_ms"],
+            backoff_max_ms=cfg["backoff_max_ms"],
+            retryable_statuses=cfg["retryable_statuses"],
+            audit_log_file=cfg.get("audit_log_file"),
+        )
+
+    # ------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------
+
+    def start(self) -> "OrderGateway":
+        if self._thread is not None:
+            return self
+        self._pool = concurrent.futures.ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="order-http")
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._sem = asyncio.Semaphore(self.max_in_flight)
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="order-gateway", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._thread = self._loop = self._pool = self._sem = None
+
+    def __enter__(self) -> "OrderGateway":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------
+    # API synchrone (boucle live)
+    # ------------------------------------------------------------
+
+    def submit(self, endpoint: str, payload: Dict[str, Any]) -> "concurrent.futures.Future[Dict[str, Any]]":
+        return self.run_threadsafe(self.request(endpoint, payload))
+
+    def run_threadsafe(self, coro: Any) -> "concurrent.futures.Future[Any]":
+        """Planifie une coroutine (ex: bracket.place_bracket) sur la boucle de la passerelle."""
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError("OrderGateway non démarrée (start())")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # ------------------------------------------------------------
+    # API asyncio
+    # ------------------------------------------------------------
+
+    async def place_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.request("placeOrder", payload)
+
+    async def modify_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.request("modifyOrder", payload)
+
+    async def cancel_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.request("cancelOrder", payload)
+
+    async def close_position(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.request("closePosition", payload)
+
+    def _audit(self, record: Dict[str, Any]) -> None:
+        if self.audit is not None:
+            self.audit.log(record)
+
+    async def _call(self, endpoint: str, payload: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        fn: Callable[[], Any] = lambda: self.client.post(endpoint, payload, debug=False, timeout=self.timeout_seconds)
+        return await asyncio.wait_for(loop.run_in_executor(self._pool, fn),
+                                      self.timeout_seconds + TIMEOUT_GRACE_SECONDS)
+
+    async def _find_open_order(self, payload: Dict[str, Any], req_id: str) -> Any:
+        """
+        Ordre ouvert portant ce clientOrderId/customTag (dict) ; False s'il n'y est pas ;
+        None si la recherche elle-même échoue (état inconnu).
+        """
+        try:
+            resp = await self._call("searchOpenOrders", {"accountId": payload.get("accountId")})
+        except Exception as e:
+            self._audit({"event": "lookup_error", "endpoint": "searchOpenOrders", "error": str(e), "request_id": req_id})
+            return None
+        if not isinstance(resp, dict) or resp.get("success") is not True:
+            self._audit({"event": "lookup_error", "endpoint": "searchOpenOrders", "response": resp, "request_id": req_id})
+            return None
+        tags = {req_id, payload.get("customTag")} - {None}
+        for order in resp.get("orders") or []:
+            if order.get("clientOrderId") in tags or order.get("customTag") in tags:
+                return order
+        return False
+
+    async def request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload = dict(payload)
+        req_id = payload.get("clientOrderId") or _transport.gen_client_order_id()
+        if endpoint == "placeOrder":
+            payload.setdefault("clientOrderId", req_id)
+
+        last_status: Optional[int] = None
+        error: Optional[str] = None
+        attempts = 0
+        sem = self._sem or asyncio.Semaphore(self.max_in_flight)
+        async with sem:
+            for attempt in range(1, self.max_retries + 2):
+                attempts = attempt
+                retry_after: Optional[float] = None
+                self._audit({
+                    "event": "request", "endpoint": endpoint, "attempt": attempt, "request_id": req_id,
+                    "payload": {k: (v if k != "accountId" else "***") for k, v in payload.items()},
+                })
+                t0 = time.perf_counter()
+                timed_out = False
+                try:
+                    resp = await self._call(endpoint, payload)
+                    error = None
+                except (asyncio.TimeoutError, HTTPTimeout):
+                    resp, error, timed_out = None, f"timeout après {self.timeout_seconds}s", True
+                except Exception as e:
+                    resp, error = None, str(e)
+                elapsed = time.perf_counter() - t0
+
+                if error is not None:
+                    self._audit({"event": "error", "endpoint": endpoint, "attempt": attempt, "error": error, "request_id": req_id})
+                    observe_api_latency(endpoint, "error", elapsed)
+                    if not _transport.should_retry(None, error, self.retryable_statuses):
+                        break
+                    if timed_out and endpoint == "placeOrder":
+                        # l'envoi a pu aboutir côté broker : on vérifie avant de risquer un doublon
+                        order = await self._find_open_order(payload, req_id)
+                        if order is None:
+                            error = f"{error} ; état de l'ordre inconnu, pas de nouvel envoi"
+                            break
+                        if order:
+                            inc_order("ok")
+                            resp = {"success": True, "errorCode": 0, "orderId": order.get("id", order.get("orderId")),
+                                    "order": order, "recovered": True}
+                            self._audit({"event": "recovered", "endpoint": endpoint, "attempt": attempt,
+                                         "response": resp, "request_id": req_id})
+                            return {"status": "ok", "response": resp, "attempts": attempts,
+                                    "request_id": req_id, "last_status": 200}
+                else:
+                    if not isinstance(resp, dict):
+                        resp = {"raw": str(resp), "statusCode": 200}
+                    last_status = api._extract_status_code(resp)
+                    self._audit({"event": "response", "endpoint": endpoint, "attempt": attempt, "response": resp, "request_id": req_id})
+                    observe_api_latency(endpoint, str(last_status or "ok"), elapsed)
+                    retry_after = _transport.retry_after_of(resp)
+                    if _transport.is_circuit_open(resp):
+                        error = resp.get("error") or "circuit ouvert"
+                        break
+                    if api._is_success_without_code(resp) or not _transport.should_retry(
+                        last_status, None, self.retryable_statuses
+                    ):
+                        if endpoint == "placeOrder":
+                            inc_order("ok")
+                        return {"status": "ok", "response": resp, "attempts": attempts,
+                                "request_id": req_id, "last_status": last_status or 200}
+                    error = f"HTTP {last_status}"
+
+                if attempt < self.max_retries + 1:
+                    await asyncio.sleep(_transport.backoff_delay(attempt, self.backoff_initial_ms,
+                                                                 self.backoff_max_ms, retry_after))
+
+        if endpoint == "placeOrder":
+            inc_order("error")
+        return {"status": "error", "error": error or "Unknown error", "attempts": attempts,
+                "request_id": req_id, "last_status": last_status}
+
+
+class InFlightOrders:
+    """
+    Ordres soumis par la boucle live, en attente de réponse (fills appliqués dans collect()).
+    Avec `lifecycle`, la réponse ne fait que faire avancer l'état de l'ordre : le tracker reçoit
+    les fills réels via lifecycle.apply_fills() (sinon fill supposé au prix de marché).
+    """
+
+    def __init__(self, gateway: OrderGateway, lifecycle: Any = None):
+        self.gateway = gateway
+        self.lifecycle = lifecycle
+        self._pending: List[tuple[concurrent.futures.Future, Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, payload: Dict[str, Any], *, side: str, qty: float, market_price: Optional[float]) -> str:
+        payload = dict(payload)
+        payload.setdefault("clientOrderId", _transport.gen_client_order_id())
+        if self.lifecycle is not None:
+            self.lifecycle.register(payload["clientOrderId"], side=side, qty=qty, signal_price=market_price)
+        future = self.gateway.submit("placeOrder", payload)
+        meta = {"request_id": payload["clientOrderId"], "side": side, "qty": qty, "market_price": market_price}
+        self._pending.append((future, meta))
+        return meta["request_id"]
+
+    def collect(self, tracker: Any = None) -> List[Dict[str, Any]]:
+        """Résultats des ordres terminés (non bloquant) ; sans lifecycle, fill au prix de marché de la soumission."""
+        done: List[Dict[str, Any]] = []
+        still: List[tuple[concurrent.futures.Future, Dict[str, Any]]] = []
+        for future, meta in self._pending:
+            if not future.done():
+                still.append((future, meta))
+                continue
+            try:
+                res = future.result()
+            except Exception as e:
+                res = {"status": "error", "error": str(e), "request_id": meta["request_id"]}
+            executed = res.get("status") == "ok"
+            if self.lifecycle is not None:
+                record = self.lifecycle.on_submit_result(meta["request_id"], res)
+                executed = record is not None and record.state != "rejected"
+                done.append({**res, "executed": executed, "side": meta["side"], "qty": meta["qty"],
+                             "order_state": record.state if record else None,
+                             "fill_price": record.avg_price if record else None})
+                continue
+            if executed and tracker is not None and meta["market_price"] is not None and meta["qty"]:
+                tracker.on_fill(price=float(meta["market_price"]), qty=float(meta["qty"]), side=meta["side"])
+            done.append({**res, "executed": executed, "side": meta["side"], "qty": meta["qty"],
+                         "fill_price": meta["market_price"] if executed else None})
+        self._pending = still
+        return done
+
+    def drain(self, tracker: Any = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Attend les ordres encore en vol (arrêt de la boucle) puis collect()."""
+        concurrent.futures.wait([f for f, _ in self._pending], timeout=timeout)
+        return self.collect(tracker)
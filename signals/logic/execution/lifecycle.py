@@ -0,0 +1,288 @@
+# signals/logic/execution/lifecycle.py
+"""
+Cycle de vie des ordres prod, indexé par clientOrderId : le tracker reçoit les fills réels
+(prix et quantité exécutés) au lieu d'un fill supposé au prix de marché.
+
+- États : pending (envoyé) -> accepted (orderId broker) -> partial -> filled ; cancelled, rejected.
+  Transitions alimentées par la réponse placeOrder (on_submit_result), les mises à jour d'ordres
+  broker (on_order_update : searchOpenOrders, flux temps réel) et les exécutions (on_fill : searchTrades).
+- Une seule source de fills : les exécutions (on_fill, dédupliquées par fill_id). Les cumuls
+  fillVolume/filledPrice des réponses et des ordres broker ne sont pas comptés (sinon un même
+  fill partiel arriverait deux fois).
+- Les fills arrivent depuis un thread de polling : ils sont mis en file, et apply_fills(tracker)
+  les applique au PerformanceTracker depuis le thread de la boucle live.
+- Métriques par ordre complètement exécuté : latence signal -> fill et slippage (en ticks,
+  positif = défavorable) en histogrammes Prometheus.
+- FillPoller : thread qui interroge searchTrades tant que des ordres attendent un fill.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from signals.monitoring import metrics
+
+PENDING = "pending"
+ACCEPTED = "accepted"
+PARTIAL = "partial"
+FILLED = "filled"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+TERMINAL = frozenset({FILLED, CANCELLED, REJECTED})
+
+# Statuts d'ordre TopstepX (OrderStatus)
+BROKER_STATUS = {1: ACCEPTED, 2: FILLED, 3: CANCELLED, 4: CANCELLED, 5: REJECTED, 6: PENDING}
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Horodatage broker ISO 8601 -> epoch s (None si absent/illisible)."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass
+class OrderRecord:
+    client_order_id: str
+    side: str
+    qty: float
+    signal_price: Optional[float]
+    signal_time: float
+    order_id: Any = None
+    state: str = PENDING
+    filled_qty: float = 0.0
+    avg_price: Optional[float] = None
+    filled_at: Optional[float] = None
+    error: Optional[str] = None
+    fill_ids: Set[Any] = field(default_factory=set)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Signal -> fill complet (s)."""
+        return None if self.filled_at is None else max(0.0, self.filled_at - self.signal_time)
+
+    @property
+    def slippage(self) -> Optional[float]:
+        """Écart prix moyen exécuté / prix au signal, positif = défavorable (unités de prix)."""
+        if self.avg_price is None or self.signal_price is None:
+            return None
+        diff = self.avg_price - self.signal_price
+        return diff if self.side.upper() == "BUY" else -diff
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client_order_id": self.client_order_id, "order_id": self.order_id, "state": self.state,
+            "side": self.side, "qty": self.qty, "filled_qty": self.filled_qty, "fill_price": self.avg_price,
+            "signal_price": self.signal_price, "latency_s": self.latency, "slippage": self.slippage,
+            "error": self.error,
+        }
+
+
+class OrderLifecycle:
+    def __init__(self, *, tick_size: Optional[float] = None, clock: Callable[[], float] = time.time,
+                 max_closed: int = 1000):
+        self.tick_size = tick_size
+        self._clock = clock
+        self.max_closed = int(max_closed)
+        self._orders: Dict[str, OrderRecord] = {}
+        self._by_order_id: Dict[Any, str] = {}
+        self._fills: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+
+    # --- Enregistrement / réponses ---
+
+    def register(self, client_order_id: str, *, side: str, qty: float, signal_price: Optional[float],
+                 signal_time: Optional[float] = None) -> OrderRecord:
+        rec = OrderRecord(client_order_id, side.upper(), float(qty), signal_price,
+                          self._clock() if signal_time is None else signal_time)
+        with self._lock:
+            self._orders[client_order_id] = rec
+            self._prune()
+        return rec
+
+    def _prune(self) -> None:
+        closed = [k for k, r in self._orders.items() if r.state in TERMINAL]
+        for key in closed[: max(0, len(closed) - self.max_closed)]:
+            rec = self._orders.pop(key)
+            self._by_order_id.pop(rec.order_id, None)
+
+    def get(self, client_order_id: str) -> Optional[OrderRecord]:
+        return self._orders.get(client_order_id)
+
+    def by_order_id(self, order_id: Any) -> Optional[OrderRecord]:
+        key = self._by_order_id.get(order_id)
+        return self._orders.get(key) if key is not None else None
+
+    def open_orders(self) -> List[OrderRecord]:
+        return [r for r in list(self._orders.values()) if r.state not in TERMINAL]
+
+    def on_submit_result(self, client_order_id: str, result: Dict[str, Any]) -> Optional[OrderRecord]:
+        """Résultat place_order / passerelle : accepted (orderId connu) ou rejected."""
+        rec = self._orders.get(client_order_id)
+        if rec is None:
+            return None
+        resp = result.get("response") if isinstance(result.get("response"), dict) else {}
+        with self._lock:
+            if result.get("status") != "ok" or resp.get("success") is False:
+                rec.state = REJECTED
+                rec.error = result.get("error") or resp.get("errorMessage") or "ordre refusé"
+                return rec
+            order_id = resp.get("orderId", resp.get("id"))
+            if order_id is not None:
+                rec.order_id = order_id
+                self._by_order_id[order_id] = client_order_id
+            if rec.state == PENDING:
+                rec.state = ACCEPTED
+        return rec
+
+    # --- Mises à jour broker ---
+
+    def on_order_update(self, order: Dict[str, Any]) -> Optional[OrderRecord]:
+        """
+        Ordre broker (id, status, customTag/clientOrderId) : transitions d'état seulement
+        (annulé, rejeté, accepté) ; les fills viennent de on_fill.
+        """
+        rec = self.by_order_id(order.get("id", order.get("orderId")))
+        if rec is None:
+            rec = self._orders.get(order.get("clientOrderId") or order.get("customTag"))
+        if rec is None or rec.state in TERMINAL:
+            return rec
+        state = BROKER_STATUS.get(order.get("status"))
+        with self._lock:
+            if state in (CANCELLED, REJECTED) and rec.state not in TERMINAL:
+                rec.state = state
+                rec.error = order.get("errorMessage") or rec.error
+            elif state == ACCEPTED and rec.state == PENDING:
+                rec.state = ACCEPTED
+        return rec
+
+    def on_fill(self, *, price: float, qty: float, order_id: Any = None, client_order_id: Optional[str] = None,
+                fill_id: Any = None, timestamp: Optional[float] = None) -> Optional[OrderRecord]:
+        """Exécution broker (searchTrades, flux) ; ignorée si ordre inconnu ou déjà vue (fill_id)."""
+        rec = self._orders.get(client_order_id) if client_order_id else self.by_order_id(order_id)
+        if rec is None:
+            return None
+        with self._lock:
+            if fill_id is not None:
+                if fill_id in rec.fill_ids:
+                    return rec
+                rec.fill_ids.add(fill_id)
+            self._fill_locked(rec, float(price), float(qty), timestamp)
+        return rec
+
+    def _fill_locked(self, rec: OrderRecord, price: float, qty: float, timestamp: Optional[float]) -> None:
+        qty = min(qty, rec.qty - rec.filled_qty)
+        if qty <= 0:
+            return
+        total = rec.filled_qty + qty
+        rec.avg_price = ((rec.avg_price or 0.0) * rec.filled_qty + price * qty) / total
+        rec.filled_qty = total
+        self._fills.append({"client_order_id": rec.client_order_id, "side": rec.side, "qty": qty, "price": price})
+        if rec.filled_qty >= rec.qty:
+            rec.state = FILLED
+            rec.filled_at = timestamp if timestamp is not None else self._clock()
+            slip = rec.slippage
+            if slip is not None and self.tick_size:
+                slip /= self.tick_size
+            metrics.observe_fill(rec.side, rec.latency, slip)
+        elif rec.state not in TERMINAL:
+            rec.state = PARTIAL
+
+    # --- Application au tracker (thread de la boucle live) ---
+
+    def apply_fills(self, tracker: Any = None) -> List[Dict[str, Any]]:
+        applied: List[Dict[str, Any]] = []
+        while True:
+            try:
+                fill = self._fills.popleft()
+            except IndexError:
+                break
+            if tracker is not None:
+                tracker.on_fill(price=fill["price"], qty=fill["qty"], side=fill["side"])
+            applied.append(fill)
+        return applied
+
+
+# ------------------------------------------------------------
+# Source de fills : polling searchTrades
+# ------------------------------------------------------------
+
+class FillPoller:
+    def __init__(self, client: Any, account_id: Any, lifecycle: OrderLifecycle, *, poll_interval: float = 1.0,
+                 margin_seconds: float = 60.0):
+        self.client = client
+        self.account_id = account_id
+        self.lifecycle = lifecycle
+        self.poll_interval = float(poll_interval)
+        self.margin_seconds = float(margin_seconds)
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, trading_cfg: Dict[str, Any], lifecycle: OrderLifecycle, *, client: Any = None,
+                    account_id: Any = None) -> "FillPoller":
+        if client is None:
+            from signals.api.client import get_client
+            client = get_client()
+        if account_id is None:
+            from signals.utils import env_loader as env
+            account_id = int(env.ACCOUNT_ID) if env.ACCOUNT_ID else None
+        ot = trading_cfg.get("order_tracking", {}) or {}
+        return cls(client, account_id, lifecycle, poll_interval=float(ot.get("poll_seconds", 1.0)))
+
+    def poll(self) -> int:
+        """Un cycle ; aucune requête s'il n'y a pas d'ordre en attente de fill. Renvoie le nb de trades lus."""
+        waiting = [r for r in self.lifecycle.open_orders() if r.order_id is not None]
+        if not waiting:
+            return 0
+        since = min(r.signal_time for r in waiting) - self.margin_seconds
+        payload = {"accountId": self.account_id,
+                   "startTimestamp": datetime.fromtimestamp(since, tz=timezone.utc).isoformat()}
+        try:
+            resp = self.client.post("searchTrades", payload)
+            if not isinstance(resp, dict):
+                raise RuntimeError(str(resp))
+            if resp.get("success") is not True:
+                raise RuntimeError(resp.get("errorMessage") or resp.get("error") or str(resp))
+        except Exception as e:
+            if str(e) != self.last_error:
+                logging.warning(f"[Fills] ⚠️ searchTrades indisponible : {e}")
+            self.last_error = str(e)
+            return 0
+        self.last_error = None
+        trades = resp.get("trades") or []
+        for trade in trades:
+            self.lifecycle.on_fill(order_id=trade.get("orderId"), price=trade["price"], qty=trade["size"],
+                                   fill_id=trade.get("id"), timestamp=parse_timestamp(trade.get("creationTimestamp")))
+        return len(trades)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> "FillPoller":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="fill-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
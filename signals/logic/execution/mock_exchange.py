@@ -0,0 +1,250 @@
+# signals/logic/execution/mock_exchange.py
+"""
+Exchange HTTP simulé en process (mêmes chemins que l'API TopstepX de config.yaml), pour
+tester localement débit et latence de la passerelle d'ordres sans toucher au vrai compte.
+
+- ThreadingHTTPServer sur 127.0.0.1 (port libre), une requête = un thread serveur.
+- loginKey délivre un token ; les autres endpoints exigent "Authorization: Bearer <token>" (401 sinon).
+- Latence simulée (`latency` s) et taux d'échec (`fail_rate`, réponses `fail_status`, 503 par
+  défaut, avec en-tête Retry-After si `retry_after` est fourni) configurables ;
+  `reject(name, body)` -> True pour refuser un ordre précis (success=false, errorCode=3).
+- fill(order_id, price, size) : exécution (partielle) d'un ordre, exposée par searchTrades.
+
+Test de charge :
+    python -m signals.logic.execution.mock_exchange --orders 500 --concurrency 16 --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_ENDPOINTS: Dict[str, str] = {
+    "loginKey": "/api/Auth/loginKey",
+    "placeOrder": "/api/Order/place",
+    "modifyOrder": "/api/Order/modify",
+    "cancelOrder": "/api/Order/cancel",
+    "searchOpenOrders": "/api/Order/searchOpen",
+    "searchTrades": "/api/Trade/search",
+    "searchOpenPositions": "/api/Position/searchOpen",
+    "closePosition": "/api/Position/closeContract",
+    "searchContracts": "/api/Contract/search",
+    "searchContractById": "/api/Contract/searchById",
+    "listAvailableContracts": "/api/Contract/available",
+}
+
+
+class MockExchange:
+    def __init__(self, *, latency: float = 0.0, fail_rate: float = 0.0, seed: Optional[int] = None,
+                 token: str = "mock-token", reject: Optional[Callable[[str, Dict[str, Any]], bool]] = None,
+                 fail_status: int = 503, retry_after: Optional[float] = None,
+                 contracts: Optional[List[Dict[str, Any]]] = None):
+        self.latency = float(latency)
+        self.fail_status = int(fail_status)
+        self.retry_after = retry_after
+        self.reject = reject
+        self.fail_rate = float(fail_rate)
+        self.token = token
+        self.endpoints = dict(DEFAULT_ENDPOINTS)
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.positions: Dict[int, Dict[str, Any]] = {}      # renseignées par le test (id -> position)
+        self.contracts: List[Dict[str, Any]] = list(contracts or [])
+        self.trades: List[Dict[str, Any]] = []
+        self.requests: List[str] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = {path: name for name, path in self.endpoints.items()}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockExchange":
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"      # keep-alive
+            disable_nagle_algorithm = True     # en-têtes et corps envoyés séparément : pas de délai ACK
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, data = exchange.handle(self.path, body, self.headers.get("Authorization"))
+                raw = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                if status == exchange.fail_status and exchange.retry_after is not None:
+                    self.send_header("Retry-After", str(exchange.retry_after))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-exchange", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join(5)
+            self._server = self._thread = None
+
+    def __enter__(self) -> "MockExchange":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------
+    # Logique d'exchange
+    # ------------------------------------------------------------
+
+    def handle(self, path: str, body: Dict[str, Any], auth: Optional[str]) -> tuple[int, Dict[str, Any]]:
+        name = self._routes.get(path)
+        with self._lock:
+            self.requests.append(name or path)
+            fail = self._rng.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if name is None:
+            return 404, {"success": False, "errorMessage": f"route inconnue {path}"}
+        if name == "loginKey":
+            return 200, {"success": True, "errorCode": 0, "token": self.token}
+        if auth != f"Bearer {self.token}":
+            return 401, {"success": False, "errorMessage": "unauthorized"}
+        if fail:
+            return self.fail_status, {"success": False, "errorMessage": "service unavailable"}
+        if self.reject is not None and self.reject(name, body):
+            return 200, {"success": False, "errorCode": 3, "errorMessage": "ordre refusé"}
+
+        with self._lock:
+            if name == "placeOrder":
+                order_id = self._next_id
+                self._next_id += 1
+                self.orders[order_id] = {**body, "id": order_id, "orderId": order_id, "status": "working"}
+                return 200, {"success": True, "errorCode": 0, "orderId": order_id}
+            if name in ("modifyOrder", "cancelOrder"):
+                order = self.orders.get(body.get("orderId"))
+                if order is None:
+                    return 200, {"success": False, "errorCode": 2, "errorMessage": "ordre inconnu"}
+                if name == "cancelOrder":
+                    order["status"] = "cancelled"
+                else:
+                    order.update({k: v for k, v in body.items() if k != "orderId"})
+                return 200, {"success": True, "errorCode": 0}
+            if name == "searchTrades":
+                return 200, {"success": True, "errorCode": 0, "trades": list(self.trades)}
+            if name == "searchOpenOrders":
+                working = [o for o in self.orders.values() if o["status"] == "working"]
+                return 200, {"success": True, "errorCode": 0, "orders": working}
+            if name == "listAvailableContracts":
+                return 200, {"success": True, "errorCode": 0, "contracts": list(self.contracts)}
+            if name == "searchContracts":
+                text = str(body.get("searchText") or "").lower()
+                found = [c for c in self.contracts if text in str(c.get("name", "")).lower()]
+                return 200, {"success": True, "errorCode": 0, "contracts": found}
+            if name == "searchContractById":
+                found = [c for c in self.contracts if c.get("id") == body.get("contractId")]
+                if not found:
+                    return 200, {"success": False, "errorCode": 1, "errorMessage": "contrat inconnu"}
+                return 200, {"success": True, "errorCode": 0, "contract": found[0]}
+            return 200, {"success": True, "errorCode": 0, "positions": list(self.positions.values())}
+
+    def fill(self, order_id: int, price: float, size: Optional[float] = None) -> Dict[str, Any]:
+        """Exécute (tout ou partie de) un ordre : trade visible par searchTrades, ordre mis à jour."""
+        with self._lock:
+            order = self.orders[order_id]
+            qty = float(order.get("size", order.get("quantity", 1)))
+            done = float(order.get("fillVolume") or 0)
+            size = float(size) if size is not None else qty - done
+            total = done + size
+            order["filledPrice"] = ((order.get("filledPrice") or 0.0) * done + price * size) / total
+            order["fillVolume"] = total
+            if total >= qty:
+                order["status"] = "filled"
+            trade = {"id": len(self.trades) + 1, "orderId": order_id, "price": price, "size": size,
+                     "side": order.get("side"), "creationTimestamp": datetime.now(timezone.utc).isoformat()}
+            self.trades.append(trade)
+            return trade
+
+    def client(self, **kwargs: Any) -> Any:
+        """APIClient pointant sur cet exchange (session et token dédiés, sans limiteur par défaut)."""
+        from signals.api.client import APIClient, TokenCache, _new_session
+
+        session = _new_session()
+
+        def login() -> str:
+            resp = session.post(self.base_url + self.endpoints["loginKey"], json={}, timeout=5)
+            return resp.json()["token"]
+
+        kwargs.setdefault("throttle", False)
+        return APIClient(self.base_url, endpoints=self.endpoints, session=session,
+                         token_cache=TokenCache(login), **kwargs)
+
+
+# ------------------------------------------------------------
+# Test de charge
+# ------------------------------------------------------------
+
+async def _load(gateway: Any, n_orders: int) -> List[float]:
+    async def one(i: int) -> float:
+        t0 = time.perf_counter()
+        res = await gateway.place_order({"symbol": "CBOT_UB1!", "side": "BUY" if i % 2 else "SELL", "quantity": 1})
+        if res["status"] != "ok":
+            raise RuntimeError(res.get("error"))
+        return time.perf_counter() - t0
+
+    return list(await asyncio.gather(*(one(i) for i in range(n_orders))))
+
+
+def load_test(n_orders: int = 200, *, concurrency: int = 16, latency: float = 0.01, fail_rate: float = 0.0) -> Dict[str, float]:
+    from signals.logic.execution.gateway import OrderGateway
+
+    with MockExchange(latency=latency, fail_rate=fail_rate, seed=0) as exchange:
+        with OrderGateway(exchange.client(), max_in_flight=concurrency, backoff_initial_ms=5, backoff_max_ms=50) as gw:
+            t0 = time.perf_counter()
+            lat = gw.run_threadsafe(_load(gw, n_orders)).result()
+            wall = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "orders": float(n_orders),
+        "seconds": wall,
+        "orders_per_s": n_orders / wall if wall else float("inf"),
+        "p50_ms": statistics.median(lat) * 1000,
+        "p99_ms": lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Test de charge de la passerelle d'ordres sur exchange simulé")
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.01, help="latence simulée par requête (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    stats = load_test(args.orders, concurrency=args.concurrency, latency=args.latency, fail_rate=args.fail_rate)
+    print(f"📈 {int(stats['orders'])} ordres en {stats['seconds']:.2f} s "
+          f"({stats['orders_per_s']:.0f}/s) | p50={stats['p50_ms']:.1f} ms p99={stats['p99_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
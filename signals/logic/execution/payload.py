@@ -2,13 +2,8 @@
 
 from typing import Dict, Any, Tuple
 
-from signals.loaders.config_loader import (
-    get_symbol,
-    get_order_type,
-    get_time_in_force,
-    get_dry_run_mode,
-    get_default_lots,
-)
+# Getters via le module (patchables) ; load_config() est mis en cache -> pas de parsing YAML par ordre
+from signals.loaders import config_loader as cfg
 # ⚠️ Importe le module, pas la valeur (pour que monkeypatch marche)
 from signals.utils import env_loader as env
 
@@ -17,7 +12,7 @@ def extract_side_and_qty(signal: Dict[str, Any]) -> Tuple[str, float]:
     side = (signal.get("signal") or signal.get("action") or "FLAT").upper()
     if side not in ("BUY", "SELL"):
         raise ValueError(f"Côté invalide pour exécution: {side}")
-    qty = float(signal.get("qty") or get_default_lots())
+    qty = float(signal.get("qty") or cfg.get_default_lots())
     return side, qty
 
 
@@ -25,10 +20,10 @@ def build_order_payload(signal: Dict[str, Any]) -> Dict[str, Any]:
     side, qty = extract_side_and_qty(signal)
     payload = {
         "accountId": env.ACCOUNT_ID,     # ✅ lu dynamiquement
-        "symbol": get_symbol(),
+        "symbol": cfg.get_symbol(),
         "side": side,
-        "orderType": get_order_type(),
-        "timeInForce": get_time_in_force(),
+        "orderType": cfg.get_order_type(),
+        "timeInForce": cfg.get_time_in_force(),
         "quantity": qty,
         # "price": signal.get("limit_price"),
         # "stopPrice": signal.get("stop_price"),
@@ -39,4 +34,4 @@ def build_order_payload(signal: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def is_dry_run() -> bool:
-    return get_dry_run_mode()
+    return cfg.get_dry_run_mode()
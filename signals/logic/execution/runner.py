@@ -1,11 +1,16 @@
 # signals/logic/execution/runner.py
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING
 
 from signals.metrics.perf_tracker import PerformanceTracker
 # import modules pour permettre monkeypatch
 from . import payload as pl
 from . import api_client as api
+from .api import transport as _transport
+
+if TYPE_CHECKING:
+    from .gateway import InFlightOrders
+    from .lifecycle import OrderLifecycle
 
 
 def execute_and_track_order(
@@ -16,11 +21,14 @@ def execute_and_track_order(
     limit_price: Optional[float],
     market_price: Optional[float],
     tracker: Optional[PerformanceTracker] = None,
+    lifecycle: Optional["OrderLifecycle"] = None,
 ) -> Dict[str, Any]:
     """
     Exécute un ordre en prod :
     - En dry-run : simule un fill et met à jour tracker.
-    - En prod : appelle place_order() via APIClient, puis met à jour tracker.
+    - En prod : appelle place_order() via APIClient ; avec `lifecycle`, l'ordre est suivi par
+      clientOrderId et le tracker ne reçoit que les fills réels (lifecycle.apply_fills) ;
+      sans, fill supposé au market_price (compatibilité).
     Retourne un dict structuré avec executed/fill_price/qty/side.
     """
     if pl.is_dry_run():
@@ -39,9 +47,13 @@ def execute_and_track_order(
     payload = pl.build_order_payload(signal)
     if limit_price is not None:
         payload["price"] = float(limit_price)
+    if lifecycle is not None:
+        payload.setdefault("clientOrderId", _transport.gen_client_order_id())
+        lifecycle.register(payload["clientOrderId"], side=side, qty=qty, signal_price=market_price)
 
     # ✅ Appel via module api_client (patchable)
     api_result = api.place_order(payload)
+    record = lifecycle.on_submit_result(payload["clientOrderId"], api_result) if lifecycle is not None else None
     if api_result.get("status") != "ok":
         return {
             "status": "error",
@@ -52,7 +64,20 @@ def execute_and_track_order(
             "side": side,
         }
 
-    # fallback : assume fill au market_price
+    if record is not None:
+        # fill réel appliqué plus tard (réponse broker / searchTrades -> lifecycle.apply_fills)
+        return {
+            "status": "ok",
+            "executed": record.state != "rejected",
+            "response": api_result.get("response"),
+            "client_order_id": record.client_order_id,
+            "order_state": record.state,
+            "fill_price": record.avg_price,
+            "qty": qty,
+            "side": side,
+        }
+
+    # fallback (sans suivi) : assume fill au market_price
     fill_price = market_price
     filled_qty = qty
 
@@ -69,6 +94,34 @@ def execute_and_track_order(
     }
 
 
+def submit_order(
+    inflight: "InFlightOrders",
+    *,
+    symbol: str,
+    side: str,
+    qty: float,
+    limit_price: Optional[float],
+    market_price: Optional[float],
+) -> Dict[str, Any]:
+    """
+    Variante non bloquante de execute_and_track_order (prod) : l'ordre part via la passerelle
+    asyncio et la boucle continue ; le fill est appliqué au tracker par inflight.collect().
+    """
+    signal = {"action": side, "qty": qty}
+    payload = pl.build_order_payload(signal)
+    if limit_price is not None:
+        payload["price"] = float(limit_price)
+    request_id = inflight.submit(payload, side=side, qty=qty, market_price=market_price)
+    return {
+        "status": "submitted",
+        "executed": True,
+        "request_id": request_id,
+        "fill_price": None,
+        "qty": qty,
+        "side": side,
+    }
+
+
 def execute_signal_legacy(
     signal: Dict[str, Any],
     *,
@@ -0,0 +1,393 @@
+# signals/logic/execution/sim_exchange.py
+"""
+Exchange simulé en process (matching sur bougies OHLCV) pour dry_run / shadow_dual et les replays.
+
+- Latence d'acheminement tirée d'une distribution (fixed | uniform | lognormal, en ms) : un ordre
+  ne participe qu'aux bougies qui suivent sa décision et se terminent après son arrivée.
+- Marché : open de la bougie d'arrivée + slippage adverse (slippage_ticks + jitter entier aléatoire).
+  Limite : touchée si low <= limite (achat) / high >= limite (vente), exécutée à min/max(limite, open).
+  Stop : déclenché sur high/low, exécuté au pire de (stop, open) + slippage.
+- Fills partiels : quantité par bougie plafonnée (max_qty_per_bar, participation * volume) ;
+  le reste attend les bougies suivantes.
+- Brackets : SL/TP actifs à partir de la bougie qui suit l'exécution complète de l'entrée ; OCO,
+  SL prioritaire si les deux sont touchés dans la même bougie (hypothèse conservatrice).
+- Les fills passent par un OrderLifecycle (même chemin qu'en prod : apply_fills -> tracker),
+  donc latence signal -> fill et slippage sont mesurés de la même façon.
+- simulate_market_orders() : version NumPy vectorisée (millions d'ordres/s) pour les benchmarks.
+
+Benchmark :
+    python -m signals.logic.execution.sim_exchange --orders 1000000 --bars 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .lifecycle import OrderLifecycle
+
+MARKET, LIMIT, STOP = "market", "limit", "stop"
+WORKING, HELD, FILLED, CANCELLED = "working", "held", "filled", "cancelled"
+
+
+@dataclass
+class SimConfig:
+    tick_size: float = 0.03125
+    bar_seconds: float = 300.0
+    latency: str = "lognormal"            # fixed | uniform | lognormal
+    latency_ms: float = 50.0
+    latency_jitter_ms: float = 20.0       # écart-type (lognormal) ou demi-largeur (uniform)
+    slippage_ticks: float = 0.0           # slippage adverse fixe (ordres marché et stops)
+    slippage_jitter_ticks: int = 0        # + entier aléatoire dans [0, n]
+    max_qty_per_bar: Optional[float] = None
+    participation: Optional[float] = None  # fraction max du volume de la bougie
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "SimConfig":
+        """trading.simulator (+ general.TICK_SIZE par défaut)."""
+        sim = ((cfg.get("trading", {}) or {}).get("simulator", {}) or {})
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in sim.items() if k in known}
+        values.setdefault("tick_size", float((cfg.get("general", {}) or {}).get("TICK_SIZE", 0.03125)))
+        return cls(**values)
+
+
+class SimFill(NamedTuple):
+    order_id: int
+    client_order_id: str
+    side: str
+    qty: float
+    price: float
+    ts: float
+
+
+class SimOrder:
+    __slots__ = ("id", "client_order_id", "side", "sign", "qty", "type", "price", "submitted_at", "active_at",
+                 "filled", "avg_price", "state", "oco", "children")
+
+    def __init__(self, oid: int, client_order_id: str, side: str, qty: float, otype: str,
+                 price: Optional[float], submitted_at: float, active_at: float):
+        self.id = oid
+        self.client_order_id = client_order_id
+        self.side = side
+        self.sign = 1 if side == "BUY" else -1
+        self.qty = float(qty)
+        self.type = otype
+        self.price = price
+        self.submitted_at = submitted_at
+        self.active_at = active_at
+        self.filled = 0.0
+        self.avg_price: Optional[float] = None
+        self.state = WORKING
+        self.oco: Optional[SimOrder] = None
+        self.children: List[SimOrder] = []
+
+    @property
+    def remaining(self) -> float:
+        return self.qty - self.filled
+
+
+class SimExchange:
+    def __init__(self, config: Optional[SimConfig] = None, *, lifecycle: Optional[OrderLifecycle] = None,
+                 on_fill: Optional[Callable[[SimFill], None]] = None):
+        self.config = config or SimConfig()
+        self.lifecycle = lifecycle
+        self.on_fill = on_fill
+        self._rng = random.Random(self.config.seed)
+        self._next_id = 1
+        self._active: List[SimOrder] = []
+        self.orders: Dict[int, SimOrder] = {}     # ordres vivants (les ordres terminés en sortent)
+        self.n_fills = 0
+        cfg = self.config
+        if cfg.latency == "lognormal" and cfg.latency_ms > 0:
+            sigma2 = math.log(1.0 + (cfg.latency_jitter_ms / cfg.latency_ms) ** 2)
+            self._ln = (math.log(cfg.latency_ms) - sigma2 / 2, math.sqrt(sigma2))
+        else:
+            self._ln = None
+
+    # --- Tirages ---
+
+    def sample_latency(self) -> float:
+        cfg = self.config
+        if cfg.latency == "fixed" or cfg.latency_jitter_ms <= 0:
+            ms = cfg.latency_ms
+        elif cfg.latency == "uniform":
+            ms = self._rng.uniform(max(0.0, cfg.latency_ms - cfg.latency_jitter_ms), cfg.latency_ms + cfg.latency_jitter_ms)
+        elif self._ln is not None:
+            ms = self._rng.lognormvariate(*self._ln)
+        else:
+            ms = 0.0
+        return ms / 1000.0
+
+    def _slippage(self) -> float:
+        cfg = self.config
+        ticks = cfg.slippage_ticks
+        if cfg.slippage_jitter_ticks > 0:
+            ticks += self._rng.randint(0, cfg.slippage_jitter_ticks)
+        return ticks * cfg.tick_size
+
+    # --- Ordres ---
+
+    def _new(self, side: str, qty: float, otype: str, price: Optional[float], ts: float,
+             client_order_id: Optional[str]) -> SimOrder:
+        oid = self._next_id
+        self._next_id += 1
+        order = SimOrder(oid, client_order_id or f"sim-{oid}", side.upper(), qty, otype, price, ts, ts + self.sample_latency())
+        self.orders[oid] = order
+        return order
+
+    def _register(self, order: SimOrder, ref_price: Optional[float], ts: float) -> None:
+        if self.lifecycle is None:
+            return
+        if self.lifecycle.get(order.client_order_id) is None:
+            self.lifecycle.register(order.client_order_id, side=order.side, qty=order.qty,
+                                    signal_price=ref_price, signal_time=ts)
+        self.lifecycle.on_submit_result(order.client_order_id,
+                                        {"status": "ok", "response": {"success": True, "orderId": order.id}})
+
+    def submit(self, side: str, qty: float, *, ts: float, order_type: str = MARKET, price: Optional[float] = None,
+               ref_price: Optional[float] = None, client_order_id: Optional[str] = None) -> SimOrder:
+        """Ordre décidé à `ts` (epoch s) ; ref_price = prix au signal (slippage mesuré par rapport à lui)."""
+        order = self._new(side, qty, order_type, price, ts, client_order_id)
+        self._active.append(order)
+        self._register(order, ref_price if ref_price is not None else price, ts)
+        return order
+
+    def submit_bracket(self, side: str, qty: float, *, ts: float, stop_price: float, take_profit_price: float,
+                       entry_type: str = MARKET, entry_price: Optional[float] = None,
+                       ref_price: Optional[float] = None, client_order_id: Optional[str] = None) -> SimOrder:
+        entry = self.submit(side, qty, ts=ts, order_type=entry_type, price=entry_price, ref_price=ref_price,
+                            client_order_id=client_order_id)
+        exit_side = "SELL" if entry.side == "BUY" else "BUY"
+        stop = self._new(exit_side, qty, STOP, stop_price, ts, f"{entry.client_order_id}-sl")
+        tp = self._new(exit_side, qty, LIMIT, take_profit_price, ts, f"{entry.client_order_id}-tp")
+        stop.state = tp.state = HELD
+        stop.oco, tp.oco = tp, stop
+        entry.children = [stop, tp]     # SL d'abord : prioritaire si les deux sont touchés
+        return entry
+
+    def cancel(self, order_id: int) -> bool:
+        order = self.orders.get(order_id)
+        if order is None or order.state in (FILLED, CANCELLED):
+            return False
+        self._cancel(order)
+        return True
+
+    def _cancel(self, order: SimOrder) -> None:
+        order.state = CANCELLED
+        self.orders.pop(order.id, None)
+        for child in order.children:
+            if child.state in (WORKING, HELD):
+                self._cancel(child)
+        if self.lifecycle is not None:
+            self.lifecycle.on_order_update({"clientOrderId": order.client_order_id, "status": 3})
+
+    @property
+    def open_orders(self) -> List[SimOrder]:
+        return [o for o in self._active if o.state == WORKING]
+
+    # --- Matching ---
+
+    def _match_price(self, order: SimOrder, o: float, h: float, l: float) -> Optional[float]:
+        sign = order.sign
+        if order.type == MARKET:
+            return o + sign * self._slippage()
+        if order.type == LIMIT:
+            if sign > 0 and l <= order.price:
+                return min(order.price, o)
+            if sign < 0 and h >= order.price:
+                return max(order.price, o)
+            return None
+        if sign > 0 and h >= order.price:
+            return max(order.price, o) + self._slippage()
+        if sign < 0 and l <= order.price:
+            return min(order.price, o) - self._slippage()
+        return None
+
+    def on_bar(self, ts: float, open_: float, high: float, low: float, close: float,
+               volume: Optional[float] = None) -> List[SimFill]:
+        """Bougie [ts, ts + bar_seconds) : exécute les ordres actifs ; renvoie les fills."""
+        cfg = self.config
+        bar_end = ts + cfg.bar_seconds
+        cap = math.inf
+        if cfg.max_qty_per_bar is not None:
+            cap = float(cfg.max_qty_per_bar)
+        if cfg.participation is not None and volume is not None:
+            cap = min(cap, float(cfg.participation) * float(volume))
+
+        fills: List[SimFill] = []
+        activated: List[SimOrder] = []
+        still: List[SimOrder] = []
+        for order in self._active:
+            if order.state != WORKING:
+                continue
+            # décidé pendant/après cette bougie, ou pas encore arrivé avant sa fin
+            if order.submitted_at > ts or order.active_at >= bar_end:
+                still.append(order)
+                continue
+            if order.oco is not None and order.oco.state == FILLED:
+                self._cancel(order)
+                continue
+            price = self._match_price(order, open_, high, low)
+            qty = min(order.remaining, cap) if price is not None else 0.0
+            if qty <= 0:
+                still.append(order)
+                continue
+            fills.append(self._fill(order, price, qty, max(ts, order.active_at)))
+            if order.remaining > 1e-12:
+                still.append(order)
+                continue
+            order.state = FILLED
+            self.orders.pop(order.id, None)
+            if order.oco is not None and order.oco.state == WORKING:
+                self._cancel(order.oco)
+            for child in order.children:
+                if child.state == HELD:
+                    child.state = WORKING
+                    child.submitted_at = bar_end       # actif à partir de la bougie suivante
+                    child.active_at = bar_end
+                    self._register(child, child.price, bar_end)
+                    activated.append(child)
+        self._active = still + activated
+        return fills
+
+    def _fill(self, order: SimOrder, price: float, qty: float, ts: float) -> SimFill:
+        total = order.filled + qty
+        order.avg_price = ((order.avg_price or 0.0) * order.filled + price * qty) / total
+        order.filled = total
+        self.n_fills += 1
+        fill = SimFill(order.id, order.client_order_id, order.side, qty, price, ts)
+        if self.lifecycle is not None:
+            self.lifecycle.on_fill(client_order_id=order.client_order_id, price=price, qty=qty, timestamp=ts)
+        if self.on_fill is not None:
+            self.on_fill(fill)
+        return fill
+
+
+class SimBroker:
+    """SimExchange + OrderLifecycle pour un tracker (principal ou shadow) de la boucle live."""
+
+    def __init__(self, config: SimConfig):
+        self.lifecycle = OrderLifecycle(tick_size=config.tick_size, clock=time.time)
+        self.exchange = SimExchange(config, lifecycle=self.lifecycle)
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "SimBroker":
+        return cls(SimConfig.from_config(cfg))
+
+    def submit(self, *, side: str, qty: float, ts: float, market_price: Optional[float],
+               stop_price: Optional[float] = None, take_profit_price: Optional[float] = None) -> Dict[str, Any]:
+        """Ordre marché décidé à la clôture de la bougie `ts` ; fill aux bougies suivantes."""
+        decided = ts + self.exchange.config.bar_seconds
+        if stop_price is not None and take_profit_price is not None:
+            order = self.exchange.submit_bracket(side, qty, ts=decided, stop_price=stop_price,
+                                                 take_profit_price=take_profit_price, ref_price=market_price)
+        else:
+            order = self.exchange.submit(side, qty, ts=decided, ref_price=market_price)
+        return {"status": "simulated", "executed": True, "client_order_id": order.client_order_id,
+                "fill_price": None, "qty": qty, "side": side}
+
+    def on_bar(self, ts: float, candle: Dict[str, Any], tracker: Any = None) -> List[Dict[str, Any]]:
+        """Matching de la bougie puis application des fills au tracker (thread de la boucle)."""
+        close = float(candle["close"] if "close" in candle else candle["price"])
+        self.exchange.on_bar(ts, float(candle.get("open", close)), float(candle.get("high", close)),
+                             float(candle.get("low", close)), close, candle.get("volume"))
+        return self.lifecycle.apply_fills(tracker)
+
+
+# ------------------------------------------------------------
+# Version vectorisée (replays / benchmarks)
+# ------------------------------------------------------------
+
+def simulate_market_orders(
+    bar_ts: np.ndarray,
+    bar_open: np.ndarray,
+    submit_ts: np.ndarray,
+    side: np.ndarray,
+    config: Optional[SimConfig] = None,
+    *,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Ordres marché en lot (sans fills partiels) : même règle que SimExchange.on_bar pour la bougie
+    d'exécution et le prix (open + slippage adverse). side : +1 achat, -1 vente.
+    Renvoie bar_idx (-1 = pas de bougie après l'arrivée), fill_ts, fill_price, latency.
+    """
+    cfg = config or SimConfig()
+    rng = rng if rng is not None else np.random.default_rng(cfg.seed)
+    n = len(submit_ts)
+    if cfg.latency == "fixed" or cfg.latency_jitter_ms <= 0:
+        lat = np.full(n, cfg.latency_ms / 1000.0)
+    elif cfg.latency == "uniform":
+        lo = max(0.0, cfg.latency_ms - cfg.latency_jitter_ms)
+        lat = rng.uniform(lo, cfg.latency_ms + cfg.latency_jitter_ms, n) / 1000.0
+    elif cfg.latency_ms <= 0:
+        lat = np.zeros(n)
+    else:
+        sigma2 = math.log(1.0 + (cfg.latency_jitter_ms / cfg.latency_ms) ** 2)
+        lat = rng.lognormal(math.log(cfg.latency_ms) - sigma2 / 2, math.sqrt(sigma2), n) / 1000.0
+    active = submit_ts + lat
+
+    # première bougie telle que ts >= décision et ts + bar_seconds > arrivée
+    idx = np.maximum(np.searchsorted(bar_ts, submit_ts, side="left"),
+                     np.searchsorted(bar_ts + cfg.bar_seconds, active, side="right"))
+    valid = idx < len(bar_ts)
+    safe = np.where(valid, idx, 0)
+    slip = np.full(n, cfg.slippage_ticks, dtype=float)
+    if cfg.slippage_jitter_ticks > 0:
+        slip += rng.integers(0, cfg.slippage_jitter_ticks + 1, n)
+    price = bar_open[safe] + side * slip * cfg.tick_size
+    return {
+        "bar_idx": np.where(valid, idx, -1),
+        "fill_ts": np.where(valid, np.maximum(bar_ts[safe], active), np.nan),
+        "fill_price": np.where(valid, price, np.nan),
+        "latency": lat,
+    }
+
+
+def benchmark(n_orders: int = 1_000_000, n_bars: int = 100_000, *, seed: int = 0) -> Dict[str, float]:
+    """Débit du simulateur : moteur événementiel (1 ordre / bougie) et version vectorisée."""
+    cfg = SimConfig(seed=seed, slippage_ticks=0.5, slippage_jitter_ticks=1)
+    rng = np.random.default_rng(seed)
+    bar_ts = np.arange(n_bars, dtype=float) * cfg.bar_seconds
+    bar_open = 120.0 + np.cumsum(rng.normal(0, cfg.tick_size, n_bars))
+
+    t0 = time.perf_counter()
+    simulate_market_orders(bar_ts, bar_open, rng.uniform(0, bar_ts[-1], n_orders), rng.choice([-1, 1], n_orders), cfg)
+    vec_s = time.perf_counter() - t0
+
+    n_event = min(n_orders, n_bars)
+    ex = SimExchange(cfg)
+    t0 = time.perf_counter()
+    for i in range(n_event):
+        o = bar_open[i]
+        ex.on_bar(bar_ts[i], o, o + 0.0625, o - 0.0625, o)
+        ex.submit("BUY" if i % 2 else "SELL", 1, ts=bar_ts[i] + cfg.bar_seconds, ref_price=o)
+    event_s = time.perf_counter() - t0
+    return {
+        "vectorized_orders_per_min": n_orders / vec_s * 60 if vec_s else float("inf"),
+        "event_orders_per_min": n_event / event_s * 60 if event_s else float("inf"),
+        "event_fills": float(ex.n_fills),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de l'exchange simulé")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--bars", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    stats = benchmark(args.orders, args.bars)
+    print(f"📈 Vectorisé : {stats['vectorized_orders_per_min'] / 1e6:.1f} M ordres/min | "
+          f"événementiel : {stats['event_orders_per_min'] / 1e6:.2f} M ordres/min ({int(stats['event_fills'])} fills)")
+
+
+if __name__ == "__main__":
+    main()
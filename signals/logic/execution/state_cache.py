@@ -0,0 +1,347 @@
+# signals/logic/execution/state_cache.py
+"""
+Cache local de l'état broker, lu de façon synchrone (sans réseau) par la boucle live et la CLI.
+
+- ContractCache : contrats (listAvailableContracts, searchContractById en complément) gardés en
+  mémoire et persistés sur disque avec un TTL : pas de requête au redémarrage si le fichier est récent.
+- AccountStateCache : ordres et positions ouverts rafraîchis par un thread de polling
+  (searchOpenOrders / searchOpenPositions). Chaque snapshot est comparé au précédent : seules les
+  différences (ajouts, modifications, suppressions) sont appliquées et notifiées (on_change).
+  Les lecteurs voient un dict remplacé d'un bloc (copy-on-write) : jamais d'état à moitié à jour.
+- pre_trade_check() : contrôles avant ordre (ordres déjà en attente, position max) sur l'état en
+  mémoire, quelques µs au lieu d'un aller-retour réseau.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Positions TopstepX : type 1 = long, 2 = short
+POSITION_LONG, POSITION_SHORT = 1, 2
+
+
+def _ok(resp: Any) -> bool:
+    return isinstance(resp, dict) and resp.get("success") is True and not resp.get("errorCode")
+
+
+def _error_of(resp: Any) -> str:
+    if isinstance(resp, dict):
+        return str(resp.get("errorMessage") or resp.get("error") or resp)
+    return str(resp)
+
+
+@dataclass
+class StateDiff:
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_snapshot(current: Dict[Any, Dict[str, Any]], items: List[Dict[str, Any]], key: str = "id") -> StateDiff:
+    """Différences entre l'état courant (indexé par `key`) et un nouveau snapshot."""
+    diff = StateDiff()
+    seen = set()
+    for item in items:
+        k = item.get(key)
+        seen.add(k)
+        old = current.get(k)
+        if old is None:
+            diff.added.append(item)
+        elif old != item:
+            diff.changed.append(item)
+    diff.removed = [item for k, item in current.items() if k not in seen]
+    return diff
+
+
+def apply_diff(current: Dict[Any, Dict[str, Any]], diff: StateDiff, key: str = "id") -> Dict[Any, Dict[str, Any]]:
+    """Nouveau dict (les entrées inchangées sont conservées telles quelles)."""
+    updated = dict(current)
+    for item in diff.removed:
+        updated.pop(item.get(key), None)
+    for item in diff.added + diff.changed:
+        updated[item.get(key)] = item
+    return updated
+
+
+# ------------------------------------------------------------
+# Contrats
+# ------------------------------------------------------------
+
+class ContractCache:
+    def __init__(
+        self,
+        client: Any,
+        *,
+        path: Optional[str] = None,
+        ttl_seconds: float = 24 * 3600,
+        live: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.path = path
+        self.ttl_seconds = float(ttl_seconds)
+        self.live = bool(live)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._contracts: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, client: Any, api_cfg: Dict[str, Any], *, live: bool = False) -> "ContractCache":
+        path = api_cfg.get("contracts_cache_file")
+        if path and live:
+            root, ext = os.path.splitext(path)
+            path = f"{root}_live{ext}"
+        return cls(client, path=path, ttl_seconds=float(api_cfg.get("contracts_ttl_hours", 24)) * 3600, live=live)
+
+    @property
+    def expired(self) -> bool:
+        return self.fetched_at is None or self._clock() - self.fetched_at > self.ttl_seconds
+
+    def load(self) -> bool:
+        """Recharge le fichier disque s'il existe, correspond au mode (live/sim) et n'a pas expiré."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"[StateCache] ⚠️ Cache contrats illisible ({self.path}) : {e}")
+            return False
+        if bool(data.get("live")) != self.live or self._clock() - float(data.get("fetched_at", 0)) > self.ttl_seconds:
+            return False
+        with self._lock:
+            self._contracts = {c["id"]: c for c in data.get("contracts", []) if "id" in c}
+            self.fetched_at = float(data["fetched_at"])
+        return True
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": self.fetched_at, "live": self.live, "contracts": list(self._contracts.values())}, f)
+        os.replace(tmp, self.path)   # jamais de fichier à moitié écrit
+
+    def refresh(self) -> int:
+        """listAvailableContracts -> remplace le cache (et le fichier) ; renvoie le nombre de contrats."""
+        resp = self.client.post("listAvailableContracts", {"live": self.live})
+        if not _ok(resp):
+            raise RuntimeError(f"listAvailableContracts : {_error_of(resp)}")
+        with self._lock:
+            self._contracts = {c["id"]: c for c in resp.get("contracts", []) if "id" in c}
+            self.fetched_at = self._clock()
+            self._save()
+        return len(self._contracts)
+
+    def ensure(self) -> "ContractCache":
+        """Disque si récent, sinon réseau : à appeler au démarrage (ou quand le TTL est dépassé)."""
+        if self.expired and not self.load():
+            self.refresh()
+        return self
+
+    def get(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        """Lecture mémoire uniquement."""
+        return self._contracts.get(contract_id)
+
+    def fetch(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        """Mémoire, sinon searchContractById (résultat ajouté au cache)."""
+        contract = self.get(contract_id)
+        if contract is not None:
+            return contract
+        resp = self.client.post("searchContractById", {"contractId": contract_id})
+        contract = resp.get("contract") if _ok(resp) else None
+        if contract:
+            with self._lock:
+                self._contracts = {**self._contracts, contract_id: contract}
+                self.fetched_at = self.fetched_at or self._clock()
+                self._save()
+        return contract
+
+    def search(self, text: str) -> List[Dict[str, Any]]:
+        needle = text.lower()
+        return [c for c in self._contracts.values()
+                if any(needle in str(c.get(k) or "").lower() for k in ("id", "name", "description"))]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._contracts.values())
+
+
+# ------------------------------------------------------------
+# Ordres / positions ouverts
+# ------------------------------------------------------------
+
+class AccountStateCache:
+    def __init__(
+        self,
+        client: Any,
+        account_id: Any,
+        *,
+        poll_interval: float = 2.0,
+        on_change: Optional[Callable[[str, StateDiff], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.account_id = account_id
+        self.poll_interval = float(poll_interval)
+        self.on_change = on_change
+        self._clock = clock
+        self._orders: Dict[Any, Dict[str, Any]] = {}
+        self._positions: Dict[Any, Dict[str, Any]] = {}
+        self.version = 0
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        trading_cfg: Dict[str, Any],
+        *,
+        client: Any = None,
+        account_id: Any = None,
+        on_change: Optional[Callable[[str, StateDiff], None]] = None,
+    ) -> "AccountStateCache":
+        """on_change est branché avant start() : le premier snapshot (ordres déjà ouverts) est notifié."""
+        if client is None:
+            from signals.api.client import get_client
+            client = get_client()
+        if account_id is None:
+            from signals.utils import env_loader as env
+            account_id = int(env.ACCOUNT_ID) if env.ACCOUNT_ID else None
+        sc = trading_cfg.get("state_cache", {}) or {}
+        return cls(client, account_id, poll_interval=float(sc.get("poll_seconds", 2.0)), on_change=on_change)
+
+    # --- Polling ---
+
+    def _snapshot(self, endpoint: str, field_name: str) -> List[Dict[str, Any]]:
+        resp = self.client.post(endpoint, {"accountId": self.account_id})
+        if not _ok(resp):
+            raise RuntimeError(f"{endpoint} : {_error_of(resp)}")
+        return list(resp.get(field_name) or [])
+
+    def refresh(self) -> bool:
+        """Un cycle de réconciliation ; False (état conservé, last_error renseigné) si l'API échoue."""
+        try:
+            orders = self._snapshot("searchOpenOrders", "orders")
+            positions = self._snapshot("searchOpenPositions", "positions")
+        except Exception as e:
+            if str(e) != self.last_error:
+                logging.warning(f"[StateCache] ⚠️ Réconciliation impossible : {e}")
+            self.last_error = str(e)
+            return False
+
+        changed = False
+        for kind, attr, items in (("orders", "_orders", orders), ("positions", "_positions", positions)):
+            diff = diff_snapshot(getattr(self, attr), items)
+            if diff:
+                setattr(self, attr, apply_diff(getattr(self, attr), diff))
+                changed = True
+                if self.on_change is not None:
+                    self.on_change(kind, diff)
+        if changed:
+            self.version += 1
+        self.last_refresh = self._clock()
+        self.last_error = None
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> "AccountStateCache":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="account-state-cache", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> "AccountStateCache":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # --- Lectures synchrones (mémoire) ---
+
+    def orders(self) -> List[Dict[str, Any]]:
+        return list(self._orders.values())
+
+    def positions(self) -> List[Dict[str, Any]]:
+        return list(self._positions.values())
+
+    def net_position(self, contract_id: Optional[str] = None) -> float:
+        """Taille nette (long > 0, short < 0), tous contrats ou un seul."""
+        net = 0.0
+        for pos in self._positions.values():
+            if contract_id is not None and pos.get("contractId") != contract_id:
+                continue
+            size = float(pos.get("size") or 0)
+            net += -size if pos.get("type") == POSITION_SHORT else size
+        return net
+
+    def age(self) -> Optional[float]:
+        return None if self.last_refresh is None else self._clock() - self.last_refresh
+
+    def pre_trade_check(
+        self,
+        *,
+        side: str,
+        qty: float,
+        contract_id: Optional[str] = None,
+        max_open_orders: Optional[int] = None,
+        max_position: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> Optional[str]:
+        """Raison du refus, ou None si l'ordre peut partir (état trop ancien : contrôles ignorés)."""
+        age = self.age()
+        if age is None or (max_age is not None and age > max_age):
+            logging.warning("[StateCache] ⚠️ État broker périmé : contrôles pré-trade ignorés")
+            return None
+        if max_open_orders is not None:
+            working = [o for o in self._orders.values() if contract_id is None or o.get("contractId") == contract_id]
+            if len(working) >= max_open_orders:
+                return f"ordres ouverts broker : {len(working)}"
+        if max_position is not None:
+            signed = qty if side.upper() == "BUY" else -qty
+            after = self.net_position(contract_id) + signed
+            if abs(after) > max_position:
+                return f"position max dépassée ({after:+g} > {max_position:g})"
+        return None
+
+
+# ------------------------------------------------------------
+# Cache contrats partagé (CLI)
+# ------------------------------------------------------------
+
+_contracts: Dict[bool, ContractCache] = {}
+_contracts_lock = threading.Lock()
+
+
+def get_contract_cache(client: Any, *, live: bool = False) -> ContractCache:
+    """Cache contrats du process (mode live et sim séparés), configuré par la section api."""
+    with _contracts_lock:
+        cache = _contracts.get(live)
+        if cache is None:
+            from signals.utils import config_reader
+            api_cfg = (config_reader.load_config() or {}).get("api", {}) or {}
+            cache = _contracts[live] = ContractCache.from_config(client, api_cfg, live=live)
+        return cache
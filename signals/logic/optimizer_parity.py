@@ -46,12 +46,15 @@ def get_active_schedule(
     Renvoie (label, config) du premier schedule actif correspondant à hour_utc.
     Détermination *strictement* basée sur l'ordre du dict (insertion du JSON).
     Aucune logique de 'meilleur fit' n'est appliquée.
+    Lookup O(1) dans l'index compilé (ScheduleMode.HALF_OPEN = sémantique de is_in_schedule).
     """
+    from signals.optimizer.schedule_index import ScheduleMode, get_schedule_index
+
     # ⚠️ Ne surtout pas trier ni re-construire le dict ici
-    for label, scfg in optimizer_cfg_by_schedule.items():
-        if is_in_schedule(hour_utc, scfg):
-            return label, scfg
-    return None
+    label = get_schedule_index(optimizer_cfg_by_schedule, ScheduleMode.HALF_OPEN).label_for_hour(hour_utc)
+    if label is None:
+        return None
+    return label, optimizer_cfg_by_schedule[label]
 
 
 def decide_entry_from_features(
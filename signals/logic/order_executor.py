@@ -16,6 +16,7 @@ def execute_and_track_order(
     limit_price: Optional[float],
     market_price: Optional[float],
     tracker,
+    lifecycle=None,
 ) -> Dict[str, Any]:
     return rn.execute_and_track_order(
         symbol=symbol,
@@ -24,4 +25,24 @@ def execute_and_track_order(
         limit_price=limit_price,
         market_price=market_price,
         tracker=tracker,
+        lifecycle=lifecycle,
+    )
+
+
+def submit_order(
+    inflight,
+    *,
+    symbol: str,
+    side: str,
+    qty: float,
+    limit_price: Optional[float],
+    market_price: Optional[float],
+) -> Dict[str, Any]:
+    return rn.submit_order(
+        inflight,
+        symbol=symbol,
+        side=side,
+        qty=qty,
+        limit_price=limit_price,
+        market_price=market_price,
     )
@@ -18,6 +18,7 @@ from signals.loaders.config_loader import (
 )
 from signals.utils.time_utils import get_current_hour_label
 from signals.utils.config_reader import load_config
+from signals.feeds.ohlcv_store import load_ohlcv_frame
 
 cfg = load_config("config.yaml")
 
@@ -54,7 +55,7 @@ def decide_trade(data_path: str = None):
     Applique les features, fait une prédiction, et retourne un signal si pertinent.
     """
     data_path = data_path or get_live_data_path()
-    df = pd.read_csv(data_path)
+    df = load_ohlcv_frame(data_path)
     if df.empty:
         print("⚠️ Données vides, impossible de décider.")
         return None
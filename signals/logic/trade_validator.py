@@ -8,7 +8,8 @@ from datetime import datetime, time
 from typing import Any, Dict, List, Optional, Tuple
 
 from signals.utils.config_reader import load_config
-from signals.loaders.config_loader import load_json_config
+from signals.optimizer.optimizer_rules import load_optimizer_config
+from signals.optimizer.schedule_index import ScheduleIndex
 
 
 @dataclass
@@ -64,14 +65,22 @@ def _within_windows(ts: datetime, windows: List[TimeWindow]) -> bool:
     if not windows:
         # pas de fenêtres = toujours permis
         return True
-    weekday = ts.weekday()
-    t = ts.time()
-    for w in windows:
-        if w.days is not None and weekday not in w.days:
-            continue
-        if w.start <= t <= w.end:
-            return True
-    return False
+    return _windows_index(windows).index_at(ts) >= 0
+
+
+_windows_cache: List[Tuple[Tuple[Any, ...], ScheduleIndex]] = []
+
+
+def _windows_index(windows: List[TimeWindow]) -> ScheduleIndex:
+    """Index (jour, minute) des fenêtres, construit une fois par jeu de fenêtres distinct."""
+    key = tuple((w.start, w.end, tuple(w.days) if w.days is not None else None) for w in windows)
+    for k, index in _windows_cache:
+        if k == key:
+            return index
+    index = ScheduleIndex.from_windows(windows)
+    _windows_cache.append((key, index))
+    del _windows_cache[:-16]
+    return index
 
 
 def _min_prob_from_yaml(cfg: Dict[str, Any]) -> Optional[float]:
@@ -115,7 +124,7 @@ def is_signal_tradable(
         # si la config horaire n’est pas dispo, on n’impose pas de contrainte horaire
         return True, "no_optimizer_schedule"
 
-    optimizer_cfg = load_json_config(opt_path)
+    optimizer_cfg = load_optimizer_config(opt_path)  # mis en cache (re-parsé si modifié)
 
     # il peut y avoir une structure par symbole ; si oui on essaie d'attraper
     sym_block = None
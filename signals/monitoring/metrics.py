@@ -12,10 +12,24 @@ ORDERS_TOTAL: Optional[Counter] = None           # labels: status
 EQUITY_GAUGE: Optional[Gauge] = None
 DRAWDOWN_GAUGE: Optional[Gauge] = None
 N_TRADES_GAUGE: Optional[Gauge] = None
+STAGE_LATENCY: Optional[Histogram] = None        # labels: stage (feed, features, predict, ...)
+FEED_LAG_GAUGE: Optional[Gauge] = None
+CIRCUIT_STATE_GAUGE: Optional[Gauge] = None      # labels: family (0 fermé, 1 essai, 2 ouvert)
+RATE_TOKENS_GAUGE: Optional[Gauge] = None        # labels: family
+THROTTLED_TOTAL: Optional[Counter] = None        # labels: family, reason (rate, circuit)
+FILL_LATENCY: Optional[Histogram] = None         # labels: side (signal -> fill complet)
+FILL_SLIPPAGE: Optional[Histogram] = None        # labels: side (ticks, positif = défavorable)
+
+# bornes (s) adaptées à des étapes de l'ordre de la ms
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+FILL_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+SLIPPAGE_BUCKETS = (-4.0, -2.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
 
 
 def start_prometheus_server(*, enabled: bool, addr: str, port: int, namespace: str = "vwap_signal") -> None:
     global _metrics_started, SIGNALS_TOTAL, API_LATENCY, ORDERS_TOTAL, EQUITY_GAUGE, DRAWDOWN_GAUGE, N_TRADES_GAUGE
+    global STAGE_LATENCY, FEED_LAG_GAUGE, CIRCUIT_STATE_GAUGE, RATE_TOKENS_GAUGE, THROTTLED_TOTAL
+    global FILL_LATENCY, FILL_SLIPPAGE
     if not enabled or _metrics_started:
         return
 
@@ -27,6 +41,18 @@ def start_prometheus_server(*, enabled: bool, addr: str, port: int, namespace: s
     EQUITY_GAUGE = Gauge(f"{namespace}_equity", "Equity courante")
     DRAWDOWN_GAUGE = Gauge(f"{namespace}_drawdown", "Drawdown courant")
     N_TRADES_GAUGE = Gauge(f"{namespace}_n_trades", "Nombre de trades exécutés")
+    STAGE_LATENCY = Histogram(f"{namespace}_stage_latency_seconds", "Durée par étape de la boucle live",
+                              ["stage"], buckets=STAGE_BUCKETS)
+    FEED_LAG_GAUGE = Gauge(f"{namespace}_feed_lag_seconds", "Retard du feed (horloge - heure de la bougie)")
+    CIRCUIT_STATE_GAUGE = Gauge(f"{namespace}_circuit_state", "État du disjoncteur API (0 fermé, 1 essai, 2 ouvert)",
+                                ["family"])
+    RATE_TOKENS_GAUGE = Gauge(f"{namespace}_rate_limit_tokens", "Jetons disponibles du limiteur API", ["family"])
+    THROTTLED_TOTAL = Counter(f"{namespace}_api_throttled_total", "Appels API retardés ou refusés localement",
+                              ["family", "reason"])
+    FILL_LATENCY = Histogram(f"{namespace}_signal_to_fill_seconds", "Latence signal -> fill complet par ordre",
+                             ["side"], buckets=FILL_LATENCY_BUCKETS)
+    FILL_SLIPPAGE = Histogram(f"{namespace}_fill_slippage_ticks", "Slippage par ordre (ticks, positif = défavorable)",
+                              ["side"], buckets=SLIPPAGE_BUCKETS)
 
     _metrics_started = True
 
@@ -56,3 +82,40 @@ def set_perf_gauges(snapshot: Dict[str, Any]) -> None:
         DRAWDOWN_GAUGE.set(float(snapshot["drawdown"]))
     if N_TRADES_GAUGE is not None and "n_trades" in snapshot:
         N_TRADES_GAUGE.set(float(snapshot["n_trades"]))
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    if STAGE_LATENCY is None:
+        return
+    STAGE_LATENCY.labels(stage=stage).observe(max(0.0, seconds))
+
+
+def set_feed_lag(seconds: float) -> None:
+    if FEED_LAG_GAUGE is None:
+        return
+    FEED_LAG_GAUGE.set(float(seconds))
+
+
+def set_circuit_state(family: str, state: int) -> None:
+    if CIRCUIT_STATE_GAUGE is None:
+        return
+    CIRCUIT_STATE_GAUGE.labels(family=family).set(float(state))
+
+
+def set_rate_tokens(family: str, tokens: float) -> None:
+    if RATE_TOKENS_GAUGE is None:
+        return
+    RATE_TOKENS_GAUGE.labels(family=family).set(float(tokens))
+
+
+def inc_throttled(family: str, reason: str) -> None:
+    if THROTTLED_TOTAL is None:
+        return
+    THROTTLED_TOTAL.labels(family=family, reason=reason).inc()
+
+
+def observe_fill(side: str, latency_seconds: Optional[float], slippage_ticks: Optional[float]) -> None:
+    if FILL_LATENCY is not None and latency_seconds is not None:
+        FILL_LATENCY.labels(side=side).observe(max(0.0, latency_seconds))
+    if FILL_SLIPPAGE is not None and slippage_ticks is not None:
+        FILL_SLIPPAGE.labels(side=side).observe(slippage_ticks)
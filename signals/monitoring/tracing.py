@@ -0,0 +1,138 @@
+# signals/monitoring/tracing.py
+"""
+Chronométrage par étape de la boucle live (une trace par bougie).
+
+- span("stage") : context manager léger (perf_counter, __slots__) utilisable n'importe où
+  dans le chemin de décision ; sans trace en cours il ne fait que deux perf_counter().
+- BarTracer.begin()/end() encadrent le traitement d'une bougie une fois lue : l'attente du feed
+  (~300 s par bougie en data.follow) n'est pas comptée, seule la lecture l'est (étape "feed").
+  Chaque étape est exportée dans l'histogramme Prometheus <ns>_stage_latency_seconds{stage},
+  le retard du feed dans <ns>_feed_lag_seconds, et, si monitoring.traces.enabled, une ligne
+  NDJSON par bougie pour l'analyse hors ligne.
+- Étapes : feed, decision (process_signal complet), features, predict, validate, execute,
+  log, checkpoint, total. Les étapes imbriquées (features/predict dans decision) sont
+  comptées séparément.
+
+Coût : quelques µs par bougie (dict + observe), négligeable devant le traitement d'une bougie.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TextIO
+
+from signals.monitoring import metrics
+
+_perf = time.perf_counter
+
+
+class BarTrace:
+    __slots__ = ("t0", "spans")
+
+    def __init__(self) -> None:
+        self.t0 = _perf()
+        self.spans: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.spans[stage] = self.spans.get(stage, 0.0) + seconds
+
+
+# trace de la bougie en cours (boucle live mono-thread)
+_current: Optional[BarTrace] = None
+
+
+class span:
+    """with span("features"): ...  -> ajoute la durée à la trace de la bougie en cours."""
+
+    __slots__ = ("stage", "t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "span":
+        self.t0 = _perf()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        bar = _current
+        if bar is not None:
+            bar.add(self.stage, _perf() - self.t0)
+
+
+class BarTracer:
+    def __init__(self, *, trace_file: Optional[str] = None, flush_every: int = 50):
+        self.trace_file = trace_file
+        self.flush_every = max(1, int(flush_every))
+        self._fh: Optional[TextIO] = None
+        self._pending = 0
+        if trace_file:
+            os.makedirs(os.path.dirname(trace_file) or ".", exist_ok=True)
+            self._fh = open(trace_file, "a", encoding="utf-8", buffering=1 << 16)
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "BarTracer":
+        tr = ((cfg.get("monitoring") or {}).get("traces") or {})
+        if not tr.get("enabled", False):
+            return cls()
+        return cls(trace_file=tr.get("file", "logs/bar_traces.ndjson"), flush_every=int(tr.get("flush_every", 50)))
+
+    def begin(self, feed_seconds: Optional[float] = None) -> BarTrace:
+        """
+        Ouvre la trace d'une bougie déjà lue. feed_seconds = durée de lecture seule (hors attente
+        de la bougie suivante en data.follow) : comptée en étape "feed" et incluse dans "total".
+        """
+        global _current
+        _current = BarTrace()
+        if feed_seconds is not None:
+            _current.t0 -= feed_seconds
+            _current.add("feed", feed_seconds)
+        return _current
+
+    def discard(self) -> None:
+        """Bougie ignorée (ex: déjà traitée) : pas d'export."""
+        global _current
+        _current = None
+
+    def end(self, candle_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Clôt la trace : export Prometheus (+ NDJSON). Renvoie l'enregistrement de la trace."""
+        global _current
+        bar, _current = _current, None
+        if bar is None:
+            return None
+        total = _perf() - bar.t0
+        for stage, seconds in bar.spans.items():
+            metrics.observe_stage(stage, seconds)
+        metrics.observe_stage("total", total)
+
+        lag = None
+        if candle_time is not None:
+            lag = time.time() - candle_time.timestamp()
+            metrics.set_feed_lag(lag)
+
+        record = {
+            "candle_time": candle_time.isoformat() if candle_time is not None else None,
+            "feed_lag_s": lag,
+            "total_s": total,
+            "stages": bar.spans,
+        }
+        if self._fh is not None:
+            record["wall_time"] = datetime.now(timezone.utc).isoformat()
+            self._fh.write(json.dumps(record) + "\n")
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._fh.flush()
+                self._pending = 0
+        return record
+
+    def close(self) -> None:
+        global _current
+        _current = None
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+                self._fh.close()
+            finally:
+                self._fh = None
@@ -0,0 +1,181 @@
+# signals/optimizer/hot_reload.py
+"""
+Hot-reload du JSON optimizer (config_optimale_vwap_mr_ALL.json) sans redémarrer la boucle live.
+
+- Un thread de fond (réveillé par watchdog sur le répertoire du fichier, avec poll de secours)
+  re-parse et valide le fichier ; une version valide et différente est mise en attente.
+- La boucle live appelle apply_pending() entre deux bougies : le remplacement est un simple
+  échange de référence, le chemin de décision ne fait jamais d'I/O. La version en attente est
+  protégée par un verrou (pris brièvement, jamais pendant la lecture du fichier) : une version
+  mise en attente pendant l'activation de la précédente n'est pas perdue.
+- Un fichier invalide (JSON cassé, écriture en cours, validation KO) est ignoré : la version
+  en service reste active.
+- Le diff (clés ajoutées / supprimées / modifiées) est loggé à l'application.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from signals.optimizer.optimizer_rules import diff_optimizer_config, validate_optimizer_config
+
+try:  # dépendance de requirements.txt ; fallback en polling si absente
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None  # type: ignore[assignment]
+
+
+class _FileChanged(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(self, path: str, event: threading.Event):
+        self._path = os.path.normcase(os.path.abspath(path))
+        self._event = event
+
+    def on_any_event(self, event) -> None:
+        for p in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if p and os.path.normcase(os.path.abspath(p)) == self._path:
+                self._event.set()
+                return
+
+
+class OptimizerReloader:
+    """Détient la config optimizer en service et la remplace à chaud par la dernière version valide."""
+
+    def __init__(
+        self,
+        path: str,
+        initial: Optional[Dict[str, Any]] = None,
+        *,
+        poll_interval: float = 5.0,
+        debounce: float = 0.25,
+        use_watchdog: bool = True,
+    ):
+        self.path = path
+        self.poll_interval = float(poll_interval)
+        self.debounce = float(debounce)
+        self.use_watchdog = use_watchdog
+        self._current: Dict[str, Any] = initial if initial is not None else self._read()
+        self._pending: Optional[Tuple[Dict[str, Any], List[str]]] = None
+        self._lock = threading.Lock()       # _pending / _current : thread de fond <-> boucle live
+        self._stamp = self._stat()
+        self.version = 1
+        self._event = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    # ------------------------------------------------------------
+    # Lecture / validation (thread de fond)
+    # ------------------------------------------------------------
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _read(self) -> Dict[str, Any]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def check(self) -> bool:
+        """
+        Relit le fichier s'il a changé ; met en attente une nouvelle version valide.
+        Renvoie True si une version a été mise en attente.
+        """
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return False
+        try:
+            new = self._read()
+        except (OSError, ValueError) as e:
+            # écriture en cours ou JSON cassé : on retentera au prochain évènement / poll
+            logging.warning(f"[OptimizerReload] lecture impossible {self.path}: {e}")
+            return False
+        self._stamp = stamp
+
+        errors = validate_optimizer_config(new)
+        if errors:
+            logging.error(f"[OptimizerReload] ❌ nouvelle config rejetée ({len(errors)} erreurs): {errors}")
+            return False
+        with self._lock:
+            pending = self._pending
+            if not diff_optimizer_config(self._current if pending is None else pending[0], new):
+                return False
+            self._pending = (new, diff_optimizer_config(self._current, new))
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            woke = self._event.wait(self.poll_interval)
+            if self._stop.is_set():
+                break
+            if woke:
+                # laisse l'écrivain terminer (rafales d'évènements pendant une écriture)
+                self._stop.wait(self.debounce)
+                self._event.clear()
+            try:
+                self.check()
+            except Exception as e:  # le thread de fond ne doit jamais mourir
+                logging.exception(f"[OptimizerReload] erreur: {e}")
+
+    # ------------------------------------------------------------
+    # API boucle live
+    # ------------------------------------------------------------
+
+    @property
+    def current(self) -> Dict[str, Any]:
+        return self._current
+
+    def apply_pending(self) -> bool:
+        """À appeler entre deux bougies : active la version en attente (échange de référence)."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is None:
+                return False
+            new, diff = pending
+            self._current = new
+            self.version += 1
+            version = self.version
+        logging.info(f"[OptimizerReload] 🔄 config optimizer v{version} activée ({len(diff)} changements)")
+        for line in diff:
+            logging.info(f"[OptimizerReload]   {line}")
+        return True
+
+    def start(self) -> "OptimizerReloader":
+        if self._thread is not None:
+            return self
+        if self.use_watchdog and Observer is not None:
+            try:
+                obs = Observer()
+                obs.schedule(_FileChanged(self.path, self._event),
+                             os.path.dirname(os.path.abspath(self.path)), recursive=False)
+                obs.daemon = True
+                obs.start()
+                self._observer = obs
+            except Exception as e:
+                logging.warning(f"[OptimizerReload] watchdog indisponible ({e}) -> polling {self.poll_interval}s")
+        self._thread = threading.Thread(target=self._run, name="optimizer-reload", daemon=True)
+        self._thread.start()
+        logging.info(f"[OptimizerReload] surveillance de {self.path}")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._event.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
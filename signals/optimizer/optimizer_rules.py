@@ -3,10 +3,15 @@
 import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+from signals.optimizer.schedule_index import ScheduleMode, get_schedule_index, in_hour_range_closed
+from signals.utils.file_cache import FileCache, read_only
 
-@dataclass
+_cache = FileCache(lambda text: read_only(json.loads(text)))
+
+
+@dataclass(frozen=True)
 class ScheduleConfig:
     name: str
     hour_start: int
@@ -23,48 +28,113 @@ class ScheduleConfig:
 
 
 def load_optimizer_config(path: str) -> Dict[str, Any]:
+    """JSON optimizer, re-parsé uniquement si le fichier a changé (dict partagé en lecture seule)."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"[OptimizerConfig] Introuvable: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _cache.load(path)
 
 
-def _is_hour_in_range(hour: int, start: int, end: int) -> bool:
+def validate_optimizer_config(optimizer_root: Any) -> List[str]:
     """
-    Gère aussi le cas fenêtré sur minuit. Ex: start=22, end=2 -> heures 22,23,0,1,2
+    Contrôle structurel d'un JSON optimizer avant mise en service (hot-reload).
+    Renvoie la liste des erreurs (vide si OK).
     """
-    if start <= end:
-        return start <= hour <= end
-    return hour >= start or hour <= end
+    errors: List[str] = []
+    if not isinstance(optimizer_root, Mapping):
+        return ["racine JSON non-objet"]
+    by_schedule = optimizer_root.get("CONFIGURATIONS_BY_SCHEDULE")
+    if not isinstance(by_schedule, Mapping) or not by_schedule:
+        return ["CONFIGURATIONS_BY_SCHEDULE absent ou vide"]
+    for name, sc in by_schedule.items():
+        if not isinstance(sc, Mapping):
+            errors.append(f"{name}: configuration non-objet")
+            continue
+        try:
+            sch = _schedule_from_cfg(name, sc)
+        except (TypeError, ValueError, AttributeError) as e:
+            errors.append(f"{name}: valeur invalide ({e})")
+            continue
+        if not (0 <= sch.hour_start <= 24 and 0 <= sch.hour_end <= 24):
+            errors.append(f"{name}: HOUR_RANGE hors [0, 24] ({sch.hour_start}-{sch.hour_end})")
+        if not (0.0 <= sch.ml_threshold <= 1.0):
+            errors.append(f"{name}: ML_THRESHOLD hors [0, 1] ({sch.ml_threshold})")
+        if sch.fixed_lots <= 0:
+            errors.append(f"{name}: FIXED_LOTS doit être > 0 ({sch.fixed_lots})")
+    return errors
+
+
+def _flatten(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    if isinstance(obj, Mapping):
+        out: Dict[str, Any] = {}
+        for k, v in obj.items():
+            out.update(_flatten(v, f"{prefix}.{k}" if prefix else str(k)))
+        return out
+    return {prefix: obj}
+
+
+def diff_optimizer_config(old: Mapping[str, Any], new: Mapping[str, Any]) -> List[str]:
+    """Différences lisibles entre deux JSON optimizer (une ligne par clé ajoutée/supprimée/modifiée)."""
+    a, b = _flatten(old or {}), _flatten(new or {})
+    lines = []
+    for key in sorted(set(a) | set(b)):
+        if key not in a:
+            lines.append(f"+ {key} = {b[key]!r}")
+        elif key not in b:
+            lines.append(f"- {key} (était {a[key]!r})")
+        elif a[key] != b[key]:
+            lines.append(f"~ {key}: {a[key]!r} -> {b[key]!r}")
+    return lines
+
+
+# sémantique historique "fin incluse" (ScheduleMode.CLOSED)
+_is_hour_in_range = in_hour_range_closed
+
+
+def _schedule_from_cfg(name: str, sc: Mapping[str, Any]) -> ScheduleConfig:
+    risk = sc.get("RISK_MANAGEMENT", {})
+    vwap_cfg = sc.get("VWAP_CONFIG", {})
+    return ScheduleConfig(
+        name=name,
+        hour_start=int(sc.get("HOUR_RANGE_START", 0)),
+        hour_end=int(sc.get("HOUR_RANGE_END", 23)),
+        ml_threshold=float(sc.get("ML_THRESHOLD", 0.5)),
+        fixed_lots=float(risk.get("FIXED_LOTS", 1.0)),
+        tp_type=str(risk.get("TP_TYPE", "vwap_level")),
+        tp_ticks=float(risk.get("TP_TICKS", 4)),
+        atr_period=int(risk.get("ATR_PERIOD", 14)),
+        atr_multiplier=float(risk.get("ATR_MULTIPLIER", 1.5)),
+        vwap_period=str(vwap_cfg.get("vwap_period", "session_RTH")),
+        entry_threshold=float(vwap_cfg.get("entry_threshold", 1.0)),
+        exit_type=str(vwap_cfg.get("exit_type", "cross")),
+    )
+
+
+_compiled: Tuple[Any, Tuple[ScheduleConfig, ...]] = (None, ())
+
+
+def compile_schedules(by_schedule: Mapping[str, Mapping[str, Any]]) -> Tuple[ScheduleConfig, ...]:
+    """
+    Table typée (ordre du JSON) des schedules. Le dernier résultat est mémorisé par identité
+    de `by_schedule` : appels répétés sur la même config = aucune reconstruction.
+    """
+    global _compiled
+    src, table = _compiled
+    if src is by_schedule:
+        return table
+    table = tuple(_schedule_from_cfg(name, sc) for name, sc in by_schedule.items())
+    _compiled = (by_schedule, table)
+    return table
 
 
 def select_active_schedule(optimizer_cfg: Dict[str, Any], hour_utc: int) -> Optional[ScheduleConfig]:
     """
     Sélectionne une schedule active à l'heure donnée (UTC).
     Retourne la première qui matche (tu peux affiner avec un score si besoin).
+    Lookup O(1) dans l'index compilé (ScheduleMode.CLOSED : fin incluse).
     """
     by_schedule = optimizer_cfg.get("CONFIGURATIONS_BY_SCHEDULE", {})
-    for name, sc in by_schedule.items():
-        start = int(sc.get("HOUR_RANGE_START", 0))
-        end = int(sc.get("HOUR_RANGE_END", 23))
-        if _is_hour_in_range(hour_utc, start, end):
-            risk = sc.get("RISK_MANAGEMENT", {})
-            vwap_cfg = sc.get("VWAP_CONFIG", {})
-            return ScheduleConfig(
-                name=name,
-                hour_start=start,
-                hour_end=end,
-                ml_threshold=float(sc.get("ML_THRESHOLD", 0.5)),
-                fixed_lots=float(risk.get("FIXED_LOTS", 1.0)),
-                tp_type=str(risk.get("TP_TYPE", "vwap_level")),
-                tp_ticks=float(risk.get("TP_TICKS", 4)),
-                atr_period=int(risk.get("ATR_PERIOD", 14)),
-                atr_multiplier=float(risk.get("ATR_MULTIPLIER", 1.5)),
-                vwap_period=str(vwap_cfg.get("vwap_period", "session_RTH")),
-                entry_threshold=float(vwap_cfg.get("entry_threshold", 1.0)),
-                exit_type=str(vwap_cfg.get("exit_type", "cross")),
-            )
-    return None
+    k = get_schedule_index(by_schedule, ScheduleMode.CLOSED).index_for_hour(hour_utc)
+    return compile_schedules(by_schedule)[k] if k >= 0 else None
 
 
 def validate_and_enrich_decision_for_schedule(
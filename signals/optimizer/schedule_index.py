@@ -0,0 +1,166 @@
+# signals/optimizer/schedule_index.py
+"""
+Index compilé (jour de semaine, minute du jour) -> schedule actif, construit une fois par
+version de config et interrogé en O(1) (ou vectoriellement pour un tableau de timestamps).
+
+Les sémantiques historiques sont des modes explicites (résultats identiques aux scans linéaires) :
+- ScheduleMode.HALF_OPEN  : optimizer_parity.is_in_schedule — [start, end), passage de minuit,
+                            durée 0 modulo 24 = journée entière (HOUR_RANGE_START/END, défaut 0/24)
+- ScheduleMode.CLOSED     : optimizer_rules.select_active_schedule — [start, end] inclus,
+                            passage de minuit si start > end (défaut 0/23)
+- ScheduleMode.HOUR_LABEL : time_utils.get_current_hour_label — heure_debut <= h < heure_fin,
+                            sans passage de minuit, schedule ignoré si une borne manque
+- ScheduleMode.WINDOWS    : trade_validator — fenêtres HH:MM [start, end] incluses, filtre jours
+Premier schedule qui matche dans l'ordre du dict (ordre du JSON), -1 si aucun.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from signals.logic.optimizer_parity import is_in_schedule
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ScheduleMode(str, Enum):
+    HALF_OPEN = "half_open"
+    CLOSED = "closed"
+    HOUR_LABEL = "hour_label"
+    WINDOWS = "windows"
+
+
+def in_hour_range_closed(hour: int, start: int, end: int) -> bool:
+    """
+    Gère aussi le cas fenêtré sur minuit. Ex: start=22, end=2 -> heures 22,23,0,1,2
+    """
+    if start <= end:
+        return start <= hour <= end
+    return hour >= start or hour <= end
+
+
+def _closed(hour: int, sc: Mapping[str, Any]) -> bool:
+    return in_hour_range_closed(hour, int(sc.get("HOUR_RANGE_START", 0)), int(sc.get("HOUR_RANGE_END", 23)))
+
+
+def _hour_label(hour: int, sc: Mapping[str, Any]) -> bool:
+    h_start, h_end = sc.get("heure_debut"), sc.get("heure_fin")
+    if h_start is None or h_end is None:
+        return False
+    return h_start <= hour < h_end
+
+
+_HOUR_PREDICATES: Dict[ScheduleMode, Callable[[int, Mapping[str, Any]], bool]] = {
+    ScheduleMode.HALF_OPEN: lambda h, sc: is_in_schedule(h, sc),
+    ScheduleMode.CLOSED: _closed,
+    ScheduleMode.HOUR_LABEL: _hour_label,
+}
+
+
+@dataclass(frozen=True)
+class ScheduleIndex:
+    labels: Tuple[str, ...]
+    mode: ScheduleMode
+    # [jour, minute] -> index du schedule (-1 = aucun), pour un instant pile HH:MM:00 ...
+    at_minute: np.ndarray
+    # ... et pour un instant strictement à l'intérieur de la minute (secondes > 0)
+    in_minute: np.ndarray
+
+    # ------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------
+
+    @classmethod
+    def from_schedules(cls, by_schedule: Mapping[str, Mapping[str, Any]], mode: ScheduleMode) -> "ScheduleIndex":
+        """Modes horaires : 24 évaluations du prédicat historique par schedule."""
+        pred = _HOUR_PREDICATES[ScheduleMode(mode)]
+        labels = tuple(by_schedule.keys())
+        by_hour = np.full(24, -1, dtype=np.int16)
+        for h in range(24):
+            for k, label in enumerate(labels):
+                if pred(h, by_schedule[label]):
+                    by_hour[h] = k
+                    break
+        table = np.broadcast_to(np.repeat(by_hour, 60), (7, MINUTES_PER_DAY))
+        return cls(labels=labels, mode=ScheduleMode(mode), at_minute=table, in_minute=table)
+
+    @classmethod
+    def from_windows(cls, windows: Sequence[Any]) -> "ScheduleIndex":
+        """
+        Fenêtres {start: time, end: time, days: [0..6] | None} (cf. trade_validator.TimeWindow).
+        Bornes à la minute : l'instant HH:MM:30 représente tout l'intérieur de la minute.
+        """
+        at = np.full((7, MINUTES_PER_DAY), -1, dtype=np.int16)
+        inner = np.full((7, MINUTES_PER_DAY), -1, dtype=np.int16)
+        for k in range(len(windows) - 1, -1, -1):   # ordre inverse : la première fenêtre gagne
+            w = windows[k]
+            days = range(7) if w.days is None else [d for d in w.days if 0 <= d < 7]
+            on_at = np.array([w.start <= time(m // 60, m % 60) <= w.end for m in range(MINUTES_PER_DAY)])
+            on_in = np.array([w.start <= time(m // 60, m % 60, 30) <= w.end for m in range(MINUTES_PER_DAY)])
+            for d in days:
+                at[d, on_at] = k
+                inner[d, on_in] = k
+        labels = tuple(f"window_{k}" for k in range(len(windows)))
+        return cls(labels=labels, mode=ScheduleMode.WINDOWS, at_minute=at, in_minute=inner)
+
+    # ------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------
+
+    def lookup(self, weekday: int, minute: int, *, inside: bool = False) -> int:
+        table = self.in_minute if inside else self.at_minute
+        return int(table[weekday % 7, minute % MINUTES_PER_DAY])
+
+    def index_at(self, ts: datetime) -> int:
+        inside = bool(ts.second or ts.microsecond)
+        return self.lookup(ts.weekday(), ts.hour * 60 + ts.minute, inside=inside)
+
+    def index_for_hour(self, hour: int) -> int:
+        """Modes horaires uniquement (indépendants du jour et des minutes)."""
+        return int(self.at_minute[0, (int(hour) % 24) * 60])
+
+    def label_for_hour(self, hour: int) -> Optional[str]:
+        k = self.index_for_hour(hour)
+        return self.labels[k] if k >= 0 else None
+
+    def index_array(self, times: Any) -> np.ndarray:
+        """Index de schedule (-1 = aucun) pour un tableau de timestamps (heure locale des valeurs)."""
+        dt = pd.DatetimeIndex(pd.to_datetime(times))
+        minute = np.asarray(dt.hour * 60 + dt.minute, dtype=np.int64)
+        weekday = np.asarray(dt.weekday, dtype=np.int64)
+        inside = np.asarray((dt.second > 0) | (dt.microsecond > 0) | (dt.nanosecond > 0), dtype=bool)
+        return np.where(inside, self.in_minute[weekday, minute], self.at_minute[weekday, minute]).astype(np.int64)
+
+    def hour_index_array(self, hours: Any) -> np.ndarray:
+        """Modes horaires : index de schedule pour un tableau d'heures."""
+        by_hour = self.at_minute[0, ::60]
+        return by_hour[np.asarray(hours, dtype=np.int64) % 24].astype(np.int64)
+
+
+# ------------------------------------------------------------
+# Cache par version de config (identité de l'objet source)
+# ------------------------------------------------------------
+
+_CACHE_SIZE = 16
+_cache: List[Tuple[Any, ScheduleMode, ScheduleIndex]] = []
+
+
+def get_schedule_index(by_schedule: Mapping[str, Mapping[str, Any]], mode: ScheduleMode) -> ScheduleIndex:
+    """
+    Index compilé pour ce dict de schedules (reconstruit seulement pour un nouvel objet :
+    configs en cache / snapshot = même objet tant que le fichier ne change pas).
+    """
+    mode = ScheduleMode(mode)
+    for src, m, index in _cache:
+        if src is by_schedule and m is mode:
+            return index
+    index = ScheduleIndex.from_schedules(by_schedule, mode)
+    _cache.append((by_schedule, mode, index))
+    del _cache[:-_CACHE_SIZE]
+    return index
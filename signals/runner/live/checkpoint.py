@@ -1,20 +1,47 @@
 import os, json, logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 CHECKPOINT_PATH = os.environ.get("CHECKPOINT_PATH", "checkpoint.json")
 
-def save_checkpoint(timestamp: str, path: Optional[str] = None) -> None:
-    cp = path or CHECKPOINT_PATH
+def _resolve(path: Optional[str]) -> str:
+    # variable d'environnement relue à chaque appel (fixée après l'import par les tests / le lanceur)
+    return path or os.environ.get("CHECKPOINT_PATH") or CHECKPOINT_PATH
+
+def save_checkpoint(
+    timestamp: str,
+    path: Optional[str] = None,
+    *,
+    offset: Optional[int] = None,
+    epoch_ns: Optional[int] = None,
+) -> None:
+    """
+    Persiste le dernier timestamp traité, et si fournis la position du feed juste après
+    cette bougie (offset: octets CSV / index store) et son epoch UTC en ns, pour une reprise
+    directe (voir signals.feeds.realtime.set_resume_point).
+    Écriture atomique (fichier temporaire + os.replace).
+    """
+    cp = _resolve(path)
     os.makedirs(os.path.dirname(cp) or ".", exist_ok=True)
-    with open(cp, "w", encoding="utf-8") as f:
-        json.dump({"last_timestamp": timestamp, "status": "OK"}, f)
+    state: Dict[str, Any] = {"last_timestamp": timestamp, "status": "OK"}
+    if offset is not None:
+        state["offset"] = int(offset)
+    if epoch_ns is not None:
+        state["epoch_ns"] = int(epoch_ns)
+    tmp = cp + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, cp)
     logging.info(f"[Checkpoint] {timestamp} -> {cp}")
 
-def load_checkpoint(path: Optional[str] = None) -> Optional[str]:
-    cp = path or CHECKPOINT_PATH
+def load_checkpoint_state(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Checkpoint complet {last_timestamp, status[, offset, epoch_ns]} ou None."""
+    cp = _resolve(path)
     try:
         with open(cp, "r", encoding="utf-8") as f:
-            return (json.load(f) or {}).get("last_timestamp")
+            return json.load(f) or None
     except Exception as e:
         logging.warning(f"[Checkpoint] lecture échouée {cp}: {e}")
         return None
+
+def load_checkpoint(path: Optional[str] = None) -> Optional[str]:
+    return (load_checkpoint_state(path) or {}).get("last_timestamp")
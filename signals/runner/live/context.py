@@ -3,12 +3,14 @@
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 # ⚠️ Importer les modules (et pas les fonctions) pour permettre le monkeypatch des tests
 import signals.utils.config_reader as cfg_reader
 import signals.optimizer.optimizer_rules as optimizer_rules
 
+from signals.logging.async_writer import AsyncCSVWriter
+from signals.logging.signal_journal import ColumnarSignalLogger
 from signals.logging.signal_logger import SignalLogger
 from signals.metrics.perf_tracker import PerformanceTracker, FuturesSpec
 
@@ -33,13 +35,25 @@ def _ensure_file_exists(path: str) -> None:
     p.touch(exist_ok=True)
 
 
+def _make_signal_logger(log_cfg: dict, sig_csv: str, perf_csv: str, journal_dir: str, csv_writer):
+    """logging.backend: "csv" (défaut) ou "columnar" (journal append-only, cf. signal_journal)."""
+    if str(log_cfg.get("backend", "csv")).lower() == "columnar":
+        return ColumnarSignalLogger(
+            journal_dir,
+            segment_rows=int(log_cfg.get("journal_segment_rows", 1000)),
+            flush_interval=float(log_cfg.get("journal_flush_interval", 60.0)),
+        )
+    return SignalLogger(sig_csv, perf_csv, writer=csv_writer)
+
+
 def init_context():
     """
     Initialise le contexte d’exécution live :
     - charge config.yaml (via module patchable)
     - configure logs JSON si activé (+ crée le fichier tout de suite)
     - démarre serveur Prometheus si activé
-    - instancie SignalLogger, PerformanceTracker, config optimizer (via module patchable)
+    - instancie le logger de signaux (CSV, en tâche de fond si logging.async_writer.enabled,
+      ou journal colonne si logging.backend = "columnar"), PerformanceTracker, config optimizer (via module patchable)
     - calcule le mode (dry_run/prod/shadow_dual) et optionnellement un logger/tracker shadow
     """
     # ✅ Utiliser le module patchable par les tests
@@ -72,7 +86,8 @@ def init_context():
     log_cfg = cfg.get("logging", {}) or {}
     sig_csv = log_cfg.get("signal_csv", "logs/signals_log.csv")
     perf_csv = log_cfg.get("performance_csv", "logs/performance_log.csv")
-    logger = SignalLogger(sig_csv, perf_csv)
+    csv_writer = AsyncCSVWriter.from_config(cfg)  # partagé avec le logger shadow (un seul thread)
+    logger = _make_signal_logger(log_cfg, sig_csv, perf_csv, log_cfg.get("journal_dir", "logs/journal"), csv_writer)
 
     # --- Perf tracker (Futures) principal ---
     gen = cfg.get("general", {}) or {}
@@ -90,13 +105,14 @@ def init_context():
 
     # --- Mode & Shadow optionnel ---
     mode, _ = _resolve_trading_mode(cfg)
-    shadow_logger: Optional[SignalLogger] = None
+    shadow_logger: Optional[Union[SignalLogger, ColumnarSignalLogger]] = None
     shadow_tracker: Optional[PerformanceTracker] = None
 
     if mode == "shadow_dual":
         shadow_sig_csv = log_cfg.get("shadow_signal_csv", "logs/shadow_signals_log.csv")
         shadow_perf_csv = log_cfg.get("shadow_performance_csv", "logs/shadow_performance_log.csv")
-        shadow_logger = SignalLogger(shadow_sig_csv, shadow_perf_csv)
+        shadow_journal = log_cfg.get("shadow_journal_dir", "logs/shadow_journal")
+        shadow_logger = _make_signal_logger(log_cfg, shadow_sig_csv, shadow_perf_csv, shadow_journal, csv_writer)
         shadow_tracker = PerformanceTracker(spec)
         logging.info("🌓 Mode SHADOW activé (dual: réel + simulation).")
 
@@ -1,21 +1,38 @@
 # signals/runner/live/orchestrator.py
 
 import logging
-from typing import Optional
+import os
+from typing import Any, Callable, Optional
+
+import pandas as pd
 
 from signals.runner.live.context import init_context
-from signals.runner.live.checkpoint import save_checkpoint, load_checkpoint
+from signals.runner.live.checkpoint import save_checkpoint, load_checkpoint_state
 from signals.runner.live.pipeline import to_utc_datetime, extract_ts_price, validate_with_optimizer
 
 # Data feed & décision
-from signals.feeds.realtime import get_next_candle
-from signals.logic.decider import process_signal
+from signals.feeds.realtime import get_last_read_seconds, get_next_candle, get_feed_position, set_resume_point
+# modules (et pas les fonctions) : process_signal patchable par les tests quel que soit l'ordre d'import
+import signals.logic.decider as decider
+import signals.logic.decider_live as decider_live
+from signals.features.real_time_features import build_feature_engine
+from signals.feeds.ohlcv_store import load_ohlcv_frame
+from signals.utils.time_utils import datetime_to_ns
+
+# Config optimizer rechargée à chaud
+import signals.loaders.config_snapshot as config_snapshot
+from signals.optimizer.hot_reload import OptimizerReloader
 
 # Exécution ordres (prod)
-from signals.logic.order_executor import execute_and_track_order
+from signals.logic.order_executor import execute_and_track_order, submit_order
+from signals.logic.execution.gateway import InFlightOrders, OrderGateway
+from signals.logic.execution.state_cache import AccountStateCache, StateDiff
+from signals.logic.execution.lifecycle import FillPoller, OrderLifecycle
+from signals.logic.execution.sim_exchange import SimBroker
 
 # Monitoring
 from signals.monitoring.metrics import record_signal, set_perf_gauges
+from signals.monitoring.tracing import BarTracer, span
 
 
 def _log_and_metrics(
@@ -73,40 +90,206 @@ def _log_and_metrics(
         set_perf_gauges(snap)
 
 
+def _start_optimizer_reload(config: dict, optimizer_cfg: dict) -> Optional[OptimizerReloader]:
+    """config_horaire.hot_reload: true -> surveille le JSON optimizer (remplacement entre deux bougies)."""
+    ch = config.get("config_horaire", {}) or {}
+    if not ch.get("hot_reload") or not ch.get("path"):
+        return None
+    reloader = OptimizerReloader(
+        ch["path"],
+        optimizer_cfg,
+        poll_interval=float(ch.get("reload_poll_seconds", 5.0)),
+    ).start()
+    config_snapshot.set_optimizer_provider(lambda: reloader.current)
+    return reloader
+
+
+def _start_feature_engine(config: dict, optimizer_cfg: dict, last_processed: Optional[str]) -> tuple[Any, Any]:
+    """
+    data.incremental_features.enabled -> (moteur de features O(1)/bougie, modèle) ; sinon (None, None).
+    À la reprise sur checkpoint, le moteur est réchauffé avec les warmup_bars bougies précédentes.
+    """
+    data = config.get("data", {}) or {}
+    inc = data.get("incremental_features", {}) or {}
+    if not inc.get("enabled"):
+        return None, None
+    history = None
+    if last_processed:
+        df = load_ohlcv_frame(os.path.join(data.get("data_path") or "", data.get("input_5m") or ""))
+        done = pd.to_datetime(df["time"], utc=True) <= pd.Timestamp(last_processed)
+        history = df[done].tail(int(inc.get("warmup_bars", 500)))
+    engine = build_feature_engine(config, history, optimizer_cfg)
+    from signals.logic.trade_decider import load_model   # xgboost chargé seulement si activé
+    return engine, load_model()
+
+
+def _start_order_gateway(config: dict, is_dry: bool, lifecycle: Optional[OrderLifecycle] = None) -> Optional[InFlightOrders]:
+    """trading.async_orders: true (hors dry_run) -> ordres via la passerelle asyncio, sans attendre la réponse."""
+    if is_dry or not (config.get("trading", {}) or {}).get("async_orders"):
+        return None
+    return InFlightOrders(OrderGateway.from_settings().start(), lifecycle=lifecycle)
+
+
+def _start_order_tracking(config: dict, is_dry: bool, tracker) -> tuple[Optional[OrderLifecycle], Optional[FillPoller]]:
+    """trading.order_tracking.enabled (hors dry_run) -> fills réels (searchTrades) appliqués au tracker."""
+    trading = config.get("trading", {}) or {}
+    if is_dry or not (trading.get("order_tracking", {}) or {}).get("enabled"):
+        return None, None
+    lifecycle = OrderLifecycle(tick_size=getattr(getattr(tracker, "spec", None), "tick_size", None))
+    return lifecycle, FillPoller.from_config(trading, lifecycle).start()
+
+
+def _start_simulators(config: dict, is_dry: bool, is_shadow: bool) -> tuple[Optional[SimBroker], Optional[SimBroker]]:
+    """trading.simulator.enabled -> fills dry_run / shadow via l'exchange simulé (latence, slippage, partiels)."""
+    if not ((config.get("trading", {}) or {}).get("simulator", {}) or {}).get("enabled"):
+        return None, None
+    return (SimBroker.from_config(config) if is_dry else None,
+            SimBroker.from_config(config) if is_shadow else None)
+
+
+def _order_update_handler(lifecycle: Optional[OrderLifecycle]) -> Optional[Callable[[str, StateDiff], None]]:
+    """Ordres broker réconciliés par le cache d'état -> transitions (annulé, rejeté) du cycle de vie."""
+    if lifecycle is None:
+        return None
+
+    def on_change(kind: str, diff: StateDiff) -> None:
+        if kind == "orders":
+            for order in diff.added + diff.changed:
+                lifecycle.on_order_update(order)
+
+    return on_change
+
+
+def _log_fills(fills: list) -> None:
+    for fill in fills:
+        logging.info(f"[Fill] ✅ {fill['side']} {fill['qty']} @ {fill['price']} | request_id={fill['client_order_id']}")
+
+
+def _start_state_cache(
+    config: dict,
+    is_dry: bool,
+    on_change: Optional[Callable[[str, StateDiff], None]] = None,
+) -> Optional[AccountStateCache]:
+    """trading.state_cache.enabled (hors dry_run) -> ordres/positions broker rafraîchis en fond."""
+    trading = config.get("trading", {}) or {}
+    if is_dry or not (trading.get("state_cache", {}) or {}).get("enabled"):
+        return None
+    return AccountStateCache.from_config(trading, on_change=on_change).start()
+
+
+def _pre_trade_check(state: Optional[AccountStateCache], config: dict, action: str, qty: float) -> Optional[str]:
+    """
+    Contrôles pré-trade sur l'état broker en mémoire (aucun appel réseau), limités au contrat
+    tradé (trading.contract_id) ; sans contract_id, tout le compte est compté.
+    """
+    if state is None:
+        return None
+    trading = config.get("trading", {}) or {}
+    sc = trading.get("state_cache", {}) or {}
+    return state.pre_trade_check(
+        side=action,
+        qty=qty,
+        contract_id=trading.get("contract_id"),
+        max_open_orders=sc.get("max_open_orders"),
+        max_position=sc.get("max_position"),
+        max_age=sc.get("max_age_seconds"),
+    )
+
+
+def _log_order_results(results: list) -> None:
+    for res in results:
+        if res.get("executed"):
+            logging.info(f"[Order] ✅ {res.get('side')} {res.get('qty')} exécuté | request_id={res.get('request_id')}")
+        else:
+            logging.warning(f"[Order] ❌ {res.get('side')} {res.get('qty')} rejeté : {res.get('error')} | request_id={res.get('request_id')}")
+
+
 def run_live_loop():
     """
     Boucle live :
     - lit les bougies du feed
-    - appelle process_signal(candle) pour produire une décision
+    - appelle process_signal(candle) pour produire une décision ; avec data.incremental_features,
+      features calculées en O(1) par bougie (moteur incrémental) puis prédiction du modèle
     - valide contre la config optimizer (horaire + seuil ML + risk)
     - modes:
         - dry_run: simule le fill (tracker principal)
         - prod: envoie ordre réel
         - shadow_dual: envoie ordre réel ET simule en parallèle (shadow tracker/logger)
-    - logue signaux + snapshots de perf
-    - enregistre checkpoint (dernier timestamp traité)
+    - trading.async_orders : les ordres prod partent via la passerelle asyncio ; la boucle continue
+      de consommer les bougies et applique les fills quand les réponses arrivent
+    - trading.order_tracking : chaque ordre prod est suivi par clientOrderId ; le tracker reçoit
+      les fills réels (prix/quantité exécutés) au lieu du prix de marché supposé
+    - trading.simulator : en dry_run / shadow, ordres exécutés par l'exchange simulé aux bougies
+      suivantes (latence, slippage, fills partiels) au lieu d'un fill instantané au close
+    - trading.state_cache : ordres/positions broker réconciliés en fond ; contrôles pré-trade
+      (ordres en attente, position max) lus en mémoire avant chaque ordre prod
+    - logue signaux + snapshots de perf (écriture CSV en tâche de fond, vidée à l'arrêt)
+    - config_horaire.hot_reload : le JSON optimizer modifié est re-validé en fond et activé entre deux bougies
+    - chronomètre chaque étape (histogrammes Prometheus, retard du feed, traces NDJSON optionnelles)
+    - enregistre checkpoint (dernier timestamp traité + position du feed) ; au redémarrage
+      le feed reprend directement après cette bougie (pas de relecture complète)
     """
     logging.info("🚀 Boucle live démarrée")
     config, logger, tracker, optimizer_cfg, mode, shadow_logger, shadow_tracker = init_context()
-    last_processed = load_checkpoint()
+    checkpoint = load_checkpoint_state() or {}
+    last_processed = checkpoint.get("last_timestamp")
+    if last_processed:
+        set_resume_point(
+            offset=checkpoint.get("offset"),
+            epoch_ns=checkpoint.get("epoch_ns"),
+            timestamp=last_processed,
+        )
+
+    reloader = _start_optimizer_reload(config, optimizer_cfg)
+    engine, model = _start_feature_engine(config, optimizer_cfg, last_processed)
+    tracer = BarTracer.from_config(config)
 
     symbol = (config.get("trading", {}) or {}).get("symbol", "UNKNOWN")
     is_dry = (mode == "dry_run")
     is_shadow = (mode == "shadow_dual")
+    lifecycle, fill_poller = _start_order_tracking(config, is_dry, tracker)
+    inflight = _start_order_gateway(config, is_dry, lifecycle)
+    state = _start_state_cache(config, is_dry, on_change=_order_update_handler(lifecycle))
+    sim, shadow_sim = _start_simulators(config, is_dry, is_shadow)
 
     while True:
         try:
             candle = get_next_candle()
+            tracer.begin(feed_seconds=get_last_read_seconds())
+
+            # Nouvelle config optimizer validée en attente -> activée avant cette bougie
+            if reloader is not None and reloader.apply_pending():
+                optimizer_cfg = reloader.current
+            # Réponses des ordres en vol arrivées depuis la bougie précédente
+            if inflight is not None:
+                _log_order_results(inflight.collect(tracker))
+            # Fills réels reçus depuis la bougie précédente (prix et quantité exécutés)
+            if lifecycle is not None:
+                _log_fills(lifecycle.apply_fills(tracker))
             ts_raw, price = extract_ts_price(candle)
             dt_utc = to_utc_datetime(ts_raw)
             ts_iso = dt_utc.isoformat()
 
-            # Idempotence
+            # Idempotence (garde-fou : le feed reprend déjà après le checkpoint)
             if last_processed and ts_iso <= last_processed:
+                tracer.discard()
                 continue
 
+            # Exchange simulé : ordres des bougies précédentes exécutés sur cette bougie
+            bar_ts = dt_utc.timestamp()
+            if sim is not None:
+                _log_fills(sim.on_bar(bar_ts, candle, tracker))
+            if shadow_sim is not None:
+                shadow_sim.on_bar(bar_ts, candle, shadow_tracker)
+
             # Décision
-            decision = process_signal(candle) or {}
+            with span("decision"):
+                if engine is not None:
+                    decision = decider_live.process_candle_incremental(
+                        engine=engine, candle=candle, now=dt_utc, tracker=tracker, model=model
+                    ) or {}
+                else:
+                    decision = decider.process_signal(candle) or {}
             action = (decision.get("action") or "FLAT").upper()
             vwap = decision.get("vwap")
             features = decision.get("features")
@@ -114,89 +297,117 @@ def run_live_loop():
             prob = decision.get("prob")
 
             # Validation optimizer
-            decision = validate_with_optimizer(
-                decision=decision,
-                optimizer_cfg=optimizer_cfg,
-                dt_utc=dt_utc,
-                price=price,
-                vwap=vwap,
-                general_cfg=config.get("general", {}) or {},
-            )
+            with span("validate"):
+                decision = validate_with_optimizer(
+                    decision=decision,
+                    optimizer_cfg=optimizer_cfg,
+                    dt_utc=dt_utc,
+                    price=price,
+                    vwap=vwap,
+                    general_cfg=config.get("general", {}) or {},
+                )
 
             # Monitoring signal
             record_signal(action, bool(decision.get("executed")), decision.get("schedule"))
 
             # --- Exécution principale ---
-            if action in ("BUY", "SELL") and decision.get("executed"):
-                if is_dry:
-                    fill_price = decision.get("fill_price", price)
-                    qty = float(decision.get("qty") or 0)
-                    if fill_price is not None and qty > 0:
-                        tracker.on_fill(price=float(fill_price), qty=qty, side=action)
-                        logging.info(f"[DryRun] Filled {action} {qty} @ {fill_price}")
-                else:
-                    exec_result = execute_and_track_order(
-                        symbol=symbol,
-                        side=action,
-                        qty=float(decision.get("qty") or 0),
-                        limit_price=None,
-                        market_price=float(price) if price is not None else None,
-                        tracker=tracker,
-                    )
-                    decision.update(exec_result or {})
+            with span("execute"):
+                if action in ("BUY", "SELL") and decision.get("executed") and not is_dry:
+                    blocked = _pre_trade_check(state, config, action, float(decision.get("qty") or 0))
+                    if blocked:
+                        logging.warning(f"[PreTrade] ⛔ {action} bloqué : {blocked}")
+                        decision.update({"executed": False, "reject_reason": blocked})
+                if action in ("BUY", "SELL") and decision.get("executed"):
+                    if is_dry and sim is not None:
+                        qty = float(decision.get("qty") or 0)
+                        if qty > 0:
+                            decision.update(sim.submit(side=action, qty=qty, ts=bar_ts, market_price=price))
+                    elif is_dry:
+                        fill_price = decision.get("fill_price", price)
+                        qty = float(decision.get("qty") or 0)
+                        if fill_price is not None and qty > 0:
+                            tracker.on_fill(price=float(fill_price), qty=qty, side=action)
+                            logging.info(f"[DryRun] Filled {action} {qty} @ {fill_price}")
+                    elif inflight is not None:
+                        exec_result = submit_order(
+                            inflight,
+                            symbol=symbol,
+                            side=action,
+                            qty=float(decision.get("qty") or 0),
+                            limit_price=None,
+                            market_price=float(price) if price is not None else None,
+                        )
+                        decision.update(exec_result)
+                    else:
+                        exec_result = execute_and_track_order(
+                            symbol=symbol,
+                            side=action,
+                            qty=float(decision.get("qty") or 0),
+                            limit_price=None,
+                            market_price=float(price) if price is not None else None,
+                            tracker=tracker,
+                            lifecycle=lifecycle,
+                        )
+                        decision.update(exec_result or {})
 
             # Marquage prix pour PnL latent principal
             if price is not None:
                 tracker.on_mark(price=float(price))
 
             # Logs + perf + métriques principal
-            _log_and_metrics(
-                logger=logger,
-                tracker=tracker,
-                ts_iso=ts_iso,
-                symbol=symbol,
-                action=action,
-                prob=prob,
-                price=price,
-                decision=decision,
-                vwap=vwap,
-                features=features,
-                session=session,
-                is_shadow=False,
-            )
-
-            # --- Exécution SHADOW (si activé) ---
-            if is_shadow and shadow_logger is not None and shadow_tracker is not None:
-                shadow_decision = dict(decision)  # on log les mêmes infos (qty, schedule, etc.)
-                if action in ("BUY", "SELL") and decision.get("executed"):
-                    # Simule le fill côté shadow, indépendamment du réel
-                    fill_price = decision.get("fill_price", price)
-                    qty = float(decision.get("qty") or 0)
-                    if fill_price is not None and qty > 0:
-                        shadow_tracker.on_fill(price=float(fill_price), qty=qty, side=action)
-                        logging.info(f"[Shadow] Filled {action} {qty} @ {fill_price}")
-
-                if price is not None:
-                    shadow_tracker.on_mark(price=float(price))
-
+            with span("log"):
                 _log_and_metrics(
-                    logger=shadow_logger,
-                    tracker=shadow_tracker,
+                    logger=logger,
+                    tracker=tracker,
                     ts_iso=ts_iso,
                     symbol=symbol,
                     action=action,
                     prob=prob,
                     price=price,
-                    decision=shadow_decision,
+                    decision=decision,
                     vwap=vwap,
                     features=features,
                     session=session,
-                    is_shadow=True,
+                    is_shadow=False,
                 )
 
+            # --- Exécution SHADOW (si activé) ---
+            if is_shadow and shadow_logger is not None and shadow_tracker is not None:
+                with span("shadow"):
+                    shadow_decision = dict(decision)  # on log les mêmes infos (qty, schedule, etc.)
+                    if action in ("BUY", "SELL") and decision.get("executed"):
+                        # Simule le fill côté shadow, indépendamment du réel
+                        fill_price = decision.get("fill_price", price)
+                        qty = float(decision.get("qty") or 0)
+                        if shadow_sim is not None and qty > 0:
+                            shadow_decision.update(shadow_sim.submit(side=action, qty=qty, ts=bar_ts, market_price=price))
+                        elif fill_price is not None and qty > 0:
+                            shadow_tracker.on_fill(price=float(fill_price), qty=qty, side=action)
+                            logging.info(f"[Shadow] Filled {action} {qty} @ {fill_price}")
+
+                    if price is not None:
+                        shadow_tracker.on_mark(price=float(price))
+
+                    _log_and_metrics(
+                        logger=shadow_logger,
+                        tracker=shadow_tracker,
+                        ts_iso=ts_iso,
+                        symbol=symbol,
+                        action=action,
+                        prob=prob,
+                        price=price,
+                        decision=shadow_decision,
+                        vwap=vwap,
+                        features=features,
+                        session=session,
+                        is_shadow=True,
+                    )
+
             # Checkpoint
-            save_checkpoint(ts_iso)
+            with span("checkpoint"):
+                save_checkpoint(ts_iso, offset=get_feed_position(), epoch_ns=datetime_to_ns(dt_utc))
             last_processed = ts_iso
+            tracer.end(dt_utc)
 
         except KeyboardInterrupt:
             logging.info("🛑 Arrêt manuel")
@@ -204,3 +415,20 @@ def run_live_loop():
         except Exception as e:
             logging.exception(f"[LiveLoop] Erreur: {e}")
             break
+
+    if inflight is not None:
+        _log_order_results(inflight.drain(tracker, timeout=30.0))
+        inflight.gateway.stop()
+    if state is not None:
+        state.stop()
+    if fill_poller is not None:
+        fill_poller.poll()      # derniers fills avant l'arrêt
+        fill_poller.stop()
+        _log_fills(lifecycle.apply_fills(tracker))
+    logger.close()  # vide la file d'écriture CSV (arrêt manuel ou erreur)
+    if shadow_logger is not None:
+        shadow_logger.close()
+    tracer.close()
+    if reloader is not None:
+        reloader.stop()
+        config_snapshot.set_optimizer_provider(None)
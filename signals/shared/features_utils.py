@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 import ta
 
+from signals.feeds.ohlcv_store import is_store, load_ohlcv_frame
+
 
 def calculate_vwap(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
@@ -50,16 +52,22 @@ def add_features(df: pd.DataFrame, prefix='', ema_span=21, rsi_period=14, vol_pe
     return df
 
 
-def load_and_merge_multiframe(df: pd.DataFrame, tf_files: dict, add_features_func) -> pd.DataFrame:
+def load_and_merge_multiframe(df: pd.DataFrame, tf_files: dict, add_features_func, store=None) -> pd.DataFrame:
     """
     Fusionne les données multi-timeframe avec la 5m.
+    Si `store` (MultiTimeframeStore) est fourni, les fichiers ne sont pas relus : seules les
+    lignes ajoutées depuis le dernier appel sont parsées, puis lookup as-of (merge_asof backward).
     """
+    if store is not None:
+        store.refresh()
+        return store.merge_into(df)
+
     for tf, path in tf_files.items():
-        if not isinstance(path, str) or not path.endswith(".csv") or not tf:
+        if not isinstance(path, str) or not (path.endswith(".csv") or is_store(path)) or not tf:
             continue
 
         try:
-            dftf = pd.read_csv(path)
+            dftf = load_ohlcv_frame(path)
             dftf["datetime"] = pd.to_datetime(dftf["time"]) if "time" in dftf.columns else pd.to_datetime(dftf.iloc[:, 0])
             dftf = dftf.sort_values("datetime").reset_index(drop=True)
             dftf = add_features_func(dftf, prefix=f"{tf}_", ema_span=21, rsi_period=14, vol_period=12)
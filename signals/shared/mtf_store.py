@@ -0,0 +1,348 @@
+# signals/shared/mtf_store.py
+"""
+Store multi-timeframe incrémental (remplace la relecture complète des CSV data.tf_files).
+
+- Chaque fichier TF est parsé une seule fois ; ensuite seul le delta (octets ajoutés depuis
+  le dernier watermark offset/mtime/size) est lu et parsé.
+- Les features add_features (EMA / RSI / vol) sont mises à jour incrémentalement.
+- Lookup "as-of" (sémantique merge_asof direction="backward") par recherche dichotomique
+  sur les timestamps triés : O(log n) par requête.
+Si le fichier est tronqué, remplacé (inode), réécrit (empreinte de la dernière ligne
+différente) ou reçoit une ligne antérieure à la dernière, la série est reconstruite.
+Un store .ohlcv (signals.feeds.ohlcv_store) est lu directement en memmap (watermark = nombre de lignes).
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from signals.features.incremental import IncrementalIndicators
+from signals.feeds.ohlcv_store import OHLCVStore, is_store, resolve_data_path
+from signals.utils.time_utils import datetime_to_ns, datetimes_to_ns
+
+NAN = float("nan")
+_FINGERPRINT_BYTES = 256
+
+
+class TimeframeSeries:
+    """
+    Série d'un timeframe : timestamps triés + colonnes add_features, alimentée soit
+    par un CSV suivi incrémentalement (path), soit par append() direct.
+    """
+
+    def __init__(
+        self,
+        tf: str,
+        path: Optional[str] = None,
+        *,
+        ema_span: int = 21,
+        rsi_period: int = 14,
+        vol_period: int = 12,
+        initial_capacity: int = 1024,
+        revisable: bool = False,
+    ):
+        """
+        revisable: conserve l'état avant la dernière barre pour permettre revise_last()
+                   (coût d'une copie d'état par append ; inutile pour un CSV de barres closes).
+        """
+        self.tf = tf
+        self.revisable = bool(revisable)
+        self.path = path
+        self._params = dict(ema_span=ema_span, rsi_period=rsi_period, vol_period=vol_period)
+        self.columns: List[str] = IncrementalIndicators(prefix=f"{tf}_", **self._params).columns
+        self._initial_capacity = max(16, int(initial_capacity))
+        self.reset()
+
+    # ------------------------------------------------------------
+    # Stockage
+    # ------------------------------------------------------------
+
+    def reset(self) -> None:
+        self._ind = IncrementalIndicators(prefix=f"{self.tf}_", **self._params)
+        self._times = np.empty(self._initial_capacity, dtype=np.int64)
+        self._values = np.empty((len(self.columns), self._initial_capacity), dtype=np.float64)
+        self._n = 0
+        self._state_before_last: Optional[Dict[str, Any]] = None
+        # watermark fichier
+        self._offset = 0
+        self._mtime_ns = -1
+        self._size = -1
+        self._inode: Optional[int] = None
+        self._fingerprint = b""
+        self._time_idx: Optional[int] = None
+        self._close_idx: Optional[int] = None
+        self._store: Optional[OHLCVStore] = None  # si path désigne un store .ohlcv
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[: self._n]
+
+    def values(self, column: str) -> np.ndarray:
+        return self._values[self.columns.index(column), : self._n]
+
+    def _grow(self) -> None:
+        cap = self._times.shape[0] * 2
+        t = np.empty(cap, dtype=np.int64)
+        t[: self._n] = self._times[: self._n]
+        v = np.empty((len(self.columns), cap), dtype=np.float64)
+        v[:, : self._n] = self._values[:, : self._n]
+        self._times, self._values = t, v
+
+    def _write(self, i: int, t_ns: int, feats: Mapping[str, float]) -> None:
+        self._times[i] = t_ns
+        for k, col in enumerate(self.columns):
+            self._values[k, i] = feats[col]
+
+    def append(self, t_ns: int, close: float) -> None:
+        """Ajoute une barre (t_ns >= dernier timestamp)."""
+        if self._n and t_ns < self._times[self._n - 1]:
+            raise ValueError(f"[MTF {self.tf}] barre non chronologique: {t_ns} < {self._times[self._n - 1]}")
+        if self._n == self._times.shape[0]:
+            self._grow()
+        if self.revisable:
+            self._state_before_last = self._ind.snapshot()
+        self._write(self._n, t_ns, self._ind.update(float(close)))
+        self._n += 1
+
+    def revise_last(self, close: float) -> None:
+        """Remplace la clôture de la dernière barre (barre en formation) et recalcule ses features."""
+        if not self._n or self._state_before_last is None:
+            raise ValueError(f"[MTF {self.tf}] aucune barre à réviser (revisable={self.revisable})")
+        self._ind.restore(self._state_before_last)
+        i = self._n - 1
+        self._write(i, int(self._times[i]), self._ind.update(float(close)))
+
+    # ------------------------------------------------------------
+    # Lookup as-of
+    # ------------------------------------------------------------
+
+    def asof_index(self, t_ns: int) -> int:
+        """Index de la dernière barre avec time <= t_ns (-1 si aucune)."""
+        return int(np.searchsorted(self.times, t_ns, side="right")) - 1
+
+    def asof(self, t_ns: int) -> Dict[str, float]:
+        i = self.asof_index(t_ns)
+        if i < 0:
+            return {c: NAN for c in self.columns}
+        return {c: float(self._values[k, i]) for k, c in enumerate(self.columns)}
+
+    def asof_many(self, ts_ns: np.ndarray) -> Dict[str, np.ndarray]:
+        idx = np.searchsorted(self.times, np.asarray(ts_ns, dtype=np.int64), side="right") - 1
+        ok = idx >= 0
+        out = {}
+        for k, c in enumerate(self.columns):
+            col = np.full(idx.shape, np.nan)
+            col[ok] = self._values[k, idx[ok]]
+            out[c] = col
+        return out
+
+    # ------------------------------------------------------------
+    # Suivi incrémental du CSV
+    # ------------------------------------------------------------
+
+    def _needs_rebuild(self, st: os.stat_result) -> bool:
+        if self._size < 0:
+            return True
+        if getattr(st, "st_ino", None) != self._inode or st.st_size < self._offset:
+            return True
+        if self._fingerprint:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset - len(self._fingerprint))
+                if f.read(len(self._fingerprint)) != self._fingerprint:
+                    return True
+        return False
+
+    def _parse_header(self, line: str) -> None:
+        header = next(csv.reader([line]))
+        header = [h.strip().lstrip("\ufeff") for h in header]
+        self._time_idx = header.index("time") if "time" in header else 0
+        if "close" not in header:
+            raise ValueError(f"[MTF {self.tf}] colonne 'close' absente de {self.path}")
+        self._close_idx = header.index("close")
+
+    def _ingest_lines(self, lines: List[str], *, full_load: bool) -> int:
+        rows = [r for r in csv.reader(lines) if r]
+        if not rows:
+            return 0
+        ti, ci = self._time_idx, self._close_idx
+        times = datetimes_to_ns([r[ti] for r in rows])
+        closes = np.array([_to_float(r[ci]) if ci < len(r) else NAN for r in rows], dtype=np.float64)
+        if full_load:
+            # comme la pipeline batch : tri par datetime avant add_features
+            order = np.argsort(times, kind="stable")
+            times, closes = times[order], closes[order]
+        elif self._n and times.min() < self._times[self._n - 1]:
+            raise _Rebuild()
+        elif np.any(np.diff(times) < 0):
+            raise _Rebuild()
+        for t, c in zip(times.tolist(), closes.tolist()):
+            self.append(t, c)
+        return len(rows)
+
+    def _refresh_store(self, path: str) -> int:
+        """Store .ohlcv : delta = lignes [déjà lues, count) lues directement en memmap."""
+        if self._store is None or self._store.path != path:
+            self.reset()
+            self._store = OHLCVStore(path)
+        store = self._store
+        done = self._offset
+        if store.reload() < done:
+            self.reset()
+            self._store = store
+            done = 0
+        times = np.asarray(store.time[done:])
+        if not len(times):
+            return 0
+        closes = np.asarray(store.column("close")[done:])
+        for t, c in zip(times.tolist(), closes.tolist()):
+            self.append(t, c)
+        self._offset = len(store)
+        return len(times)
+
+    def refresh(self) -> int:
+        """
+        Lit uniquement les nouvelles lignes complètes du CSV. Renvoie le nombre de barres ajoutées
+        (après reconstruction éventuelle : nombre total de barres).
+        """
+        if not self.path:
+            return 0
+        store_path = resolve_data_path(self.path)
+        if is_store(store_path):
+            return self._refresh_store(store_path)
+        st = os.stat(self.path)
+        if st.st_mtime_ns == self._mtime_ns and st.st_size == self._size:
+            return 0
+
+        full_load = self._needs_rebuild(st)
+        if full_load:
+            self.reset()
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError as e:
+            logging.warning(f"[MTF {self.tf}] lecture impossible {self.path}: {e}")
+            return 0
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            complete = b""
+        else:
+            complete = chunk[: end + 1]
+        lines = complete.decode("utf-8").splitlines()
+
+        if self._time_idx is None:
+            if not lines:
+                return 0
+            self._parse_header(lines[0])
+            lines = lines[1:]
+
+        try:
+            added = self._ingest_lines(lines, full_load=full_load)
+        except _Rebuild:
+            logging.info(f"[MTF {self.tf}] données non chronologiques -> reconstruction complète")
+            self.reset()
+            return self.refresh()
+
+        self._offset += len(complete)
+        if self._offset:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, self._offset - _FINGERPRINT_BYTES))
+                self._fingerprint = f.read(min(self._offset, _FINGERPRINT_BYTES))
+        self._inode = getattr(st, "st_ino", None)
+        # la watermark (offset) ne couvre que les lignes complètes : une ligne partielle
+        # sera relue dès que le fichier grossit (size/mtime changent)
+        self._size = st.st_size
+        self._mtime_ns = st.st_mtime_ns
+        return added
+
+
+class _Rebuild(Exception):
+    pass
+
+
+def _to_float(s: str) -> float:
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class MultiTimeframeStore:
+    """
+    Ensemble de TimeframeSeries indexé par TF ; sert les colonnes {tf}_ema21/_rsi14/_vol12
+    pour un timestamp 5m donné.
+    """
+
+    def __init__(self, series: Iterable[TimeframeSeries]):
+        self.series: Dict[str, TimeframeSeries] = {s.tf: s for s in series}
+        self.columns: List[str] = [c for s in self.series.values() for c in s.columns]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, tf_files: Mapping[str, str], **params) -> "MultiTimeframeStore":
+        series = []
+        for tf, path in tf_files.items():
+            if not isinstance(path, str) or not (path.endswith(".csv") or is_store(path)) or not tf:
+                continue
+            series.append(TimeframeSeries(tf, path, **params))
+        return cls(series)
+
+    def refresh(self) -> Dict[str, int]:
+        out = {}
+        with self._lock:
+            for tf, s in self.series.items():
+                try:
+                    out[tf] = s.refresh()
+                except Exception as e:
+                    print(f"❌ Erreur lors de la fusion MTF pour {tf}: {e}")
+                    out[tf] = 0
+        return out
+
+    def asof(self, dt: Any) -> Dict[str, float]:
+        t = datetime_to_ns(dt)
+        out: Dict[str, float] = {}
+        for s in self.series.values():
+            out.update(s.asof(t))
+        return out
+
+    def merge_into(self, df: pd.DataFrame, on: str = "datetime") -> pd.DataFrame:
+        """Équivalent de pd.merge_asof(df, tf, on=on, direction='backward') pour toutes les TF."""
+        df = df.sort_values(on).reset_index(drop=True)
+        ts = datetimes_to_ns(df[on])
+        cols: Dict[str, np.ndarray] = {}
+        for s in self.series.values():
+            if len(s):
+                cols.update(s.asof_many(ts))
+        return df.assign(**cols) if cols else df
+
+
+_STORES: Dict[Tuple[Tuple[str, str], ...], MultiTimeframeStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_mtf_store(tf_files: Mapping[str, str], *, refresh: bool = True) -> MultiTimeframeStore:
+    """
+    Store partagé (process-wide) pour un jeu de fichiers TF ; rafraîchi à chaque appel (delta only),
+    sauf refresh=False quand l'appelant rafraîchit lui-même (load_and_merge_multiframe, moteur live).
+    """
+    key = tuple(sorted((str(k), str(v)) for k, v in (tf_files or {}).items()))
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = MultiTimeframeStore.from_files(dict(key))
+            _STORES[key] = store
+    if refresh:
+        store.refresh()
+    return store
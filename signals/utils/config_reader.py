@@ -1,10 +1,25 @@
 import os
 import yaml
 
+from signals.utils.file_cache import FileCache, read_only
+
+
+def _parse_yaml(text):
+    try:
+        return read_only(yaml.safe_load(text))
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f"❌ Erreur lors du parsing YAML : {e}")
+
+
+_cache = FileCache(_parse_yaml)
+
 
 def load_config(config_path="config.yaml"):
     """
     Charge et retourne le contenu du fichier de configuration YAML.
+    Le résultat est mis en cache : le fichier n'est re-parsé que s'il a changé (mtime/taille
+    puis contenu). Le dict renvoyé est partagé et en lecture seule (ReadOnlyDict : TypeError
+    si modifié) ; copy.deepcopy() pour une copie modifiable.
 
     Args:
         config_path (str): Chemin vers le fichier YAML.
@@ -19,8 +34,9 @@ def load_config(config_path="config.yaml"):
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"❌ Fichier de configuration non trouvé : {config_path}")
 
-    with open(config_path, "r", encoding="utf-8") as file:
-        try:
-            return yaml.safe_load(file)
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"❌ Erreur lors du parsing YAML : {e}")
+    return _cache.load(config_path)
+
+
+def clear_config_cache():
+    """Vide le cache (force le re-parsing au prochain load_config)."""
+    _cache.clear()
@@ -0,0 +1,109 @@
+# signals/utils/file_cache.py
+"""
+Cache de fichiers parsés (YAML / JSON) invalidé sur changement du fichier.
+
+- Chaque appel ne fait qu'un os.stat() : le fichier n'est relu que si (mtime_ns, taille) change,
+  et n'est re-parsé que si son contenu (sha1) a réellement changé.
+- L'objet renvoyé est partagé entre tous les appelants : read_only() le fige (ReadOnlyDict /
+  ReadOnlyList, toujours des dict/list pour isinstance et json) ; toute modification en place
+  lève TypeError. copy.deepcopy() renvoie une copie modifiable.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+
+def _refuse(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"❌ {type(self).__name__} partagé (cache) : copier avant de modifier (copy.deepcopy)")
+
+
+class ReadOnlyDict(dict):
+    """dict en lecture seule ; copy / deepcopy / pickle -> dict modifiable."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _refuse
+    clear = pop = popitem = setdefault = update = _refuse
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> dict:
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self) -> Any:
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """list en lecture seule ; copy / deepcopy / pickle -> list modifiable."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+    append = extend = insert = remove = pop = clear = sort = reverse = _refuse
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self) -> Any:
+        return list, (list(self),)
+
+
+def read_only(obj: Any) -> Any:
+    """Fige récursivement un objet parsé (dict -> ReadOnlyDict, list -> ReadOnlyList)."""
+    if isinstance(obj, dict):
+        return ReadOnlyDict((k, read_only(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return ReadOnlyList(read_only(v) for v in obj)
+    return obj
+
+
+@dataclass
+class _Entry:
+    stamp: Tuple[int, int]
+    digest: str
+    value: Any
+
+
+class FileCache:
+    def __init__(self, parser: Callable[[str], Any]):
+        self._parser = parser          # texte -> objet
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> Any:
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry.stamp == stamp:
+            return entry.value
+
+        with self._lock:
+            with open(key, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            entry = self._entries.get(key)
+            if entry is not None and entry.digest == digest:
+                entry.stamp = stamp  # touch sans changement de contenu
+                return entry.value
+            value = self._parser(raw.decode("utf-8"))
+            self._entries[key] = _Entry(stamp=stamp, digest=digest, value=value)
+            return value
+
+    def digest(self, path: str) -> str | None:
+        """sha1 du contenu actuellement en cache pour `path` (None si jamais chargé)."""
+        entry = self._entries.get(os.path.abspath(path))
+        return entry.digest if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
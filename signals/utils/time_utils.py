@@ -1,5 +1,37 @@
 # time_utils.py
 
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+# Règle unique de conversion date -> epoch ns (int64), partagée par les stores, le ring buffer
+# et le journal : une date avec fuseau est convertie en UTC, une date naïve est prise comme UTC,
+# un entier est déjà un epoch ns. Chaînes ISO 8601 (avec ou sans 'Z', fraction ou offset).
+
+def datetime_to_ns(value: Any) -> int:
+    """Date scalaire (str ISO, datetime, Timestamp, datetime64, epoch ns) -> int64 ns epoch UTC."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC")
+    return int(ts.value)
+
+
+def datetimes_to_ns(values: Any) -> np.ndarray:
+    """Version vectorisée de datetime_to_ns (liste, ndarray, Series) -> ndarray int64."""
+    if isinstance(values, (np.ndarray, pd.Series)):
+        if pd.api.types.is_integer_dtype(values.dtype):
+            return np.asarray(values, dtype=np.int64)
+        s = pd.Series(values, copy=False)
+    else:
+        s = pd.Series(list(values), dtype=object)
+    s = pd.to_datetime(s, utc=True, format="ISO8601")
+    return s.dt.as_unit("ns").astype("int64").to_numpy()
+
+
 def get_current_hour_label(current_hour: int, config_by_label: dict) -> str | None:
     """
     Retourne le label de session (ex: 'LONDON_AM') correspondant à l'heure courante.
@@ -11,14 +43,7 @@ def get_current_hour_label(current_hour: int, config_by_label: dict) -> str | No
     Returns:
         str | None: Le label de session correspondant, ou None si aucune session active
     """
-    for label, cfg in config_by_label.items():
-        h_start = cfg.get("heure_debut")
-        h_end = cfg.get("heure_fin")
-
-        if h_start is None or h_end is None:
-            continue
-
-        if h_start <= current_hour < h_end:
-            return label
+    from signals.optimizer.schedule_index import ScheduleMode, get_schedule_index
 
-    return None
+    # lookup O(1) ; sémantique historique : heure_debut <= h < heure_fin, sans passage de minuit
+    return get_schedule_index(config_by_label, ScheduleMode.HOUR_LABEL).label_for_hour(current_hour)
@@ -4,6 +4,7 @@ import json
 import os
 from pathlib import Path
 
+from signals.logging.api_audit import flush_audit
 from signals.logic.execution.api.client import place_order
 
 
@@ -30,7 +31,8 @@ def test_place_order_import_error(monkeypatch, tmp_path):
     assert res["status"] == "error"
     assert "import" in res["error"]
 
-    # audit a été écrit
+    # audit a été écrit (écriture en tâche de fond -> flush)
+    flush_audit()
     with open(fake_cfg["api"]["audit_log_file"], "r", encoding="utf-8") as f:
         lines = [json.loads(l) for l in f]
     assert any(rec.get("event") == "import_error" for rec in lines)
@@ -60,6 +62,7 @@ def test_place_order_ok_no_retry(monkeypatch, tmp_path):
     assert "request_id" in res
 
     # audit contient request + response
+    flush_audit()
     with open(audit_file, "r", encoding="utf-8") as f:
         lines = [json.loads(l) for l in f]
     events = [rec["event"] for rec in lines]
@@ -99,6 +102,7 @@ def test_place_order_retry_then_ok(monkeypatch, tmp_path):
     assert res["attempts"] == 2
 
     # audit contient 2 requests et 2 responses
+    flush_audit()
     with open(audit_file, "r", encoding="utf-8") as f:
         events = [json.loads(l)["event"] for l in f]
     assert events.count("request") == 2
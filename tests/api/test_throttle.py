@@ -0,0 +1,124 @@
+# tests/api/test_throttle.py
+import time
+from email.utils import formatdate
+
+import pytest
+
+from signals.logic.execution.api import throttle as th
+from signals.logic.execution.api import transport as tr
+from signals.logic.execution.gateway import OrderGateway
+from signals.logic.execution.mock_exchange import MockExchange
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = Clock()
+    bucket = th.TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == 0.5          # 4e appel : attendre un jeton (1/rate)
+    assert bucket.reserve() == 1.0          # réservations cumulées
+    clock.t = 10
+    assert bucket.tokens == 3
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = Clock()
+    cb = th.CircuitBreaker(failure_threshold=3, reset_seconds=5, clock=clock)
+    for _ in range(2):
+        cb.record_failure()
+    assert cb.state == th.CLOSED and cb.check() == 0
+    cb.record_failure()
+    assert cb.state == th.OPEN and cb.check() == 5
+
+    clock.t = 5
+    assert cb.check() == 0 and cb.state == th.HALF_OPEN   # un seul appel d'essai
+    assert cb.check() > 0
+    cb.record_failure()                                    # essai raté : rouvert
+    assert cb.state == th.OPEN and cb.check() == 5
+
+    clock.t = 10
+    assert cb.check() == 0
+    cb.record_success()
+    assert cb.state == th.CLOSED and cb.failures == 0
+
+
+def test_retry_after_opens_breaker_immediately():
+    clock = Clock()
+    cb = th.CircuitBreaker(failure_threshold=5, reset_seconds=1, clock=clock)
+    cb.record_failure(retry_after=30)
+    assert cb.state == th.OPEN and cb.check() == 30
+
+
+def test_parse_retry_after_and_jittered_backoff():
+    assert th.parse_retry_after("2") == 2.0
+    assert th.parse_retry_after(None) is None and th.parse_retry_after("bogus") is None
+    assert 8 < th.parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+    delays = [tr.backoff_delay(3, 100, 500) for _ in range(200)]
+    assert all(0 <= d <= 0.4 for d in delays) and len(set(delays)) > 1
+    assert all(tr.backoff_delay(1, 100, 500, retry_after=1.5) >= 1.5 for _ in range(20))
+
+
+def test_families_share_one_guard_and_export_gauges(monkeypatch):
+    states, throttled = [], []
+    monkeypatch.setattr(th.metrics, "set_circuit_state", lambda fam, s: states.append((fam, s)))
+    monkeypatch.setattr(th.metrics, "inc_throttled", lambda fam, reason: throttled.append((fam, reason)))
+    reg = th.ThrottleRegistry({"rate_limits": {"orders": {"rate": 1, "burst": 1}},
+                               "circuit_breaker": {"failure_threshold": 1}}, clock=Clock())
+    guard = reg.guard_for("placeOrder")
+    assert reg.guard_for("cancelOrder") is guard and reg.guard_for("searchContracts") is not guard
+
+    guard.before_call()
+    assert guard.before_call() == (1.0, "rate")
+    guard.record(ok=False)
+    assert guard.before_call()[1] == "circuit"
+    assert states[-1] == ("orders", th.OPEN)
+    assert throttled == [("orders", "rate"), ("orders", "circuit")]
+
+
+def test_429_storm_opens_circuit_and_stops_hitting_the_broker():
+    reg = th.ThrottleRegistry({"circuit_breaker": {"failure_threshold": 3, "reset_seconds": 5}})
+    with MockExchange(fail_rate=1.0, fail_status=429, retry_after=0.2) as ex:
+        client = ex.client(throttle=reg)
+        first = client.post("placeOrder", {})
+        assert first["statusCode"] == 429 and first["retryAfter"] == 0.2
+
+        ex.requests.clear()
+        refused = [client.post("placeOrder", {}) for _ in range(20)]
+        assert all(r["circuitOpen"] for r in refused) and ex.requests == []   # aucun appel réseau
+
+        with OrderGateway(client, max_retries=3, backoff_initial_ms=1) as gw:
+            res = gw.submit("placeOrder", {"symbol": "UB"}).result(2)
+        assert res["status"] == "error" and res["attempts"] == 1 and "circuit" in res["error"]
+
+        time.sleep(0.25)                    # Retry-After écoulé : un appel d'essai passe
+        ex.fail_rate = 0.0
+        assert client.post("placeOrder", {})["success"] is True
+        assert reg.guard_for("placeOrder").breaker.state == th.CLOSED
+
+
+def test_probe_released_when_login_fails_during_half_open():
+    from signals.api.client import APIClient
+
+    class FailingTokens:
+        def get(self):
+            raise Exception("Échec API : auth refusée")
+
+    clock = Clock()
+    reg = th.ThrottleRegistry({"circuit_breaker": {"failure_threshold": 1, "reset_seconds": 5}}, clock=clock)
+    breaker = reg.guard_for("placeOrder").breaker
+    breaker.record_failure()
+    clock.t = 5                                             # half-open : le prochain appel est l'essai
+    client = APIClient("http://127.0.0.1:9", endpoints={"placeOrder": "/p"}, token_cache=FailingTokens(), throttle=reg)
+    with pytest.raises(Exception, match="auth refusée"):
+        client.post("placeOrder", {})
+    assert breaker.state == th.OPEN and not breaker._probe_in_flight
+    clock.t = 10
+    assert breaker.check() == 0                             # nouvel essai possible, pas bloqué à vie
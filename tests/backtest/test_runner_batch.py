@@ -0,0 +1,86 @@
+# tests/backtest/test_runner_batch.py
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+import signals.backtest.runner as runner
+import signals.features.real_time_features as rtf
+
+FEATURES = ["dist_to_vwap_atr", "ret_3", "volatility_6"]
+
+CFG = {
+    "general": {"TICK_SIZE": 0.03125, "TICK_VALUE": 31.25, "ATR_PERIOD": 14,
+                "DEFAULT_VWAP_PERIOD": 14, "DEFAULT_ENTRY_THRESHOLD": 1.0},
+    "model": {"features": FEATURES},
+}
+OPT = {"CONFIGURATIONS_BY_SCHEDULE": {
+    "ASIA": {"heure_debut": 0, "heure_fin": 8, "ML_THRESHOLD": 0.5,
+             "RISK_MANAGEMENT": {"TP_TYPE": "fixed_ticks", "TP_TICKS": 6, "FIXED_LOTS": 2}},
+    # colonne absente -> lignes ignorées (comme l'exception get_last_row_features)
+    "EU": {"heure_debut": 8, "heure_fin": 13, "features": ["missing_col"]},
+    "US": {"heure_debut": 13, "heure_fin": 21, "ML_THRESHOLD": 0.45, "features": list(FEATURES),
+           "RISK_MANAGEMENT": {"TP_TYPE": "vwap_level"}},
+}}
+
+
+def _make_5m(n=1500, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 115.0 + np.cumsum(rng.normal(0, 0.03, n))
+    times = pd.date_range("2025-07-14T00:00:00Z", periods=n, freq="5min")
+    return pd.DataFrame({
+        "time": [t.strftime("%Y-%m-%dT%H:%M:%SZ") for t in times],
+        "open": close, "high": close + rng.uniform(0, 0.1, n), "low": close - rng.uniform(0, 0.1, n),
+        "close": close, "volume": rng.integers(100, 5000, n).astype(float),
+    })
+
+
+def _train_model(seed=5):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(0, 1, (400, len(FEATURES))), columns=FEATURES)
+    y = (X["dist_to_vwap_atr"] + rng.normal(0, 0.5, 400) < 0).astype(int)
+    return xgb.train({"objective": "binary:logistic", "max_depth": 3}, xgb.DMatrix(X, label=y), 20)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: {})
+    monkeypatch.setattr(rtf, "get_mtf_resample", lambda: None)
+    booster = _train_model()
+    monkeypatch.setattr(runner, "load_model", lambda: booster)
+    df = _make_5m()
+    monkeypatch.setattr(runner.BacktestEngine, "_load_5m", lambda self: df.copy())
+    return lambda: runner.BacktestEngine(CFG, OPT)
+
+
+def test_batch_matches_row_by_row(engine):
+    rows = engine().simulate(batch=False)
+    batched = engine().simulate(batch=True)
+
+    assert len(rows) > 5
+    assert [t.__dict__ for t in batched] == [t.__dict__ for t in rows]
+    assert {t.session for t in rows} == {"ASIA", "US"}
+    assert all(isinstance(t.time, str) and t.time.endswith("Z") for t in rows)
+
+
+def test_batch_predicts_in_few_calls(engine):
+    eng = engine()
+    calls = []
+    predict = eng.model.predict
+    eng.model = type("Spy", (), {"predict": lambda self, d: calls.append(d.num_row()) or predict(d)})()
+    eng.simulate(batch=True)
+    # ASIA (model.features) et US partagent la même liste -> une seule matrice, un seul predict
+    assert len(calls) == 1
+    hours = pd.to_datetime(_make_5m()["time"]).dt.hour
+    assert calls[0] == int(((hours < 8) | ((hours >= 13) & (hours < 21))).sum())
+
+
+def test_simulate_vectorized_uses_optimizer_exits(engine):
+    trades = engine().simulate_vectorized()
+    assert trades
+    assert {t.action for t in trades} <= {"BUY", "SELL"}
+    for t in trades:
+        dir_ = 1 if t.action == "BUY" else -1
+        expected = (t.exit_price - t.price) / 0.03125 * dir_ * 31.25 * t.qty
+        assert t.pnl == pytest.approx(expected)
+        assert "exit=" in t.reason
@@ -0,0 +1,41 @@
+# tests/backtest/test_sweep.py
+import numpy as np
+import pandas as pd
+
+from signals.backtest.sweep import SweepGrid, apply_variant, max_drawdown, run_sweep
+from signals.backtest.vectorized import run_vectorized
+
+from tests.backtest.test_vectorized import SCHEDULES, TICK, _arrays
+
+SCHED = {f"S{k}": s for k, s in enumerate(SCHEDULES)}
+GRID = SweepGrid(ml_thresholds=[0.5, 0.7], entry_thresholds=[1.0, 2.0], tp_ticks=[4, 8], atr_multipliers=[1.0, 2.0])
+
+
+def test_grid_skips_irrelevant_dimensions():
+    # S0 : ATR + fixed_ticks -> 2*2*2*2 ; S1 : ni l'un ni l'autre -> 2*2 ; S2 : ATR seul -> 2*2*2
+    assert [len(GRID.variants(c)) for c in SCHEDULES] == [16, 4, 8]
+
+
+def test_max_drawdown():
+    assert max_drawdown(np.array([])) == 0.0
+    assert max_drawdown(np.array([100.0, -30.0, -50.0, 200.0, -10.0])) == 80.0
+    assert max_drawdown(np.array([-20.0, 5.0])) == 20.0
+
+
+def test_sweep_rows_match_single_runs_and_pool():
+    a = _arrays(n=3000)
+    kw = dict(tick_size=TICK, tick_value=31.25, optimizer_root={"GLOBAL_CONSTANTS": {"MAX_EQUITY_DD_USD_LIMIT": 900}})
+    inline = run_sweep(a, SCHED, GRID, workers=1, **kw)
+    pooled = run_sweep(a, SCHED, GRID, workers=2, chunk_size=5, **kw)
+
+    assert len(inline) == 28
+    pd.testing.assert_frame_equal(inline, pooled)
+
+    row = inline[inline["schedule"] == "S0"].iloc[3]
+    variant = (row["ML_THRESHOLD"], row["entry_threshold"], row["TP_TICKS"], row["ATR_MULTIPLIER"])
+    res = run_vectorized(**{**a, "sched_idx": np.where(a["sched_idx"] == 0, 0, -1)},
+                         schedules=[apply_variant(SCHEDULES[0], variant)], tick_size=TICK, tick_value=31.25)
+    assert row["n_trades"] == len(res)
+    assert row["pnl"] == res.pnl_usd.sum()
+    assert row["dd_limit"] == 900
+    assert row["dd_ok"] == (row["max_dd"] <= 900)
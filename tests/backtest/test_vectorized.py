@@ -0,0 +1,69 @@
+# tests/backtest/test_vectorized.py
+import numpy as np
+import pytest
+
+from signals.backtest.vectorized import EXIT_REASONS, run_scalar, run_vectorized, schedule_index
+
+TICK = 0.03125
+
+SCHEDULES = [
+    {"HOUR_RANGE_START": 0, "HOUR_RANGE_END": 8, "ML_THRESHOLD": 0.55,
+     "VWAP_CONFIG": {"entry_threshold": 1.5, "exit_type": "cross"},
+     "RISK_MANAGEMENT": {"METHOD": "ATR", "ATR_MULTIPLIER": 1.5, "TP_TYPE": "fixed_ticks", "TP_TICKS": 6,
+                         "FIXED_LOTS": 2}},
+    {"HOUR_RANGE_START": 8, "HOUR_RANGE_END": 14, "ML_THRESHOLD": 0.5,
+     "VWAP_CONFIG": {"entry_threshold": 1.0, "exit_type": "cross", "tp_type": "vwap_level"}},
+    {"HOUR_RANGE_START": 14, "HOUR_RANGE_END": 22, "ML_THRESHOLD": 0.6,
+     "VWAP_CONFIG": {"entry_threshold": 2.0},
+     "RISK_MANAGEMENT": {"METHOD": "ATR", "ATR_MULTIPLIER": 0.8, "TP_TYPE": "vwap_level"}},
+]
+
+
+def _arrays(n=5000, seed=1):
+    rng = np.random.default_rng(seed)
+    close = np.round((115.0 + np.cumsum(rng.normal(0, 0.03, n))) / TICK) * TICK
+    high = close + rng.integers(0, 5, n) * TICK
+    low = close - rng.integers(0, 5, n) * TICK
+    vwap = close + rng.normal(0, 0.08, n)
+    atr = np.abs(rng.normal(0.06, 0.02, n))
+    vwap[:14] = np.nan
+    atr[:14] = np.nan
+    ndist = (close - vwap) / (atr * TICK) / 60.0
+    prob = rng.uniform(0, 1, n)
+    prob[rng.uniform(0, 1, n) < 0.01] = np.nan
+    hours = (np.arange(n) // 12) % 24
+    return dict(high=high, low=low, close=close, vwap=vwap, atr=atr, ndist=ndist, prob=prob,
+                sched_idx=schedule_index(hours, {str(k): s for k, s in enumerate(SCHEDULES)}))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_vectorized_matches_scalar_decide_exit(seed):
+    a = _arrays(seed=seed)
+    kw = dict(schedules=SCHEDULES, tick_size=TICK, tick_value=31.25)
+    vec = run_vectorized(**a, **kw)
+    ref = run_scalar(**a, **kw)
+
+    assert len(ref) > 50
+    for field in ("entry_idx", "exit_idx", "side", "reason", "schedule", "qty"):
+        np.testing.assert_array_equal(getattr(vec, field), getattr(ref, field), err_msg=field)
+    for field in ("entry_price", "exit_price", "pnl_usd"):
+        np.testing.assert_array_equal(getattr(vec, field), getattr(ref, field), err_msg=field)
+
+    # toutes les règles de sortie et les deux sens sont exercés
+    used = {EXIT_REASONS[r] for r in ref.reason}
+    assert {"sl_atr", "fixed_ticks", "cross", "vwap_level"} <= used
+    assert set(ref.side.tolist()) == {-1, 1}
+
+
+def test_open_position_closed_at_end():
+    n = 30
+    close = np.full(n, 100.0)
+    a = dict(high=close + TICK, low=close - TICK, close=close, vwap=close + 1.0, atr=np.full(n, 0.1),
+             ndist=np.full(n, -3.0), prob=np.full(n, 0.9), sched_idx=np.zeros(n, dtype=np.int64))
+    cfg = [{"ML_THRESHOLD": 0.5, "VWAP_CONFIG": {"entry_threshold": 1.0},
+            "RISK_MANAGEMENT": {"TP_TYPE": "vwap_level"}}]
+    vec = run_vectorized(**a, schedules=cfg, tick_size=TICK, tick_value=31.25)
+    assert vec.entry_idx.tolist() == [0]
+    assert vec.exit_idx.tolist() == [n - 1]
+    assert EXIT_REASONS[vec.reason[0]] == "eod"
+    assert vec.to_frame()["exit_reason"].tolist() == ["eod"]
@@ -2,6 +2,27 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from signals.logging import api_audit  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_audit_log(monkeypatch, tmp_path):
+    """
+    Les audits API visant logs/ (fichier suivi, ex: logs/api_responses.ndjson par défaut)
+    sont redirigés vers tmp_path : un run de tests ne modifie jamais l'arbre.
+    """
+    real_get_audit_sink = api_audit.get_audit_sink
+
+    def get_audit_sink(path, **options):
+        if Path(path).resolve().is_relative_to(ROOT / "logs"):
+            path = str(tmp_path / Path(path).name)
+        return real_get_audit_sink(path, **options)
+
+    monkeypatch.setattr(api_audit, "get_audit_sink", get_audit_sink)
+    return tmp_path
@@ -0,0 +1,70 @@
+# tests/execution/test_bracket.py
+import sys
+
+from signals.api.endpoints import bracketOrders
+from signals.logic.execution.bracket import build_bracket_payloads, submit_bracket
+from signals.logic.execution.gateway import OrderGateway
+from signals.logic.execution.mock_exchange import MockExchange
+
+RTT = 0.05
+
+
+def _payloads(entry_type=1):
+    return build_bracket_payloads(account_id=212, contract_id="CON.F.US.UB", side=0, size=1,
+                                  entry_type=entry_type, entry_price=120.0, stop_price=119.5,
+                                  take_profit_price=121.0, tag="t")
+
+
+def test_protective_legs_go_out_together():
+    with MockExchange(latency=RTT) as ex, OrderGateway(ex.client(), max_retries=0) as gw:
+        gw.client.login()   # login hors mesure
+        res = submit_bracket(gw, *_payloads()).result(5)
+
+    assert res["status"] == "ok"
+    entry_id = res["entry"]["order_id"]
+    sl, tp = ex.orders[res["stop"]["order_id"]], ex.orders[res["take_profit"]["order_id"]]
+    assert sl["linkedOrderId"] == tp["linkedOrderId"] == entry_id
+    assert sl["side"] == tp["side"] == 1 and sl["type"] == 4 and tp["limitPrice"] == 121.0
+    assert all(res[k]["latency_ms"] >= RTT * 1000 for k in ("entry", "stop", "take_profit"))
+    # SL et TP en parallèle : ~1 RTT d'exposition après l'entrée (et non 2)
+    assert res["naked_ms"] < 1.8 * RTT * 1000
+    assert res["total_ms"] < 2.8 * RTT * 1000
+
+
+def test_failed_leg_cancels_siblings_and_entry():
+    reject_sl = lambda name, body: name == "placeOrder" and body.get("type") == 4
+    with MockExchange(latency=0.01, reject=reject_sl) as ex, OrderGateway(ex.client(), max_retries=0) as gw:
+        res = submit_bracket(gw, *_payloads()).result(5)
+
+    assert res["status"] == "rolled_back" and res["error"] == "ordre refusé"
+    assert res["stop"]["order_id"] is None
+    assert ex.orders[res["take_profit"]["order_id"]]["status"] == "cancelled"
+    assert ex.orders[res["entry"]["order_id"]]["status"] == "cancelled"
+    assert all(r["status"] == "ok" for r in res["rollback"])
+
+
+def test_market_entry_is_unwound_and_rejected_entry_sends_nothing():
+    reject_tp = lambda name, body: name == "placeOrder" and body.get("type") == 1
+    with MockExchange(reject=reject_tp) as ex, OrderGateway(ex.client(), max_retries=0) as gw:
+        res = submit_bracket(gw, *_payloads(entry_type=2)).result(5)
+        assert res["status"] == "rolled_back"
+        # contre-ordre limité à la taille de l'entrée : pas de closePosition sur tout le contrat
+        assert "closePosition" not in ex.requests
+        unwind = ex.orders[res["rollback"][-1]["response"]["orderId"]]
+        assert (unwind["side"], unwind["size"], unwind["type"], unwind["customTag"]) == (1, 1, 2, "t-unwind")
+
+        ex.requests.clear()
+        res = submit_bracket(gw, *_payloads(entry_type=1)).result(5)   # entrée limite refusée
+    assert res["status"] == "error" and res["stop"] is None
+    assert ex.requests == ["placeOrder"]
+
+
+def test_cli_uses_concurrent_bracket(monkeypatch, capsys):
+    with MockExchange() as ex:
+        client = ex.client()
+        monkeypatch.setattr(sys, "argv", ["main.py", "brackets", "212", "CON.F.US.UB", "0", "1",
+                                          "--entryType", "2", "--stopPrice", "119.5", "--limitPrice", "121"])
+        bracketOrders.run(client)
+    out = capsys.readouterr().out
+    assert "Entrée : orderId=1" in out and "Bracket protégé" in out
+    assert len(ex.orders) == 3
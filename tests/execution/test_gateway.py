@@ -0,0 +1,122 @@
+# tests/execution/test_gateway.py
+import asyncio
+import json
+import time
+
+import pytest
+from requests.exceptions import ReadTimeout
+
+from signals.logging.api_audit import flush_audit
+from signals.logic.execution import runner as rn
+from signals.logic.execution.gateway import InFlightOrders, OrderGateway
+from signals.logic.execution.mock_exchange import MockExchange, load_test
+from signals.metrics.perf_tracker import FuturesSpec, PerformanceTracker
+
+
+@pytest.fixture
+def exchange():
+    with MockExchange(latency=0.05, seed=1) as ex:
+        yield ex
+
+
+def test_concurrent_orders_overlap_on_mock_exchange(exchange, tmp_path):
+    audit = tmp_path / "audit.ndjson"
+    with OrderGateway(exchange.client(), max_in_flight=10, audit_log_file=str(audit)) as gw:
+        t0 = time.perf_counter()
+        futures = [gw.submit("placeOrder", {"symbol": "UB", "side": "BUY", "quantity": 1}) for _ in range(10)]
+        results = [f.result(5) for f in futures]
+        elapsed = time.perf_counter() - t0
+
+    assert all(r["status"] == "ok" for r in results)
+    assert sorted(r["response"]["orderId"] for r in results) == list(range(1, 11))
+    assert elapsed < 0.05 * 10 / 2          # en vol simultanément, pas en série
+    assert exchange.requests.count("loginKey") == 1   # token partagé
+    flush_audit()
+    events = [json.loads(l)["event"] for l in audit.read_text().splitlines()]
+    assert events.count("request") == 10 and events.count("response") == 10
+
+
+def test_retry_backoff_and_timeout_do_not_block_the_loop():
+    calls = []
+
+    class FlakyClient:
+        def post(self, endpoint, payload, debug=False, timeout=None):
+            calls.append((endpoint, timeout))
+            if payload.get("slow"):
+                time.sleep(timeout)             # le timeout HTTP interrompt l'appel lui-même
+                raise ReadTimeout(f"read timeout={timeout}")
+            if len(calls) == 1:
+                return {"statusCode": 503}
+            return {"success": True, "errorCode": 0}
+
+    with OrderGateway(FlakyClient(), timeout_seconds=0.1, max_retries=1, backoff_initial_ms=50) as gw:
+        # le thread de la boucle asyncio reste libre pendant le backoff
+        ok = gw.submit("cancelOrder", {"orderId": 1})
+        ticks = asyncio.run_coroutine_threadsafe(_ticks(0.04), gw._loop).result(2)
+        assert ticks >= 3
+        res = ok.result(2)
+        assert res["status"] == "ok" and res["attempts"] == 2
+
+        slow = gw.submit("modifyOrder", {"orderId": 1, "slow": True}).result(2)
+    assert slow["status"] == "error" and "timeout" in slow["error"] and slow["attempts"] == 2
+    assert {t for _, t in calls} == {0.1}
+
+
+class TimeoutOnceClient:
+    """placeOrder : premier envoi en timeout ; `landed` dit si le broker l'a quand même reçu."""
+
+    def __init__(self, landed, lookup_ok=True):
+        self.landed, self.lookup_ok, self.calls = landed, lookup_ok, []
+
+    def post(self, endpoint, payload, debug=False, timeout=None):
+        self.calls.append(endpoint)
+        if endpoint == "searchOpenOrders":
+            if not self.lookup_ok:
+                raise ConnectionError("connection reset")
+            orders = [{"id": 7, "customTag": "x", "clientOrderId": "cid-1"}] if self.landed else []
+            return {"success": True, "errorCode": 0, "orders": orders}
+        if self.calls.count("placeOrder") == 1:
+            raise ReadTimeout("read timed out")
+        return {"success": True, "errorCode": 0, "orderId": 8}
+
+
+@pytest.mark.parametrize("landed, lookup_ok, expected", [
+    (True, True, ("ok", 7, ["placeOrder", "searchOpenOrders"])),
+    (False, True, ("ok", 8, ["placeOrder", "searchOpenOrders", "placeOrder"])),
+    (False, False, ("error", None, ["placeOrder", "searchOpenOrders"])),
+])
+def test_place_order_timeout_is_only_retried_when_lookup_shows_it_did_not_land(landed, lookup_ok, expected):
+    client = TimeoutOnceClient(landed, lookup_ok)
+    gw = OrderGateway(client, timeout_seconds=0.1, max_retries=2, backoff_initial_ms=1)
+    res = asyncio.run(gw.place_order({"accountId": 1, "clientOrderId": "cid-1", "size": 1}))
+    status, order_id, calls = expected
+    assert (res["status"], (res.get("response") or {}).get("orderId"), client.calls) == (status, order_id, calls)
+    if status == "error":
+        assert "inconnu" in res["error"]
+
+
+async def _ticks(duration):
+    n, end = 0, time.perf_counter() + duration
+    while time.perf_counter() < end:
+        await asyncio.sleep(0.005)
+        n += 1
+    return n
+
+
+def test_inflight_orders_apply_fills_from_the_loop_thread(exchange, monkeypatch):
+    monkeypatch.setattr(rn.pl, "build_order_payload", lambda s: {"symbol": "UB", "side": s["action"], "quantity": s["qty"]})
+    tracker = PerformanceTracker(FuturesSpec(tick_size=0.03125, tick_value=31.25))
+    with OrderGateway(exchange.client()) as gw:
+        inflight = InFlightOrders(gw)
+        res = rn.submit_order(inflight, symbol="UB", side="BUY", qty=2, limit_price=None, market_price=120.0)
+        assert res["status"] == "submitted" and len(inflight) == 1
+        assert inflight.collect(tracker) == []          # pas encore de réponse : la boucle continue
+        done = inflight.drain(tracker, timeout=5)
+    assert done[0]["executed"] and done[0]["request_id"] == res["request_id"]
+    assert tracker.snapshot()["position_size"] == 2
+
+
+def test_load_test_reports_throughput():
+    stats = load_test(40, concurrency=8, latency=0.02)
+    assert stats["orders"] == 40 and stats["orders_per_s"] > 100
+    assert stats["p50_ms"] >= 20
@@ -0,0 +1,102 @@
+# tests/execution/test_lifecycle.py
+from signals.logic.execution import lifecycle as lc
+from signals.logic.execution import runner as rn
+from signals.logic.execution.gateway import InFlightOrders, OrderGateway
+from signals.logic.execution.mock_exchange import MockExchange
+from signals.metrics.perf_tracker import FuturesSpec, PerformanceTracker
+
+TICK = 0.03125
+
+
+class Clock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _tracker():
+    return PerformanceTracker(FuturesSpec(tick_size=TICK, tick_value=31.25))
+
+
+def test_partial_fills_reach_tracker_at_real_prices(monkeypatch):
+    observed = []
+    monkeypatch.setattr(lc.metrics, "observe_fill", lambda side, lat, slip: observed.append((side, lat, slip)))
+    clock = Clock()
+    life = lc.OrderLifecycle(tick_size=TICK, clock=clock)
+    life.register("c1", side="BUY", qty=3, signal_price=120.0)
+    rec = life.on_submit_result("c1", {"status": "ok", "response": {"success": True, "orderId": 42}})
+    assert rec.state == lc.ACCEPTED and life.by_order_id(42) is rec
+
+    clock.t += 0.2
+    life.on_fill(order_id=42, price=120.0625, qty=1, fill_id="t1")
+    life.on_fill(order_id=42, price=120.0625, qty=1, fill_id="t1")      # doublon ignoré
+    assert rec.state == lc.PARTIAL and rec.filled_qty == 1
+    life.on_fill(order_id=42, price=120.125, qty=2, fill_id="t2", timestamp=1_000.5)
+    assert rec.state == lc.FILLED and rec.avg_price == (120.0625 + 2 * 120.125) / 3
+    assert observed == [("BUY", 0.5, rec.slippage / TICK)] and rec.slippage > 0
+
+    tracker = _tracker()
+    fills = life.apply_fills(tracker)
+    assert [(f["price"], f["qty"]) for f in fills] == [(120.0625, 1), (120.125, 2)]
+    assert tracker.position_qty == 3 and tracker.entry_price == rec.avg_price
+    assert life.apply_fills(tracker) == [] and life.open_orders() == []
+
+
+def test_rejections_cancels_and_fills_from_trades_only():
+    life = lc.OrderLifecycle()
+    life.register("r", side="SELL", qty=1, signal_price=100.0)
+    assert life.on_submit_result("r", {"status": "ok", "response": {"success": False, "errorMessage": "marge"}}).error == "marge"
+    assert life.get("r").state == lc.REJECTED
+
+    life.register("c", side="SELL", qty=4, signal_price=100.0)
+    life.on_submit_result("c", {"status": "ok", "response": {"orderId": 7, "fillVolume": 1, "filledPrice": 99.5}})
+    life.on_order_update({"id": 7, "status": 1, "fillVolume": 1, "filledPrice": 99.5})
+    life.on_fill(order_id=7, price=99.5, qty=1, fill_id="t1")          # le même fill partiel, une seule fois
+    life.on_fill(order_id=7, price=98.75, qty=2, fill_id="t2")
+    assert [(f["qty"], f["price"]) for f in life.apply_fills()] == [(1, 99.5), (2, 98.75)]
+    assert life.get("c").slippage == 1.0                                 # vendu 1 point sous le signal
+
+    life.on_order_update({"id": 7, "status": 3, "fillVolume": 4, "filledPrice": 0.0})
+    assert life.get("c").state == lc.CANCELLED and life.apply_fills() == []
+
+
+def test_runner_no_longer_assumes_market_fill(monkeypatch):
+    monkeypatch.setattr(rn.pl, "is_dry_run", lambda: False)
+    monkeypatch.setattr(rn.pl, "build_order_payload", lambda s: {"symbol": "UB", "side": s["action"], "quantity": s["qty"]})
+    monkeypatch.setattr(rn.api, "place_order", lambda payload: {"status": "ok", "response": {"success": True, "orderId": 5}})
+    life, tracker = lc.OrderLifecycle(), _tracker()
+
+    res = rn.execute_and_track_order(symbol="UB", side="BUY", qty=1.0, limit_price=None, market_price=120.0,
+                                     tracker=tracker, lifecycle=life)
+    assert res["executed"] and res["order_state"] == lc.ACCEPTED and res["fill_price"] is None
+    assert tracker.position_qty == 0                                     # pas de fill supposé
+
+    life.on_fill(order_id=5, price=120.25, qty=1)
+    life.apply_fills(tracker)
+    assert tracker.entry_price == 120.25
+
+
+def test_gateway_and_fill_poller_on_mock_exchange(monkeypatch):
+    monkeypatch.setattr(rn.pl, "build_order_payload", lambda s: {"symbol": "UB", "side": s["action"], "size": s["qty"]})
+    tracker, life = _tracker(), lc.OrderLifecycle(tick_size=TICK)
+    with MockExchange() as ex, OrderGateway(ex.client()) as gw:
+        poller = lc.FillPoller(gw.client, 212, life)
+        assert poller.poll() == 0 and ex.requests == []                  # rien en attente : pas d'appel
+
+        inflight = InFlightOrders(gw, lifecycle=life)
+        res = rn.submit_order(inflight, symbol="UB", side="SELL", qty=2, limit_price=None, market_price=120.0)
+        done = inflight.drain(tracker, timeout=5)
+        assert done[0]["order_state"] == lc.ACCEPTED and tracker.position_qty == 0
+
+        order_id = life.get(res["request_id"]).order_id
+        ex.fill(order_id, 119.96875, size=1)
+        ex.fill(order_id, 119.9375)
+        assert poller.poll() == 2
+        poller.poll()                                                    # trades déjà vus
+    life.apply_fills(tracker)
+    rec = life.get(res["request_id"])
+    assert rec.state == lc.FILLED and tracker.position_qty == -2
+    assert tracker.entry_price == rec.avg_price == (119.96875 + 119.9375) / 2
+    assert rec.latency is not None and rec.slippage > 0
@@ -0,0 +1,105 @@
+# tests/execution/test_sim_exchange.py
+import numpy as np
+import pytest
+
+from signals.logic.execution import lifecycle as lc
+from signals.logic.execution import sim_exchange as se
+from signals.metrics.perf_tracker import FuturesSpec, PerformanceTracker
+
+TICK = 0.03125
+BAR = 300.0
+
+
+def _cfg(**kw):
+    base = dict(tick_size=TICK, bar_seconds=BAR, latency="fixed", latency_ms=50, seed=1)
+    base.update(kw)
+    return se.SimConfig(**base)
+
+
+def test_market_order_fills_next_bar_open_with_slippage():
+    ex = se.SimExchange(_cfg(slippage_ticks=1))
+    ex.on_bar(0, 120.0, 120.5, 119.5, 120.25)
+    order = ex.submit("BUY", 2, ts=BAR, ref_price=120.25)        # décidé à la clôture de la bougie 0
+    assert ex.on_bar(0, 120.0, 120.5, 119.5, 120.25) == []       # pas de look-ahead sur la bougie du signal
+    fills = ex.on_bar(BAR, 121.0, 121.5, 120.5, 121.0)
+    assert [(f.qty, f.price, f.ts) for f in fills] == [(2.0, 121.0 + TICK, BAR + 0.05)]
+    assert order.state == se.FILLED and order.id not in ex.orders
+
+
+def test_latency_beyond_bar_end_defers_to_following_bar():
+    ex = se.SimExchange(_cfg(latency_ms=400_000))                 # 400 s > une bougie
+    ex.submit("SELL", 1, ts=BAR)
+    assert ex.on_bar(BAR, 121.0, 121.5, 120.5, 121.0) == []
+    assert ex.on_bar(2 * BAR, 122.0, 122.5, 121.5, 122.0)[0].price == 122.0
+
+
+def test_partial_fills_capped_by_bar_volume():
+    ex = se.SimExchange(_cfg(max_qty_per_bar=5, participation=0.1))
+    order = ex.submit("BUY", 8, ts=0)
+    assert [f.qty for f in ex.on_bar(0, 120.0, 120.5, 119.5, 120.0, volume=30)] == [3.0]
+    assert [f.qty for f in ex.on_bar(BAR, 121.0, 121.5, 120.5, 121.0, volume=1000)] == [5.0]
+    assert order.state == se.FILLED and order.avg_price == pytest.approx((3 * 120.0 + 5 * 121.0) / 8)
+
+
+def test_limit_and_stop_orders():
+    ex = se.SimExchange(_cfg(slippage_ticks=1))
+    limit = ex.submit("BUY", 1, ts=0, order_type=se.LIMIT, price=119.0)
+    stop = ex.submit("SELL", 1, ts=0, order_type=se.STOP, price=119.5)
+    assert ex.on_bar(0, 120.0, 120.5, 119.75, 120.0) == []        # ni touché ni déclenché
+    fills = {f.order_id: f.price for f in ex.on_bar(BAR, 119.25, 119.5, 118.5, 119.0)}
+    assert fills == {limit.id: 119.0, stop.id: 119.25 - TICK}     # stop sauté par le gap : open - slippage
+
+
+def test_bracket_triggers_on_later_bars_with_oco_and_sl_priority():
+    ex = se.SimExchange(_cfg())
+    entry = ex.submit_bracket("BUY", 1, ts=0, stop_price=119.0, take_profit_price=121.0)
+    sl, tp = entry.children
+    ex.on_bar(0, 120.0, 122.0, 118.0, 120.0)                      # entrée ; SL/TP pas encore actifs
+    assert entry.state == se.FILLED and sl.state == tp.state == se.WORKING
+    fills = ex.on_bar(BAR, 120.0, 121.5, 118.5, 120.0)            # les deux touchés : SL retenu
+    assert [(f.client_order_id, f.price) for f in fills] == [(sl.client_order_id, 119.0)]
+    assert tp.state == se.CANCELLED and ex.open_orders == []
+
+    ex2 = se.SimExchange(_cfg())
+    entry2 = ex2.submit_bracket("SELL", 1, ts=0, stop_price=121.0, take_profit_price=119.0)
+    ex2.on_bar(0, 120.0, 120.0, 120.0, 120.0)
+    assert ex2.on_bar(BAR, 119.5, 119.75, 118.75, 119.0)[0].price == 119.0
+    assert entry2.children[0].state == se.CANCELLED
+
+
+def test_broker_feeds_tracker_through_lifecycle(monkeypatch):
+    observed = []
+    monkeypatch.setattr(lc.metrics, "observe_fill", lambda side, lat, slip: observed.append((side, lat, slip)))
+    broker = se.SimBroker(_cfg(slippage_ticks=2))
+    tracker = PerformanceTracker(FuturesSpec(tick_size=TICK, tick_value=31.25))
+
+    res = broker.submit(side="BUY", qty=1, ts=0, market_price=120.0)
+    assert res["status"] == "simulated" and res["executed"] is True
+    assert broker.on_bar(0, {"open": 120.0, "close": 120.0}, tracker) == []
+    fills = broker.on_bar(BAR, {"open": 120.5, "high": 121, "low": 120, "close": 120.75, "volume": 10}, tracker)
+    assert fills[0]["price"] == 120.5 + 2 * TICK and tracker.position_qty == 1
+    assert observed == [("BUY", pytest.approx(0.05), pytest.approx(18.0))]    # 16 ticks d'écart + 2 de slippage
+
+
+def test_vectorized_matches_event_engine():
+    cfg = _cfg(latency_ms=120_000, slippage_ticks=0.5)
+    bar_ts = np.arange(50) * BAR
+    bar_open = 120.0 + np.arange(50) * TICK
+    submit_ts = np.array([0.0, 10.0, 250.0, 900.0, 14_000.0, 20_000.0])
+    side = np.array([1, -1, 1, -1, 1, 1])
+    vec = se.simulate_market_orders(bar_ts, bar_open, submit_ts, side, cfg)
+
+    ex = se.SimExchange(cfg)
+    orders = [ex.submit("BUY" if s > 0 else "SELL", 1, ts=t) for t, s in zip(submit_ts, side)]
+    prices = {}
+    for ts, o in zip(bar_ts, bar_open):
+        for f in ex.on_bar(ts, o, o, o, o):
+            prices[f.order_id] = f.price
+    expected = [prices.get(order.id, np.nan) for order in orders]
+    np.testing.assert_allclose(vec["fill_price"], expected)
+    assert list(vec["bar_idx"]) == [0, 1, 1, 3, 47, -1]
+
+
+def test_benchmark_reports_throughput():
+    stats = se.benchmark(20_000, 2_000)
+    assert stats["vectorized_orders_per_min"] > 1e6 and stats["event_fills"] == 2_000 - 1
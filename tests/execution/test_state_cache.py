@@ -0,0 +1,112 @@
+# tests/execution/test_state_cache.py
+import time
+
+from signals.logic.execution.mock_exchange import MockExchange
+from signals.logic.execution.state_cache import AccountStateCache, ContractCache, apply_diff, diff_snapshot
+
+CONTRACTS = [
+    {"id": "CON.F.US.UB.Z25", "name": "UBZ5", "description": "Ultra T-Bond"},
+    {"id": "CON.F.US.ENQ.Z25", "name": "NQZ5", "description": "E-mini Nasdaq"},
+]
+
+
+class Clock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def test_diff_applies_only_changes():
+    current = {1: {"id": 1, "size": 1}, 2: {"id": 2, "size": 1}}
+    diff = diff_snapshot(current, [{"id": 1, "size": 1}, {"id": 2, "size": 3}, {"id": 3, "size": 1}])
+    assert [d["id"] for d in diff.added] == [3] and [d["id"] for d in diff.changed] == [2] and not diff.removed
+    updated = apply_diff(current, diff)
+    assert updated[1] is current[1] and updated[2]["size"] == 3 and current[2]["size"] == 1
+    assert not diff_snapshot(updated, list(updated.values()))
+    assert [d["id"] for d in diff_snapshot(updated, [{"id": 1, "size": 1}]).removed] == [2, 3]
+
+
+def test_contracts_are_persisted_with_ttl(tmp_path):
+    path = str(tmp_path / "contracts.json")
+    clock = Clock()
+    with MockExchange(contracts=CONTRACTS) as ex:
+        client = ex.client()
+        cache = ContractCache(client, path=path, ttl_seconds=60, clock=clock).ensure()
+        assert cache.get("CON.F.US.UB.Z25")["name"] == "UBZ5"
+        assert [c["id"] for c in cache.search("nasdaq")] == ["CON.F.US.ENQ.Z25"]
+
+        ex.requests.clear()
+        restarted = ContractCache(client, path=path, ttl_seconds=60, clock=clock).ensure()
+        assert len(restarted.all()) == 2 and ex.requests == []        # relu depuis le disque
+
+        clock.t += 61
+        ContractCache(client, path=path, ttl_seconds=60, clock=clock).ensure()
+        assert ex.requests == ["listAvailableContracts"]              # TTL dépassé
+
+        ex.contracts.append({"id": "CON.F.US.ZN.Z25", "name": "ZNZ5", "description": "10Y"})
+        assert restarted.fetch("CON.F.US.ZN.Z25")["name"] == "ZNZ5"
+        assert restarted.fetch("CON.F.US.ZN.Z25") is not None and ex.requests.count("searchContractById") == 1
+        assert restarted.fetch("inconnu") is None
+
+
+def test_account_state_reconciles_incrementally():
+    events = []
+    with MockExchange(contracts=CONTRACTS) as ex:
+        client = ex.client()
+        state = AccountStateCache(client, 212, on_change=lambda kind, diff: events.append((kind, diff)))
+        assert state.refresh() and state.orders() == [] and not events
+
+        order_id = client.post("placeOrder", {"contractId": "CON.F.US.UB.Z25", "side": 0, "size": 1})["orderId"]
+        ex.positions[7] = {"id": 7, "contractId": "CON.F.US.UB.Z25", "type": 2, "size": 2}
+        assert state.refresh()
+        assert [(k, len(d.added)) for k, d in events] == [("orders", 1), ("positions", 1)]
+        assert state.net_position("CON.F.US.UB.Z25") == -2 and state.version == 1
+
+        events.clear()
+        assert state.refresh() and not events and state.version == 1   # rien de changé : rien à appliquer
+
+        client.post("cancelOrder", {"orderId": order_id})
+        state.refresh()
+        assert events[0][0] == "orders" and events[0][1].removed[0]["id"] == order_id
+        assert state.orders() == []
+
+
+def test_pre_trade_check_reads_memory_only():
+    clock = Clock()
+    with MockExchange() as ex:
+        state = AccountStateCache(ex.client(), 212, clock=clock)
+        assert state.pre_trade_check(side="BUY", qty=1, max_open_orders=1) is None   # jamais rafraîchi
+
+        ex.client().post("placeOrder", {"side": 0, "size": 1})
+        ex.positions[1] = {"id": 1, "contractId": "UB", "type": 1, "size": 2}
+        state.refresh()
+        ex.requests.clear()
+
+        t0 = time.perf_counter()
+        reason = state.pre_trade_check(side="BUY", qty=1, max_open_orders=1)
+        assert time.perf_counter() - t0 < 0.001 and ex.requests == []
+        assert reason == "ordres ouverts broker : 1"
+        assert "position max" in state.pre_trade_check(side="BUY", qty=1, max_position=2)
+        assert state.pre_trade_check(side="SELL", qty=1, max_position=2) is None
+
+        clock.t += 30
+        assert state.pre_trade_check(side="BUY", qty=1, max_open_orders=1, max_age=10) is None
+
+
+def test_poller_keeps_last_state_when_api_fails():
+    with MockExchange() as ex:
+        client = ex.client()
+        client.post("placeOrder", {"side": 0, "size": 1})
+        with AccountStateCache(client, 212, poll_interval=0.02) as state:
+            deadline = time.time() + 2
+            while state.last_refresh is None and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(state.orders()) == 1
+
+            ex.fail_rate = 1.0
+            deadline = time.time() + 2
+            while state.last_error is None and time.time() < deadline:
+                time.sleep(0.01)
+        assert "searchOpenOrders" in state.last_error and len(state.orders()) == 1
@@ -66,3 +66,65 @@ def test_live_feature_order_and_decision(monkeypatch):
     # FIXED_LOTS appliqué
     assert out["qty"] == 2
     assert out["session"] == "ASIAN02"
+
+
+def test_incremental_live_path_updates_engine_every_candle(monkeypatch):
+    from signals.features.incremental import IncrementalFeatureEngine
+    from signals.features.ring_buffer import CandleRingBuffer
+
+    general = {"TICK_SIZE": 0.25, "TICK_VALUE": 12.5, "ATR_PERIOD": 3, "DEFAULT_VWAP_PERIOD": 3,
+               "DEFAULT_ENTRY_THRESHOLD": 1.0}
+    fake_cfg = {"model": {"features": ["ret_3", "normalized_dist_to_vwap"]},
+                "config_horaire": {"path": "dummy.json"}, "general": general}
+    monkeypatch.setattr(live.cfg_reader, "load_config", lambda *a, **k: fake_cfg)
+    fake_opt = {"GLOBAL_CONSTANTS": {}, "CONFIGURATIONS_BY_SCHEDULE": {"ASIAN02": {
+        "HOUR_RANGE_START": 0, "HOUR_RANGE_END": 2, "ML_THRESHOLD": 0.6,
+        "VWAP_CONFIG": {"entry_threshold": 0.0}, "RISK_MANAGEMENT": {"FIXED_LOTS": 1}}}}
+    monkeypatch.setattr(live.rules, "load_optimizer_config", lambda p: fake_opt)
+    captured = []
+    monkeypatch.setattr(live, "predict_proba", lambda model, X: captured.append(X) or 0.9)
+
+    engine = IncrementalFeatureEngine.from_config(fake_cfg, buffer=CandleRingBuffer(64))
+    times = pd.date_range("2025-07-13T23:50:00Z", periods=5, freq="5min")   # 2 bougies hors schedule (0-2h)
+    out = None
+    for t, close in zip(times, [100.0, 100.5, 101.0, 101.5, 99.0]):
+        candle = {"time": t.strftime("%Y-%m-%dT%H:%M:%SZ"), "open": close, "high": close + 0.5,
+                  "low": close - 0.5, "close": close, "volume": 10}
+        out = live.process_candle_incremental(engine=engine, candle=candle, now=t.to_pydatetime(), model=object())
+    assert engine.n_updates == 5                # hors schedule : moteur tout de même alimenté
+    assert len(captured) == 3 and list(captured[-1].columns) == ["ret_3", "normalized_dist_to_vwap"]
+    assert captured[-1].iloc[0]["ret_3"] == pytest.approx(99.0 / 100.5 - 1)
+    assert out is not None and out["session"] == "ASIAN02" and out["vwap"] == engine.last["vwap"]
+    assert len(engine.buffer) == 5 and captured[-1].iloc[0]["normalized_dist_to_vwap"] == pytest.approx(
+        engine.buffer.last("normalized_dist_to_vwap"))
+
+
+def test_incremental_live_path_applies_drawdown_guard(monkeypatch):
+    from signals.features.incremental import IncrementalFeatureEngine
+
+    general = {"TICK_SIZE": 0.25, "TICK_VALUE": 12.5, "ATR_PERIOD": 3, "DEFAULT_VWAP_PERIOD": 3,
+               "DEFAULT_ENTRY_THRESHOLD": 1.0}
+    fake_cfg = {"model": {"features": ["normalized_dist_to_vwap"]},
+                "config_horaire": {"path": "dummy.json"}, "general": general}
+    monkeypatch.setattr(live.cfg_reader, "load_config", lambda *a, **k: fake_cfg)
+    fake_opt = {"GLOBAL_CONSTANTS": {"MAX_EQUITY_DD_USD_LIMIT": 500.0}, "CONFIGURATIONS_BY_SCHEDULE": {"ASIAN02": {
+        "HOUR_RANGE_START": 0, "HOUR_RANGE_END": 2, "ML_THRESHOLD": 0.6,
+        "VWAP_CONFIG": {"entry_threshold": 0.0}, "RISK_MANAGEMENT": {"FIXED_LOTS": 1}}}}
+    monkeypatch.setattr(live.rules, "load_optimizer_config", lambda p: fake_opt)
+    calls = []
+    monkeypatch.setattr(live, "predict_proba", lambda model, X: calls.append(X) or 0.9)
+
+    class Tracker:
+        def __init__(self, dd):
+            self.dd = dd
+
+    engine = IncrementalFeatureEngine.from_config(fake_cfg)
+    now = datetime(2025, 7, 14, 0, 30, tzinfo=timezone.utc)
+    candle = {"time": "2025-07-14T00:30:00Z", "open": 100.0, "high": 100.5, "low": 99.5, "close": 100.0, "volume": 10}
+    out = live.process_candle_incremental(engine=engine, candle=candle, now=now, model=object(), tracker=Tracker(600.0))
+    assert out is None and calls == []          # DD >= limite : entrée bloquée avant la prédiction
+    assert engine.n_updates == 1                # le moteur reste alimenté
+
+    candle = dict(candle, time="2025-07-14T00:35:00Z", close=99.0)
+    live.process_candle_incremental(engine=engine, candle=candle, now=now, model=object(), tracker=Tracker(100.0))
+    assert len(calls) == 1
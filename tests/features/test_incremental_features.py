@@ -0,0 +1,100 @@
+# tests/features/test_incremental_features.py
+import numpy as np
+import pandas as pd
+
+import signals.features.real_time_features as rtf
+from signals.features.incremental import (
+    BASE_COLUMNS,
+    IncrementalFeatureEngine,
+    IncrementalIndicators,
+)
+from signals.shared.features_utils import add_features
+
+
+CFG = {
+    "general": {
+        "TICK_SIZE": 0.03125,
+        "ATR_PERIOD": 14,
+        "DEFAULT_VWAP_PERIOD": 14,
+        "DEFAULT_ENTRY_THRESHOLD": 2.0,
+    }
+}
+
+
+def _make_5m(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 115.0 + np.cumsum(rng.normal(0, 0.03, n))
+    close = np.round(close / 0.03125) * 0.03125
+    high = close + rng.integers(0, 4, n) * 0.03125
+    low = close - rng.integers(0, 4, n) * 0.03125
+    opn = close + rng.integers(-2, 3, n) * 0.03125
+    vol = rng.integers(100, 5000, n).astype(float)
+    times = pd.date_range("2025-07-14T00:00:00Z", periods=n, freq="5min")
+    return pd.DataFrame({
+        "time": [t.strftime("%Y-%m-%dT%H:%M:%SZ") for t in times],
+        "open": opn, "high": high, "low": low, "close": close, "volume": vol,
+    })
+
+
+def _assert_same(a, b, name):
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    assert np.array_equal(np.isnan(a), np.isnan(b)), f"NaN mismatch on {name}"
+    m = np.isfinite(a) & np.isfinite(b)
+    # atol : le std glissant en ligne de pandas laisse ~1e-7 de résidu sur une fenêtre constante
+    np.testing.assert_allclose(a[m], b[m], rtol=1e-9, atol=1e-6, err_msg=name)
+    assert np.array_equal(np.isinf(a), np.isinf(b)), f"inf mismatch on {name}"
+
+
+def test_engine_matches_batch_pipeline(monkeypatch):
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: {})
+    df = _make_5m()
+    batch = rtf.compute_features_for_live_data(df.copy(), CFG)
+
+    engine = IncrementalFeatureEngine.from_config(CFG)
+    rows = engine.update_many(df.to_dict("records"))
+    inc = pd.DataFrame(rows)
+
+    assert len(inc) == len(batch)
+    for col in BASE_COLUMNS:
+        _assert_same(inc[col], batch[col], col)
+
+
+def test_build_feature_engine_warmup_then_update(monkeypatch):
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: {})
+    df = _make_5m(n=120)
+    batch = rtf.compute_features_for_live_data(df.copy(), CFG)
+
+    engine = rtf.build_feature_engine(CFG, history=df.iloc[:-1])
+    last = engine.update(df.iloc[-1].to_dict())
+    for col in BASE_COLUMNS:
+        _assert_same([last[col]], [batch[col].iloc[-1]], col)
+
+
+def test_engine_reads_tf_bars_appended_after_startup(monkeypatch, tmp_path):
+    tf = tmp_path / "UB_60.csv"
+    tf.write_text("time,open,high,low,close,volume\n"
+                  + "".join(f"2025-07-13T{h:02d}:00:00Z,115,115.1,114.9,115,100\n" for h in range(20, 24)))
+    monkeypatch.setattr(rtf, "get_mtf_resample", lambda: None)
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: {"1h": str(tf)})
+    df = _make_5m(n=24)
+    engine = rtf.build_feature_engine(CFG, history=df.iloc[:12])       # 00:00 -> 00:55
+    before = engine.last["1h_ema21"]
+
+    with open(tf, "a", encoding="utf-8") as f:                          # barre 1h publiée en cours de session
+        f.write("2025-07-14T00:00:00Z,115,118.1,114.9,118,100\n")
+    row = engine.update(df.iloc[12].to_dict())                          # 01:00
+    assert row["1h_ema21"] > before
+
+
+def test_indicators_match_add_features():
+    df = _make_5m(n=300)
+    ref = add_features(df.copy(), prefix="15min_", ema_span=21, rsi_period=14, vol_period=12)
+
+    ind = IncrementalIndicators(prefix="15min_")
+    out = pd.DataFrame([ind.update(c) for c in df["close"]])
+
+    # EMA / RSI : même récursion que pandas -> identique au bit près
+    assert np.array_equal(out["15min_ema21"].values, ref["15min_ema21"].values)
+    assert np.array_equal(out["15min_rsi14"].values, ref["15min_rsi14"].values, equal_nan=True)
+    _assert_same(out["15min_vol12"], ref["15min_vol12"], "15min_vol12")
@@ -0,0 +1,89 @@
+# tests/features/test_resampler.py
+import numpy as np
+import pandas as pd
+
+import signals.features.real_time_features as rtf
+from signals.features.resampler import MTFResampler, merge_resampled_multiframe, resample_ohlcv
+from signals.shared.features_utils import add_features, load_and_merge_multiframe
+
+TFS = ["15min", "1h", "4h"]
+
+
+def _make_5m(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 115.0 + np.cumsum(rng.normal(0, 0.03, n))
+    times = pd.date_range("2025-07-14T21:35:00", periods=n, freq="5min")
+    # trou de séance : aucune barre entre 00:00 et 01:00 le 2e jour
+    times = times[(times < "2025-07-16T00:00") | (times >= "2025-07-16T01:00")]
+    close = close[: len(times)]
+    return pd.DataFrame({
+        "datetime": times,
+        "open": close + 0.01, "high": close + 0.05, "low": close - 0.05, "close": close,
+        "volume": rng.integers(100, 5000, len(times)).astype(float),
+    })
+
+
+def _write_tf_csv(df5, tf, path):
+    # export "à la TradingView" : barres étiquetées par leur début, buckets vides absents
+    bars = (df5.set_index("datetime")
+            .resample(tf, label="left", closed="left")
+            .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+            .dropna().reset_index())
+    bars = bars.rename(columns={"datetime": "time"})
+    bars["time"] = bars["time"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    bars.to_csv(path, index=False)
+
+
+def test_resample_ohlcv_buckets():
+    df5 = _make_5m()
+    bars = resample_ohlcv(df5, "1h")
+    first = df5[df5["datetime"] < "2025-07-14T22:00"]
+    assert bars["datetime"].iloc[0] == pd.Timestamp("2025-07-14T21:00")
+    assert bars["open"].iloc[0] == first["open"].iloc[0]
+    assert bars["high"].iloc[0] == first["high"].max()
+    assert bars["volume"].iloc[0] == first["volume"].sum()
+    assert not (bars["datetime"] == pd.Timestamp("2025-07-16T00:00")).any()
+
+
+def test_batch_resample_matches_tf_files(tmp_path):
+    df5 = _make_5m()
+    files = {}
+    for tf in TFS:
+        files[tf] = str(tmp_path / f"{tf}.csv")
+        _write_tf_csv(df5, tf, files[tf])
+
+    from_files = load_and_merge_multiframe(df5.copy(), files, add_features)
+    resampled = merge_resampled_multiframe(df5.copy(), TFS)
+    for tf in TFS:
+        for col in (f"{tf}_ema21", f"{tf}_rsi14", f"{tf}_vol12"):
+            # rtol : read_csv ne relit pas les flottants au bit près
+            np.testing.assert_allclose(resampled[col], from_files[col], rtol=1e-9, equal_nan=True, err_msg=col)
+
+
+def test_incremental_matches_batch_on_history_prefix():
+    df5 = _make_5m(n=200)
+    res = MTFResampler(TFS)
+    for i, rec in enumerate(df5.to_dict("records")):
+        res.observe(rec)
+        got = res.asof(rec["datetime"])
+        # le live voit la barre TF en formation : identique au batch sur l'historique connu à t
+        expected = merge_resampled_multiframe(df5.iloc[: i + 1].copy(), TFS).iloc[-1]
+        for col, v in got.items():
+            # atol : std glissant en ligne (pandas) vs recalcul sur la fenêtre
+            np.testing.assert_allclose(v, expected[col], rtol=1e-9, atol=1e-9, equal_nan=True,
+                                       err_msg=f"{col}@{i}")
+
+
+def test_build_feature_engine_uses_resampler(monkeypatch):
+    cfg = {"general": {"TICK_SIZE": 0.03125, "ATR_PERIOD": 14, "DEFAULT_VWAP_PERIOD": 14,
+                       "DEFAULT_ENTRY_THRESHOLD": 2.0}}
+    monkeypatch.setattr(rtf, "get_mtf_resample", lambda: {"timeframes": ["1h"], "offsets": {}})
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: (_ for _ in ()).throw(AssertionError("fichiers lus")))
+
+    df5 = _make_5m(n=120)
+    engine = rtf.build_feature_engine(cfg, history=df5)
+    batch = rtf.compute_features_for_live_data(df5.copy(), cfg)
+    assert isinstance(engine.mtf, MTFResampler)
+    for col in ("1h_ema21", "1h_rsi14", "1h_vol12"):
+        np.testing.assert_allclose(engine.last[col], batch[col].iloc[-1], rtol=1e-9, atol=1e-9, equal_nan=True)
+        assert engine.buffer.last(col) == engine.last[col] or np.isnan(engine.last[col])
@@ -0,0 +1,63 @@
+# tests/features/test_ring_buffer.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.features.ring_buffer import CandleRingBuffer, required_capacity, MIN_CAPACITY
+from signals.features.real_time_features import get_last_row_features
+
+
+def _row(i):
+    return {
+        "time": f"2025-07-14T00:{i % 60:02d}:00Z",
+        "open": float(i), "high": i + 0.5, "low": i - 0.5, "close": float(i), "volume": 10.0 * i,
+    }
+
+
+def test_window_is_contiguous_view_after_wrap():
+    buf = CandleRingBuffer(capacity=5, columns=["open", "high", "low", "close", "volume"])
+    for i in range(13):
+        buf.append(_row(i))
+
+    assert len(buf) == 5
+    close = buf.column("close")
+    assert close.tolist() == [8.0, 9.0, 10.0, 11.0, 12.0]
+    # vue sans copie, lecture seule
+    assert close.base is not None and close.flags["C_CONTIGUOUS"]
+    with pytest.raises(ValueError):
+        close[0] = 0.0
+
+    w = buf.window(3)
+    assert w["volume"].tolist() == [100.0, 110.0, 120.0]
+    assert len(w["time"]) == 3
+
+
+def test_partial_fill_and_missing_columns():
+    buf = CandleRingBuffer(capacity=8, columns=["close", "vwap"])
+    buf.append({"time": "2025-07-14T00:00:00Z", "close": 1.0})
+    buf.append({"time": "2025-07-14T00:05:00Z", "close": 2.0, "vwap": 1.5})
+    assert buf.column("close").tolist() == [1.0, 2.0]
+    assert np.isnan(buf.column("vwap")[0])
+    assert buf.last("vwap") == 1.5
+
+
+def test_get_last_row_features_from_buffer_matches_frame():
+    buf = CandleRingBuffer(capacity=4, columns=["a", "b", "c"])
+    rows = [{"time": "2025-07-14T00:00:00Z", "a": i, "b": 2 * i, "c": 3 * i} for i in range(6)]
+    buf.extend(rows)
+    df = pd.DataFrame(rows)
+
+    x_buf = get_last_row_features(buf, ["c", "a"])
+    x_df = get_last_row_features(df, ["c", "a"])
+    assert list(x_buf.columns) == ["c", "a"]
+    assert x_buf.values.tolist() == x_df.values.astype(float).tolist()
+
+    with pytest.raises(ValueError):
+        get_last_row_features(buf, ["zzz"])
+
+
+def test_required_capacity_follows_schedule_features():
+    cfg = {"general": {"DEFAULT_VWAP_PERIOD": 40, "ATR_PERIOD": 14}, "model": {"features": ["ret_3"]}}
+    opt = {"CONFIGURATIONS_BY_SCHEDULE": {"A": {"features": ["vwap_slope_5"]}}}
+    assert required_capacity(cfg, opt, margin=0) == max(MIN_CAPACITY, 45)
+    assert required_capacity({"general": {}}, None, margin=0) == MIN_CAPACITY
@@ -0,0 +1,99 @@
+# tests/feeds/test_ohlcv_store.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import signals.feeds.realtime as realtime
+from signals.feeds.ohlcv_store import OHLCVStore, convert_csv, is_store, load_ohlcv_frame, resolve_data_path
+from signals.shared.mtf_store import TimeframeSeries
+
+
+def _write_csv(path, n=300, seed=4, start="2025-07-14T14:35:00Z"):
+    rng = np.random.default_rng(seed)
+    close = np.round((115.0 + np.cumsum(rng.normal(0, 0.03, n))) / 0.03125) * 0.03125
+    times = pd.date_range(start, periods=n, freq="5min")
+    df = pd.DataFrame({
+        "time": [t.strftime("%Y-%m-%dT%H:%M:%SZ") for t in times],
+        "open": close, "high": close + 0.0625, "low": close - 0.03125, "close": close,
+        "volume": rng.integers(100, 5000, n),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_convert_roundtrip_and_zero_copy(tmp_path):
+    csv_path = str(tmp_path / "ub 5.csv")
+    src = _write_csv(csv_path)
+    store = convert_csv(csv_path)
+
+    assert store.path.endswith("ub 5.ohlcv") and is_store(store.path)
+    assert len(store) == len(src)
+    assert isinstance(store.column("close"), np.memmap)
+    np.testing.assert_array_equal(store.column("close"), src["close"].to_numpy())
+
+    # lecture unifiée : même colonne time (chaînes ISO 'Z') depuis le store et depuis le CSV
+    df = load_ohlcv_frame(store.path)
+    assert df["time"].tolist() == src["time"].tolist() == load_ohlcv_frame(csv_path)["time"].tolist()
+    np.testing.assert_array_equal(df["volume"].to_numpy(), src["volume"].to_numpy(dtype=float))
+
+
+def test_existing_csv_is_never_shadowed_by_a_converted_store(tmp_path):
+    csv_path = str(tmp_path / "ub 5.csv")
+    _write_csv(csv_path, n=10)
+    convert_csv(csv_path)
+    src = _write_csv(csv_path, n=15)          # le CSV continue de grossir après la conversion
+    assert resolve_data_path(csv_path) == csv_path
+    assert len(load_ohlcv_frame(csv_path)) == len(src)
+
+
+def test_append_truncates_orphan_bytes_and_checks_order(tmp_path):
+    store = OHLCVStore.create(str(tmp_path / "x.ohlcv"))
+    store.append(["2025-07-14T00:00:00Z", "2025-07-14T00:05:00Z"], close=[1.0, 2.0], volume=[5, 6])
+    # append interrompu : octets écrits mais meta.json non mis à jour
+    with open(os.path.join(store.path, "close.f8"), "ab") as f:
+        f.write(b"\xff" * 12)
+
+    store.append_candle({"time": "2025-07-14T00:10:00Z", "open": 3, "high": 3, "low": 3, "close": 3.0})
+    reader = OHLCVStore(store.path)
+    assert reader.column("close").tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(reader.column("open")[0])
+    assert os.path.getsize(os.path.join(store.path, "close.f8")) == 3 * 8
+
+    with pytest.raises(ValueError):
+        store.append(["2025-07-14T00:00:00Z"], close=[0.0])
+
+
+def test_feed_reads_store(tmp_path, monkeypatch):
+    csv_path = tmp_path / "ub 5.csv"
+    src = _write_csv(str(csv_path), n=20)
+    convert_csv(str(csv_path))
+    os.remove(csv_path)  # seul le store reste
+    monkeypatch.setattr(realtime, "load_config",
+                        lambda: {"data": {"data_path": str(tmp_path), "input_5m": "ub 5.csv"}})
+    realtime.reset_feed()
+    try:
+        candles = [realtime.get_next_candle() for _ in range(len(src))]
+        with pytest.raises(StopIteration):
+            realtime.get_next_candle()
+    finally:
+        realtime.reset_feed()
+    assert [c["time"] for c in candles] == src["time"].tolist()
+    assert [c["close"] for c in candles] == src["close"].tolist()
+
+
+def test_mtf_series_follows_store(tmp_path):
+    csv_path = str(tmp_path / "ub 60.csv")
+    src = _write_csv(csv_path, n=120)
+    from_csv = TimeframeSeries("1h", csv_path)
+    from_csv.refresh()
+
+    store = OHLCVStore.create(str(tmp_path / "h1.ohlcv"))
+    store.append_frame(src.iloc[:100])
+    series = TimeframeSeries("1h", store.path)
+    assert series.refresh() == 100
+    store.append_frame(src.iloc[100:])
+    assert series.refresh() == 20
+    np.testing.assert_array_equal(series.times, from_csv.times)
+    np.testing.assert_allclose(series.values("1h_ema21"), from_csv.values("1h_ema21"), rtol=1e-12)
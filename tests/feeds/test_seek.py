@@ -0,0 +1,87 @@
+# tests/feeds/test_seek.py
+import pytest
+
+import signals.feeds.realtime as realtime
+from signals.feeds.ohlcv_store import convert_csv
+from signals.feeds.seek import bisect_csv_offset, resume_offset
+from signals.runner.live.checkpoint import load_checkpoint, load_checkpoint_state, save_checkpoint
+from signals.utils.time_utils import datetime_to_ns
+
+HEADER = "time,open,high,low,close,volume\n"
+
+
+def _line(i):
+    h, m = divmod(i * 5, 60)
+    return f"2025-07-14T{h:02d}:{m:02d}:00Z,115.0,115.1,114.9,{115 + i / 100:.2f},{100 + i}\n"
+
+
+def _ns(i):
+    h, m = divmod(i * 5, 60)
+    return datetime_to_ns(f"2025-07-14T{h:02d}:{m:02d}:00Z")
+
+
+@pytest.fixture
+def csv_5m(tmp_path):
+    path = tmp_path / "5m.csv"
+    path.write_text(HEADER + "".join(_line(i) for i in range(200)))
+    return path
+
+
+def _offset_after(i):
+    return len(HEADER) + sum(len(_line(k)) for k in range(i + 1))
+
+
+def test_bisect_csv_offset(csv_5m):
+    for i in (0, 1, 57, 198, 199):
+        assert bisect_csv_offset(str(csv_5m), _ns(i)) == _offset_after(i)
+    # entre deux bougies, avant le début, après la fin
+    assert bisect_csv_offset(str(csv_5m), _ns(10) + 1) == _offset_after(10)
+    assert bisect_csv_offset(str(csv_5m), _ns(0) - 1) == len(HEADER)
+    assert bisect_csv_offset(str(csv_5m), _ns(199) + 10**12) == csv_5m.stat().st_size
+
+
+def test_resume_offset_validates_persisted_offset(csv_5m):
+    path = str(csv_5m)
+    assert resume_offset(path, offset=_offset_after(42), epoch_ns=_ns(42)) == _offset_after(42)
+    # offset périmé (fichier réécrit) -> recherche dichotomique sur le timestamp
+    assert resume_offset(path, offset=_offset_after(40) + 3, epoch_ns=_ns(42)) == _offset_after(42)
+    assert resume_offset(path, offset=_offset_after(41), timestamp="2025-07-14T03:30:00+00:00") == _offset_after(42)
+    assert resume_offset(path) == 0
+
+
+def test_resume_offset_store(csv_5m, tmp_path):
+    store = str(tmp_path / "5m.ohlcv")
+    convert_csv(str(csv_5m), store)
+    assert resume_offset(store, offset=43, epoch_ns=_ns(42)) == 43
+    assert resume_offset(store, offset=7, epoch_ns=_ns(42)) == 43
+
+
+def test_checkpoint_state_roundtrip(tmp_path):
+    cp = str(tmp_path / "cp" / "checkpoint.json")
+    save_checkpoint("2025-07-14T00:05:00+00:00", cp, offset=123, epoch_ns=_ns(1))
+    assert load_checkpoint(cp) == "2025-07-14T00:05:00+00:00"
+    assert load_checkpoint_state(cp) == {
+        "last_timestamp": "2025-07-14T00:05:00+00:00", "status": "OK", "offset": 123, "epoch_ns": _ns(1),
+    }
+    assert load_checkpoint_state(str(tmp_path / "absent.json")) is None
+
+
+@pytest.mark.parametrize("follow", [False, True])
+def test_realtime_resumes_after_checkpoint(csv_5m, monkeypatch, follow):
+    monkeypatch.setattr(realtime, "load_config", lambda: {
+        "data": {"data_path": str(csv_5m.parent), "input_5m": csv_5m.name,
+                 "follow": follow, "follow_poll_seconds": 0.05}
+    })
+    realtime.reset_feed()
+    try:
+        for _ in range(5):
+            realtime.get_next_candle()
+        pos = realtime.get_feed_position()
+        assert pos == _offset_after(4)
+
+        realtime.reset_feed()
+        realtime.set_resume_point(offset=pos, epoch_ns=_ns(4))
+        assert realtime.get_next_candle()["time"] == "2025-07-14T00:25:00Z"
+        assert realtime.get_feed_position() == _offset_after(5)
+    finally:
+        realtime.reset_feed()
@@ -0,0 +1,87 @@
+# tests/feeds/test_tail.py
+import os
+import threading
+import time
+
+import pytest
+
+import signals.feeds.realtime as realtime
+from signals.feeds.tail import CsvTail, FollowFeed
+
+HEADER = "time,open,high,low,close,volume\n"
+
+
+def _line(i):
+    return f"2025-07-14T14:{i:02d}:00Z,115.0,115.1,114.9,{115 + i / 100:.2f},{100 + i}\n"
+
+
+def test_csv_tail_partial_line_and_offsets(tmp_path):
+    path = tmp_path / "5m.csv"
+    path.write_text(HEADER + _line(0) + _line(5) + _line(10)[:12])
+    tail = CsvTail(str(path))
+
+    rows = tail.read_new()
+    assert [c["time"] for c, _ in rows] == ["2025-07-14T14:00:00Z", "2025-07-14T14:05:00Z"]
+    assert rows[-1][1] == len(HEADER + _line(0) + _line(5))
+    assert tail.read_new() == []  # ligne partielle en attente
+
+    with open(path, "a") as f:
+        f.write(_line(10)[12:] + _line(15))
+    rows = tail.read_new()
+    assert [c["close"] for c, _ in rows] == [115.10, 115.15]
+    assert tail.offset == os.path.getsize(path)
+
+
+def test_csv_tail_rotation_skips_already_emitted(tmp_path):
+    path = tmp_path / "5m.csv"
+    path.write_text(HEADER + _line(0) + _line(5))
+    tail = CsvTail(str(path))
+    assert len(tail.read_new()) == 2
+
+    # rotation : nouveau fichier (nouvel inode) réexporté avec l'historique + une nouvelle bougie
+    os.rename(path, tmp_path / "5m.old")
+    path.write_text(HEADER + _line(0) + _line(5) + _line(10))
+    rows = tail.read_new()
+    assert [c["time"] for c, _ in rows] == ["2025-07-14T14:10:00Z"]
+
+
+def test_follow_feed_wakes_on_append(tmp_path):
+    path = tmp_path / "5m.csv"
+    path.write_text(HEADER + _line(0))
+    feed = FollowFeed(str(path), poll_interval=30.0)
+    try:
+        assert feed.next_candle(timeout=1)["time"] == "2025-07-14T14:00:00Z"
+        with pytest.raises(TimeoutError):
+            feed.next_candle(timeout=0.05)
+
+        def append():
+            time.sleep(0.2)
+            with open(path, "a") as f:
+                f.write(_line(5))
+
+        threading.Thread(target=append, daemon=True).start()
+        t0 = time.monotonic()
+        candle = feed.next_candle(timeout=10)
+        # réveil par watchdog, pas par le poll de 30 s
+        assert time.monotonic() - t0 < 5
+        assert candle["time"] == "2025-07-14T14:05:00Z"
+        assert feed.offset == os.path.getsize(path)
+        assert feed.last_read_seconds < 0.1     # lecture seule, sans les 0.2 s d'attente de l'ajout
+    finally:
+        feed.close()
+
+
+def test_realtime_follow_mode(tmp_path, monkeypatch):
+    (tmp_path / "5m.csv").write_text(HEADER + _line(0) + _line(5))
+    monkeypatch.setattr(realtime, "load_config", lambda: {
+        "data": {"data_path": str(tmp_path), "input_5m": "5m.csv", "follow": True, "follow_poll_seconds": 0.05}
+    })
+    realtime.reset_feed()
+    try:
+        assert realtime.get_next_candle()["time"] == "2025-07-14T14:00:00Z"
+        assert realtime.get_next_candle()["volume"] == 105.0
+        with open(tmp_path / "5m.csv", "a") as f:
+            f.write(_line(10))
+        assert realtime.get_next_candle()["time"] == "2025-07-14T14:10:00Z"
+    finally:
+        realtime.reset_feed()
@@ -0,0 +1,25 @@
+# tests/live/test_incremental_wiring.py
+import numpy as np
+import pandas as pd
+
+import signals.features.real_time_features as rtf
+import signals.logic.trade_decider as trade_decider
+from signals.runner.live import orchestrator
+
+
+def test_feature_engine_warms_up_before_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(rtf, "get_mtf_resample", lambda: None)
+    monkeypatch.setattr(rtf, "get_tf_files", lambda: {})
+    monkeypatch.setattr(trade_decider, "load_model", lambda: "model")
+    times = pd.date_range("2025-07-14T00:00:00Z", periods=10, freq="5min")
+    close = 115.0 + np.arange(10) * 0.03125
+    pd.DataFrame({"time": times.strftime("%Y-%m-%dT%H:%M:%SZ"), "open": close, "high": close + 0.0625,
+                  "low": close - 0.0625, "close": close, "volume": 100.0}).to_csv(tmp_path / "ub.csv", index=False)
+    cfg = {"general": {"TICK_SIZE": 0.03125, "ATR_PERIOD": 3, "DEFAULT_VWAP_PERIOD": 3, "DEFAULT_ENTRY_THRESHOLD": 2.0},
+           "data": {"data_path": str(tmp_path), "input_5m": "ub.csv",
+                    "incremental_features": {"enabled": True, "warmup_bars": 4}}}
+
+    assert orchestrator._start_feature_engine({"data": {}}, {}, None) == (None, None)
+    engine, model = orchestrator._start_feature_engine(cfg, {}, times[6].isoformat())
+    assert model == "model" and engine.n_updates == 4
+    assert engine.last["close"] == close[6] and len(engine.buffer) == 4
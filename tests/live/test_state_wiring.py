@@ -0,0 +1,39 @@
+# tests/live/test_state_wiring.py
+import time
+
+import signals.api.client as api_client
+from signals.logic.execution.mock_exchange import MockExchange
+from signals.logic.execution.state_cache import AccountStateCache
+from signals.runner.live import orchestrator
+
+
+def test_startup_snapshot_is_notified(monkeypatch):
+    events = []
+    cfg = {"trading": {"state_cache": {"enabled": True, "poll_seconds": 60}}}
+    with MockExchange() as ex:
+        client = ex.client()
+        client.post("placeOrder", {"side": 0, "size": 1, "customTag": "déjà-ouvert"})
+        monkeypatch.setattr(api_client, "get_client", lambda: client)
+        state = orchestrator._start_state_cache(cfg, False, on_change=lambda kind, diff: events.append((kind, diff)))
+        try:
+            deadline = time.time() + 2
+            while not events and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            state.stop()
+    assert events[0][0] == "orders" and events[0][1].added[0]["customTag"] == "déjà-ouvert"
+    assert orchestrator._order_update_handler(None) is None
+
+
+def test_pre_trade_check_counts_only_the_traded_contract():
+    with MockExchange() as ex:
+        client = ex.client()
+        client.post("placeOrder", {"side": 0, "size": 1, "contractId": "CON.F.US.ENQ.Z25"})
+        ex.positions[1] = {"id": 1, "contractId": "CON.F.US.ENQ.Z25", "type": 1, "size": 3}
+        state = AccountStateCache(client, 212)
+        state.refresh()
+    cfg = {"trading": {"contract_id": "CON.F.US.UB.Z25",
+                       "state_cache": {"max_open_orders": 1, "max_position": 1}}}
+    assert orchestrator._pre_trade_check(state, cfg, "BUY", 1.0) is None
+    cfg["trading"]["contract_id"] = "CON.F.US.ENQ.Z25"
+    assert orchestrator._pre_trade_check(state, cfg, "BUY", 1.0) == "ordres ouverts broker : 1"
@@ -0,0 +1,54 @@
+# tests/logging/test_api_audit.py
+import glob
+import gzip
+import json
+import threading
+
+from signals.logging.api_audit import APIAuditLogger, AuditSink, get_audit_sink
+
+
+def _lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(l) for l in f]
+
+
+def test_shared_sink_keeps_order_and_handle(tmp_path):
+    path = str(tmp_path / "audit.ndjson")
+    a, b = APIAuditLogger(path), APIAuditLogger(path)
+    assert a._sink is b._sink is get_audit_sink(path)
+    for i in range(200):
+        (a if i % 2 else b).log({"event": "request", "i": i, "payload": {"x": object()}})
+    a.flush(5)
+    recs = _lines(path)
+    assert [r["i"] for r in recs] == list(range(200))
+    assert all("ts_epoch_ms" in r for r in recs)
+    a._sink.close()
+    assert get_audit_sink(path) is not a._sink       # sink fermé -> recréé
+
+
+def test_log_does_not_wait_for_disk(tmp_path, monkeypatch):
+    sink = AuditSink(str(tmp_path / "slow.ndjson"))
+    gate = threading.Event()
+    original = sink._write
+    monkeypatch.setattr(sink, "_write", lambda recs: (gate.wait(5), original(recs)))
+    for i in range(10):
+        sink.log({"event": "request", "i": i})   # disque "bloqué" : retour immédiat
+    gate.set()
+    sink.close()
+    assert [r["i"] for r in _lines(sink.path)] == list(range(10))
+
+
+def test_rotation_compresses_and_prunes(tmp_path):
+    path = str(tmp_path / "audit.ndjson")
+    sink = AuditSink(path, max_bytes=2_000, backups=2)
+    for i in range(300):
+        sink.log({"event": "response", "i": i, "pad": "x" * 50})
+    sink.close()
+
+    archives = sorted(glob.glob(path + ".*.gz"))
+    assert len(archives) == 2
+    assert not [p for p in glob.glob(path + ".*") if not p.endswith(".gz")]
+    with gzip.open(archives[-1], "rt", encoding="utf-8") as f:
+        archived = [json.loads(l)["i"] for l in f]
+    current = [r["i"] for r in _lines(path)]
+    assert archived[-1] + 1 == current[0] and current[-1] == 299
@@ -0,0 +1,89 @@
+# tests/logging/test_async_writer.py
+import csv
+import threading
+
+from signals.logging.async_writer import AsyncCSVWriter
+from signals.logging.signal_logger import SignalLogger
+
+
+def _signal(logger, i):
+    logger.log_signal(
+        timestamp=f"2025-07-14T00:{i:02d}:00+00:00", symbol="UB", action="buy", prob=0.8, price=120.5,
+        qty=1, reason="", session="ASIAN02", vwap=120.0, spread_to_vwap=0.5, features=None,
+    )
+
+
+def _perf(logger, i):
+    logger.log_performance_snapshot(
+        timestamp=f"t{i}", equity=1.0, realized_pnl=0.0, unrealized_pnl=0.0, drawdown=0.0,
+        max_equity=1.0, n_trades=i, position_size=0.0, last_price=None,
+    )
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_async_logger_matches_sync_output(tmp_path):
+    sync = SignalLogger(str(tmp_path / "s_sync.csv"), str(tmp_path / "p_sync.csv"))
+    writer = AsyncCSVWriter(flush_interval=0.05)
+    asyn = SignalLogger(str(tmp_path / "s_async.csv"), str(tmp_path / "p_async.csv"), writer=writer)
+    for i in range(50):
+        for lg in (sync, asyn):
+            _signal(lg, i)
+            _perf(lg, i)
+
+    asyn.flush(timeout=5)
+    assert _rows(tmp_path / "s_async.csv") == _rows(tmp_path / "s_sync.csv")
+    asyn.close()
+    assert _rows(tmp_path / "p_async.csv") == _rows(tmp_path / "p_sync.csv")
+    assert len(_rows(tmp_path / "p_async.csv")) == 51
+    assert writer.written == 100 and writer.dropped == 0
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, monkeypatch):
+    writer = AsyncCSVWriter(queue_size=2, flush_interval=0.05)
+    gate = threading.Event()
+    original = writer._write_rows
+    monkeypatch.setattr(writer, "_write_rows", lambda rows: (gate.wait(5), original(rows)))
+
+    path = str(tmp_path / "out.csv")
+    accepted = [writer.write(path, [i]) for i in range(20)]   # disque "bloqué" : ne doit pas attendre
+    assert writer.dropped > 0 and accepted.count(False) == writer.dropped
+
+    gate.set()
+    writer.close()
+    assert [int(r[0]) for r in _rows(path)] == [i for i, ok in enumerate(accepted) if ok]
+
+
+def test_close_drains_queue_and_falls_back_to_direct_writes(tmp_path):
+    writer = AsyncCSVWriter(flush_interval=10)
+    path = str(tmp_path / "out.csv")
+    for i in range(1000):
+        writer.write(path, [i, "x"])
+    writer.close()
+    assert len(_rows(path)) == 1000
+    writer.write(path, ["after", "close"])
+    assert _rows(path)[-1] == ["after", "close"]
+
+
+def test_from_config():
+    assert AsyncCSVWriter.from_config({"logging": {}}) is None
+    w = AsyncCSVWriter.from_config({"logging": {"async_writer": {"enabled": True, "fsync": True, "queue_size": 5}}})
+    try:
+        assert w.fsync and w._q.maxsize == 5
+    finally:
+        w.close()
+
+
+def test_row_is_snapshotted_at_enqueue(tmp_path):
+    writer = AsyncCSVWriter(flush_interval=10)
+    path = str(tmp_path / "out.csv")
+    features = {"rsi": 50.0}
+    row = ["t0", features]
+    writer.write(path, row)
+    features["rsi"] = 99.0                # l'appelant réutilise ses objets après write()
+    row[0] = "t1"
+    writer.close()
+    assert _rows(path) == [["t0", "{'rsi': 50.0}"]]
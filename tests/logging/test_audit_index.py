@@ -0,0 +1,75 @@
+# tests/logging/test_audit_index.py
+import glob
+import json
+import os
+
+from signals.logging.api_audit import AuditSink
+from signals.logging.audit_index import AuditIndex, index_path_for, main
+
+
+def _order_events(sink, rid, attempts=2):
+    for attempt in range(1, attempts + 1):
+        sink.log({"event": "request", "attempt": attempt, "request_id": rid,
+                  "payload": {"clientOrderId": rid, "pad": "x" * 40}})
+        sink.log({"event": "error" if attempt < attempts else "response", "attempt": attempt, "request_id": rid})
+
+
+def test_index_follows_rotation_and_compression(tmp_path):
+    path = str(tmp_path / "api_responses.ndjson")
+    sink = AuditSink(path, max_bytes=3_000, backups=50, index=True)
+    for k in range(60):
+        _order_events(sink, f"order-{k}")
+        sink.log({"event": "import_error", "error": "no id"})     # non indexé
+    sink.close()
+    assert glob.glob(path + ".*.gz")
+
+    index = AuditIndex(index_path_for(path))
+    try:
+        for k in (0, 31, 59):
+            events = index.timeline(f"order-{k}")
+            assert [(e["event"], e["attempt"]) for e in events] == [
+                ("request", 1), ("error", 1), ("request", 2), ("response", 2)
+            ]
+            assert {e["request_id"] for e in events} == {f"order-{k}"}
+        assert index.timeline("unknown") == []
+    finally:
+        index.close()
+
+
+def test_rebuild_matches_live_index(tmp_path, capsys):
+    path = str(tmp_path / "audit.ndjson")
+    sink = AuditSink(path, max_bytes=2_000, backups=50, index=True)
+    for k in range(30):
+        _order_events(sink, f"o{k}", attempts=1)
+    sink.close()
+    live = AuditIndex(index_path_for(path))
+    expected = {k: live.timeline(f"o{k}") for k in range(30)}
+    live.close()
+
+    os.remove(index_path_for(path))
+    main(["rebuild", path])
+    assert "60 événement(s)" in capsys.readouterr().out
+    rebuilt = AuditIndex(index_path_for(path))
+    try:
+        assert {k: rebuilt.timeline(f"o{k}") for k in range(30)} == expected
+    finally:
+        rebuilt.close()
+
+    main(["lookup", path, "o7"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(l)["event"] for l in lines[:2]] == ["request", "response"]
+    assert "2 événement(s) pour o7" in lines[-1]
+
+
+def test_pruned_archives_leave_the_index(tmp_path):
+    path = str(tmp_path / "audit.ndjson")
+    sink = AuditSink(path, max_bytes=1_000, backups=1, index=True)
+    for k in range(40):
+        _order_events(sink, f"o{k}", attempts=1)
+    sink.close()
+    index = AuditIndex(index_path_for(path))
+    try:
+        assert index.lookup("o0") == []
+        assert index.timeline("o39")[-1]["event"] == "response"
+    finally:
+        index.close()
@@ -0,0 +1,127 @@
+# tests/logging/test_signal_journal.py
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import signals.logging.signal_journal as signal_journal
+from signals.logging.signal_journal import (
+    ColumnarSignalLogger,
+    convert_csv_logs,
+    load_journal,
+    main,
+    query_journal,
+)
+from signals.logging.signal_logger import SignalLogger
+
+T0 = pd.Timestamp("2025-07-01T00:00:00Z")
+
+
+def _log(logger, n, offset=0):
+    for i in range(offset, offset + n):
+        ts = (T0 + pd.Timedelta(minutes=5 * i)).isoformat()
+        logger.log_signal(
+            timestamp=ts, symbol="UB", action=("buy", "sell", "flat")[i % 3], prob=0.5 + (i % 10) / 100,
+            price=120.0 + i / 100, qty=(1 if i % 3 < 2 else None), reason=None,
+            session=("ASIAN02" if i % 2 else "US01"), vwap=120.0, spread_to_vwap=i / 100,
+            features={"normalized_dist_to_vwap": i / 10, "rsi": 50.0},
+            extra={"schedule": "ASIAN02", "vwap_config": {"W": 20}, "risk": None, "shadow": False},
+        )
+        logger.log_performance_snapshot(
+            timestamp=ts, equity=1000.0 + i, realized_pnl=float(i), unrealized_pnl=0.0, drawdown=0.0,
+            max_equity=1000.0 + i, n_trades=i, position_size=0.0, last_price=None,
+        )
+
+
+def test_segments_roundtrip_with_typed_columns(tmp_path):
+    journal = ColumnarSignalLogger(str(tmp_path / "j"), segment_rows=40)
+    _log(journal, 100)
+    journal.close()
+
+    assert len(os.listdir(tmp_path / "j" / "signals")) == 3     # 40 + 40 + 20
+    df = load_journal(str(tmp_path / "j"))
+    assert len(df) == 100 and df["timestamp"].is_monotonic_increasing
+    assert str(df["timestamp"].dt.tz) == "UTC"
+    assert isinstance(df["action"].dtype, pd.CategoricalDtype)
+    assert set(df["action"].cat.categories) == {"BUY", "SELL", "FLAT"}
+    assert df["feat.normalized_dist_to_vwap"].dtype == np.float64
+    assert df.loc[7, "feat.normalized_dist_to_vwap"] == 0.7
+    assert np.isnan(df.loc[2, "qty"]) and df.loc[0, "schedule"] == "ASIAN02"
+    assert df.loc[0, "extra"] == '{"vwap_config": {"W": 20}, "risk": null}'
+
+    perf = load_journal(str(tmp_path / "j"), "performance")
+    assert perf["n_trades"].dtype == np.int64 and perf["n_trades"].tolist() == list(range(100))
+
+
+def test_query_filters_time_session_action_and_aggregates(tmp_path):
+    journal = ColumnarSignalLogger(str(tmp_path / "j"), segment_rows=25)
+    _log(journal, 100)
+    journal.close()
+
+    start, end = T0 + pd.Timedelta(minutes=100), T0 + pd.Timedelta(minutes=200)   # i in [20, 40]
+    df = query_journal(str(tmp_path / "j"), start=start.isoformat(), end=end.isoformat(),
+                       session=["ASIAN02"], action=["buy"])
+    expected = [i for i in range(20, 41) if i % 2 and i % 3 == 0]
+    assert df["price"].round(2).tolist() == [120.0 + i / 100 for i in expected]
+
+    counts = query_journal(str(tmp_path / "j"), by=["session", "action"])
+    assert counts["count"].sum() == 100 and len(counts) == 6
+    means = query_journal(str(tmp_path / "j"), by=["action"], agg="mean", columns=["prob"])
+    assert set(means.columns) == {"action", "prob"}
+
+
+def test_convert_existing_csv_logs(tmp_path, capsys):
+    csv_logger = SignalLogger(str(tmp_path / "signals.csv"), str(tmp_path / "perf.csv"))
+    _log(csv_logger, 30)
+    convert_csv_logs(str(tmp_path / "signals.csv"), str(tmp_path / "perf.csv"), str(tmp_path / "j"))
+
+    direct = ColumnarSignalLogger(str(tmp_path / "direct"))
+    _log(direct, 30)
+    direct.close()
+    a, b = load_journal(str(tmp_path / "j")), load_journal(str(tmp_path / "direct"))
+    pd.testing.assert_series_equal(a["feat.rsi"], b["feat.rsi"])
+    pd.testing.assert_series_equal(a["prob"], b["prob"])
+    assert a["action"].tolist() == b["action"].tolist()
+    assert load_journal(str(tmp_path / "j"), "performance")["equity"].iloc[-1] == 1029.0
+
+    main(["query", str(tmp_path / "j"), "--by", "action"])
+    out = capsys.readouterr().out
+    assert "BUY" in out and "3 ligne(s)" in out
+
+
+def test_month_query_is_fast(tmp_path):
+    # ~1 mois de bougies 5 min en segments de 1000 lignes
+    journal = ColumnarSignalLogger(str(tmp_path / "j"), segment_rows=1000)
+    _log(journal, 9000)
+    journal.close()
+    t0 = time.perf_counter()
+    counts = query_journal(str(tmp_path / "j"), session=["ASIAN02"], by=["action"])
+    assert time.perf_counter() - t0 < 1.0
+    assert counts["count"].sum() == 4500
+
+
+def test_segment_writes_run_off_the_caller_thread(tmp_path, monkeypatch):
+    gate = threading.Event()
+    writers = []
+    original = signal_journal._write_segment
+
+    def slow_write(root, kind, columns):
+        writers.append(threading.current_thread().name)
+        gate.wait(5)                      # disque "bloqué"
+        return original(root, kind, columns)
+
+    monkeypatch.setattr(signal_journal, "_write_segment", slow_write)
+    journal = ColumnarSignalLogger(str(tmp_path / "j"), segment_rows=10)
+    t0 = time.perf_counter()
+    _log(journal, 30)                     # 3 segments par type : aucun ne doit bloquer l'appelant
+    assert time.perf_counter() - t0 < 1.0
+    assert os.listdir(tmp_path / "j" / "signals") == []
+
+    gate.set()
+    assert journal.flush(timeout=5)
+    assert set(writers) == {"journal-writer"}
+    assert len(load_journal(str(tmp_path / "j"))) == 30
+    journal.close()
+    assert len(load_journal(str(tmp_path / "j"), "performance")) == 30
@@ -0,0 +1,85 @@
+# tests/monitoring/test_tracing.py
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from importlib import reload
+
+import pytest
+from prometheus_client import REGISTRY
+
+import signals.monitoring.metrics as metrics
+from signals.monitoring.tracing import BarTracer, span
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics(monkeypatch):
+    reload(metrics)
+    monkeypatch.setattr(metrics, "start_http_server", lambda port, addr="0.0.0.0": None)
+
+
+def test_bar_trace_exports_histograms_lag_and_ndjson(tmp_path):
+    metrics.start_prometheus_server(enabled=True, addr="127.0.0.1", port=9999, namespace="trace_ns")
+    trace_file = tmp_path / "traces.ndjson"
+    tracer = BarTracer.from_config({"monitoring": {"traces": {"enabled": True, "file": str(trace_file)}}})
+
+    candle_time = datetime.now(timezone.utc) - timedelta(seconds=30)
+    tracer.begin()
+    with span("feed"):
+        pass
+    with span("decision"):
+        with span("features"):
+            time.sleep(0.002)
+        with span("features"):  # cumul
+            pass
+    rec = tracer.end(candle_time)
+    tracer.close()
+
+    assert set(rec["stages"]) == {"feed", "decision", "features"}
+    assert rec["stages"]["decision"] >= rec["stages"]["features"] >= 0.002
+    assert rec["total_s"] >= rec["stages"]["decision"]
+    assert 29 < rec["feed_lag_s"] < 60
+
+    count = lambda stage: REGISTRY.get_sample_value("trace_ns_stage_latency_seconds_count", {"stage": stage})
+    assert count("features") == 1.0 and count("total") == 1.0
+    assert 29 < REGISTRY.get_sample_value("trace_ns_feed_lag_seconds") < 60
+
+    lines = trace_file.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["stages"]["features"] == rec["stages"]["features"]
+
+
+def test_feed_read_time_counts_without_the_wait(monkeypatch):
+    observed = []
+    monkeypatch.setattr(metrics, "observe_stage", lambda stage, s: observed.append((stage, s)))
+    tracer = BarTracer()
+    time.sleep(0.05)                        # attente de la bougie : avant begin(), non comptée
+    tracer.begin(feed_seconds=0.001)
+    rec = tracer.end()
+    assert rec["stages"] == {"feed": 0.001}
+    assert 0.001 <= rec["total_s"] < 0.04
+    assert ("feed", 0.001) in observed
+
+
+def test_spans_outside_a_bar_and_discard_are_noops():
+    tracer = BarTracer()
+    with span("feed"):
+        pass
+    assert tracer.end() is None
+    tracer.begin()
+    tracer.discard()
+    assert tracer.end() is None
+
+
+def test_span_overhead_is_microseconds():
+    tracer = BarTracer()
+    tracer.begin()
+    n = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with span("predict"):
+            pass
+    per_span = (time.perf_counter() - t0) / n
+    tracer.discard()
+    # ~10 spans par bougie : quelques µs, à comparer à des ms de traitement par bougie
+    assert per_span < 20e-6
@@ -0,0 +1,98 @@
+# tests/optimizer/test_hot_reload.py
+import json
+import logging
+import os
+import time
+
+from signals.optimizer.hot_reload import OptimizerReloader
+from signals.optimizer.optimizer_rules import (
+    diff_optimizer_config,
+    select_active_schedule,
+    validate_optimizer_config,
+)
+
+
+def _opt(ml=0.6, start=0, end=2):
+    return {
+        "GLOBAL_CONSTANTS": {"TICK_SIZE": 0.03125},
+        "CONFIGURATIONS_BY_SCHEDULE": {
+            "ASIAN02": {"HOUR_RANGE_START": start, "HOUR_RANGE_END": end, "ML_THRESHOLD": ml,
+                        "RISK_MANAGEMENT": {"FIXED_LOTS": 1}},
+        },
+    }
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data) if isinstance(data, dict) else data)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+def test_validate_and_diff():
+    assert validate_optimizer_config(_opt()) == []
+    assert validate_optimizer_config({"CONFIGURATIONS_BY_SCHEDULE": {}})
+    assert any("ML_THRESHOLD" in e for e in validate_optimizer_config(_opt(ml=1.5)))
+    assert any("ASIAN02" in e for e in validate_optimizer_config(_opt(start="x")))
+    assert diff_optimizer_config(_opt(), _opt(ml=0.7)) == [
+        "~ CONFIGURATIONS_BY_SCHEDULE.ASIAN02.ML_THRESHOLD: 0.6 -> 0.7"
+    ]
+
+
+def test_reload_swaps_only_between_candles(tmp_path, caplog):
+    path = tmp_path / "opt.json"
+    _write(path, _opt())
+    reloader = OptimizerReloader(str(path), use_watchdog=False)
+    before = reloader.current
+
+    # fichier invalide (écriture partielle puis config rejetée) : version en service conservée
+    _write(path, '{"CONFIGURATIONS_BY_')
+    assert reloader.check() is False
+    _write(path, _opt(ml=2.0))
+    assert reloader.check() is False
+    assert reloader.apply_pending() is False and reloader.current is before
+
+    _write(path, _opt(ml=0.8, end=3))
+    assert reloader.check() is True
+    assert reloader.current is before          # pas encore activée
+    with caplog.at_level(logging.INFO):
+        assert reloader.apply_pending() is True
+    assert select_active_schedule(reloader.current, 3).ml_threshold == 0.8
+    assert "ASIAN02.ML_THRESHOLD: 0.6 -> 0.8" in caplog.text
+    assert "ASIAN02.HOUR_RANGE_END: 2 -> 3" in caplog.text
+
+
+def test_background_watcher_stages_new_version(tmp_path):
+    path = tmp_path / "opt.json"
+    _write(path, _opt())
+    reloader = OptimizerReloader(str(path), poll_interval=0.05, debounce=0.01).start()
+    try:
+        _write(path, _opt(ml=0.9))
+        deadline = time.monotonic() + 5
+        while not reloader.apply_pending():
+            assert time.monotonic() < deadline, "nouvelle version jamais détectée"
+            time.sleep(0.01)
+        assert reloader.current["CONFIGURATIONS_BY_SCHEDULE"]["ASIAN02"]["ML_THRESHOLD"] == 0.9
+    finally:
+        reloader.stop()
+
+
+def test_snapshot_follows_reloader(tmp_path, monkeypatch):
+    import signals.loaders.config_snapshot as config_snapshot
+    import signals.utils.config_reader as cfg_reader
+
+    path = tmp_path / "opt.json"
+    _write(path, _opt())
+    monkeypatch.setattr(cfg_reader, "load_config", lambda *a, **k: {"config_horaire": {"path": str(path)}})
+    reloader = OptimizerReloader(str(path), use_watchdog=False)
+    config_snapshot.set_optimizer_provider(lambda: reloader.current)
+    try:
+        assert config_snapshot.get_snapshot().schedules[0].ml_threshold == 0.6
+        _write(path, _opt(ml=0.75))
+        assert reloader.check()
+        # tant que la bascule n'est pas faite, le snapshot reste sur l'ancienne version
+        assert config_snapshot.get_snapshot().schedules[0].ml_threshold == 0.6
+        reloader.apply_pending()
+        assert config_snapshot.get_snapshot().schedules[0].ml_threshold == 0.75
+    finally:
+        config_snapshot.set_optimizer_provider(None)
+        config_snapshot.reset_snapshot()
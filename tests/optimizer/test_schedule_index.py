@@ -0,0 +1,93 @@
+# tests/optimizer/test_schedule_index.py
+import random
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from signals.logic.optimizer_parity import is_in_schedule
+from signals.logic.trade_validator import TimeWindow, _within_windows
+from signals.optimizer.schedule_index import (
+    ScheduleIndex,
+    ScheduleMode,
+    get_schedule_index,
+    in_hour_range_closed,
+)
+
+
+def _random_schedules(rng, n=4):
+    out = {}
+    for k in range(n):
+        out[f"S{k}"] = {"HOUR_RANGE_START": rng.randint(0, 24), "HOUR_RANGE_END": rng.randint(0, 24),
+                        "heure_debut": rng.randint(0, 23), "heure_fin": rng.randint(0, 24)}
+    if rng.random() < 0.3:
+        del out["S0"]["heure_fin"]  # schedule ignoré en mode HOUR_LABEL
+    return out
+
+
+def _linear(mode, hour, schedules):
+    """Scans linéaires historiques (référence)."""
+    for label, sc in schedules.items():
+        if mode is ScheduleMode.HALF_OPEN:
+            ok = is_in_schedule(hour, sc)
+        elif mode is ScheduleMode.CLOSED:
+            ok = in_hour_range_closed(hour, int(sc.get("HOUR_RANGE_START", 0)), int(sc.get("HOUR_RANGE_END", 23)))
+        else:
+            h0, h1 = sc.get("heure_debut"), sc.get("heure_fin")
+            ok = h0 is not None and h1 is not None and h0 <= hour < h1
+        if ok:
+            return label
+    return None
+
+
+def test_hour_modes_match_linear_scans():
+    rng = random.Random(7)
+    for _ in range(200):
+        schedules = _random_schedules(rng)
+        for mode in (ScheduleMode.HALF_OPEN, ScheduleMode.CLOSED, ScheduleMode.HOUR_LABEL):
+            index = ScheduleIndex.from_schedules(schedules, mode)
+            for h in range(24):
+                assert index.label_for_hour(h) == _linear(mode, h, schedules), (mode, h, schedules)
+
+
+def test_index_is_cached_per_config_object():
+    schedules = {"A": {"HOUR_RANGE_START": 9, "HOUR_RANGE_END": 17}}
+    first = get_schedule_index(schedules, ScheduleMode.HALF_OPEN)
+    assert get_schedule_index(schedules, ScheduleMode.HALF_OPEN) is first
+    assert get_schedule_index(schedules, ScheduleMode.CLOSED) is not first
+    assert get_schedule_index(dict(schedules), ScheduleMode.HALF_OPEN) is not first
+
+
+def test_windows_mode_matches_within_windows():
+    windows = [
+        TimeWindow(start=time(8, 0), end=time(17, 0), days=[0, 1, 2, 3, 4]),
+        TimeWindow(start=time(22, 30), end=time(23, 59), days=None),
+    ]
+    index = ScheduleIndex.from_windows(windows)
+    rng = random.Random(3)
+    base = datetime(2025, 7, 14)  # lundi
+    samples = [base + timedelta(days=d, hours=17) for d in range(7)]               # borne de fin pile
+    samples += [base + timedelta(hours=17, seconds=1), base + timedelta(hours=23, minutes=59, seconds=30)]
+    samples += [base + timedelta(seconds=rng.randint(0, 7 * 86400 - 1)) for _ in range(2000)]
+    for ts in samples:
+        legacy = any((w.days is None or ts.weekday() in w.days) and w.start <= ts.time() <= w.end for w in windows)
+        assert (index.index_at(ts) >= 0) == legacy, ts
+        assert _within_windows(ts, windows) == legacy
+
+    arr = index.index_array(pd.DatetimeIndex(samples))
+    assert np.array_equal(arr, [index.index_at(ts) for ts in samples])
+
+
+def test_vectorized_query_on_utc_timestamps():
+    schedules = {
+        "NIGHT": {"HOUR_RANGE_START": 22, "HOUR_RANGE_END": 2},
+        "DAY": {"HOUR_RANGE_START": 8, "HOUR_RANGE_END": 16},
+    }
+    times = pd.date_range("2025-07-14", periods=288, freq="5min", tz="UTC")
+    index = get_schedule_index(schedules, ScheduleMode.HALF_OPEN)
+    expected = [
+        ["NIGHT", "DAY"].index(sel) if (sel := _linear(ScheduleMode.HALF_OPEN, t.hour, schedules)) else -1
+        for t in times
+    ]
+    assert index.index_array(times).tolist() == expected
+    assert index.hour_index_array(times.hour).tolist() == expected
@@ -0,0 +1,88 @@
+# tests/shared/test_mtf_store.py
+import numpy as np
+import pandas as pd
+
+from signals.shared.features_utils import add_features, load_and_merge_multiframe
+from signals.shared.mtf_store import MultiTimeframeStore, TimeframeSeries, get_mtf_store
+
+
+def _tf_lines(start, n, freq, seed=1):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=n, freq=freq)
+    close = 115 + np.cumsum(rng.normal(0, 0.05, n))
+    return [f"{t.strftime('%Y-%m-%dT%H:%M:%SZ')},{c},{c + 0.1},{c - 0.1},{c},100\n" for t, c in zip(times, close)]
+
+
+def _write(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        if mode == "w":
+            f.write("time,open,high,low,close,volume\n")
+        f.writelines(lines)
+
+
+def _df5(n=300):
+    times = pd.date_range("2025-07-14T00:00:00Z", periods=n, freq="5min")
+    return pd.DataFrame({"datetime": times, "close": np.linspace(115, 116, n)})
+
+
+def _assert_frames_equal(a, b, cols):
+    for c in cols:
+        np.testing.assert_allclose(a[c].to_numpy(float), b[c].to_numpy(float), rtol=1e-9, atol=1e-6, err_msg=c)
+
+
+def test_store_matches_batch_merge(tmp_path):
+    p = tmp_path / "UB_15.csv"
+    _write(p, _tf_lines("2025-07-13T20:00:00Z", 60, "15min"))
+    df = _df5()
+
+    batch = load_and_merge_multiframe(df.copy(), {"15min": str(p)}, add_features)
+    store = MultiTimeframeStore.from_files({"15min": str(p)})
+    fast = load_and_merge_multiframe(df.copy(), {"15min": str(p)}, add_features, store=store)
+
+    cols = ["15min_ema21", "15min_rsi14", "15min_vol12"]
+    _assert_frames_equal(fast, batch, cols)
+
+
+def test_refresh_reads_only_appended_complete_lines(tmp_path):
+    p = tmp_path / "UB_60.csv"
+    lines = _tf_lines("2025-07-10T00:00:00Z", 120, "1h")
+    _write(p, lines[:100])
+
+    series = TimeframeSeries("1h", str(p))
+    assert series.refresh() == 100
+    assert series.refresh() == 0  # rien de neuf
+
+    # ajout de 10 lignes + une ligne partielle (sans \n)
+    _write(p, lines[100:110], mode="a")
+    with open(p, "a", encoding="utf-8") as f:
+        f.write(lines[110][:12])
+    assert series.refresh() == 10
+    assert len(series) == 110
+
+    # complète la ligne partielle + le reste
+    with open(p, "a", encoding="utf-8") as f:
+        f.write(lines[110][12:])
+        f.writelines(lines[111:])
+    assert series.refresh() == 10
+    assert len(series) == 120
+
+    ref = add_features(pd.read_csv(p), prefix="1h_")
+    # (read_csv n'est pas round-trip exact sur les floats -> tolérance)
+    np.testing.assert_allclose(series.values("1h_ema21"), ref["1h_ema21"].to_numpy(), rtol=1e-12)
+
+
+def test_rewritten_file_triggers_rebuild(tmp_path):
+    p = tmp_path / "UB_240.csv"
+    _write(p, _tf_lines("2025-07-01T00:00:00Z", 50, "4h", seed=1))
+    store = get_mtf_store({"4h": str(p)})
+    before = store.asof(pd.Timestamp("2025-07-05T00:00:00Z"))["4h_ema21"]
+
+    # même taille mais contenu différent -> empreinte différente -> reconstruction
+    _write(p, _tf_lines("2025-07-01T00:00:00Z", 50, "4h", seed=2))
+    store = get_mtf_store({"4h": str(p)})
+    after = store.asof(pd.Timestamp("2025-07-05T00:00:00Z"))["4h_ema21"]
+    assert len(store.series["4h"]) == 50
+    assert before != after
+
+    # avant la première barre -> NaN (merge_asof backward)
+    assert np.isnan(store.asof(pd.Timestamp("2025-06-30T00:00:00Z"))["4h_rsi14"])
@@ -1,5 +1,9 @@
 # tests/test_api_client.py
 
+import base64
+import json as _json
+import threading
+
 import pytest
 from signals.api import client
 import requests
@@ -26,3 +30,98 @@ def test_safe_post_failure(monkeypatch):
 
     with pytest.raises(Exception, match="Échec API"):
         client.safe_post("http://fail.url", {"data": 1})
+
+
+# --- Client partagé : session keep-alive + cache du token ---
+
+def _jwt(exp):
+    body = base64.urlsafe_b64encode(_json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"h.{body}.s"
+
+
+def test_token_cache_refreshes_just_before_expiry():
+    now = [1_000.0]
+    issued = []
+
+    def fetch():
+        issued.append(_jwt(now[0] + 600))
+        return issued[-1]
+
+    cache = client.TokenCache(fetch, refresh_margin=60, clock=lambda: now[0])
+    first = cache.get()
+    now[0] += 500
+    assert cache.get() == first and len(issued) == 1
+    now[0] += 50            # à moins de 60 s de l'expiration -> renouvelé
+    assert cache.get() != first and len(issued) == 2
+
+    cache.invalidate("autre-token")      # pas le token courant : ignoré
+    assert len(issued) == 2 and cache.get() == issued[-1]
+
+
+def test_token_cache_single_login_under_concurrency():
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(1)
+        return "opaque-token"          # sans claim exp -> TTL par défaut
+
+    cache = client.TokenCache(fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert calls == [1] and results == ["opaque-token"] * 8
+
+
+class _Resp:
+    def __init__(self, status, data=None):
+        self.status_code = status
+        self.reason = "ERR"
+        self.text = _json.dumps(data)
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.calls.append((url, headers["Authorization"], timeout))
+        return self.responses.pop(0)
+
+
+def test_api_client_reuses_session_and_token():
+    tokens = iter(["t1", "t2"])
+    cache = client.TokenCache(lambda: next(tokens))
+    session = _Session([_Resp(200, {"success": True}), _Resp(401), _Resp(200, {"orderId": 7}), _Resp(503)])
+    api = client.APIClient("https://x", endpoints={"placeOrder": "/api/Order/place"}, session=session, token_cache=cache,
+                           throttle=False)   # le 503 ne doit pas ouvrir le disjoncteur partagé
+
+    assert api.post("placeOrder", {"a": 1}) == {"success": True}
+    # 401 : token invalidé, nouveau login et rejeu unique
+    assert api.post("placeOrder", {"a": 1}, timeout=2) == {"orderId": 7}
+    assert [c[1] for c in session.calls] == ["Bearer t1", "Bearer t1", "Bearer t2"]
+    assert session.calls[-1] == ("https://x/api/Order/place", "Bearer t2", 2)
+    # erreur HTTP -> dict avec statusCode (retry géré par place_order)
+    assert api.post("placeOrder", {})["statusCode"] == 503
+
+
+def test_shared_session_is_pooled():
+    s = client.get_session()
+    assert s is client.get_session()
+    adapter = s.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == client.POOL_MAXSIZE
+    assert client.APIClient(session=None, token_cache=client.TokenCache(lambda: "t")).session is s
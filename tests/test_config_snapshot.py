@@ -0,0 +1,105 @@
+# tests/test_config_snapshot.py
+
+import json
+import os
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+import signals.loaders.config_snapshot as config_snapshot
+import signals.utils.config_reader as cfg_reader
+from signals.utils.file_cache import FileCache
+
+
+def _bump_mtime(path, delta_ns=10_000_000):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+def test_file_cache_reparses_only_on_content_change(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text('{"x": 1}')
+    calls = []
+    cache = FileCache(lambda text: calls.append(text) or json.loads(text))
+
+    first = cache.load(str(path))
+    assert cache.load(str(path)) is first
+    _bump_mtime(path)                      # touch sans changement de contenu
+    assert cache.load(str(path)) is first
+    assert len(calls) == 1
+
+    path.write_text('{"x": 22}')
+    _bump_mtime(path)
+    assert cache.load(str(path)) == {"x": 22}
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def config_files(tmp_path, monkeypatch):
+    opt = tmp_path / "opt.json"
+    opt.write_text(json.dumps({
+        "GLOBAL_CONSTANTS": {"MAX_EQUITY_DD_USD_LIMIT": 800.0},
+        "CONFIGURATIONS_BY_SCHEDULE": {
+            "ASIAN02": {"HOUR_RANGE_START": 0, "HOUR_RANGE_END": 2, "ML_THRESHOLD": 0.6,
+                        "RISK_MANAGEMENT": {"FIXED_LOTS": 2}},
+            "US": {"HOUR_RANGE_START": 13, "HOUR_RANGE_END": 20,
+                   "CONSTRAINTS": {"MAX_EQUITY_DD_USD_LIMIT": 500.0}},
+        },
+    }))
+    (tmp_path / "config.yaml").write_text(
+        f"config_horaire:\n  path: {opt}\ntrading:\n  symbol: UB\ngeneral:\n  DEFAULT_FIXED_LOTS: 3\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    cfg_reader.clear_config_cache()
+    config_snapshot.reset_snapshot()
+    yield opt
+    cfg_reader.clear_config_cache()
+    config_snapshot.reset_snapshot()
+
+
+def test_snapshot_compiled_once_and_invalidated_on_change(config_files):
+    snap = config_snapshot.get_snapshot()
+    assert config_snapshot.get_snapshot() is snap
+    assert [s.name for s in snap.schedules] == ["ASIAN02", "US"]
+    assert snap.schedules[0].ml_threshold == 0.6 and snap.schedules[0].fixed_lots == 2.0
+    assert dict(snap.dd_limits) == {"ASIAN02": 800.0, "US": 500.0}
+    assert snap.trading.symbol == "UB" and snap.trading.default_lots == 3
+
+    data = json.loads(config_files.read_text())
+    data["CONFIGURATIONS_BY_SCHEDULE"]["ASIAN02"]["ML_THRESHOLD"] = 0.7
+    config_files.write_text(json.dumps(data))
+    _bump_mtime(config_files)
+
+    new = config_snapshot.get_snapshot()
+    assert new is not snap and new.version == snap.version + 1
+    assert new.schedules[0].ml_threshold == 0.7
+
+
+def test_snapshot_is_immutable(config_files):
+    snap = config_snapshot.get_snapshot()
+    with pytest.raises(TypeError):
+        snap.by_schedule["ASIAN02"]["ML_THRESHOLD"] = 0.1
+    with pytest.raises(FrozenInstanceError):
+        snap.schedules[0].ml_threshold = 0.1
+    assert isinstance(snap.app["config_horaire"], type(snap.by_schedule))
+    assert type(snap.app) is type(cfg_reader.load_config())       # un seul type figé : ReadOnlyDict
+
+
+def test_shared_loader_results_are_read_only(config_files):
+    import copy
+    import signals.optimizer.optimizer_rules as rules
+
+    cfg = cfg_reader.load_config()
+    opt = rules.load_optimizer_config(str(config_files))
+    with pytest.raises(TypeError):
+        cfg["trading"]["symbol"] = "NQ"
+    with pytest.raises(TypeError):
+        opt["CONFIGURATIONS_BY_SCHEDULE"].pop("US")
+    with pytest.raises(TypeError):
+        cfg.setdefault("extra", {})
+    assert isinstance(cfg, dict) and json.loads(json.dumps(cfg))["trading"] == {"symbol": "UB"}
+
+    mine = copy.deepcopy(cfg)                 # copie modifiable, le cache reste intact
+    mine["trading"]["symbol"] = "NQ"
+    assert cfg_reader.load_config()["trading"]["symbol"] == "UB"
+    assert config_snapshot.get_snapshot().trading.symbol == "UB"
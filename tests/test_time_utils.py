@@ -0,0 +1,22 @@
+# tests/test_time_utils.py
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from signals.utils.time_utils import datetime_to_ns, datetimes_to_ns
+
+NS = 1752501900000000000   # 2025-07-14T14:05:00Z
+
+
+def test_one_tz_rule_for_scalars_and_arrays():
+    paris = timezone(timedelta(hours=2))
+    scalars = ["2025-07-14T14:05:00Z", "2025-07-14 14:05:00", datetime(2025, 7, 14, 16, 5, tzinfo=paris),
+               pd.Timestamp("2025-07-14 14:05"), np.datetime64("2025-07-14T14:05"), NS]
+    assert [datetime_to_ns(v) for v in scalars] == [NS] * len(scalars)
+    assert list(datetimes_to_ns(scalars[:4])) == [NS] * 4          # aware -> UTC, naïf pris comme UTC
+
+    naive = pd.Series(pd.date_range("2025-07-14 14:05", periods=2, freq="5min"))
+    assert list(datetimes_to_ns(naive)) == list(datetimes_to_ns(naive.dt.tz_localize("UTC")))
+    assert list(datetimes_to_ns(np.array(["2025-07-14T14:05"], dtype="datetime64[s]"))) == [NS]
+    assert datetimes_to_ns(np.array([NS])).dtype == np.int64